@@ -8,8 +8,12 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
-from .routes import chat, agents, decisions, feedback
+from .routes import chat, agents, decisions, feedback, metrics, outputs
 from src.observability import setup_logging_middleware, get_logger
+from src.executor import get_agent_executor
+from src.agent_pool import get_warm_pool
+from src.availability import get_availability_registry
+from src.worktree_pool import get_worktree_pool
 
 
 @asynccontextmanager
@@ -18,9 +22,19 @@ async def lifespan(app: FastAPI):
     # Startup
     logger = get_logger("app.lifecycle")
     logger.info("application_starting", service="lastagent-api")
+    registry = get_availability_registry()
+    await registry.probe_all()
+    registry.start_background_probing()
+    pool = get_warm_pool()
+    if pool.enabled:
+        await get_agent_executor().prewarm()
+        pool.start_background_pruning()
     yield
     # Shutdown
     logger.info("application_stopping", service="lastagent-api")
+    registry.stop_background_probing()
+    await pool.shutdown()
+    await get_worktree_pool().shutdown()
 
 
 app = FastAPI(
@@ -47,6 +61,8 @@ app.include_router(chat.router, prefix="/v1", tags=["chat"])
 app.include_router(agents.router, prefix="/v1", tags=["agents"])
 app.include_router(decisions.router, prefix="/v1", tags=["decisions"])
 app.include_router(feedback.router, prefix="/v1", tags=["feedback"])
+app.include_router(metrics.router, prefix="/v1", tags=["metrics"])
+app.include_router(outputs.router, prefix="/v1", tags=["outputs"])
 
 
 @app.get("/")
@@ -61,6 +77,7 @@ async def root():
             "agents": "/v1/agents",
             "decisions": "/v1/decisions",
             "feedback": "/v1/feedback",
+            "metrics": "/v1/metrics",
         },
     }
 
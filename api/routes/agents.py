@@ -5,15 +5,19 @@ List and get information about available agents.
 AGENTS ARE NOT LLMs - they have CLI/SDK with agentic capabilities.
 """
 
+from dataclasses import asdict
+
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional
 
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from src.config import get_config
+from src.config import get_config, AgentConfig
+from src.availability import AgentAvailability, get_availability_registry
+from src.timeouts import get_timeout_policy
 
 
 router = APIRouter()
@@ -33,6 +37,12 @@ class AgentInfo(BaseModel):
     strengths: List[str]
     mcp_server: Optional[str]
     requires_working_directory: bool
+    available: bool  # CLI found on PATH at the last probe
+    path: Optional[str] = None  # Resolved CLI path
+    version: Optional[str] = None  # First line of `<cli> --version`
+    probe_latency_ms: Optional[float] = None
+    probed_at: Optional[str] = None
+    probe_error: Optional[str] = None
 
 
 class AgentsListResponse(BaseModel):
@@ -41,44 +51,88 @@ class AgentsListResponse(BaseModel):
     count: int
 
 
+class TimeoutOverride(BaseModel):
+    """Pinned run timeout for an agent."""
+    seconds: float = Field(..., gt=0)
+    task_type: Optional[str] = None  # None = every task type
+
+
+# =============================================================================
+# HELPERS
+# =============================================================================
+
+def _agent_info(name: str, agent: AgentConfig, probe: AgentAvailability) -> AgentInfo:
+    """Build AgentInfo from config plus the latest availability probe."""
+    return AgentInfo(
+        name=name,
+        display_name=agent.display_name,
+        type=agent.type,
+        command=agent.command,
+        capabilities=agent.capabilities,
+        strengths=agent.strengths,
+        mcp_server=agent.mcp_server,
+        requires_working_directory=agent.requires_working_directory,
+        available=probe.available,
+        path=probe.path,
+        version=probe.version,
+        probe_latency_ms=probe.probe_latency_ms,
+        probed_at=probe.probed_at.isoformat(),
+        probe_error=probe.error,
+    )
+
+
+def _require_agent(agent_name: str) -> AgentConfig:
+    """Get an agent's config, or raise 404."""
+    try:
+        return get_config().get_agent(agent_name)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Agent not found: {agent_name}")
+
+
+async def _get_probe(name: str, refresh: bool) -> AgentAvailability:
+    """Get the cached probe for an agent, probing it if needed."""
+    registry = get_availability_registry()
+    probe = registry.get(name)
+    if probe is None or refresh:
+        probe = await registry.probe(name)
+    return probe
+
+
 # =============================================================================
 # ENDPOINTS
 # =============================================================================
 
 @router.get("/agents", response_model=AgentsListResponse)
-async def list_agents():
+async def list_agents(refresh: bool = False):
     """
     List all available agents.
     
     Returns information about each agent including capabilities and strengths.
-    All agents are CLI-based (not LLM APIs).
+    All agents are CLI-based (not LLM APIs). Availability comes from the
+    background CLI probes; pass refresh=true to re-probe now.
     """
     config = get_config()
-    agents = []
+    registry = get_availability_registry()
+    
+    if refresh or not registry.get_all():
+        await registry.probe_all()
     
+    agents = []
     for name in config.get_agent_names():
         agent = config.get_agent(name)
-        agents.append(AgentInfo(
-            name=name,
-            display_name=agent.display_name,
-            type=agent.type,
-            command=agent.command,
-            capabilities=agent.capabilities,
-            strengths=agent.strengths,
-            mcp_server=agent.mcp_server,
-            requires_working_directory=agent.requires_working_directory,
-        ))
+        agents.append(_agent_info(name, agent, await _get_probe(name, refresh=False)))
         
     return AgentsListResponse(agents=agents, count=len(agents))
 
 
 @router.get("/agents/{agent_name}", response_model=AgentInfo)
-async def get_agent(agent_name: str):
+async def get_agent(agent_name: str, refresh: bool = False):
     """
     Get information about a specific agent.
     
     Args:
         agent_name: Name of the agent (e.g., "claude", "aider")
+        refresh: Re-probe the CLI instead of using the cached result
     """
     config = get_config()
     
@@ -87,16 +141,7 @@ async def get_agent(agent_name: str):
     except KeyError:
         raise HTTPException(status_code=404, detail=f"Agent not found: {agent_name}")
         
-    return AgentInfo(
-        name=agent_name,
-        display_name=agent.display_name,
-        type=agent.type,
-        command=agent.command,
-        capabilities=agent.capabilities,
-        strengths=agent.strengths,
-        mcp_server=agent.mcp_server,
-        requires_working_directory=agent.requires_working_directory,
-    )
+    return _agent_info(agent_name, agent, await _get_probe(agent_name, refresh))
 
 
 @router.get("/agents/by-capability/{capability}")
@@ -115,3 +160,42 @@ async def get_agents_by_capability(capability: str):
         "agents": agents,
         "count": len(agents),
     }
+
+
+@router.get("/agents/{agent_name}/timeout")
+async def get_agent_timeout(agent_name: str, task_type: Optional[str] = None):
+    """
+    Get the timeout an agent's runs get when the request doesn't set one.
+    
+    Args:
+        agent_name: Name of the agent
+        task_type: Task analyzer type (e.g., "coding"); omit for all runs
+    
+    source is "override", "adaptive" (latency percentile x factor) or
+    "default" (not enough latency history yet).
+    """
+    _require_agent(agent_name)
+    return asdict(get_timeout_policy().resolve(agent_name, task_type))
+
+
+@router.put("/agents/{agent_name}/timeout")
+async def set_agent_timeout(agent_name: str, override: TimeoutOverride):
+    """
+    Pin an agent's timeout instead of deriving it from latency.
+    
+    Overrides are kept in memory until cleared or the server restarts.
+    """
+    _require_agent(agent_name)
+    policy = get_timeout_policy()
+    policy.set_override(agent_name, override.seconds, override.task_type)
+    return asdict(policy.resolve(agent_name, override.task_type))
+
+
+@router.delete("/agents/{agent_name}/timeout")
+async def clear_agent_timeout(agent_name: str, task_type: Optional[str] = None):
+    """Remove a timeout override, returning to the adaptive timeout."""
+    _require_agent(agent_name)
+    policy = get_timeout_policy()
+    if not policy.clear_override(agent_name, task_type):
+        raise HTTPException(status_code=404, detail=f"No timeout override for: {agent_name}")
+    return asdict(policy.resolve(agent_name, task_type))
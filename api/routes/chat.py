@@ -5,21 +5,40 @@ OpenAI-compatible chat completions endpoint.
 """
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+import json
+import time
 import uuid
 
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from src.orchestrator import get_orchestrator
+from src.orchestrator import FanOutPolicy, get_orchestrator
 from src.council_selector import get_council_selector
 from src.approvals import ApprovalMode
+from src.executor import StreamEventType
 
 
 router = APIRouter()
 
+# Orchestrator result metadata passed through in lastagent_metadata
+RESULT_METADATA_KEYS = (
+    "attempts",
+    "hedge",
+    "cache",
+    "output",
+    "resource_usage",
+    "worktree",
+    "tool_calls",
+    "fan_out",
+    "trace",
+    "selection_cache",
+    "selection_similarity",
+)
+
 
 # =============================================================================
 # REQUEST/RESPONSE MODELS (OpenAI-compatible)
@@ -44,6 +63,21 @@ class ChatCompletionRequest(BaseModel):
     approval_mode: Optional[str] = Field(
         None, description="Approval mode: AUTO, APPROVE_ALL, APPROVE_HIGH_RISK"
     )
+    bypass_cache: Optional[bool] = Field(
+        False, description="Skip the council selection and execution result caches for this request"
+    )
+    isolation: Optional[str] = Field(
+        None, description="Isolation: worktree (own git worktree per task) or shared"
+    )
+    read_only: Optional[bool] = Field(
+        None, description="Task won't modify files (shares the working directory lock)"
+    )
+    n: Optional[int] = Field(
+        1, ge=1, description="Run the task on the top-n agents at once (fan-out)"
+    )
+    fan_out_policy: Optional[str] = Field(
+        None, description="With n > 1: first_success, all, or judge"
+    )
 
 
 class Choice(BaseModel):
@@ -54,10 +88,52 @@ class Choice(BaseModel):
 
 
 class Usage(BaseModel):
-    """Token usage statistics."""
+    """
+    Token usage statistics.
+    
+    Real counts when the agent's CLI reports them (agents.yml
+    output_format: stream-json), otherwise word-count estimates.
+    """
     prompt_tokens: int
     completion_tokens: int
     total_tokens: int
+    estimated: bool = False  # Word counts, not tokens reported by the agent
+    cost_usd: Optional[float] = None
+    
+    @classmethod
+    def from_run(cls, usage: Optional[Dict[str, Any]], prompt: str, response: str) -> "Usage":
+        """Usage reported by the agent CLI, else an estimate from word counts."""
+        if usage:
+            prompt_tokens = (
+                usage.get("input_tokens", 0)
+                + usage.get("cache_read_tokens", 0)
+                + usage.get("cache_creation_tokens", 0)
+            )
+            return cls(
+                prompt_tokens=prompt_tokens,
+                completion_tokens=usage.get("output_tokens", 0),
+                total_tokens=prompt_tokens + usage.get("output_tokens", 0),
+                cost_usd=usage.get("cost_usd"),
+            )
+        return cls(
+            prompt_tokens=len(prompt.split()),
+            completion_tokens=len(response.split()),
+            total_tokens=len(prompt.split()) + len(response.split()),
+            estimated=True,
+        )
+    
+    @classmethod
+    def total(cls, usages: Iterable["Usage"]) -> "Usage":
+        """Combined usage of several runs (fan-out)."""
+        usages = list(usages)
+        costs = [u.cost_usd for u in usages if u.cost_usd is not None]
+        return cls(
+            prompt_tokens=sum(u.prompt_tokens for u in usages),
+            completion_tokens=sum(u.completion_tokens for u in usages),
+            total_tokens=sum(u.total_tokens for u in usages),
+            estimated=any(u.estimated for u in usages),
+            cost_usd=sum(costs) if costs else None,
+        )
 
 
 class ChatCompletionResponse(BaseModel):
@@ -86,8 +162,6 @@ async def create_chat_completion(request: ChatCompletionRequest):
     3. Execute the agent with the original prompts
     4. Return the response
     """
-    import time
-    
     # Extract system and user prompts from messages
     system_prompt = ""
     user_prompt = ""
@@ -97,10 +171,10 @@ async def create_chat_completion(request: ChatCompletionRequest):
             system_prompt = msg.content
         elif msg.role == "user":
             user_prompt = msg.content
-            
+    
     if not user_prompt:
         raise HTTPException(status_code=400, detail="At least one user message is required")
-        
+    
     # Get orchestrator
     orchestrator = get_orchestrator()
     
@@ -115,6 +189,34 @@ async def create_chat_completion(request: ChatCompletionRequest):
                 detail=f"Invalid approval_mode: {request.approval_mode}"
             )
     
+    n = request.n or 1
+    fan_out_policy = None
+    if request.fan_out_policy:
+        try:
+            fan_out_policy = FanOutPolicy(request.fan_out_policy)
+        except ValueError:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid fan_out_policy: {request.fan_out_policy}"
+            )
+    
+    if request.stream:
+        if n > 1:
+            raise HTTPException(status_code=400, detail="n > 1 is not supported with stream")
+        return StreamingResponse(
+            _stream_chat_completion(
+                orchestrator,
+                system_prompt=system_prompt,
+                user_prompt=user_prompt,
+                working_directory=request.working_directory,
+                approval_mode=approval_mode,
+                bypass_cache=bool(request.bypass_cache),
+                isolation=request.isolation,
+                read_only=request.read_only,
+            ),
+            media_type="text/event-stream",
+        )
+    
     # Process the task
     try:
         result = await orchestrator.process_task(
@@ -122,10 +224,25 @@ async def create_chat_completion(request: ChatCompletionRequest):
             user_prompt=user_prompt,
             working_directory=request.working_directory,
             approval_mode=approval_mode,
+            bypass_cache=bool(request.bypass_cache),
+            isolation=request.isolation,
+            read_only=request.read_only,
+            n=n,
+            fan_out_policy=fan_out_policy,
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
-        
+    
+    # Fan-out: usage of every run; policy "all" returns one choice per agent
+    fan_out = result.metadata.get("fan_out")
+    runs = fan_out["results"] if fan_out else [
+        {"response": result.response, "usage": result.metadata.get("usage")}
+    ]
+    if fan_out and fan_out["policy"] == FanOutPolicy.ALL.value:
+        responses = [run["response"] for run in runs]
+    else:
+        responses = [result.response]
+    
     # Build response
     response = ChatCompletionResponse(
         id=f"chatcmpl-{uuid.uuid4().hex[:8]}",
@@ -133,22 +250,83 @@ async def create_chat_completion(request: ChatCompletionRequest):
         model=result.agent,
         choices=[
             Choice(
-                index=0,
-                message=Message(role="assistant", content=result.response),
+                index=index,
+                message=Message(role="assistant", content=response),
                 finish_reason="stop",
             )
+            for index, response in enumerate(responses)
         ],
-        usage=Usage(
-            prompt_tokens=len(user_prompt.split()),
-            completion_tokens=len(result.response.split()),
-            total_tokens=len(user_prompt.split()) + len(result.response.split()),
+        usage=Usage.total(
+            Usage.from_run(run["usage"], user_prompt, run["response"]) for run in runs
         ),
         lastagent_metadata={
             "task_id": result.task_id,
             "agent": result.agent,
             "duration_ms": result.duration_ms,
             "success": result.success,
+            **{k: result.metadata[k] for k in RESULT_METADATA_KEYS if k in result.metadata},
         },
     )
     
     return response
+
+
+async def _stream_chat_completion(
+    orchestrator,
+    system_prompt: str,
+    user_prompt: str,
+    working_directory: Optional[str],
+    approval_mode: Optional[ApprovalMode],
+    bypass_cache: bool = False,
+    isolation: Optional[str] = None,
+    read_only: Optional[bool] = None,
+) -> AsyncIterator[str]:
+    """
+    Yield OpenAI-compatible `chat.completion.chunk` server-sent events.
+    
+    Each agent stdout chunk becomes one `delta` event as soon as the CLI
+    produces it; the stream ends with a `finish_reason` chunk and `[DONE]`.
+    """
+    completion_id = f"chatcmpl-{uuid.uuid4().hex[:8]}"
+    created = int(time.time())
+    
+    def sse(payload: Dict[str, Any]) -> str:
+        return f"data: {json.dumps(payload)}\n\n"
+    
+    async for event in orchestrator.process_task_stream(
+        system_prompt=system_prompt,
+        user_prompt=user_prompt,
+        working_directory=working_directory,
+        approval_mode=approval_mode,
+        bypass_cache=bypass_cache,
+        isolation=isolation,
+        read_only=read_only,
+    ):
+        chunk: Dict[str, Any] = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": event.agent_name,
+        }
+        if event.type == StreamEventType.CHUNK:
+            chunk["choices"] = [
+                {"index": 0, "delta": {"content": event.data}, "finish_reason": None}
+            ]
+        else:
+            chunk["choices"] = [
+                {"index": 0, "delta": {}, "finish_reason": "stop" if event.success else "error"}
+            ]
+            chunk["lastagent_metadata"] = {
+                "agent": event.agent_name,
+                "duration_ms": event.duration_ms,
+                "success": event.success,
+                "exit_code": event.exit_code,
+                "error": event.error,
+            }
+            if event.worktree:
+                chunk["lastagent_metadata"]["worktree"] = event.worktree
+            if event.usage:
+                chunk["usage"] = Usage.from_run(event.usage, "", "").model_dump()
+        yield sse(chunk)
+    
+    yield "data: [DONE]\n\n"
@@ -60,6 +60,7 @@ class DecisionStatsResponse(BaseModel):
     decisions_by_status: Dict[str, int]
     average_confidence: float
     success_rate: float
+    token_usage: Dict[str, Dict[str, float]] = {}  # Per agent: runs, tokens, cost_usd
 
 
 # =============================================================================
@@ -138,6 +139,7 @@ async def get_decision_stats():
         decisions_by_status=stats.decisions_by_status,
         average_confidence=stats.average_confidence,
         success_rate=stats.success_rate,
+        token_usage=stats.token_usage,
     )
 
 
@@ -0,0 +1,204 @@
+"""
+Metrics Endpoint
+
+Runtime metrics for capacity planning and debugging.
+"""
+
+from dataclasses import asdict
+
+from fastapi import APIRouter, HTTPException
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.scheduler import get_execution_scheduler
+from src.process_lifecycle import get_process_manager
+from src.agent_pool import get_warm_pool
+from src.latency import get_latency_tracker
+from src.result_cache import get_result_cache
+from src.selection_cache import get_selection_cache
+from src.similarity_cache import get_similarity_cache
+from src.routing_table import get_routing_table
+from src.worktree_pool import get_worktree_pool
+from src.directory_locks import get_directory_locks
+from src.stall_detector import get_stall_detector
+from src.timeouts import get_timeout_policy
+from src.resource_limits import get_resource_limiter
+from src.task_analyzer import TaskType
+from src.observability import get_tracer
+
+
+router = APIRouter()
+
+
+# =============================================================================
+# ENDPOINTS
+# =============================================================================
+
+@router.get("/metrics/scheduler")
+async def get_scheduler_metrics():
+    """
+    Get execution scheduler metrics.
+    
+    Includes in-flight and queued executions plus queue-wait time
+    (average, p95 and max over recent admissions).
+    """
+    return asdict(get_execution_scheduler().get_stats())
+
+
+@router.get("/metrics/processes")
+async def get_process_metrics(limit: int = 20):
+    """
+    Get agent subprocess lifecycle metrics.
+    
+    Includes spawn/exit/kill counters and recent reports of processes that
+    outlived their agent CLI (leaked or orphaned children).
+    """
+    manager = get_process_manager()
+    return {
+        "stats": asdict(manager.get_stats()),
+        "recent_leaks": [asdict(r) for r in manager.get_leaks(limit)],
+    }
+
+
+@router.get("/metrics/pool")
+async def get_pool_metrics():
+    """
+    Get warm agent process pool metrics.
+    
+    Includes idle processes and hit/miss counters (a miss is a task that
+    had to cold-start its CLI).
+    """
+    return asdict(get_warm_pool().get_stats())
+
+
+@router.get("/metrics/latency")
+async def get_latency_metrics():
+    """
+    Get per-agent execution latency percentiles.
+    
+    Computed over recent successful runs, overall (task_type null) and per
+    task type; hedged execution and adaptive timeouts are based on these.
+    """
+    tracker = get_latency_tracker()
+    return {
+        "min_samples": tracker.min_samples,
+        "agents": [asdict(s) for s in tracker.get_stats(include_task_types=True)],
+    }
+
+
+@router.get("/metrics/result-cache")
+async def get_result_cache_metrics():
+    """
+    Get execution result cache metrics.
+    
+    Includes hit/miss/bypass counts plus LRU evictions and TTL expirations.
+    """
+    return asdict(get_result_cache().get_stats())
+
+
+@router.get("/metrics/selection-cache")
+async def get_selection_cache_metrics():
+    """
+    Get council selection cache metrics.
+    
+    Includes hit/miss/bypass counts plus LRU evictions and TTL expirations,
+    for exact matches and for near-duplicates ("similarity").
+    """
+    return {
+        **asdict(get_selection_cache().get_stats()),
+        "similarity": asdict(get_similarity_cache().get_stats()),
+    }
+
+
+@router.get("/metrics/routing-table")
+async def get_routing_table_metrics():
+    """
+    Get council routing table metrics.
+    
+    Includes table hits/misses, council re-validations and how often they
+    disagreed, plus the leading route of every known feature signature.
+    """
+    table = get_routing_table()
+    return {
+        **asdict(table.get_stats()),
+        "routes": [asdict(route) for route in table.get_routes()],
+    }
+
+
+@router.get("/metrics/worktrees")
+async def get_worktree_metrics():
+    """
+    Get git worktree pool metrics.
+    
+    Includes idle and leased worktrees plus merge-back branches created.
+    """
+    return asdict(get_worktree_pool().get_stats())
+
+
+@router.get("/metrics/locks")
+async def get_lock_metrics():
+    """
+    Get working directory lock metrics.
+    
+    Includes locked directories, readers/writers holding them, tasks
+    waiting and how often a lock was contended.
+    """
+    return asdict(get_directory_locks().get_stats())
+
+
+@router.get("/metrics/stalls")
+async def get_stall_metrics():
+    """
+    Get stall detector metrics.
+    
+    Includes runs watched and runs aborted for producing no output and
+    using no CPU for their stall timeout.
+    """
+    return asdict(get_stall_detector().get_stats())
+
+
+@router.get("/metrics/timeouts")
+async def get_timeout_metrics():
+    """
+    Get the effective run timeout of each agent, overall and per task type.
+    
+    Each entry has the timeout in seconds and its source: an override, the
+    adaptive value from latency history, or the default.
+    """
+    policy = get_timeout_policy()
+    task_types = [t.value for t in TaskType if t != TaskType.UNKNOWN]
+    return {
+        "adaptive": policy.adaptive,
+        "percentile": policy.percentile,
+        "factor": policy.factor,
+        "min_seconds": policy.min_seconds,
+        "max_seconds": policy.max_seconds,
+        "timeouts": [asdict(t) for t in policy.get_all(task_types)],
+    }
+
+
+@router.get("/metrics/limits")
+async def get_limit_metrics():
+    """
+    Get agent resource limit metrics.
+    
+    Includes CLIs spawned with agents.yml limits and runs that failed on
+    one, by limit (address_space, cpu_time, open_files).
+    """
+    return asdict(get_resource_limiter().get_stats())
+
+
+@router.get("/metrics/traces/{trace_id}")
+async def get_trace(trace_id: str):
+    """
+    Get the spans recorded for a trace.
+    
+    Each agent run is an agent_execution span with spawn / first_byte /
+    last_byte / exit sub-spans (result metadata "trace" has the IDs).
+    """
+    spans = get_tracer().get_trace_spans(trace_id)
+    if not spans:
+        raise HTTPException(status_code=404, detail=f"Trace not found: {trace_id}")
+    return {"trace_id": trace_id, "spans": [span.to_dict() for span in spans]}
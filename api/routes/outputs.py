@@ -0,0 +1,35 @@
+"""
+Outputs Endpoint
+
+Retrieve full agent output that was too large to keep in memory.
+"""
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import FileResponse
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from src.output_buffer import get_output_store
+
+
+router = APIRouter()
+
+
+# =============================================================================
+# ENDPOINTS
+# =============================================================================
+
+@router.get("/outputs/{handle}")
+async def get_output(handle: str):
+    """
+    Get the full stdout/stderr of an agent run that spilled to disk.
+    
+    Handles are listed in lastagent_metadata.output of truncated responses
+    and expire after settings.execution.output.retention_seconds.
+    """
+    stored = get_output_store().get(handle)
+    if stored is None:
+        raise HTTPException(status_code=404, detail=f"Output not found or expired: {handle}")
+    return FileResponse(stored.path, media_type="text/plain; charset=utf-8")
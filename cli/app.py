@@ -228,8 +228,36 @@ def chat(
         if not result.success:
             raise typer.Exit(1)
     
+    async def run_chat_stream():
+        from src.orchestrator import get_orchestrator
+        from src.executor import StreamEventType
+        from cli.tui.streaming import stream_response
+        
+        orchestrator = get_orchestrator()
+        summary = None
+        
+        async def chunks():
+            nonlocal summary
+            async for event in orchestrator.process_task_stream(
+                system_prompt=system,
+                user_prompt=prompt,
+                working_directory=str(directory) if directory else None,
+            ):
+                if event.type == StreamEventType.CHUNK:
+                    yield event.data
+                else:
+                    summary = event
+        
+        await stream_response(chunks(), console=console, render_markdown=not no_markdown)
+        
+        if summary is not None:
+            console.print(f"[dim]{summary.agent_name} · {summary.duration_ms}ms[/]")
+            if not summary.success:
+                print_error(summary.error or "Agent execution failed")
+                raise typer.Exit(1)
+    
     try:
-        asyncio.run(run_chat())
+        asyncio.run(run_chat() if no_stream else run_chat_stream())
     except KeyboardInterrupt:
         console.print("\n[dim]Cancelled.[/]")
         raise typer.Exit(130)
@@ -266,11 +294,14 @@ def agents(
         
         lastagent agents --json
     """
+    import asyncio
     import json as json_lib
     from src.config import get_config
+    from src.availability import get_availability_registry
     from cli.tui.console import print_agents_table
     
     config = get_config()
+    probes = asyncio.run(get_availability_registry().probe_all())
     
     if capability:
         agent_names = config.get_agents_by_capability(capability)
@@ -281,11 +312,15 @@ def agents(
     agents_list = []
     for name in agent_names:
         agent = config.get_agent(name)
+        probe = probes.get(name)
         agents_list.append({
             "name": name,
             "type": getattr(agent, 'type', 'unknown'),
             "strengths": getattr(agent, 'strengths', []),
-            "available": True,  # Could check actual availability
+            "available": probe.available if probe else False,
+            "path": probe.path if probe else None,
+            "version": probe.version if probe else None,
+            "probe_latency_ms": probe.probe_latency_ms if probe else None,
         })
     
     if json_output:
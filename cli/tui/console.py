@@ -168,6 +168,7 @@ def print_agents_table(agents: list[dict]):
     table.add_column("Agent", style="bold")
     table.add_column("Type", style="dim")
     table.add_column("Best For", style="italic")
+    table.add_column("Version", style="dim")
     table.add_column("Status", justify="center")
     
     for agent in agents:
@@ -175,6 +176,7 @@ def print_agents_table(agents: list[dict]):
         agent_type = agent.get("type", "unknown")
         best_for = agent.get("strengths", [""])[0] if agent.get("strengths") else ""
         available = agent.get("available", True)
+        version = agent.get("version") or ""
         
         status = "[green]●[/]" if available else "[red]○[/]"
         style = get_agent_style(name)
@@ -183,6 +185,7 @@ def print_agents_table(agents: list[dict]):
             f"[{style}]{name}[/]",
             agent_type,
             best_for[:50] + "..." if len(best_for) > 50 else best_for,
+            version[:30] + "..." if len(version) > 30 else version,
             status,
         )
     
@@ -10,6 +10,7 @@ from typing import Dict, List, Optional, Tuple
 
 from .config import get_config, AgentConfig
 from .task_analyzer import TaskAnalysis, TaskType
+from .availability import get_availability_registry
 
 
 @dataclass
@@ -59,6 +60,17 @@ class AgentMatcher:
     def __init__(self):
         """Initialize the agent matcher."""
         self.config = get_config()
+        self.availability = get_availability_registry()
+        
+    def available_agents(self) -> List[str]:
+        """
+        Agents whose CLI is installed.
+        
+        If no CLI is found at all, every configured agent is returned so the
+        executor can report the missing install instead of selecting nothing.
+        """
+        available = self.availability.available_agents()
+        return available or self.config.get_agent_names()
         
     def match(self, analysis: TaskAnalysis) -> MatchResult:
         """
@@ -71,10 +83,14 @@ class AgentMatcher:
             MatchResult with ranked agent matches
         """
         matches = []
+        installed = set(self.available_agents())
         
         for agent_name in self.config.get_agent_names():
             agent = self.config.get_agent(agent_name)
             match = self._score_agent(agent_name, agent, analysis)
+            if agent_name not in installed:
+                match.is_eligible = False
+                match.reason = f"Agent CLI not installed: {agent.command or agent_name}"
             matches.append(match)
             
         # Sort by score (highest first)
@@ -87,8 +103,12 @@ class AgentMatcher:
         recommended = [m.agent_name for m in eligible[:3]]
         
         # If less than 3 eligible, add top scoring ineligible ones
+        # (never agents that aren't installed)
         if len(recommended) < 3:
-            ineligible = [m for m in matches if not m.is_eligible]
+            ineligible = [
+                m for m in matches
+                if not m.is_eligible and m.agent_name in installed
+            ]
             for m in ineligible:
                 if m.agent_name not in recommended:
                     recommended.append(m.agent_name)
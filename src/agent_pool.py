@@ -0,0 +1,395 @@
+"""
+LastAgent Warm Agent Process Pool
+
+Pre-spawns idle agent CLI processes so tasks skip the cold start.
+
+Every task normally pays the full start-up cost of its CLI (Node/Python
+interpreter boot, auth and config loading, repository scanning). For CLIs
+that accept the prompt on stdin, that work can happen *before* the task
+arrives: the pool starts the CLI with every argument except the prompt and
+leaves it blocked on stdin. When a task comes in, the executor takes a warm
+process, writes the prompt to its stdin and reads the response as usual.
+
+Pools are keyed by (agent, working directory, system prompt) because those
+are baked into the argv at spawn time. Each pool is refilled in the
+background after a process is handed out. Keys that serve many repositories
+or prompts must not pile up warm CLIs: the idle processes of all keys
+together are capped at max_idle, and keys that haven't been acquired for
+key_ttl seconds are evicted (their idle processes killed) by prune().
+Only acquire() and prewarm() spawn; expired processes are not replaced
+until their key is used again.
+
+Configuration (agents.yml, per agent):
+    warm_pool:
+      size: 1         # Idle processes kept per key
+      idle_ttl: 300   # Seconds an idle process may wait before being recycled
+      max_tasks: 1    # Tasks served before recycling (one-shot CLIs exit after 1)
+
+The pool is opt-in via settings.yml -> execution.warm_pool.enabled; max_idle
+and key_ttl are set there too.
+"""
+
+import asyncio
+import os
+import signal
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from .config import get_config, AgentConfig
+from .process_lifecycle import ProcessLifecycleManager, get_process_manager
+
+# Enterprise structured logging
+try:
+    from src.observability import get_logger
+except ImportError:
+    from .observability import get_logger
+
+
+# (agent_name, resolved working directory, system prompt)
+PoolKey = Tuple[str, str, str]
+
+
+@dataclass
+class WarmProcess:
+    """An idle, pre-spawned agent CLI waiting for its prompt on stdin."""
+    key: PoolKey
+    process: asyncio.subprocess.Process
+    loop: asyncio.AbstractEventLoop
+    spawned_at: float = field(default_factory=time.monotonic)
+    tasks_served: int = 0
+
+
+@dataclass
+class PoolStats:
+    """Warm pool counters."""
+    enabled: bool
+    idle: int
+    max_idle: int
+    keys: int
+    hits: int
+    misses: int
+    spawned: int
+    recycled: int
+    evicted_keys: int  # Keys dropped after key_ttl without an acquire
+
+
+class WarmProcessPool:
+    """
+    Keeps pre-spawned agent processes ready for incoming tasks.
+    
+    Usage:
+        pool = get_warm_pool()
+        process = await pool.acquire("claude", cwd, system_prompt, warm_cmd)
+        if process is None:
+            ...  # cold spawn
+        else:
+            stdout, stderr = await process.communicate(prompt.encode())
+            await pool.release(process)
+    """
+    
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        processes: Optional[ProcessLifecycleManager] = None,
+        max_idle: Optional[int] = None,
+        key_ttl: Optional[float] = None,
+    ):
+        """
+        Initialize the pool.
+        
+        Args:
+            enabled: Turn pooling on/off. Defaults to settings.execution.warm_pool.enabled
+            processes: Lifecycle manager used to spawn and kill pooled processes
+            max_idle: Idle processes across all keys. Defaults to warm_pool.max_idle
+            key_ttl: Seconds without an acquire before a key is evicted.
+                Defaults to warm_pool.key_ttl
+        """
+        self.config = get_config()
+        settings = self.config.settings.execution.get("warm_pool", {})
+        if enabled is None:
+            enabled = settings.get("enabled", False)
+        if max_idle is None:
+            max_idle = settings.get("max_idle", 4)
+        if key_ttl is None:
+            key_ttl = settings.get("key_ttl", 600)
+        
+        self.enabled = bool(enabled)
+        self.max_idle = max(0, int(max_idle))
+        self.key_ttl = float(key_ttl)
+        self.prune_interval = float(settings.get("prune_interval", 30))
+        self.processes = processes or get_process_manager()
+        self._log = get_logger("pool")
+        
+        self._idle: Dict[PoolKey, List[WarmProcess]] = {}
+        self._commands: Dict[PoolKey, List[str]] = {}
+        self._last_used: Dict[PoolKey, float] = {}
+        self._busy: Dict[int, WarmProcess] = {}
+        self._refilling: Dict[PoolKey, asyncio.Task] = {}
+        self._prune_task: Optional[asyncio.Task] = None
+        self._counters: Dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "spawned": 0,
+            "recycled": 0,
+            "evicted_keys": 0,
+        }
+    
+    def supports(self, agent_name: str) -> bool:
+        """Check whether tasks for this agent may use warm processes."""
+        if not self.enabled:
+            return False
+        try:
+            return self.config.get_agent(agent_name).warm_pool is not None
+        except KeyError:
+            return False
+    
+    def _pool_config(self, agent_name: str) -> AgentConfig:
+        return self.config.get_agent(agent_name)
+    
+    @staticmethod
+    def make_key(agent_name: str, working_directory: Optional[str], system_prompt: str) -> PoolKey:
+        """Build the pool key for a task."""
+        return (agent_name, os.path.realpath(working_directory or "."), system_prompt or "")
+    
+    async def acquire(
+        self,
+        agent_name: str,
+        working_directory: Optional[str],
+        system_prompt: str,
+        warm_cmd: List[str],
+    ) -> Optional[asyncio.subprocess.Process]:
+        """
+        Take a warm process for a task, or None if none is ready.
+        
+        A miss still registers the key so the pool warms up for next time.
+        
+        Args:
+            agent_name: Agent to execute
+            working_directory: Task working directory
+            system_prompt: Task system prompt
+            warm_cmd: argv of the CLI without the prompt (prompt goes to stdin)
+        
+        Returns:
+            A running process waiting on stdin, or None
+        """
+        if not self.supports(agent_name):
+            return None
+        
+        key = self.make_key(agent_name, working_directory, system_prompt)
+        self._commands[key] = list(warm_cmd)
+        self._last_used[key] = time.monotonic()
+        
+        warm = self._take_idle(key)
+        self._schedule_refill(key)
+        if warm is None:
+            self._counters["misses"] += 1
+            return None
+        
+        warm.tasks_served += 1
+        self._busy[warm.process.pid] = warm
+        self._counters["hits"] += 1
+        return warm.process
+    
+    async def release(self, process: asyncio.subprocess.Process) -> None:
+        """
+        Return a process after its task.
+        
+        Processes still running and under max_tasks go back to the idle
+        list; everything else is retired.
+        """
+        warm = self._busy.pop(process.pid, None)
+        if warm is None:
+            return
+        max_tasks = self._pool_config(warm.key[0]).warm_pool.max_tasks
+        if process.returncode is None and warm.tasks_served < max_tasks:
+            self._idle.setdefault(warm.key, []).append(warm)
+        elif process.returncode is None:
+            await self._recycle(warm)
+    
+    async def prewarm(
+        self,
+        agent_name: str,
+        warm_cmd: List[str],
+        working_directory: Optional[str] = None,
+        system_prompt: str = "",
+    ) -> None:
+        """Fill the pool for a key ahead of the first task."""
+        if not self.supports(agent_name):
+            return
+        key = self.make_key(agent_name, working_directory, system_prompt)
+        self._commands[key] = list(warm_cmd)
+        self._last_used[key] = time.monotonic()
+        await self._refill(key)
+    
+    def _take_idle(self, key: PoolKey) -> Optional[WarmProcess]:
+        """Pop the oldest usable idle process for a key."""
+        idle = self._idle.get(key, [])
+        loop = asyncio.get_running_loop()
+        ttl = self._pool_config(key[0]).warm_pool.idle_ttl
+        while idle:
+            warm = idle.pop(0)
+            usable = (
+                warm.loop is loop
+                and warm.process.returncode is None
+                and time.monotonic() - warm.spawned_at < ttl
+            )
+            if usable:
+                return warm
+            self._discard(warm)
+        return None
+    
+    def _schedule_refill(self, key: PoolKey) -> None:
+        """Top the pool for a key back up in the background."""
+        running = self._refilling.get(key)
+        if running is not None and not running.done():
+            return
+        self._refilling[key] = asyncio.ensure_future(self._refill(key))
+    
+    async def _refill(self, key: PoolKey) -> None:
+        """Spawn processes until the key has `size` idle entries (within max_idle)."""
+        cmd = self._commands.get(key)
+        if cmd is None:
+            return
+        size = self._pool_config(key[0]).warm_pool.size
+        idle = self._idle.setdefault(key, [])
+        while len(idle) < size and self._idle_count() < self.max_idle:
+            try:
+                process = await self.processes.spawn(
+                    key[0],
+                    cmd,
+                    cwd=key[1],
+                    pty=self._pool_config(key[0]).pty,
+                    stdin=asyncio.subprocess.PIPE,
+                )
+            except Exception as e:
+                self._log.warning("warm_spawn_failed", agent=key[0], error=str(e))
+                return
+            self._counters["spawned"] += 1
+            warm = WarmProcess(key=key, process=process, loop=asyncio.get_running_loop())
+            if self._idle.get(key) is not idle:
+                # Key was evicted while spawning
+                await self._recycle(warm)
+                return
+            idle.append(warm)
+    
+    def _idle_count(self) -> int:
+        """Idle processes across all keys."""
+        return sum(len(idle) for idle in self._idle.values())
+    
+    async def _recycle(self, warm: WarmProcess) -> None:
+        """Kill a pooled process that is no longer wanted."""
+        self._counters["recycled"] += 1
+        if warm.process.returncode is None:
+            await self.processes.terminate(warm.process, reason="recycled")
+    
+    def _discard(self, warm: WarmProcess) -> None:
+        """Drop an idle entry that can't be used (expired, dead, other loop)."""
+        self._counters["recycled"] += 1
+        if warm.process.returncode is None:
+            if warm.loop is asyncio.get_running_loop():
+                asyncio.ensure_future(self.processes.terminate(warm.process, reason="recycled"))
+            else:
+                # Transport belongs to a loop that is gone; kill synchronously
+                try:
+                    if os.name == "posix":
+                        os.killpg(warm.process.pid, signal.SIGKILL)
+                    else:
+                        warm.process.kill()
+                except (ProcessLookupError, PermissionError):
+                    pass
+    
+    async def prune(self) -> int:
+        """
+        Recycle idle processes past their idle TTL and evict stale keys.
+        
+        Expired processes are not replaced here; the key's next acquire()
+        refills it. Keys not acquired within key_ttl lose all their idle
+        processes and their registration.
+        
+        Returns:
+            Number of processes recycled
+        """
+        recycled = 0
+        now = time.monotonic()
+        for key in list(self._idle):
+            if now - self._last_used.get(key, 0.0) > self.key_ttl:
+                recycled += self._evict(key)
+                continue
+            before = len(self._idle[key])
+            kept = []
+            while True:
+                warm = self._take_idle(key)
+                if warm is None:
+                    break
+                kept.append(warm)
+            self._idle[key] = kept
+            recycled += before - len(kept)
+        return recycled
+    
+    def _evict(self, key: PoolKey) -> int:
+        """Forget a key and kill its idle processes. Returns how many were killed."""
+        refill = self._refilling.pop(key, None)
+        if refill is not None:
+            refill.cancel()
+        self._commands.pop(key, None)
+        self._last_used.pop(key, None)
+        idle = self._idle.pop(key, [])
+        for warm in idle:
+            self._discard(warm)
+        self._counters["evicted_keys"] += 1
+        self._log.info("warm_key_evicted", agent=key[0], cwd=key[1], idle=len(idle))
+        return len(idle)
+    
+    def start_background_pruning(self) -> None:
+        """Periodically prune expired idle processes (call from a running loop)."""
+        if not self.enabled or (self._prune_task and not self._prune_task.done()):
+            return
+        
+        async def _loop():
+            while True:
+                await asyncio.sleep(self.prune_interval)
+                await self.prune()
+        
+        self._prune_task = asyncio.ensure_future(_loop())
+    
+    async def shutdown(self) -> None:
+        """Stop background work and kill every idle process."""
+        if self._prune_task:
+            self._prune_task.cancel()
+            self._prune_task = None
+        for task in self._refilling.values():
+            task.cancel()
+        self._refilling.clear()
+        for key, idle in list(self._idle.items()):
+            for warm in idle:
+                if warm.loop is asyncio.get_running_loop():
+                    await self._recycle(warm)
+                else:
+                    self._discard(warm)
+        self._idle.clear()
+    
+    def get_stats(self) -> PoolStats:
+        """Get pool counters."""
+        return PoolStats(
+            enabled=self.enabled,
+            idle=self._idle_count(),
+            max_idle=self.max_idle,
+            keys=len(self._commands),
+            **self._counters,
+        )
+
+
+# =============================================================================
+# SINGLETON INSTANCE
+# =============================================================================
+
+_pool: Optional[WarmProcessPool] = None
+
+
+def get_warm_pool() -> WarmProcessPool:
+    """Get the global warm process pool instance."""
+    global _pool
+    if _pool is None:
+        _pool = WarmProcessPool()
+    return _pool
@@ -0,0 +1,261 @@
+"""
+LastAgent Agent Availability Registry
+
+Knows which agent CLIs are actually installed.
+
+All configured CLIs are probed concurrently (at API startup and then
+periodically in the background). Each probe resolves the command on PATH
+and runs `<command> --version`, recording path, version and probe latency.
+
+The executor and AgentMatcher read from the registry instead of calling
+shutil.which on every request, so tasks are never routed to an agent that
+isn't installed. Agents that haven't been probed yet get a cheap PATH
+lookup on first use; results older than probe_interval are refreshed the
+same way when background probing isn't running (e.g. one-shot CLI use).
+"""
+
+import asyncio
+import shutil
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from .config import get_config
+from .process_lifecycle import get_process_manager
+
+# Enterprise structured logging
+try:
+    from src.observability import get_logger
+except ImportError:
+    from .observability import get_logger
+
+
+@dataclass
+class AgentAvailability:
+    """Probe result for one agent CLI."""
+    agent_name: str
+    command: str
+    available: bool
+    path: Optional[str] = None
+    version: Optional[str] = None
+    probe_latency_ms: float = 0.0
+    error: Optional[str] = None
+    probed_at: datetime = field(default_factory=datetime.utcnow)
+    checked_at: float = field(default_factory=time.monotonic, repr=False)
+
+
+class AgentAvailabilityRegistry:
+    """
+    Probes agent CLIs and caches whether they are installed.
+    
+    Usage:
+        registry = get_availability_registry()
+        await registry.probe_all()
+        if registry.is_available("aider"):
+            ...
+        print(registry.get("claude").version)
+    """
+    
+    def __init__(
+        self,
+        probe_interval: Optional[float] = None,
+        version_timeout: Optional[float] = None,
+        commands: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Initialize the registry.
+        
+        Args:
+            probe_interval: Seconds between background probes (also the age
+                after which a cached result is refreshed on read).
+                Defaults to settings.execution.availability.probe_interval
+            version_timeout: Max seconds to wait for `<command> --version`.
+                Defaults to settings.execution.availability.version_timeout
+            commands: agent name -> CLI command. Defaults to agents.yml
+        """
+        config = get_config()
+        settings = config.settings.execution.get("availability", {})
+        if probe_interval is None:
+            probe_interval = settings.get("probe_interval", 300)
+        if version_timeout is None:
+            version_timeout = settings.get("version_timeout", 5)
+        if commands is None:
+            commands = {
+                name: agent.command or name
+                for name, agent in config.agents.items()
+            }
+        
+        self.probe_interval = float(probe_interval)
+        self.version_timeout = float(version_timeout)
+        self.commands: Dict[str, str] = dict(commands)
+        self._log = get_logger("availability")
+        
+        self._entries: Dict[str, AgentAvailability] = {}
+        self._probe_task: Optional[asyncio.Task] = None
+    
+    async def probe(self, agent_name: str) -> AgentAvailability:
+        """
+        Probe one agent CLI: resolve it on PATH and query its version.
+        
+        Args:
+            agent_name: Configured agent name
+        
+        Returns:
+            The new availability entry (also stored in the registry)
+        """
+        command = self.commands.get(agent_name, agent_name)
+        start = time.perf_counter()
+        path = shutil.which(command)
+        version = None
+        error = None
+        
+        if path is None:
+            error = f"Command not found on PATH: {command}"
+        else:
+            try:
+                version = await self._query_version(agent_name, path)
+            except asyncio.TimeoutError:
+                error = f"Version probe timed out after {self.version_timeout}s"
+            except OSError as e:
+                error = str(e)
+        
+        entry = AgentAvailability(
+            agent_name=agent_name,
+            command=command,
+            available=path is not None,
+            path=path,
+            version=version,
+            probe_latency_ms=round((time.perf_counter() - start) * 1000, 2),
+            error=error,
+        )
+        previous = self._entries.get(agent_name)
+        self._entries[agent_name] = entry
+        
+        if previous is None or previous.available != entry.available:
+            self._log.info(
+                "agent_availability_changed",
+                agent=agent_name,
+                available=entry.available,
+                path=path,
+                version=version,
+                probe_latency_ms=entry.probe_latency_ms,
+            )
+        return entry
+    
+    async def _query_version(self, agent_name: str, path: str) -> Optional[str]:
+        """Run `<path> --version` and return its first line of output."""
+        processes = get_process_manager()
+        process = await processes.spawn(
+            agent_name,
+            [path, "--version"],
+            stdin=asyncio.subprocess.DEVNULL,
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(
+                process.communicate(),
+                timeout=self.version_timeout,
+            )
+        except asyncio.TimeoutError:
+            await processes.terminate(process, reason="timeout")
+            raise
+        await processes.finalize(process)
+        
+        for line in (stdout or stderr).decode(errors="replace").splitlines():
+            if line.strip():
+                return line.strip()
+        return None
+    
+    async def probe_all(self) -> Dict[str, AgentAvailability]:
+        """Probe every configured agent concurrently."""
+        entries = await asyncio.gather(*(self.probe(name) for name in self.commands))
+        return {entry.agent_name: entry for entry in entries}
+    
+    def get(self, agent_name: str) -> Optional[AgentAvailability]:
+        """Get the last probe result for an agent (None if never probed)."""
+        return self._entries.get(agent_name)
+    
+    def get_all(self) -> Dict[str, AgentAvailability]:
+        """Get the last probe result for every probed agent."""
+        return dict(self._entries)
+    
+    def is_available(self, agent_name: str) -> bool:
+        """
+        Check whether an agent's CLI is installed.
+        
+        Uses the cached probe result; missing or stale entries are refreshed
+        with a PATH lookup (the version is kept from the last full probe).
+        """
+        entry = self._entries.get(agent_name)
+        if entry is None or time.monotonic() - entry.checked_at > self.probe_interval:
+            entry = self._refresh_path(agent_name, entry)
+        return entry.available
+    
+    def is_command_available(self, command: str) -> bool:
+        """Check a CLI command, via its agent's entry when it is configured."""
+        for agent_name, agent_command in self.commands.items():
+            if agent_command == command:
+                return self.is_available(agent_name)
+        return shutil.which(command) is not None
+    
+    def available_agents(self) -> List[str]:
+        """Configured agents whose CLI is installed, in config order."""
+        return [name for name in self.commands if self.is_available(name)]
+    
+    def _refresh_path(
+        self,
+        agent_name: str,
+        previous: Optional[AgentAvailability],
+    ) -> AgentAvailability:
+        """Cheap synchronous refresh: PATH lookup only."""
+        command = self.commands.get(agent_name, agent_name)
+        start = time.perf_counter()
+        path = shutil.which(command)
+        keep_version = previous is not None and previous.path == path
+        entry = AgentAvailability(
+            agent_name=agent_name,
+            command=command,
+            available=path is not None,
+            path=path,
+            version=previous.version if keep_version else None,
+            probe_latency_ms=round((time.perf_counter() - start) * 1000, 2),
+            error=None if path else f"Command not found on PATH: {command}",
+        )
+        self._entries[agent_name] = entry
+        return entry
+    
+    def start_background_probing(self) -> None:
+        """Re-probe all agents every probe_interval (call from a running loop)."""
+        if self._probe_task and not self._probe_task.done():
+            return
+        
+        async def _loop():
+            while True:
+                await asyncio.sleep(self.probe_interval)
+                try:
+                    await self.probe_all()
+                except Exception as e:
+                    self._log.warning("availability_probe_failed", error=str(e))
+        
+        self._probe_task = asyncio.ensure_future(_loop())
+    
+    def stop_background_probing(self) -> None:
+        """Stop the background probe loop."""
+        if self._probe_task:
+            self._probe_task.cancel()
+            self._probe_task = None
+
+
+# =============================================================================
+# SINGLETON INSTANCE
+# =============================================================================
+
+_registry: Optional[AgentAvailabilityRegistry] = None
+
+
+def get_availability_registry() -> AgentAvailabilityRegistry:
+    """Get the global agent availability registry instance."""
+    global _registry
+    if _registry is None:
+        _registry = AgentAvailabilityRegistry()
+    return _registry
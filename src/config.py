@@ -17,6 +17,21 @@ from pydantic import BaseModel, Field
 # CONFIGURATION MODELS
 # =============================================================================
 
+class WarmPoolConfig(BaseModel):
+    """Warm process pool settings for an agent (see src/agent_pool.py)."""
+    size: int = 1  # Idle processes kept per (working dir, system prompt)
+    idle_ttl: float = 300  # Seconds an idle process may wait before recycling
+    max_tasks: int = 1  # Tasks served per process before recycling
+
+
+class ResourceLimitsConfig(BaseModel):
+    """Resource limits for an agent's processes (see src/resource_limits.py)."""
+    address_space_mb: Optional[int] = None  # RLIMIT_AS (virtual memory)
+    cpu_seconds: Optional[int] = None  # RLIMIT_CPU per process
+    open_files: Optional[int] = None  # RLIMIT_NOFILE
+    nice: Optional[int] = None  # Priority increment (1-19 = lower priority)
+
+
 class AgentConfig(BaseModel):
     """
     Configuration for a single agent.
@@ -31,6 +46,17 @@ class AgentConfig(BaseModel):
     strengths: List[str] = Field(default_factory=list)
     mcp_server: Optional[str] = None
     requires_working_directory: bool = False
+    max_concurrent: Optional[int] = None  # Per-agent concurrency limit (None = global only)
+    mutates_files: bool = False  # Takes its working directory's lock exclusively
+    pty: bool = False  # Run with a pseudo-terminal as stdout (unbuffered output)
+    prompt_transports: List[str] = ["argv"]  # argv / stdin / file, accepted by the CLI
+    output_format: str = "text"  # text / stream-json (parsed by src/output_parsers.py)
+    # Seconds per run until latency history exists (None = settings default)
+    timeout: Optional[float] = None
+    # Idle seconds before a run is aborted (None = settings default, 0 = off)
+    stall_timeout: Optional[float] = None
+    limits: Optional[ResourceLimitsConfig] = None  # rlimits / nice (None = unlimited)
+    warm_pool: Optional[WarmPoolConfig] = None  # Pre-spawned idle processes (None = cold start)
 
 
 class CouncilMember(BaseModel):
@@ -99,19 +125,19 @@ class ConfigLoader:
             self.config_dir = Path(__file__).parent.parent / "config"
         else:
             self.config_dir = Path(config_dir)
-            
+        
         self._agents: Dict[str, AgentConfig] = {}
         self._council: Optional[CouncilConfig] = None
         self._settings: Optional[Settings] = None
         self._loaded = False
-        
+    
     def load(self) -> None:
         """Load all configuration files."""
         self._load_agents()
         self._load_council()
         self._load_settings()
         self._loaded = True
-        
+    
     def _load_yaml(self, filename: str) -> Dict[str, Any]:
         """Load a YAML file from the config directory."""
         path = self.config_dir / filename
@@ -119,14 +145,14 @@ class ConfigLoader:
             raise FileNotFoundError(f"Config file not found: {path}")
         with open(path, "r") as f:
             return yaml.safe_load(f)
-            
+    
     def _load_agents(self) -> None:
         """Load agent configurations."""
         data = self._load_yaml("agents.yml")
         agents_data = data.get("agents", {})
         for name, agent_data in agents_data.items():
             self._agents[name] = AgentConfig(**agent_data)
-            
+    
     def _load_council(self) -> None:
         """Load council configuration."""
         data = self._load_yaml("council.yml")
@@ -141,7 +167,7 @@ class ConfigLoader:
             selection_process=data.get("selection_process", {}),
             fallback=data.get("fallback", {}),
         )
-        
+    
     def _load_settings(self) -> None:
         """Load general settings."""
         data = self._load_yaml("settings.yml")
@@ -153,14 +179,14 @@ class ConfigLoader:
             execution=data.get("execution", {}),
             mesh=data.get("mesh", {}),
         )
-        
+    
     @property
     def agents(self) -> Dict[str, AgentConfig]:
         """Get all agent configurations."""
         if not self._loaded:
             self.load()
         return self._agents
-        
+    
     @property
     def council(self) -> CouncilConfig:
         """Get council configuration."""
@@ -169,7 +195,7 @@ class ConfigLoader:
         if self._council is None:
             raise ValueError("Council config not loaded")
         return self._council
-        
+    
     @property
     def settings(self) -> Settings:
         """Get general settings."""
@@ -178,17 +204,17 @@ class ConfigLoader:
         if self._settings is None:
             raise ValueError("Settings not loaded")
         return self._settings
-        
+    
     def get_agent(self, name: str) -> AgentConfig:
         """
         Get configuration for a specific agent.
         
         Args:
             name: Agent name (e.g., "claude", "gemini")
-            
+        
         Returns:
             AgentConfig for the agent
-            
+        
         Raises:
             KeyError: If agent not found
         """
@@ -197,14 +223,14 @@ class ConfigLoader:
         if name not in self._agents:
             raise KeyError(f"Agent not found: {name}")
         return self._agents[name]
-        
+    
     def get_agents_by_capability(self, capability: str) -> List[str]:
         """
         Get agents that have a specific capability.
         
         Args:
             capability: Capability name (e.g., "coding", "research")
-            
+        
         Returns:
             List of agent names
         """
@@ -214,7 +240,7 @@ class ConfigLoader:
             name for name, agent in self._agents.items()
             if capability in agent.capabilities
         ]
-        
+    
     def get_agent_names(self) -> List[str]:
         """Get list of all agent names."""
         if not self._loaded:
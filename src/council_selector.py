@@ -19,11 +19,19 @@ The council uses LLM APIs to SELECT. Execution is always CLI.
 """
 
 import asyncio
+import math
 import sys
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
+from .config import get_config
+from .task_analyzer import TaskAnalysis, get_task_analyzer
+from .agent_matcher import MatchResult, get_agent_matcher
+from .selection_cache import SelectionCache, get_selection_cache, registry_version
+from .similarity_cache import get_similarity_cache
+from .routing_table import Route, feature_signature, get_routing_table
+
 # Enterprise structured logging
 try:
     from src.observability import get_logger, log_agent_selected, log_error
@@ -41,9 +49,9 @@ LLM_COUNCIL_PATH = Path(__file__).parent.parent.parent / "llm-council" / "backen
 if str(LLM_COUNCIL_PATH) not in sys.path:
     sys.path.insert(0, str(LLM_COUNCIL_PATH))
 
-from .config import get_config
-from .task_analyzer import TaskAnalysis, get_task_analyzer
-from .agent_matcher import MatchResult, get_agent_matcher
+
+# Characters of each agent response shown to the fan-out judge
+JUDGE_RESPONSE_CHARS = 4000
 
 
 @dataclass
@@ -72,6 +80,12 @@ class CouncilSelection:
     rankings: List[CouncilRanking]
     aggregate_scores: Dict[str, float]
     match_result: Optional[MatchResult] = None
+    cache_status: Optional[str] = None  # "hit", "similar", "routing_table", "miss" or "bypass"
+    similarity: Optional[float] = None  # Prompt similarity of a "similar" hit
+    signature: Optional[str] = None  # Task feature signature (routing table key)
+    # Council convened: "full", "single", "skipped", "routing_table" or "fallback"
+    council_path: Optional[str] = None
+    match_margin: Optional[float] = None  # Top local match score minus the runner-up's
 
 
 class CouncilSelector:
@@ -103,6 +117,9 @@ class CouncilSelector:
         self.config = get_config()
         self.task_analyzer = get_task_analyzer()
         self.agent_matcher = get_agent_matcher()
+        self.cache = get_selection_cache()
+        self.similar = get_similarity_cache()
+        self.routing = get_routing_table()
         self.use_mock = use_mock
         self._log = get_logger("council")
         
@@ -119,21 +136,32 @@ class CouncilSelector:
         except ImportError:
             # Will use fallback selection
             pass
-            
+    
     async def select_agent(
         self,
         user_prompt: str,
         system_prompt: str = "",
         working_directory: Optional[str] = None,
+        bypass_cache: bool = False,
     ) -> CouncilSelection:
         """
         Select the best agent for a task using council voting.
         
+        Identical tasks reuse the council's earlier verdict from the
+        selection cache (src/selection_cache.py), near-duplicates from the
+        similarity cache (src/similarity_cache.py), unless bypass_cache is set.
+        Tasks whose feature signature the council consistently routes to
+        one agent are answered from the routing table (src/routing_table.py),
+        except for a sampled fraction that the council re-validates.
+        Otherwise the local match margin decides whether the full council,
+        one fast model or no council at all votes (council.yml adaptive_sizing).
+        
         Args:
             user_prompt: The user's request
             system_prompt: Optional system prompt
             working_directory: Optional working directory for context
-            
+            bypass_cache: Run the council even if the task is cached
+        
         Returns:
             CouncilSelection with the selected agent and voting details
         """
@@ -142,6 +170,7 @@ class CouncilSelector:
         
         # Get agent matches
         match_result = self.agent_matcher.match(analysis)
+        signature = feature_signature(analysis)
         
         # If mock mode or council unavailable, use local selection
         if self.use_mock or not self._council_available:
@@ -150,22 +179,121 @@ class CouncilSelector:
                     "fallback_selection_used",
                     reason="mock_mode" if self.use_mock else "council_unavailable",
                 )
-            return self._fallback_selection(analysis, match_result)
-            
+            return replace(self._fallback_selection(analysis, match_result), signature=signature)
+        
+        # Same task since the agent registry last changed: reuse the verdict
+        cache_key = None
+        cache_status = None
+        similarity_scope = None
+        if self.cache.enabled:
+            if bypass_cache:
+                self.cache.record_bypass()
+                cache_status = "bypass"
+            else:
+                version = registry_version(self.config, self.agent_matcher.available_agents())
+                cache_key = self.cache.make_key(user_prompt, system_prompt, version)
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    if self._log:
+                        self._log.info("selection_cache_hit", selected_agent=cached.selected_agent)
+                    return replace(cached, cache_status="hit", signature=signature)
+                cache_status = "miss"
+                
+                # Near-duplicate: only the user prompt may differ
+                if self.similar.enabled:
+                    similarity_scope = SelectionCache.make_key(
+                        analysis.task_type.value, system_prompt, version
+                    )
+                    match = self.similar.lookup(user_prompt, similarity_scope)
+                    if match is not None:
+                        cached, similarity = match
+                        if self._log:
+                            self._log.info(
+                                "selection_similarity_hit",
+                                selected_agent=cached.selected_agent,
+                                similarity=similarity,
+                            )
+                        return replace(
+                            cached,
+                            cache_status="similar",
+                            similarity=similarity,
+                            signature=signature,
+                        )
+        
+        # Same task features the council keeps routing one way: use the table
+        route = None
+        if self.routing.enabled and not bypass_cache:
+            route = self.routing.lookup(signature, self.agent_matcher.available_agents())
+            if route is not None:
+                if not self.routing.should_revalidate():
+                    if self._log:
+                        self._log.info(
+                            "routing_table_hit",
+                            selected_agent=route.agent,
+                            signature=signature,
+                        )
+                    return self._routed_selection(route, match_result)
+                if self._log:
+                    self._log.info(
+                        "routing_table_revalidation",
+                        expected_agent=route.agent,
+                        signature=signature,
+                    )
+        
+        # A clear local winner needs less of the council, or none of it
+        council_path, margin, models = self._council_size(match_result)
+        if council_path == "skipped":
+            selection = self._fallback_selection(analysis, match_result)
+            if self._log:
+                self._log.info(
+                    "council_skipped",
+                    selected_agent=selection.selected_agent,
+                    match_margin=margin,
+                )
+            return replace(
+                selection,
+                confidence=max(m.match_score for m in match_result.matches if m.is_eligible),
+                reasoning=(
+                    f"Clear local match: {selection.selected_agent} leads the next agent "
+                    f"by {margin:.2f} (council skipped)"
+                ),
+                cache_status=cache_status,
+                signature=signature,
+                council_path=council_path,
+                match_margin=margin,
+            )
+        
         # Run 3-stage council process
         try:
             if self._log:
                 self._log.info(
                     "council_selection_started",
                     available_agents=self.config.get_agent_names(),
-                    council_models=getattr(self, '_council_models', []),
+                    council_models=models,
+                    council_path=council_path,
+                    match_margin=margin,
                 )
-            return await self._run_council_selection(
+            selection = await self._run_council_selection(
                 user_prompt,
                 system_prompt,
                 analysis,
                 match_result,
+                models=models,
             )
+            selection.cache_status = cache_status
+            selection.signature = signature
+            selection.match_margin = margin
+            if selection.votes:
+                selection.council_path = council_path
+                # Only real verdicts; a fallback should be retried next time
+                if cache_key:
+                    self.cache.put(cache_key, selection)
+                    if similarity_scope:
+                        self.similar.put(user_prompt, similarity_scope, selection)
+                self.routing.record_decision(
+                    signature, selection.selected_agent, expected=route.agent if route else None
+                )
+            return selection
         except Exception as e:
             # Fallback on error
             log_error(
@@ -173,37 +301,86 @@ class CouncilSelector:
                 error_type=type(e).__name__,
                 error_message=str(e),
             )
-            return self._fallback_selection(analysis, match_result, error=str(e))
-            
+            return replace(
+                self._fallback_selection(analysis, match_result, error=str(e)), signature=signature
+            )
+    
+    def record_outcome(self, signature: Optional[str], agent: str, success: bool) -> None:
+        """Feed how a selected task ran back into the routing table."""
+        if signature:
+            self.routing.record_outcome(signature, agent, success)
+    
     async def _run_council_selection(
         self,
         user_prompt: str,
         system_prompt: str,
         analysis: TaskAnalysis,
         match_result: MatchResult,
+        models: Optional[List[str]] = None,
     ) -> CouncilSelection:
-        """Run the full 3-stage council selection process."""
-        available_agents = self.config.get_agent_names()
+        """
+        Run the 3-stage council selection process.
+        
+        models limits the voting members (default: the whole council).
+        """
+        available_agents = self.agent_matcher.available_agents()
         agents_description = self._format_agents_for_prompt(available_agents)
+        models = models or self._council_models
         
         # Stage 1: Collect agent suggestions from each council member
-        votes = await self._stage1_collect_votes(
-            user_prompt, system_prompt, agents_description
+        votes, leader = await self._stage1_collect_votes(
+            user_prompt, system_prompt, agents_description, models
         )
         
         if not votes:
             return self._fallback_selection(analysis, match_result, error="No council votes")
-            
-        # Stage 2: Have each member rank the suggested agents
-        suggestions = list(set(v.selected_agent for v in votes if v.selected_agent))
-        rankings = await self._stage2_collect_rankings(
-            user_prompt, system_prompt, suggestions
-        )
         
-        # Stage 3: Chairman synthesizes final selection
-        selected, confidence, reasoning = await self._stage3_select_final(
-            user_prompt, system_prompt, votes, rankings, match_result.recommended_agents
+        suggestions = list(dict.fromkeys(v.selected_agent for v in votes))
+        stage1 = self.config.council.selection_process.get("stage1", {})
+        unanimous = (
+            len(suggestions) == 1 and suggestions[0] and len(votes) == len(models)
         )
+        if leader:
+            # A strict majority agreed before the rest answered: that decides
+            agreeing = sum(1 for v in votes if v.selected_agent == leader)
+            selected = leader
+            rankings = []
+            confidence = round(agreeing / len(models), 2)
+            reasoning = f"Council quorum ({agreeing} of {len(models)} models)"
+            log_agent_selected(selected, 0, reasoning)
+        elif unanimous and (len(models) == 1 or stage1.get("skip_on_unanimity", False)):
+            # Every member voted for the same agent: ranking and chairman can't change that.
+            # A one-model council (adaptive sizing) never convenes the chairman.
+            selected = suggestions[0]
+            rankings = []
+            confidence = 0.9
+            reasoning = (
+                f"Single-model council vote ({votes[0].model})" if len(models) == 1
+                else f"Unanimous council vote ({len(votes)} of {len(models)} models)"
+            )
+            if self._log:
+                self._log.info("council_unanimous", selected_agent=selected, votes=len(votes))
+            log_agent_selected(selected, 0, reasoning)
+        else:
+            # Stage 2: Have the members that voted rank the suggested agents
+            suggestions = [agent for agent in suggestions if agent]
+            rankings = await self._stage2_collect_rankings(
+                user_prompt, system_prompt, suggestions, [v.model for v in votes]
+            )
+            
+            # Stage 3: Chairman synthesizes final selection
+            selected, confidence, reasoning = await self._stage3_select_final(
+                user_prompt, system_prompt, votes, rankings, match_result.recommended_agents
+            )
+        
+        # Never route to an agent whose CLI isn't installed
+        if selected not in available_agents:
+            if self._log:
+                self._log.warning("council_selected_unavailable_agent", agent=selected)
+            selected = next(
+                (a for a in match_result.recommended_agents if a in available_agents),
+                available_agents[0],
+            )
         
         # Calculate aggregate scores
         aggregate_scores = self._calculate_aggregate_scores(votes, rankings)
@@ -217,14 +394,21 @@ class CouncilSelector:
             aggregate_scores=aggregate_scores,
             match_result=match_result,
         )
-        
+    
     async def _stage1_collect_votes(
         self,
         user_prompt: str,
         system_prompt: str,
         agents_description: str,
-    ) -> List[CouncilVote]:
-        """Stage 1: Each council member suggests an agent."""
+        models: Optional[List[str]] = None,
+    ) -> Tuple[List[CouncilVote], Optional[str]]:
+        """
+        Stage 1: Each council member suggests an agent.
+        
+        Returns:
+            (votes, the agent a quorum agreed on or None)
+        """
+        models = models or self._council_models
         prompt = f"""You are helping to select the best AI agent for a task.
 
 Task Context:
@@ -242,36 +426,119 @@ Reply with ONLY the agent name (e.g., "claude", "gemini", "aider") followed by a
 Format: <agent_name>: <brief reason>"""
 
         messages = [{"role": "user", "content": prompt}]
-        responses = await self._query_models_parallel(self._council_models, messages)
+        quorum = self._stage1_quorum(len(models))
+        if quorum is not None:
+            return await self._collect_votes_until_quorum(models, messages, quorum)
+        responses = await self._query_models_parallel(models, messages)
         
         votes = []
         for model, response in responses.items():
-            if response:
-                selected, reasoning = self._parse_agent_suggestion(response.get("content", ""))
-                votes.append(CouncilVote(
-                    model=model,
-                    selected_agent=selected,
-                    reasoning=reasoning,
-                ))
-                if self._log:
-                    self._log.debug(
-                        "stage1_vote_collected",
-                        model=model,
-                        vote=selected,
-                    )
-                
-        return votes
+            vote = self._parse_vote(model, response)
+            if vote:
+                votes.append(vote)
         
+        return votes, None
+    
+    async def _collect_votes_until_quorum(
+        self,
+        models: List[str],
+        messages: List[Dict[str, str]],
+        quorum: int,
+    ) -> Tuple[List[CouncilVote], Optional[str]]:
+        """
+        Stage 1 with early exit: query every member, stop at quorum agreeing votes.
+        
+        Requests to members that haven't answered by then are cancelled.
+        
+        Returns:
+            (votes in the order they arrived, the agreed agent or None)
+        """
+        requests = {
+            asyncio.ensure_future(self._query_model(model, messages)): model
+            for model in models
+        }
+        pending = set(requests)
+        votes: List[CouncilVote] = []
+        counts: Dict[str, int] = {}
+        leader = None
+        
+        try:
+            while pending and leader is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for request in sorted(done, key=list(requests).index):
+                    try:
+                        response = request.result()
+                    except Exception as e:
+                        if self._log:
+                            self._log.warning(
+                                "stage1_vote_failed",
+                                model=requests[request],
+                                error=str(e),
+                            )
+                        continue
+                    vote = self._parse_vote(requests[request], response)
+                    if vote is None:
+                        continue
+                    votes.append(vote)
+                    if vote.selected_agent:
+                        counts[vote.selected_agent] = counts.get(vote.selected_agent, 0) + 1
+                        if leader is None and counts[vote.selected_agent] >= quorum:
+                            leader = vote.selected_agent
+        finally:
+            for request in pending:
+                request.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        
+        if leader and self._log:
+            self._log.info(
+                "stage1_quorum_reached",
+                selected_agent=leader,
+                votes=len(votes),
+                quorum=quorum,
+                cancelled=[requests[request] for request in pending],
+            )
+        return votes, leader
+    
+    def _parse_vote(self, model: str, response: Optional[Dict[str, Any]]) -> Optional[CouncilVote]:
+        """Turn a member's stage 1 response into a vote (None if it didn't answer)."""
+        if not response:
+            return None
+        selected, reasoning = self._parse_agent_suggestion(response.get("content", ""))
+        if self._log:
+            self._log.debug(
+                "stage1_vote_collected",
+                model=model,
+                vote=selected,
+            )
+        return CouncilVote(
+            model=model,
+            selected_agent=selected,
+            reasoning=reasoning,
+        )
+    
+    def _stage1_quorum(self, members: int) -> Optional[int]:
+        """Agreeing votes that end stage 1 early, or None to wait for every member."""
+        stage1 = self.config.council.selection_process.get("stage1", {})
+        settings = stage1.get("quorum", {})
+        if not settings.get("enabled", False) or members < 2:
+            return None
+        # Strictly more than the agreement share: at 0.5 a 2-2 split is no quorum
+        needed = math.floor(float(settings.get("agreement", 0.5)) * members) + 1
+        quorum = min(max(needed, 2), members)
+        return quorum if quorum < members else None  # Needing every vote is no early exit
+    
     async def _stage2_collect_rankings(
         self,
         user_prompt: str,
         system_prompt: str,
         suggestions: List[str],
+        models: Optional[List[str]] = None,
     ) -> List[CouncilRanking]:
         """Stage 2: Each council member ranks the suggestions."""
+        models = models or self._council_models
         if len(suggestions) < 2:
             return []
-            
+        
         suggestions_text = ", ".join(suggestions)
         prompt = f"""The following agents were suggested for this task:
 {suggestions_text}
@@ -285,7 +552,7 @@ Reply with a numbered list:
 ...etc"""
 
         messages = [{"role": "user", "content": prompt}]
-        responses = await self._query_models_parallel(self._council_models, messages)
+        responses = await self._query_models_parallel(models, messages)
         
         rankings = []
         for model, response in responses.items():
@@ -297,9 +564,9 @@ Reply with a numbered list:
                     ranking=ranked_agents,
                     raw_text=raw_text,
                 ))
-                
-        return rankings
         
+        return rankings
+    
     async def _stage3_select_final(
         self,
         user_prompt: str,
@@ -350,7 +617,7 @@ REASONING: <brief explanation>"""
                 selected = max(vote_counts, key=vote_counts.get)
                 return selected, 0.7, "Selected by majority vote (chairman unavailable)"
             return recommended[0] if recommended else "claude", 0.5, "Default selection"
-            
+        
         # Parse chairman response
         content = response.get("content", "")
         selected, confidence, reasoning = self._parse_chairman_response(content, votes, recommended)
@@ -364,7 +631,62 @@ REASONING: <brief explanation>"""
         log_agent_selected(selected, 0, reasoning)
         
         return selected, confidence, reasoning
+    
+    async def judge_responses(
+        self,
+        user_prompt: str,
+        responses: Dict[str, str],
+    ) -> Tuple[Optional[str], str]:
+        """
+        Pick the best of several agents' responses to one task (fan-out).
+        
+        A single chairman call, not a full council round, so judging stays
+        cheap next to the agent runs it compares.
+        
+        Args:
+            user_prompt: The task
+            responses: Agent name -> response
         
+        Returns:
+            (winning agent, reasoning) - agent is None if the judge is
+            unavailable or its answer names none of the agents
+        """
+        if self.use_mock or not self._council_available:
+            return None, "Judge unavailable"
+        
+        candidates = "\n\n".join(
+            f"=== {agent} ===\n{response[:JUDGE_RESPONSE_CHARS]}"
+            for agent, response in responses.items()
+        )
+        prompt = f"""Several agents answered the same task. Pick the best answer.
+
+Task: {user_prompt}
+
+Answers:
+{candidates}
+
+Reply with:
+WINNER: <agent_name>
+REASONING: <brief explanation>"""
+
+        messages = [{"role": "user", "content": prompt}]
+        response = await self._query_model(self._chairman_model, messages)
+        if response is None:
+            return None, "Judge unavailable"
+        
+        winner, reasoning = None, "Judge pick"
+        for line in response.get("content", "").split("\n"):
+            line = line.strip()
+            if line.upper().startswith("WINNER:"):
+                agent = line.split(":", 1)[1].strip().lower()
+                if agent in responses:
+                    winner = agent
+            elif line.upper().startswith("REASONING:"):
+                reasoning = line.split(":", 1)[1].strip()
+        if self._log:
+            self._log.info("judge_decided", winner=winner, candidates=list(responses))
+        return winner, reasoning
+    
     def _fallback_selection(
         self,
         analysis: TaskAnalysis,
@@ -378,11 +700,11 @@ REASONING: <brief explanation>"""
         else:
             selected = "claude"  # Default fallback
             confidence = 0.5
-            
+        
         reason = "Selected based on local capability matching"
         if error:
             reason += f" (council error: {error})"
-            
+        
         return CouncilSelection(
             selected_agent=selected,
             confidence=confidence,
@@ -391,8 +713,54 @@ REASONING: <brief explanation>"""
             rankings=[],
             aggregate_scores={selected: 1.0},
             match_result=match_result,
+            council_path="fallback",
+        )
+    
+    def _council_size(self, match_result: MatchResult) -> Tuple[str, float, List[str]]:
+        """
+        How much of the council a task needs, from the local match margin.
+        
+        Returns:
+            (path, margin, models): "skipped" (no models), "single" (the fast
+            model) or "full" (every council member), and the top eligible
+            agent's lead over the runner-up
+        """
+        members = list(getattr(self, "_council_models", []))
+        eligible = [m.match_score for m in match_result.matches if m.is_eligible]
+        scores = sorted(eligible, reverse=True)[:2] + [0.0, 0.0]
+        margin = round(scores[0] - scores[1], 3)
+        settings = self.config.council.selection_process.get("adaptive_sizing", {})
+        min_confidence = self.config.council.fallback.get("min_confidence", 0.6)
+        if not settings.get("enabled", False) or scores[0] < min_confidence:
+            return "full", margin, members
+        if margin >= settings.get("skip_margin", 0.4):
+            return "skipped", margin, []
+        if margin >= settings.get("single_margin", 0.2) and (settings.get("fast_model") or members):
+            return "single", margin, [settings.get("fast_model") or members[0]]
+        return "full", margin, members
+    
+    def _routed_selection(self, route: Route, match_result: MatchResult) -> CouncilSelection:
+        """Selection answered from the routing table."""
+        reason = (
+            f"Routing table: the council chose {route.agent} for {route.decisions} recent tasks "
+            f"with these features ({route.agreement:.0%} agreement)"
         )
+        if route.success_rate is not None:
+            reason += f", {route.success_rate:.0%} of its runs succeeded"
         
+        return CouncilSelection(
+            selected_agent=route.agent,
+            confidence=route.agreement,
+            reasoning=reason,
+            votes=[],
+            rankings=[],
+            aggregate_scores={route.agent: route.agreement},
+            match_result=match_result,
+            cache_status="routing_table",
+            signature=route.signature,
+            council_path="routing_table",
+        )
+    
     def _format_agents_for_prompt(self, agents: List[str]) -> str:
         """Format agent list for the selection prompt."""
         lines = []
@@ -402,7 +770,7 @@ REASONING: <brief explanation>"""
             strengths = agent.strengths[0] if agent.strengths else ""
             lines.append(f"- {agent_name}: {strengths} (capabilities: {caps})")
         return "\n".join(lines)
-        
+    
     def _parse_agent_suggestion(self, text: str) -> Tuple[str, str]:
         """Parse an agent suggestion from model response."""
         import re
@@ -411,7 +779,7 @@ REASONING: <brief explanation>"""
         match = re.match(r"(\w+)\s*:\s*(.*)", text.strip())
         if match:
             return match.group(1).lower(), match.group(2)
-            
+        
         # Try to find just the agent name at the start
         words = text.strip().split()
         if words:
@@ -419,9 +787,9 @@ REASONING: <brief explanation>"""
             valid_agents = self.config.get_agent_names()
             if first_word in valid_agents:
                 return first_word, text
-                
-        return "", text
         
+        return "", text
+    
     def _parse_ranking(self, text: str, valid_agents: List[str]) -> List[str]:
         """Parse a ranking from model response."""
         import re
@@ -434,9 +802,9 @@ REASONING: <brief explanation>"""
                 agent = match.group(1).lower()
                 if agent in valid_agents and agent not in ranked:
                     ranked.append(agent)
-                    
-        return ranked
         
+        return ranked
+    
     def _parse_chairman_response(
         self,
         text: str,
@@ -463,7 +831,7 @@ REASONING: <brief explanation>"""
                     pass
             elif line.upper().startswith("REASONING:"):
                 reasoning = line.split(":", 1)[1].strip()
-                
+        
         if not selected:
             # Fallback to most voted
             vote_counts = {}
@@ -473,9 +841,9 @@ REASONING: <brief explanation>"""
                 selected = max(vote_counts, key=vote_counts.get)
             else:
                 selected = recommended[0] if recommended else "claude"
-                
-        return selected, confidence, reasoning
         
+        return selected, confidence, reasoning
+    
     def _calculate_aggregate_scores(
         self,
         votes: List[CouncilVote],
@@ -488,20 +856,20 @@ REASONING: <brief explanation>"""
         for vote in votes:
             if vote.selected_agent:
                 scores[vote.selected_agent] = scores.get(vote.selected_agent, 0) + 1
-                
+        
         # Add ranking-based scores (inverse position)
         for ranking in rankings:
             for i, agent in enumerate(ranking.ranking):
                 # First place gets N points, second gets N-1, etc.
                 position_score = len(ranking.ranking) - i
                 scores[agent] = scores.get(agent, 0) + position_score * 0.5
-                
+        
         # Normalize to 0-1 range
         if scores:
             max_score = max(scores.values())
             if max_score > 0:
                 scores = {k: v / max_score for k, v in scores.items()}
-                
+        
         return scores
 
 
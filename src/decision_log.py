@@ -74,6 +74,8 @@ class DecisionStats:
     decisions_by_status: Dict[str, int]
     average_confidence: float
     success_rate: float
+    # Agent -> runs, tokens and cost reported by its CLI (executions with usage only)
+    token_usage: Dict[str, Dict[str, float]] = field(default_factory=dict)
 
 
 class DecisionLogger:
@@ -128,7 +130,7 @@ class DecisionLogger:
         self.file_path = file_path or ".agents/decisions.jsonl"
         
         self._decisions: Dict[str, Decision] = {}
-        
+    
     def log_decision(
         self,
         decision_type: DecisionType,
@@ -165,9 +167,9 @@ class DecisionLogger:
         
         if self.persist_to_file:
             self._persist_decision(decision)
-            
-        return decision.id
         
+        return decision.id
+    
     def update_outcome(
         self,
         decision_id: str,
@@ -187,7 +189,7 @@ class DecisionLogger:
         decision = self._decisions.get(decision_id)
         if not decision:
             raise ValueError(f"Decision not found: {decision_id}")
-            
+        
         decision.status = status
         decision.outcome_status = outcome_status
         decision.outcome_data = outcome_data
@@ -195,11 +197,11 @@ class DecisionLogger:
         
         if self.persist_to_file:
             self._persist_decision(decision)
-            
+    
     def get_decision(self, decision_id: str) -> Optional[Decision]:
         """Get a decision by ID."""
         return self._decisions.get(decision_id)
-        
+    
     def get_decisions(
         self,
         limit: int = 100,
@@ -213,7 +215,7 @@ class DecisionLogger:
             limit: Maximum number to return
             decision_type: Filter by type
             status: Filter by status
-            
+        
         Returns:
             List of decisions
         """
@@ -223,20 +225,20 @@ class DecisionLogger:
             decisions = [d for d in decisions if d.decision_type == decision_type]
         if status:
             decisions = [d for d in decisions if d.status == status]
-            
+        
         # Sort by created_at descending
         decisions.sort(key=lambda d: d.created_at, reverse=True)
         
         return decisions[:limit]
-        
+    
     def get_decisions_for_task(self, task_id: str) -> List[Decision]:
         """Get all decisions for a specific task."""
         return [d for d in self._decisions.values() if d.task_id == task_id]
-        
+    
     def get_decisions_for_session(self, session_id: str) -> List[Decision]:
         """Get all decisions for a specific session."""
         return [d for d in self._decisions.values() if d.session_id == session_id]
-        
+    
     def get_stats(self) -> DecisionStats:
         """Get statistics about logged decisions."""
         decisions = list(self._decisions.values())
@@ -249,19 +251,19 @@ class DecisionLogger:
                 average_confidence=0.0,
                 success_rate=0.0,
             )
-            
+        
         # Count by type
         by_type: Dict[str, int] = {}
         for d in decisions:
             type_name = d.decision_type.value
             by_type[type_name] = by_type.get(type_name, 0) + 1
-            
+        
         # Count by status
         by_status: Dict[str, int] = {}
         for d in decisions:
             status_name = d.status.value
             by_status[status_name] = by_status.get(status_name, 0) + 1
-            
+        
         # Calculate averages
         avg_confidence = sum(d.confidence_score for d in decisions) / len(decisions)
         
@@ -270,14 +272,35 @@ class DecisionLogger:
         successful = [d for d in executed if d.outcome_status == "success"]
         success_rate = len(successful) / len(executed) if executed else 0.0
         
+        # Sum token usage of agent executions, per agent
+        token_usage: Dict[str, Dict[str, float]] = {}
+        for d in decisions:
+            usage = (d.outcome_data or {}).get("usage")
+            if d.decision_type != DecisionType.AGENT_EXECUTION or not usage:
+                continue
+            totals = token_usage.setdefault(
+                d.context.get("agent", d.agent),
+                {
+                    "runs": 0,
+                    "input_tokens": 0,
+                    "output_tokens": 0,
+                    "total_tokens": 0,
+                    "cost_usd": 0.0,
+                },
+            )
+            totals["runs"] += 1
+            for key in ("input_tokens", "output_tokens", "total_tokens", "cost_usd"):
+                totals[key] += usage.get(key) or 0
+        
         return DecisionStats(
             total_decisions=len(decisions),
             decisions_by_type=by_type,
             decisions_by_status=by_status,
             average_confidence=round(avg_confidence, 3),
             success_rate=round(success_rate, 3),
+            token_usage=token_usage,
         )
-        
+    
     def _persist_decision(self, decision: Decision) -> None:
         """Persist a decision to file."""
         import os
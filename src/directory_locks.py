@@ -0,0 +1,212 @@
+"""
+LastAgent Directory Lock Manager
+
+Reader/writer locks on agent working directories.
+
+Aider auto-commits and Codex edits files; two such agents in the same
+checkout corrupt each other's git state. Every execution therefore locks
+its working directory, resolved to the enclosing git repository root (or
+the real path outside git):
+
+  - read-only agents/tasks take it shared - any number run together
+  - mutating agents take it exclusively
+
+Waiters are granted in arrival order (a writer isn't starved by a stream of
+readers). Locks are independent per directory, and the scheduler takes the
+directory lock before an execution slot, so tasks waiting on one repository
+neither hold slots nor block tasks on other repositories.
+"""
+
+import asyncio
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, Optional
+
+
+READ = "read"
+WRITE = "write"
+
+
+@dataclass
+class DirectoryLockStats:
+    """Point-in-time lock metrics."""
+    locked_directories: int
+    readers: int
+    writers: int
+    waiting: int
+    acquired_total: int
+    contended_total: int
+    wait_ms_max: float
+
+
+@dataclass
+class _Waiter:
+    """A queued lock request."""
+    mode: str
+    future: asyncio.Future
+
+
+@dataclass
+class _DirectoryLock:
+    """Lock state for one directory."""
+    readers: int = 0
+    writer: bool = False
+    queue: Deque[_Waiter] = field(default_factory=deque)
+    
+    def can_grant(self, mode: str) -> bool:
+        """Check whether a request in this mode is compatible with the holders."""
+        if mode == WRITE:
+            return not self.writer and self.readers == 0
+        return not self.writer
+    
+    def grant(self, mode: str) -> None:
+        """Record a new holder."""
+        if mode == WRITE:
+            self.writer = True
+        else:
+            self.readers += 1
+    
+    @property
+    def idle(self) -> bool:
+        """No holders and no waiters."""
+        return not self.writer and self.readers == 0 and not self.queue
+
+
+def resolve_lock_path(working_directory: Optional[str]) -> str:
+    """
+    Key for a working directory: its git repository root, else its real path.
+    
+    Two subdirectories of one repository share git state, so they share a lock.
+    """
+    path = os.path.realpath(working_directory or ".")
+    current = path
+    while True:
+        if os.path.exists(os.path.join(current, ".git")):
+            return current
+        parent = os.path.dirname(current)
+        if parent == current:
+            return path
+        current = parent
+
+
+class DirectoryLockManager:
+    """
+    Per-directory reader/writer locks with FIFO waiters.
+    
+    Usage:
+        locks = get_directory_locks()
+        wait_ms = await locks.acquire("/repo", WRITE)
+        try:
+            ...  # run the mutating agent
+        finally:
+            locks.release("/repo", WRITE)
+    """
+    
+    def __init__(self):
+        """Initialize the lock manager."""
+        self._locks: Dict[str, _DirectoryLock] = {}
+        self._acquired_total = 0
+        self._contended_total = 0
+        self._wait_ms_max = 0.0
+    
+    async def acquire(self, path: str, mode: str = READ) -> float:
+        """
+        Wait for a lock on a (resolved) directory.
+        
+        Args:
+            path: Key from resolve_lock_path()
+            mode: READ (shared) or WRITE (exclusive)
+        
+        Returns:
+            Time spent waiting, in milliseconds
+        """
+        lock = self._locks.setdefault(path, _DirectoryLock())
+        self._acquired_total += 1
+        
+        # Fast path: nobody queued ahead and compatible with current holders
+        if not lock.queue and lock.can_grant(mode):
+            lock.grant(mode)
+            return 0.0
+        
+        start = time.perf_counter()
+        self._contended_total += 1
+        waiter = _Waiter(mode=mode, future=asyncio.get_running_loop().create_future())
+        lock.queue.append(waiter)
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Granted just as the caller went away - hand the lock back
+                self.release(path, mode)
+            else:
+                try:
+                    lock.queue.remove(waiter)
+                except ValueError:
+                    pass
+                self._dispatch(path, lock)
+            raise
+        
+        wait_ms = (time.perf_counter() - start) * 1000
+        self._wait_ms_max = max(self._wait_ms_max, wait_ms)
+        return wait_ms
+    
+    def release(self, path: str, mode: str = READ) -> None:
+        """Release a lock obtained with acquire()."""
+        lock = self._locks.get(path)
+        if lock is None:
+            return
+        if mode == WRITE:
+            lock.writer = False
+        else:
+            lock.readers = max(0, lock.readers - 1)
+        self._dispatch(path, lock)
+    
+    def _dispatch(self, path: str, lock: _DirectoryLock) -> None:
+        """Grant queued requests in FIFO order while they are compatible."""
+        while lock.queue:
+            waiter = lock.queue[0]
+            if waiter.future.done():
+                lock.queue.popleft()  # Cancelled while queued
+                continue
+            if not lock.can_grant(waiter.mode):
+                break
+            lock.queue.popleft()
+            lock.grant(waiter.mode)
+            waiter.future.set_result(None)
+        if lock.idle:
+            del self._locks[path]
+    
+    def holders(self, path: str) -> Dict[str, int]:
+        """Current readers/writer/waiters for a directory (for tests and debugging)."""
+        lock = self._locks.get(path, _DirectoryLock())
+        return {"readers": lock.readers, "writers": int(lock.writer), "waiting": len(lock.queue)}
+    
+    def get_stats(self) -> DirectoryLockStats:
+        """Get current lock metrics."""
+        locks = self._locks.values()
+        return DirectoryLockStats(
+            locked_directories=sum(1 for lock in locks if lock.readers or lock.writer),
+            readers=sum(lock.readers for lock in locks),
+            writers=sum(1 for lock in locks if lock.writer),
+            waiting=sum(len(lock.queue) for lock in locks),
+            acquired_total=self._acquired_total,
+            contended_total=self._contended_total,
+            wait_ms_max=round(self._wait_ms_max, 2),
+        )
+
+
+# =============================================================================
+# SINGLETON INSTANCE
+# =============================================================================
+
+_locks: Optional[DirectoryLockManager] = None
+
+
+def get_directory_locks() -> DirectoryLockManager:
+    """Get the global directory lock manager instance."""
+    global _locks
+    if _locks is None:
+        _locks = DirectoryLockManager()
+    return _locks
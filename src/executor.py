@@ -5,7 +5,7 @@ Executes agents via their native CLI/SDK.
 AGENTS ARE NOT LLMs - they have agentic capabilities (tools, file access, execution).
 
 All agents are invoked via CLI subprocess:
-  - claude -p "prompt" --output-format text
+  - claude -p "prompt" --output-format stream-json --verbose
   - gemini prompt "..."
   - aider --message "..."
   - codex --full-auto "..."
@@ -13,19 +13,48 @@ All agents are invoked via CLI subprocess:
 """
 
 import asyncio
-import shutil
+import codecs
+import os
 import time
-from dataclasses import dataclass, field
+from contextvars import ContextVar
+from dataclasses import dataclass, field, replace
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from .config import get_config, AgentConfig
+from .scheduler import get_execution_scheduler
+from .process_lifecycle import get_process_manager
+from .agent_pool import get_warm_pool
+from .availability import get_availability_registry
+from .latency import get_latency_tracker
+from .result_cache import get_result_cache
+from .output_buffer import READ_CHUNK_SIZE, CapturedOutput, SpillBuffer, drain, get_output_store
+from .resource_usage import ResourceUsage
+from .worktree_pool import WorktreeLease, WorktreeError, get_worktree_pool
+from .directory_locks import READ, WRITE
+from .stall_detector import AgentStalledError, get_stall_detector
+from .prompt_transport import ARGV, FILE, STDIN, PromptDelivery, get_prompt_transport
+from .timeouts import get_timeout_policy
+from .output_parsers import STREAM_JSON, TEXT, ParsedOutput, create_parser
+from .resource_limits import ResourceLimitExceeded, get_resource_limiter
 
 # Enterprise structured logging
 try:
-    from src.observability import get_logger, log_error
+    from src.observability import get_logger, log_error, get_tracer, ProcessTrace, Span, SpanStatus
+    from src.observability.logging_config import get_trace_id
 except ImportError:
-    from .observability import get_logger, log_error
+    from .observability import get_logger, log_error, get_tracer, ProcessTrace, Span, SpanStatus
+    from .observability.logging_config import get_trace_id
+
+
+# Bytes read from agent stdout per streamed chunk
+STREAM_CHUNK_SIZE = 4096
+
+# Resource usage of the CLI runs made by the current execute() call
+_run_usage: ContextVar[Optional[List[ResourceUsage]]] = ContextVar("run_usage", default=None)
+
+# Span of the current execute() call (parent of its process sub-spans)
+_execution_span: ContextVar[Optional[Span]] = ContextVar("execution_span", default=None)
 
 
 class ExecutionMethod(Enum):
@@ -33,14 +62,24 @@ class ExecutionMethod(Enum):
     CLI_SUBPROCESS = "cli"  # All agents use CLI
 
 
+class StreamEventType(Enum):
+    """Kinds of events yielded by AgentExecutor.execute_stream()."""
+    CHUNK = "chunk"  # A piece of agent stdout
+    SUMMARY = "summary"  # Final event: exit code, duration, stderr
+
+
 @dataclass
 class ExecutionContext:
     """Context for agent execution."""
     system_prompt: str
     user_prompt: str
     working_directory: Optional[str] = None
-    timeout: int = 300  # seconds
+    timeout: Optional[float] = None  # seconds (None = adaptive, see src/timeouts.py)
+    task_type: Optional[str] = None  # Task analyzer type, for per-task-type latency
     allowed_tools: Optional[List[str]] = None
+    bypass_cache: bool = False  # Skip the result cache for this request
+    isolation: Optional[str] = None  # "shared" or "worktree" (None = settings default)
+    read_only: Optional[bool] = None  # Directory lock mode override (None = agent default)
 
 
 @dataclass
@@ -55,6 +94,31 @@ class ExecutionResult:
     metadata: Dict[str, Any] = field(default_factory=dict)
 
 
+@dataclass
+class StreamEvent:
+    """
+    A single event from a streaming agent execution.
+    
+    CHUNK events carry stdout text as soon as the CLI produces it.
+    The last event is always a SUMMARY carrying exit code, duration and stderr.
+    """
+    type: StreamEventType
+    agent_name: str
+    data: str = ""
+    success: bool = False
+    exit_code: Optional[int] = None
+    duration_ms: int = 0
+    stderr: str = ""
+    error: Optional[str] = None
+    queue_wait_ms: float = 0.0
+    lock_wait_ms: float = 0.0
+    resource_usage: Optional[Dict[str, Any]] = None
+    worktree: Optional[Dict[str, Any]] = None
+    usage: Optional[Dict[str, Any]] = None  # Token usage reported by the CLI
+    timed_out: bool = False  # Killed on timeout (not on a stall)
+    failure_kind: Optional[str] = None  # "stalled", "resource_limit" or "unavailable"
+
+
 class AgentExecutor:
     """
     Executes agents via their native CLI/SDK.
@@ -71,11 +135,49 @@ class AgentExecutor:
         """Initialize the executor."""
         self.config = get_config()
         self._log = get_logger("executor")
-        
+        self.scheduler = get_execution_scheduler()
+        self.processes = get_process_manager()
+        self.pool = get_warm_pool()
+        self.availability = get_availability_registry()
+        self.latency = get_latency_tracker()
+        self.cache = get_result_cache()
+        self.outputs = get_output_store()
+        self.worktrees = get_worktree_pool()
+        self.stalls = get_stall_detector()
+        self.prompts = get_prompt_transport()
+        self.timeouts = get_timeout_policy()
+        self.limits = get_resource_limiter()
+        self.tracer = get_tracer()
+        self.tracing = self.config.settings.execution.get("tracing", {}).get("enabled", True)
+    
     def _is_cli_available(self, command: str) -> bool:
-        """Check if a CLI command is available on the system."""
-        return shutil.which(command) is not None
+        """Check if a CLI command is available (cached by the availability registry)."""
+        return self.availability.is_command_available(command)
+    
+    async def prewarm(
+        self,
+        working_directory: Optional[str] = None,
+        system_prompt: str = "",
+    ) -> None:
+        """
+        Fill the warm pool for every pooled agent whose CLI is installed.
         
+        No-op unless settings.execution.warm_pool.enabled is set. Other
+        (working directory, system prompt) keys warm up after their first task.
+        """
+        context = ExecutionContext(
+            system_prompt=system_prompt,
+            user_prompt="",
+            working_directory=working_directory,
+        )
+        for agent_name, agent in self.config.agents.items():
+            warm = self._build_warm_command(agent_name, context)
+            if warm is None or not self.pool.supports(agent_name):
+                continue
+            if not self._is_cli_available(agent.command or agent_name):
+                continue
+            await self.pool.prewarm(agent_name, warm[0], working_directory, system_prompt)
+    
     async def execute(
         self,
         agent_name: str,
@@ -87,10 +189,30 @@ class AgentExecutor:
         Args:
             agent_name: Name of the agent to execute
             context: Execution context with prompts and settings
-            
+        
         Returns:
             ExecutionResult with the response
         """
+        span = self._start_execution_span(agent_name)
+        token = _execution_span.set(span)
+        try:
+            result = await self._execute(agent_name, context)
+        except BaseException:
+            self._end_execution_span(span, False, "Execution cancelled")
+            raise
+        finally:
+            _execution_span.reset(token)
+        self._end_execution_span(span, result.success, result.error)
+        if span is not None:
+            result.metadata["trace"] = self._trace_metadata(span)
+        return result
+    
+    async def _execute(
+        self,
+        agent_name: str,
+        context: ExecutionContext
+    ) -> ExecutionResult:
+        """execute() within the run's execution span."""
         start_time = time.perf_counter()
         
         try:
@@ -111,21 +233,91 @@ class AgentExecutor:
                     execution_method=ExecutionMethod.CLI_SUBPROCESS,
                     duration_ms=0,
                     error=f"Agent CLI not installed: {cli_command}. Install it to use this agent.",
+                    metadata={"failure_kind": "unavailable"},
                 )
             
-            # Log CLI execution start
-            self._log.info(
-                "cli_execution_started",
-                agent=agent_name,
-                command=cli_command,
-                method="CLI_SUBPROCESS",
-            )
+            context, timeout = self._resolve_timeout(agent_name, context)
+            
+            # Serve repeated read-only prompts from the result cache
+            cache_key = None
+            cache_status = None
+            if self.cache.supports(agent_name) and self._is_read_only(agent, context):
+                if context.bypass_cache:
+                    self.cache.record_bypass()
+                    cache_status = "bypass"
+                else:
+                    cache_key = await self.cache.make_key(
+                        agent_name,
+                        context.system_prompt,
+                        context.user_prompt,
+                        context.working_directory,
+                    )
+                    cached = self.cache.get(cache_key) if cache_key else None
+                    cache_status = "miss" if cache_key else "uncacheable"
+                    if cached is not None:
+                        duration_ms = int((time.perf_counter() - start_time) * 1000)
+                        self._log.info(
+                            "cli_execution_cache_hit",
+                            agent=agent_name,
+                            duration_ms=duration_ms,
+                            original_duration_ms=cached.duration_ms,
+                        )
+                        # A hit spends no tokens: drop the original run's usage
+                        metadata = {k: v for k, v in cached.metadata.items() if k != "usage"}
+                        return replace(
+                            cached,
+                            duration_ms=duration_ms,
+                            metadata={**metadata, "cache": "hit"},
+                        )
             
-            # Route to the appropriate CLI handler
-            result = await self._execute_cli(agent_name, agent, context)
+            # Lock the working directory, then wait for an execution slot
+            # (global + per-agent limits)
+            directory, mode = self._directory_lock(agent, context)
+            async with self.scheduler.slot(agent_name, directory, mode) as lease:
+                # Log CLI execution start
+                self._log.info(
+                    "cli_execution_started",
+                    agent=agent_name,
+                    command=cli_command,
+                    method="CLI_SUBPROCESS",
+                    queue_wait_ms=lease.queue_wait_ms,
+                    lock_wait_ms=lease.lock_wait_ms,
+                    lock_mode=mode if directory is not None else None,
+                )
+                
+                # Isolate the run in its own git worktree if requested
+                worktree = await self._lease_worktree(context)
+                run_context = (
+                    replace(context, working_directory=worktree.working_directory)
+                    if worktree else context
+                )
+                
+                # Route to the appropriate CLI handler
+                runs: List[ResourceUsage] = []
+                token = _run_usage.set(runs)
+                run_start = time.perf_counter()
+                try:
+                    result = await self._execute_cli(agent_name, agent, run_context)
+                    run_ms = int((time.perf_counter() - run_start) * 1000)
+                except BaseException:
+                    if worktree:
+                        # Cancelled (e.g. a hedge that lost): drop partial edits
+                        await self._release_worktree(worktree, agent_name, merge=False)
+                    raise
+                finally:
+                    _run_usage.reset(token)
+                if worktree:
+                    result.metadata["worktree"] = await self._release_worktree(
+                        worktree, agent_name, merge=result.success
+                    )
             
             duration_ms = int((time.perf_counter() - start_time) * 1000)
             result.duration_ms = duration_ms
+            result.metadata["queue_wait_ms"] = lease.queue_wait_ms
+            result.metadata["lock_wait_ms"] = lease.lock_wait_ms
+            result.metadata["timeout"] = timeout
+            if runs:
+                result.metadata["resource_usage"] = runs[-1].to_dict()
             
             # Log CLI execution complete
             self._log.info(
@@ -133,9 +325,28 @@ class AgentExecutor:
                 agent=agent_name,
                 success=result.success,
                 duration_ms=duration_ms,
+                queue_wait_ms=lease.queue_wait_ms,
+                **result.metadata.get("resource_usage", {}),
+            )
+            self._record_latency(
+                agent_name, context, run_ms, result.success, result.metadata.get("timed_out", False)
             )
+            if cache_status:
+                result.metadata["cache"] = cache_status
+            if cache_key and result.success and result.response.strip():
+                # Keyed on the tree before the run; store only if it's still that tree
+                after = await self.cache.make_key(
+                    agent_name,
+                    context.system_prompt,
+                    context.user_prompt,
+                    context.working_directory,
+                )
+                if after == cache_key:
+                    self.cache.put(cache_key, replace(result, metadata=dict(result.metadata)))
+                else:
+                    self.cache.record_changed()
             return result
-            
+        
         except KeyError:
             duration_ms = int((time.perf_counter() - start_time) * 1000)
             log_error(
@@ -168,8 +379,817 @@ class AgentExecutor:
                 execution_method=ExecutionMethod.CLI_SUBPROCESS,
                 duration_ms=duration_ms,
                 error=str(e),
+                metadata=(
+                    {"failure_kind": "resource_limit"}
+                    if isinstance(e, ResourceLimitExceeded) else {}
+                ),
+            )
+    
+    async def execute_hedged(
+        self,
+        agent_name: str,
+        context: ExecutionContext,
+        hedge_agent: str,
+        hedge_after_ms: float,
+    ) -> ExecutionResult:
+        """
+        Execute an agent, starting a backup agent if it runs too long.
+        
+        If the primary hasn't finished after hedge_after_ms, the same task is
+        started on hedge_agent. The first successful result wins and the
+        other run is cancelled (its process group is killed). If both fail,
+        the primary's result is returned.
+        
+        Only tasks that can't edit the shared working directory are hedged:
+        read-only ones (context.read_only, else neither agent mutates_files)
+        and worktree-isolated ones, where each run leases its own worktree.
+        Others just run the primary.
+        
+        Args:
+            agent_name: Primary agent
+            context: Execution context with prompts and settings
+            hedge_agent: Backup agent started after the delay
+            hedge_after_ms: Delay before starting the backup
+        
+        Returns:
+            ExecutionResult of the winning run, with metadata["hedge"]
+        """
+        if not self._can_hedge([agent_name, hedge_agent], context):
+            self._log.info(
+                "hedge_skipped", agent=agent_name, hedge_agent=hedge_agent, reason="mutating"
+            )
+            return await self.execute(agent_name, context)
+        
+        primary = asyncio.ensure_future(self.execute(agent_name, context))
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=hedge_after_ms / 1000)
+        except asyncio.CancelledError:
+            primary.cancel()
+            await asyncio.gather(primary, return_exceptions=True)
+            raise
+        if done:
+            return primary.result()
+        
+        self._log.info(
+            "hedge_started",
+            agent=agent_name,
+            hedge_agent=hedge_agent,
+            hedge_after_ms=round(hedge_after_ms, 2),
+        )
+        hedge = asyncio.ensure_future(self.execute(hedge_agent, context))
+        runs = {primary: agent_name, hedge: hedge_agent}
+        pending = set(runs)
+        winner: Optional[asyncio.Future] = None
+        
+        try:
+            while pending and winner is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for run in done:
+                    if run.result().success and winner is None:
+                        winner = run
+        finally:
+            # Kill the loser (or both, if we were cancelled)
+            for run in pending:
+                run.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        
+        result = (winner or primary).result()
+        result.metadata["hedge"] = {
+            "primary": agent_name,
+            "hedge_agent": hedge_agent,
+            "hedge_after_ms": round(hedge_after_ms, 2),
+            "winner": runs[winner] if winner else None,
+        }
+        self._log.info(
+            "hedge_completed",
+            agent=agent_name,
+            hedge_agent=hedge_agent,
+            winner=runs[winner] if winner else None,
+        )
+        return result
+    
+    def _can_hedge(self, agent_names: List[str], context: ExecutionContext) -> bool:
+        """Whether runs of these agents may race on one task without sharing edits."""
+        if self.worktrees.wants_isolation(context.isolation):
+            return True
+        try:
+            return all(
+                self._is_read_only(self.config.get_agent(name), context) for name in agent_names
+            )
+        except KeyError:
+            return False
+    
+    async def execute_many(
+        self,
+        agent_names: List[str],
+        context: ExecutionContext,
+        first_success: bool = True,
+    ) -> List[ExecutionResult]:
+        """
+        Execute the same task on several agents at once (fan-out).
+        
+        Trades extra compute for latency: with first_success, the first run
+        that succeeds with non-empty output wins and the others are
+        cancelled (their process groups are killed). Otherwise every run
+        completes. Runs still share scheduler slots and directory locks, so
+        mutating agents on one working directory take turns unless the
+        context uses worktree isolation.
+        
+        Args:
+            agent_names: Agents to run, best first
+            context: Execution context with prompts and settings
+            first_success: Stop at the first good result instead of waiting for all
+        
+        Returns:
+            Results of the runs that completed, in the order they finished.
+            Each has metadata["fan_out"], whose "winner" is the first agent
+            that succeeded with output (None if none did)
+        """
+        runs = {
+            asyncio.ensure_future(self.execute(agent_name, context)): agent_name
+            for agent_name in dict.fromkeys(agent_names)
+        }
+        pending = set(runs)
+        finished: List[asyncio.Future] = []
+        winner: Optional[asyncio.Future] = None
+        self._log.info("fan_out_started", agents=list(runs.values()), first_success=first_success)
+        
+        try:
+            while pending and not (first_success and winner):
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for run in sorted(done, key=list(runs).index):
+                    finished.append(run)
+                    result = run.result()
+                    if winner is None and result.success and result.response.strip():
+                        winner = run
+        finally:
+            for run in pending:
+                run.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        
+        results = [run.result() for run in finished]
+        for result in results:
+            result.metadata["fan_out"] = {
+                "agents": list(runs.values()),
+                "first_success": first_success,
+                "winner": runs[winner] if winner else None,
+                "cancelled": [runs[run] for run in pending],
+            }
+        self._log.info(
+            "fan_out_completed",
+            agents=list(runs.values()),
+            winner=runs[winner] if winner else None,
+            completed=len(results),
+            cancelled=len(pending),
+        )
+        return results
+    
+    async def execute_stream(
+        self,
+        agent_name: str,
+        context: ExecutionContext
+    ) -> AsyncIterator[StreamEvent]:
+        """
+        Execute an agent via its CLI, yielding stdout as it is produced.
+        
+        Unlike execute(), nothing is buffered: each CHUNK event is emitted as
+        soon as the CLI writes it, so time-to-first-token tracks the agent
+        rather than its total runtime. The final event is always a SUMMARY.
+        
+        Args:
+            agent_name: Name of the agent to execute
+            context: Execution context with prompts and settings
+        
+        Yields:
+            StreamEvent objects (CHUNK..., then one SUMMARY)
+        """
+        span = self._start_execution_span(agent_name)
+        success, error = False, "Stream closed before completion"
+        try:
+            async for event in self._execute_stream(agent_name, context, span):
+                if event.type == StreamEventType.SUMMARY:
+                    success, error = event.success, event.error
+                yield event
+        finally:
+            self._end_execution_span(span, success, error)
+    
+    async def _execute_stream(
+        self,
+        agent_name: str,
+        context: ExecutionContext,
+        span: Optional[Span] = None,
+    ) -> AsyncIterator[StreamEvent]:
+        """execute_stream() within the run's execution span."""
+        start_time = time.perf_counter()
+        
+        def summary(**kwargs: Any) -> StreamEvent:
+            return self._summary_event(agent_name, start_time, **kwargs)
+        
+        try:
+            agent = self.config.get_agent(agent_name)
+        except KeyError:
+            log_error(
+                "agent_not_found",
+                error_type="KeyError",
+                error_message=f"Unknown agent: {agent_name}",
+                agent=agent_name,
+            )
+            yield summary(error=f"Unknown agent: {agent_name}")
+            return
+        
+        cli_command = agent.command or agent_name
+        if not self._is_cli_available(cli_command):
+            self._log.warning(
+                "cli_not_available",
+                agent=agent_name,
+                command=cli_command,
+            )
+            yield summary(
+                error=f"Agent CLI not installed: {cli_command}. Install it to use this agent.",
+                failure_kind="unavailable",
+            )
+            return
+        
+        context, timeout = self._resolve_timeout(agent_name, context)
+        delivery = self._prompt_delivery(agent_name, context)
+        cmd = self._build_command(agent_name, context, delivery)
+        if cmd is None:
+            delivery.cleanup()
+            yield summary(error=f"No CLI handler for agent: {agent_name}")
+            return
+        
+        directory, mode = self._directory_lock(agent, context)
+        async with self.scheduler.slot(agent_name, directory, mode) as lease:
+            self._log.info(
+                "cli_stream_started",
+                agent=agent_name,
+                command=cli_command,
+                method="CLI_SUBPROCESS",
+                queue_wait_ms=lease.queue_wait_ms,
+                lock_wait_ms=lease.lock_wait_ms,
+                lock_mode=mode if directory is not None else None,
+                timeout_seconds=timeout["seconds"],
+                timeout_source=timeout["source"],
             )
+            worktree = await self._lease_worktree(context)
+            if worktree:
+                context = replace(context, working_directory=worktree.working_directory)
+            run_start = time.perf_counter()
+            try:
+                async for event in self._stream_process(
+                    agent_name, cmd, context, start_time, delivery.stdin, span
+                ):
+                    if event.type == StreamEventType.SUMMARY:
+                        event.queue_wait_ms = lease.queue_wait_ms
+                        event.lock_wait_ms = lease.lock_wait_ms
+                        run_ms = int((time.perf_counter() - run_start) * 1000)
+                        self._record_latency(
+                            agent_name, context, run_ms, event.success, event.timed_out
+                        )
+                        if worktree:
+                            event.worktree = await self._release_worktree(
+                                worktree, agent_name, merge=event.success
+                            )
+                            worktree = None
+                    yield event
+            finally:
+                delivery.cleanup()
+                if worktree:
+                    # Consumer went away before the SUMMARY: drop partial edits
+                    await self._release_worktree(worktree, agent_name, merge=False)
+    
+    def _record_latency(
+        self,
+        agent_name: str,
+        context: ExecutionContext,
+        run_ms: int,
+        success: bool,
+        timed_out: bool,
+    ) -> None:
+        """
+        Add a run to the latency history behind adaptive timeouts and hedging.
+        
+        run_ms covers the CLI run only: queueing, lock waits and worktree
+        setup aren't limited by the timeout, so they mustn't stretch it.
+        Runs killed on timeout count at (at least) their timeout.
+        """
+        if success:
+            self.latency.record(agent_name, run_ms, context.task_type)
+        elif timed_out:
+            self.latency.record_timeout(
+                agent_name, max(run_ms, context.timeout * 1000), context.task_type
+            )
+    
+    def _start_execution_span(self, agent_name: str) -> Optional[Span]:
+        """Open the span of one agent run (None if tracing is disabled)."""
+        if not self.tracing:
+            return None
+        return self.tracer.start_span(
+            "agent_execution",
+            trace_id=get_trace_id(),
+            component="executor",
+            phase="execution",
+            agent=agent_name,
+        )
+    
+    def _end_execution_span(
+        self,
+        span: Optional[Span],
+        success: bool,
+        error: Optional[str],
+    ) -> None:
+        """Close a run's span with its outcome."""
+        if span is None or span.end_time is not None:
+            return
+        if not success:
+            span.set_error("AgentExecutionFailed", error or "Execution failed")
+        self.tracer.end_span(span, SpanStatus.SUCCESS if success else SpanStatus.ERROR)
+    
+    @staticmethod
+    def _trace_metadata(span: Span) -> Dict[str, Any]:
+        """ExecutionResult metadata locating the run's trace."""
+        return {
+            "trace_id": span.trace_id,
+            "span_id": span.span_id,
+            **span.attributes.get("process", {}),
+        }
+    
+    def _process_trace(self, span: Optional[Span]) -> Optional[ProcessTrace]:
+        """Timing recorder for a CLI process started under span."""
+        return ProcessTrace(self.tracer, span) if span is not None else None
+    
+    @staticmethod
+    def _finish_process_trace(
+        trace: Optional[ProcessTrace],
+        process: asyncio.subprocess.Process,
+        status: SpanStatus,
+    ) -> None:
+        """Record a finished process's sub-spans and timings on the execution span."""
+        if trace is None:
+            return
+        trace.exited(process.returncode)
+        trace.finish(status)
+        trace.parent.set_attribute("process", trace.timings())
+    
+    @staticmethod
+    def _child_env(trace: Optional[ProcessTrace]) -> Optional[Dict[str, str]]:
+        """Environment for a cold-spawned CLI (None = inherit ours unchanged)."""
+        return {**os.environ, **trace.env()} if trace is not None else None
+    
+    def _summary_event(self, agent_name: str, start_time: float, **kwargs: Any) -> StreamEvent:
+        """Build the final SUMMARY event of a stream."""
+        return StreamEvent(
+            type=StreamEventType.SUMMARY,
+            agent_name=agent_name,
+            duration_ms=int((time.perf_counter() - start_time) * 1000),
+            **kwargs,
+        )
+    
+    async def _stream_process(
+        self,
+        agent_name: str,
+        cmd: List[str],
+        context: ExecutionContext,
+        start_time: float,
+        stdin_data: Optional[bytes] = None,
+        span: Optional[Span] = None,
+    ) -> AsyncIterator[StreamEvent]:
+        """Spawn the CLI and relay its stdout as StreamEvents."""
+        def summary(**kwargs: Any) -> StreamEvent:
+            return self._summary_event(agent_name, start_time, **kwargs)
+        
+        trace = self._process_trace(span)
+        try:
+            process, stdin_data = await self._spawn(agent_name, cmd, context, stdin_data, trace)
+        except Exception as e:
+            log_error(
+                "cli_execution_failed",
+                error_type=type(e).__name__,
+                error_message=str(e),
+                agent=agent_name,
+            )
+            yield summary(error=str(e))
+            return
+        
+        # Feed stdin and drain stderr concurrently so neither side blocks on a full pipe
+        stdin_task = asyncio.ensure_future(self._feed_stdin(process, stdin_data))
+        stderr_buffer = self.outputs.new_buffer()
+        stderr_task = asyncio.ensure_future(drain(process.stderr, stderr_buffer))
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        parser = create_parser(self._output_format(agent_name))
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + context.timeout
+        watch = self.stalls.watch(agent_name, process.pid)
+        timed_out = False
+        stall: Optional[AgentStalledError] = None
+        first_chunk_ms: Optional[int] = None
+        stdout_bytes = 0
+        usage: Optional[ResourceUsage] = None
+        status = SpanStatus.ERROR  # Until the CLI exits on its own
+        
+        try:
+            try:
+                while True:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        raise asyncio.TimeoutError()
+                    try:
+                        wait = min(remaining, self.stalls.check_interval) if watch else remaining
+                        chunk = await asyncio.wait_for(
+                            process.stdout.read(STREAM_CHUNK_SIZE),
+                            timeout=wait,
+                        )
+                    except asyncio.TimeoutError:
+                        if watch and watch.check(stdout_bytes + stderr_buffer.size):
+                            raise self.stalls.stalled(watch)
+                        continue
+                    if not chunk:
+                        break
+                    stdout_bytes += len(chunk)
+                    if trace:
+                        trace.output()
+                    text = parser.feed(decoder.decode(chunk))
+                    if text:
+                        if first_chunk_ms is None:
+                            first_chunk_ms = int((time.perf_counter() - start_time) * 1000)
+                        yield StreamEvent(
+                            type=StreamEventType.CHUNK,
+                            agent_name=agent_name,
+                            data=text,
+                        )
+                tail = parser.feed(decoder.decode(b"", final=True)) + parser.finish()
+                if tail:
+                    yield StreamEvent(type=StreamEventType.CHUNK, agent_name=agent_name, data=tail)
+                await asyncio.wait_for(
+                    process.wait(),
+                    timeout=max(deadline - loop.time(), 0.001),
+                )
+                status = SpanStatus.SUCCESS if process.returncode == 0 else SpanStatus.ERROR
+            except asyncio.TimeoutError as e:
+                timed_out = True
+                status = SpanStatus.TIMEOUT
+                stall = e if isinstance(e, AgentStalledError) else None
+                usage = await self.processes.resource_usage(process)
+                await self.processes.terminate(process, reason="stalled" if stall else "timeout")
             
+            await stderr_task
+        finally:
+            if usage is None:
+                usage = await self.processes.resource_usage(process)
+            # Consumer went away (aclose / cancellation) - don't leave the CLI running
+            if process.returncode is None:
+                await self.processes.terminate(process, reason="cancelled")
+            else:
+                await self.processes.finalize(process)
+            self._finish_process_trace(trace, process, status)
+            await self.pool.release(process)
+            if not stdin_task.done():
+                stdin_task.cancel()
+            if not stderr_task.done():
+                stderr_task.cancel()
+                stderr_buffer.discard()
+        
+        stderr = stderr_buffer.finish()
+        stderr_text = self._decode_output(stderr)
+        usage = usage or ResourceUsage()
+        usage.stdout_bytes = stdout_bytes
+        success = not timed_out and process.returncode == 0
+        breach = (
+            None if timed_out
+            else self.limits.check(agent_name, process.returncode, stderr, usage)
+        )
+        failure_kind = None
+        if stall:
+            error = str(stall)
+            failure_kind = "stalled"
+        elif timed_out:
+            error = "Execution timeout"
+        elif breach:
+            error = str(breach)
+            failure_kind = "resource_limit"
+        elif process.returncode != 0:
+            error = f"Exit code: {process.returncode}"
+        else:
+            error = None
+        
+        parsed = parser.result()
+        event = summary(
+            success=success,
+            exit_code=process.returncode,
+            stderr=stderr_text,
+            error=error,
+            resource_usage=usage.to_dict(),
+            usage=parsed.usage.to_dict() if parsed.usage else None,
+            timed_out=timed_out and stall is None,
+            failure_kind=failure_kind,
+        )
+        self._log.info(
+            "cli_stream_completed",
+            agent=agent_name,
+            success=success,
+            exit_code=process.returncode,
+            first_chunk_ms=first_chunk_ms,
+            duration_ms=event.duration_ms,
+            pty=self._use_pty(agent_name),
+            **(event.usage or {}),
+        )
+        yield event
+    
+    def _resolve_timeout(
+        self,
+        agent_name: str,
+        context: ExecutionContext,
+    ) -> Tuple[ExecutionContext, Dict[str, Any]]:
+        """
+        Fill in the run's timeout unless the caller set one.
+        
+        Returns:
+            (context with timeout set, {"seconds", "source"} for metadata) -
+            source is "request", or "override" / "adaptive" / "default"
+            from the timeout policy
+        """
+        if context.timeout is not None:
+            return context, {"seconds": context.timeout, "source": "request"}
+        timeout = self.timeouts.resolve(agent_name, context.task_type)
+        return (
+            replace(context, timeout=timeout.seconds),
+            {"seconds": timeout.seconds, "source": timeout.source},
+        )
+    
+    def _directory_lock(
+        self,
+        agent: AgentConfig,
+        context: ExecutionContext,
+    ) -> Tuple[Optional[str], str]:
+        """
+        Which directory lock an execution needs: (directory, READ/WRITE).
+        
+        Mutating agents (agents.yml mutates_files) lock exclusively unless the
+        task is marked read_only. Isolated (worktree) runs and disabled
+        locking need no lock: (None, READ).
+        """
+        settings = self.config.settings.execution.get("directory_locks", {})
+        if not settings.get("enabled", True) or self.worktrees.wants_isolation(context.isolation):
+            return None, READ
+        mode = READ if self._is_read_only(agent, context) else WRITE
+        return context.working_directory or ".", mode
+    
+    def _is_read_only(self, agent: AgentConfig, context: ExecutionContext) -> bool:
+        """Whether a run leaves its working directory alone (read_only, else not mutates_files)."""
+        return context.read_only if context.read_only is not None else not agent.mutates_files
+    
+    async def _lease_worktree(self, context: ExecutionContext) -> Optional[WorktreeLease]:
+        """Lease a worktree if the context asks for isolation (None = run in place)."""
+        if not self.worktrees.wants_isolation(context.isolation):
+            return None
+        try:
+            return await self.worktrees.lease(context.working_directory)
+        except WorktreeError as e:
+            self._log.warning("worktree_lease_failed", error=str(e))
+            return None
+    
+    async def _release_worktree(
+        self,
+        lease: WorktreeLease,
+        agent_name: str,
+        merge: bool = True,
+    ) -> Dict[str, Any]:
+        """Return a worktree to the pool; describe it for result metadata."""
+        branch = await self.worktrees.release(lease, label=agent_name, merge=merge)
+        return {
+            "path": lease.path,
+            "base_commit": lease.base_commit,
+            "branch": branch,
+        }
+    
+    async def _spawn(
+        self,
+        agent_name: str,
+        cmd: List[str],
+        context: ExecutionContext,
+        stdin_data: Optional[bytes] = None,
+        trace: Optional[ProcessTrace] = None,
+    ) -> Tuple[asyncio.subprocess.Process, Optional[bytes]]:
+        """
+        Start the CLI for a task, preferring a warm pooled process.
+        
+        Args:
+            stdin_data: Prompt for a cold-spawned CLI that reads it from stdin
+            trace: Process timing to start; a cold-spawned CLI also gets
+                its trace context (TRACEPARENT)
+        
+        Returns:
+            (process, stdin_data) - stdin_data is the prompt to write to the
+            process's stdin, or None if it takes the prompt from argv
+        """
+        warm = self._build_warm_command(agent_name, context)
+        if warm is not None:
+            warm_cmd, prompt = warm
+            process = await self.pool.acquire(
+                agent_name,
+                context.working_directory,
+                context.system_prompt,
+                warm_cmd,
+            )
+            if process is not None:
+                self._log.debug("warm_process_used", agent=agent_name, pid=process.pid)
+                if trace:
+                    trace.spawned(pid=process.pid, warm=True)
+                return process, prompt
+        process = await self.processes.spawn(
+            agent_name,
+            cmd,
+            cwd=context.working_directory or ".",
+            pty=self._use_pty(agent_name),
+            stdin=asyncio.subprocess.PIPE if stdin_data is not None else None,
+            env=self._child_env(trace),
+        )
+        if trace:
+            trace.spawned(pid=process.pid, warm=False)
+        return process, stdin_data
+    
+    def _use_pty(self, agent_name: str) -> bool:
+        """Whether the agent runs with a pseudo-terminal as stdout (agents.yml pty)."""
+        try:
+            return self.config.get_agent(agent_name).pty
+        except KeyError:
+            return False
+    
+    def _output_format(self, agent_name: str) -> str:
+        """How the agent's CLI formats its output (agents.yml output_format)."""
+        try:
+            return self.config.get_agent(agent_name).output_format
+        except KeyError:
+            return "text"
+    
+    async def _run_cli(
+        self,
+        agent_name: str,
+        cmd: List[str],
+        cwd: str,
+        timeout: float,
+        context: Optional[ExecutionContext] = None,
+        stdin_data: Optional[bytes] = None,
+    ) -> Tuple[Optional[int], CapturedOutput, CapturedOutput]:
+        """
+        Run a CLI to completion and return (returncode, stdout, stderr).
+        
+        The CLI runs in its own process group; on timeout or cancellation the
+        whole tree is killed and reaped before the exception propagates.
+        With a context, a warm pooled process is used when one is ready.
+        stdin_data (a prompt sent over stdin) is written while output is read.
+        Output past settings.execution.output.max_memory_bytes spills to
+        disk; stdout/stderr then hold a preview (see CapturedOutput).
+        
+        Raises:
+            asyncio.TimeoutError: If the CLI does not finish within timeout
+            AgentStalledError: If the CLI goes silent for its stall timeout
+            ResourceLimitExceeded: If the CLI failed on one of its agents.yml limits
+        """
+        trace = self._process_trace(_execution_span.get())
+        if context is not None:
+            process, stdin_data = await self._spawn(agent_name, cmd, context, stdin_data, trace)
+        else:
+            process = await self.processes.spawn(
+                agent_name,
+                cmd,
+                cwd=cwd,
+                pty=self._use_pty(agent_name),
+                stdin=asyncio.subprocess.PIPE if stdin_data is not None else None,
+                env=self._child_env(trace),
+            )
+            if trace:
+                trace.spawned(pid=process.pid, warm=False)
+        stdout = self.outputs.new_buffer()
+        stderr = self.outputs.new_buffer()
+        watch = self.stalls.watch(agent_name, process.pid)
+        status = SpanStatus.ERROR
+        try:
+            await asyncio.wait_for(
+                self.stalls.supervise(
+                    watch,
+                    self._communicate(process, stdin_data, stdout, stderr, trace),
+                    lambda: stdout.size + stderr.size,
+                ),
+                timeout=timeout
+            )
+            status = SpanStatus.SUCCESS if process.returncode == 0 else SpanStatus.ERROR
+        except asyncio.TimeoutError as e:
+            status = SpanStatus.TIMEOUT
+            await self._record_usage(process, stdout.size)
+            reason = "stalled" if isinstance(e, AgentStalledError) else "timeout"
+            await self.processes.terminate(process, reason=reason)
+            stdout.discard()
+            stderr.discard()
+            raise
+        except asyncio.CancelledError:
+            await self.processes.terminate(process, reason="cancelled")
+            stdout.discard()
+            stderr.discard()
+            raise
+        finally:
+            self._finish_process_trace(trace, process, status)
+            await self.pool.release(process)
+        usage = await self._record_usage(process, stdout.size)
+        await self.processes.finalize(process)
+        stdout_output, stderr_output = stdout.finish(), stderr.finish()
+        breach = self.limits.check(agent_name, process.returncode, stderr_output, usage)
+        if breach is not None:
+            raise breach
+        return process.returncode, stdout_output, stderr_output
+    
+    async def _record_usage(
+        self,
+        process: asyncio.subprocess.Process,
+        stdout_bytes: int,
+    ) -> ResourceUsage:
+        """Attach a run's resource usage to the current execute() call."""
+        usage = await self.processes.resource_usage(process) or ResourceUsage()
+        usage.stdout_bytes = stdout_bytes
+        runs = _run_usage.get()
+        if runs is not None:
+            runs.append(usage)
+        return usage
+    
+    async def _communicate(
+        self,
+        process: asyncio.subprocess.Process,
+        stdin_data: Optional[bytes],
+        stdout: SpillBuffer,
+        stderr: SpillBuffer,
+        trace: Optional[ProcessTrace] = None,
+    ) -> None:
+        """Like process.communicate(), but captures into bounded buffers."""
+        await asyncio.gather(
+            self._feed_stdin(process, stdin_data),
+            drain(process.stdout, stdout, trace.output if trace else None),
+            drain(process.stderr, stderr),
+        )
+        await process.wait()
+    
+    async def _feed_stdin(self, process: asyncio.subprocess.Process, data: Optional[bytes]) -> None:
+        """Write a prompt to the CLI's stdin (if piped) and close it."""
+        if process.stdin is None:
+            return
+        try:
+            if data:
+                process.stdin.write(data)
+                await process.stdin.drain()
+            process.stdin.close()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+    
+    def _decode_output(self, output: bytes) -> str:
+        """Decode captured output, noting where truncated output can be fetched."""
+        text = output.decode(errors="replace") if output else ""
+        return text + self._truncation_note(output)
+    
+    @staticmethod
+    def _truncation_note(output: bytes) -> str:
+        """Where to fetch the rest of truncated output ("" if complete)."""
+        if isinstance(output, CapturedOutput) and output.truncated:
+            return (
+                f"\n[output truncated: showing {len(output)} of {output.total_bytes} bytes; "
+                f"full output at /v1/outputs/{output.handle}]"
+            )
+        return ""
+    
+    def _parse_output(self, agent_name: str, output: bytes) -> ParsedOutput:
+        """
+        Extract the response, tool calls and token usage from captured stdout.
+        
+        Structured output that spilled to disk is parsed from the spill file:
+        the preview would lose the final result event with the answer and usage.
+        """
+        output_format = self._output_format(agent_name)
+        parser = create_parser(output_format)
+        stored = None
+        if isinstance(output, CapturedOutput) and output.truncated and output_format != TEXT:
+            stored = self.outputs.get(output.handle)
+        
+        if stored is not None:
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            with open(stored.path, "rb") as spilled:
+                for chunk in iter(lambda: spilled.read(READ_CHUNK_SIZE), b""):
+                    parser.feed(decoder.decode(chunk))
+            parser.feed(decoder.decode(b"", final=True))
+        else:
+            parser.feed(output.decode(errors="replace") if output else "")
+        parser.finish()
+        parsed = parser.result()
+        if stored is None:
+            parsed.text += self._truncation_note(output)
+        return parsed
+    
+    def _output_metadata(self, stdout: bytes, stderr: bytes) -> Dict[str, Any]:
+        """ExecutionResult metadata for streams that spilled to disk."""
+        truncated = {
+            name: output.describe()
+            for name, output in (("stdout", stdout), ("stderr", stderr))
+            if isinstance(output, CapturedOutput) and output.truncated
+        }
+        return {"output": truncated} if truncated else {}
+    
     async def _execute_cli(
         self,
         agent_name: str,
@@ -196,7 +1216,162 @@ class AgentExecutor:
                 duration_ms=0,
                 error=f"No CLI handler for agent: {agent_name}",
             )
-
+    
+    def _timeout_result(
+        self,
+        agent_name: str,
+        context: ExecutionContext,
+        error: asyncio.TimeoutError,
+    ) -> ExecutionResult:
+        """Result for a run killed on timeout or because it stalled."""
+        if isinstance(error, AgentStalledError):
+            return ExecutionResult(
+                success=False,
+                response="",
+                agent_name=agent_name,
+                execution_method=ExecutionMethod.CLI_SUBPROCESS,
+                duration_ms=0,
+                error=str(error),
+                metadata={
+                    "stalled": {"idle_seconds": round(error.idle_seconds, 1)},
+                    "failure_kind": "stalled",
+                },
+            )
+        return ExecutionResult(
+            success=False,
+            response="",
+            agent_name=agent_name,
+            execution_method=ExecutionMethod.CLI_SUBPROCESS,
+            duration_ms=int(context.timeout * 1000),
+            error="Execution timeout",
+            metadata={"timed_out": True},
+        )
+    
+    # =========================================================================
+    # COMMAND BUILDERS
+    # =========================================================================
+    
+    def _build_command(
+        self,
+        agent_name: str,
+        context: ExecutionContext,
+        delivery: Optional[PromptDelivery] = None,
+    ) -> Optional[List[str]]:
+        """Build the CLI argv for an agent, or None if there is no handler."""
+        builders = {
+            "claude": self._build_claude_command,
+            "gemini": self._build_gemini_command,
+            "aider": self._build_aider_command,
+            "codex": self._build_codex_command,
+            "goose": self._build_goose_command,
+        }
+        builder = builders.get(agent_name)
+        return builder(context, delivery) if builder else None
+    
+    def _prompt_text(self, agent_name: str, context: ExecutionContext) -> str:
+        """
+        The prompt an agent's CLI receives.
+        
+        gemini has no system prompt flag; claude's (--append-system-prompt)
+        would put the system prompt back in argv, so off argv it travels
+        with the user prompt over stdin.
+        """
+        if agent_name in ("gemini", "claude") and context.system_prompt:
+            return f"{context.system_prompt}\n\n{context.user_prompt}"
+        return context.user_prompt
+    
+    def _prompt_delivery(self, agent_name: str, context: ExecutionContext) -> PromptDelivery:
+        """Choose argv, stdin or a temp file for the prompt (see src/prompt_transport.py)."""
+        return self.prompts.prepare(agent_name, self._prompt_text(agent_name, context))
+    
+    def _build_warm_command(
+        self,
+        agent_name: str,
+        context: ExecutionContext
+    ) -> Optional[Tuple[List[str], bytes]]:
+        """
+        Build the argv for a warm (pre-spawned) process and its stdin payload.
+        
+        Only CLIs that read the prompt from stdin (agents.yml
+        prompt_transports) can be pre-spawned; the argv carries everything
+        but the prompt. Returns None otherwise.
+        """
+        if STDIN not in self.prompts.transports(agent_name):
+            return None
+        delivery = PromptDelivery(mode=STDIN, prompt=self._prompt_text(agent_name, context))
+        cmd = self._build_command(agent_name, context, delivery)
+        return (cmd, delivery.stdin) if cmd else None
+    
+    def _build_claude_command(
+        self,
+        context: ExecutionContext,
+        delivery: Optional[PromptDelivery] = None,
+    ) -> List[str]:
+        """Build: claude -p "prompt" --output-format text|stream-json (stdin: no prompt argument)"""
+        on_argv = delivery is None or delivery.mode == ARGV
+        cmd = ["claude", "-p"]
+        if on_argv:
+            cmd.append(context.user_prompt)
+        if self._output_format("claude") == STREAM_JSON:
+            # Print mode only emits stream-json with --verbose
+            cmd.extend(["--output-format", "stream-json", "--verbose"])
+        else:
+            cmd.extend(["--output-format", "text"])
+        
+        # Add system prompt if provided (off argv it's part of the stdin prompt)
+        if context.system_prompt and on_argv:
+            cmd.extend(["--append-system-prompt", context.system_prompt])
+        
+        # Auto-accept edits for autonomous mode
+        cmd.extend(["--permission-mode", "bypassPermissions"])
+        return cmd
+    
+    def _build_gemini_command(
+        self,
+        context: ExecutionContext,
+        delivery: Optional[PromptDelivery] = None,
+    ) -> List[str]:
+        """Build: gemini --yolo "system\n\nprompt" (stdin: gemini --yolo)"""
+        if delivery is not None and delivery.mode != ARGV:
+            return ["gemini", "--yolo"]
+        
+        # Use positional prompt (system and user combined) with --yolo for autonomous mode
+        return ["gemini", "--yolo", self._prompt_text("gemini", context)]
+    
+    def _build_aider_command(
+        self,
+        context: ExecutionContext,
+        delivery: Optional[PromptDelivery] = None,
+    ) -> List[str]:
+        """Build: aider --message "prompt" --yes (file: --message-file <path>)"""
+        if delivery is not None and delivery.mode == FILE:
+            return ["aider", "--message-file", delivery.path, "--yes"]
+        return ["aider", "--message", context.user_prompt, "--yes"]
+    
+    def _build_codex_command(
+        self,
+        context: ExecutionContext,
+        delivery: Optional[PromptDelivery] = None,
+    ) -> List[str]:
+        """Build: codex --full-auto "prompt" (argv only)"""
+        return ["codex", "--full-auto", context.user_prompt]
+    
+    def _build_goose_command(
+        self,
+        context: ExecutionContext,
+        delivery: Optional[PromptDelivery] = None,
+    ) -> List[str]:
+        """Build: goose run "prompt" (stdin: run -i -, file: run -i <path>)"""
+        if delivery is not None and delivery.mode == STDIN:
+            return ["goose", "run", "-i", "-"]
+        if delivery is not None and delivery.mode == FILE:
+            return ["goose", "run", "-i", delivery.path]
+        return ["goose", "run", context.user_prompt]
+    
+    # =========================================================================
+    # CLI HANDLERS
+    # =========================================================================
+    
     async def _execute_claude_cli(
         self,
         agent: AgentConfig,
@@ -212,35 +1387,21 @@ class AgentExecutor:
         
         Pattern from seedpy/agents_router/claude_agent/claude_cli_agent.py
         """
-        # Build command: claude -p "prompt" --output-format text
-        cmd = ["claude", "-p", context.user_prompt, "--output-format", "text"]
-        
-        # Add system prompt if provided
-        if context.system_prompt:
-            cmd.extend(["--append-system-prompt", context.system_prompt])
-        
-        # Auto-accept edits for autonomous mode
-        cmd.extend(["--permission-mode", "bypassPermissions"])
-        
+        delivery = self._prompt_delivery("claude", context)
+        cmd = self._build_claude_command(context, delivery)
         cwd = context.working_directory or "."
         
         try:
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                cwd=cwd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, stderr = await asyncio.wait_for(
-                process.communicate(),
-                timeout=context.timeout
+            returncode, stdout, stderr = await self._run_cli(
+                "claude", cmd, cwd, context.timeout, context, delivery.stdin
             )
             
-            response = stdout.decode() if stdout else ""
-            stderr_text = stderr.decode() if stderr else ""
+            parsed = self._parse_output("claude", stdout)
+            response = parsed.text
+            stderr_text = self._decode_output(stderr)
             
             # Handle warnings vs errors
-            if stderr_text and process.returncode != 0:
+            if stderr_text and returncode != 0:
                 stderr_lower = stderr_text.lower()
                 if not ("warn:" in stderr_lower or "warning:" in stderr_lower):
                     return ExecutionResult(
@@ -250,27 +1411,35 @@ class AgentExecutor:
                         execution_method=ExecutionMethod.CLI_SUBPROCESS,
                         duration_ms=0,
                         error=f"Claude CLI error: {stderr_text}",
-                        metadata={"stderr": stderr_text},
+                        metadata={
+                            "stderr": stderr_text,
+                            **self._output_metadata(stdout, stderr),
+                            **parsed.metadata(),
+                        },
                     )
             
+            # stream-json reports failed runs (e.g. max turns reached) in its result event
+            if returncode != 0:
+                error = f"Exit code: {returncode}"
+            elif parsed.is_error:
+                error = f"Claude CLI error: {response}"
+            else:
+                error = None
+            
             return ExecutionResult(
-                success=process.returncode == 0,
+                success=error is None,
                 response=response,
                 agent_name="claude",
                 execution_method=ExecutionMethod.CLI_SUBPROCESS,
                 duration_ms=0,
-                error=None if process.returncode == 0 else f"Exit code: {process.returncode}",
-            )
-        except asyncio.TimeoutError:
-            return ExecutionResult(
-                success=False,
-                response="",
-                agent_name="claude",
-                execution_method=ExecutionMethod.CLI_SUBPROCESS,
-                duration_ms=context.timeout * 1000,
-                error="Execution timeout",
+                error=error,
+                metadata={**self._output_metadata(stdout, stderr), **parsed.metadata()},
             )
-            
+        except asyncio.TimeoutError as e:
+            return self._timeout_result("claude", context, e)
+        finally:
+            delivery.cleanup()
+    
     async def _execute_gemini_cli(
         self,
         agent: AgentConfig,
@@ -283,171 +1452,129 @@ class AgentExecutor:
           gemini "your prompt here"   # Positional prompt
           gemini -y "prompt"          # YOLO mode (auto-accept)
         """
-        # Combine system and user prompt
-        full_prompt = context.user_prompt
-        if context.system_prompt:
-            full_prompt = f"{context.system_prompt}\n\n{context.user_prompt}"
-        
-        # Use positional prompt with --yolo for autonomous mode
-        cmd = ["gemini", "--yolo", full_prompt]
+        delivery = self._prompt_delivery("gemini", context)
+        cmd = self._build_gemini_command(context, delivery)
         cwd = context.working_directory or "."
         
         try:
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                cwd=cwd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, stderr = await asyncio.wait_for(
-                process.communicate(),
-                timeout=context.timeout
+            returncode, stdout, stderr = await self._run_cli(
+                "gemini", cmd, cwd, context.timeout, context, delivery.stdin
             )
             
-            response = stdout.decode() if stdout else ""
+            parsed = self._parse_output("gemini", stdout)
+            response = parsed.text
             
             return ExecutionResult(
-                success=process.returncode == 0,
+                success=returncode == 0,
                 response=response,
                 agent_name="gemini",
                 execution_method=ExecutionMethod.CLI_SUBPROCESS,
                 duration_ms=0,
-                error=None if process.returncode == 0 else f"Exit code: {process.returncode}",
+                error=None if returncode == 0 else f"Exit code: {returncode}",
+                metadata={**self._output_metadata(stdout, stderr), **parsed.metadata()},
             )
-        except asyncio.TimeoutError:
-            return ExecutionResult(
-                success=False,
-                response="",
-                agent_name="gemini",
-                execution_method=ExecutionMethod.CLI_SUBPROCESS,
-                duration_ms=context.timeout * 1000,
-                error="Execution timeout",
-            )
-            
+        except asyncio.TimeoutError as e:
+            return self._timeout_result("gemini", context, e)
+        finally:
+            delivery.cleanup()
+    
     async def _execute_aider(
         self,
         agent: AgentConfig,
         context: ExecutionContext
     ) -> ExecutionResult:
         """Execute Aider CLI - git-aware code editing agent."""
-        cmd = ["aider", "--message", context.user_prompt, "--yes"]
+        delivery = self._prompt_delivery("aider", context)
+        cmd = self._build_aider_command(context, delivery)
         cwd = context.working_directory or "."
         
         try:
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                cwd=cwd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, stderr = await asyncio.wait_for(
-                process.communicate(),
-                timeout=context.timeout
+            returncode, stdout, stderr = await self._run_cli(
+                "aider", cmd, cwd, context.timeout, context, delivery.stdin
             )
             
-            response = stdout.decode() if stdout else ""
+            parsed = self._parse_output("aider", stdout)
+            response = parsed.text
             if stderr:
-                response += f"\n[stderr]: {stderr.decode()}"
-                
+                response += f"\n[stderr]: {self._decode_output(stderr)}"
+            
             return ExecutionResult(
-                success=process.returncode == 0,
+                success=returncode == 0,
                 response=response,
                 agent_name="aider",
                 execution_method=ExecutionMethod.CLI_SUBPROCESS,
                 duration_ms=0,
-                error=None if process.returncode == 0 else f"Exit code: {process.returncode}",
-            )
-        except asyncio.TimeoutError:
-            return ExecutionResult(
-                success=False,
-                response="",
-                agent_name="aider",
-                execution_method=ExecutionMethod.CLI_SUBPROCESS,
-                duration_ms=context.timeout * 1000,
-                error="Execution timeout",
+                error=None if returncode == 0 else f"Exit code: {returncode}",
+                metadata={**self._output_metadata(stdout, stderr), **parsed.metadata()},
             )
-            
+        except asyncio.TimeoutError as e:
+            return self._timeout_result("aider", context, e)
+        finally:
+            delivery.cleanup()
+    
     async def _execute_codex(
         self,
         agent: AgentConfig,
         context: ExecutionContext
     ) -> ExecutionResult:
         """Execute Codex CLI - sandboxed autonomous coding agent."""
-        cmd = ["codex", "--full-auto", context.user_prompt]
+        delivery = self._prompt_delivery("codex", context)
+        cmd = self._build_codex_command(context, delivery)
         cwd = context.working_directory or "."
         
         try:
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                cwd=cwd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, stderr = await asyncio.wait_for(
-                process.communicate(),
-                timeout=context.timeout
+            returncode, stdout, stderr = await self._run_cli(
+                "codex", cmd, cwd, context.timeout, context, delivery.stdin
             )
             
-            response = stdout.decode() if stdout else ""
+            parsed = self._parse_output("codex", stdout)
+            response = parsed.text
             
             return ExecutionResult(
-                success=process.returncode == 0,
+                success=returncode == 0,
                 response=response,
                 agent_name="codex",
                 execution_method=ExecutionMethod.CLI_SUBPROCESS,
                 duration_ms=0,
-                error=None if process.returncode == 0 else f"Exit code: {process.returncode}",
-            )
-        except asyncio.TimeoutError:
-            return ExecutionResult(
-                success=False,
-                response="",
-                agent_name="codex",
-                execution_method=ExecutionMethod.CLI_SUBPROCESS,
-                duration_ms=context.timeout * 1000,
-                error="Execution timeout",
+                error=None if returncode == 0 else f"Exit code: {returncode}",
+                metadata={**self._output_metadata(stdout, stderr), **parsed.metadata()},
             )
-            
+        except asyncio.TimeoutError as e:
+            return self._timeout_result("codex", context, e)
+        finally:
+            delivery.cleanup()
+    
     async def _execute_goose(
         self,
         agent: AgentConfig,
         context: ExecutionContext
     ) -> ExecutionResult:
         """Execute Goose CLI - multi-step workflow agent."""
-        cmd = ["goose", "run", context.user_prompt]
+        delivery = self._prompt_delivery("goose", context)
+        cmd = self._build_goose_command(context, delivery)
         cwd = context.working_directory or "."
         
         try:
-            process = await asyncio.create_subprocess_exec(
-                *cmd,
-                cwd=cwd,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            stdout, stderr = await asyncio.wait_for(
-                process.communicate(),
-                timeout=context.timeout
+            returncode, stdout, stderr = await self._run_cli(
+                "goose", cmd, cwd, context.timeout, context, delivery.stdin
             )
             
-            response = stdout.decode() if stdout else ""
+            parsed = self._parse_output("goose", stdout)
+            response = parsed.text
             
             return ExecutionResult(
-                success=process.returncode == 0,
+                success=returncode == 0,
                 response=response,
                 agent_name="goose",
                 execution_method=ExecutionMethod.CLI_SUBPROCESS,
                 duration_ms=0,
-                error=None if process.returncode == 0 else f"Exit code: {process.returncode}",
-            )
-        except asyncio.TimeoutError:
-            return ExecutionResult(
-                success=False,
-                response="",
-                agent_name="goose",
-                execution_method=ExecutionMethod.CLI_SUBPROCESS,
-                duration_ms=context.timeout * 1000,
-                error="Execution timeout",
+                error=None if returncode == 0 else f"Exit code: {returncode}",
+                metadata={**self._output_metadata(stdout, stderr), **parsed.metadata()},
             )
+        except asyncio.TimeoutError as e:
+            return self._timeout_result("goose", context, e)
+        finally:
+            delivery.cleanup()
 
 
 # =============================================================================
@@ -0,0 +1,148 @@
+"""
+LastAgent Latency Tracker
+
+Rolling per-agent execution latency histograms.
+
+The executor records the duration of every successful agent run, per agent
+and per agent + task type (coding, research, ... from the task analyzer).
+Only the CLI run is timed, not the wait for a slot or directory lock.
+Runs killed on timeout are recorded at their timeout: the run needed at least
+that long, and leaving it out would let a timeout derived from these
+percentiles shrink below what the agent needs and never grow back.
+Other components read percentiles from here, e.g. hedged execution starts a
+backup agent once the primary has run longer than its historical p95, and
+adaptive timeouts (src/timeouts.py) are derived from p99.
+"""
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Tuple
+
+from .config import get_config
+
+
+# Recent runs kept per agent (and per agent + task type)
+LATENCY_SAMPLE_SIZE = 500
+
+# (agent_name, task_type) - task_type None holds every run of the agent
+LatencyKey = Tuple[str, Optional[str]]
+
+
+@dataclass
+class LatencyStats:
+    """Latency summary for one agent."""
+    agent_name: str
+    samples: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    task_type: Optional[str] = None  # None = all task types
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list (q in 0-100)."""
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * q / 100))
+    return sorted_values[index]
+
+
+class LatencyTracker:
+    """
+    Keeps recent execution durations per agent.
+    
+    Usage:
+        tracker = get_latency_tracker()
+        tracker.record("claude", 12500, task_type="coding")
+        p95 = tracker.percentile("claude", 95)  # None until min_samples
+        p99 = tracker.percentile("claude", 99, task_type="coding")
+    """
+    
+    def __init__(self, min_samples: Optional[int] = None):
+        """
+        Initialize the tracker.
+        
+        Args:
+            min_samples: Samples needed before percentiles are reported.
+                Defaults to settings.execution.latency.min_samples
+        """
+        if min_samples is None:
+            settings = get_config().settings.execution.get("latency", {})
+            min_samples = settings.get("min_samples", 20)
+        
+        self.min_samples = max(1, int(min_samples))
+        self._samples: Dict[LatencyKey, Deque[float]] = {}
+    
+    def record(self, agent_name: str, duration_ms: float, task_type: Optional[str] = None) -> None:
+        """Record the duration of a successful run (of a task type, if known)."""
+        keys = [(agent_name, None)] + ([(agent_name, task_type)] if task_type else [])
+        for key in keys:
+            samples = self._samples.setdefault(key, deque(maxlen=LATENCY_SAMPLE_SIZE))
+            samples.append(float(duration_ms))
+    
+    def record_timeout(
+        self,
+        agent_name: str,
+        timeout_ms: float,
+        task_type: Optional[str] = None,
+    ) -> None:
+        """Record a run killed on timeout; it took at least timeout_ms."""
+        self.record(agent_name, timeout_ms, task_type)
+    
+    def percentile(
+        self,
+        agent_name: str,
+        q: float,
+        task_type: Optional[str] = None,
+    ) -> Optional[float]:
+        """
+        Get a latency percentile for an agent.
+        
+        Args:
+            agent_name: Agent to look up
+            q: Percentile, 0-100
+            task_type: Only runs of this task type (None = all runs)
+        
+        Returns:
+            Latency in milliseconds, or None with fewer than min_samples runs
+        """
+        samples = self._samples.get((agent_name, task_type))
+        if not samples or len(samples) < self.min_samples:
+            return None
+        return _percentile(sorted(samples), q)
+    
+    def sample_count(self, agent_name: str, task_type: Optional[str] = None) -> int:
+        """Number of recorded runs for an agent (and task type)."""
+        return len(self._samples.get((agent_name, task_type), ()))
+    
+    def get_stats(self, include_task_types: bool = False) -> List[LatencyStats]:
+        """Get latency summaries for every agent (and agent + task type) with samples."""
+        stats = []
+        for (agent_name, task_type), samples in self._samples.items():
+            if task_type is not None and not include_task_types:
+                continue
+            values = sorted(samples)
+            stats.append(LatencyStats(
+                agent_name=agent_name,
+                samples=len(values),
+                p50_ms=round(_percentile(values, 50), 2),
+                p95_ms=round(_percentile(values, 95), 2),
+                p99_ms=round(_percentile(values, 99), 2),
+                max_ms=round(values[-1], 2),
+                task_type=task_type,
+            ))
+        return stats
+
+
+# =============================================================================
+# SINGLETON INSTANCE
+# =============================================================================
+
+_tracker: Optional[LatencyTracker] = None
+
+
+def get_latency_tracker() -> LatencyTracker:
+    """Get the global latency tracker instance."""
+    global _tracker
+    if _tracker is None:
+        _tracker = LatencyTracker()
+    return _tracker
@@ -11,6 +11,9 @@ from .logger import (
 from .tracer import (
     Tracer,
     Span,
+    SpanStatus,
+    ProcessTrace,
+    TRACEPARENT_ENV,
     get_tracer,
     trace_context,
 )
@@ -71,6 +74,9 @@ __all__ = [
     # Tracer
     "Tracer",
     "Span",
+    "SpanStatus",
+    "ProcessTrace",
+    "TRACEPARENT_ENV",
     "get_tracer",
     "trace_context",
     # Timeline
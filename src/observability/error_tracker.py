@@ -17,6 +17,8 @@ from typing import Any
 class ErrorClassification(str, Enum):
     """Classification of error types."""
     TIMEOUT = "timeout"
+    STALLED = "stalled"
+    RESOURCE_LIMIT = "resource_limit"
     API_ERROR = "api_error"
     VALIDATION_ERROR = "validation_error"
     AUTHORIZATION_ERROR = "authorization_error"
@@ -34,7 +36,11 @@ class ErrorClassification(str, Enum):
         exc_type = type(exc).__name__
         
         # Map common exception types
-        if "Timeout" in exc_type:
+        if "Stalled" in exc_type:
+            return cls.STALLED
+        elif "ResourceLimit" in exc_type:
+            return cls.RESOURCE_LIMIT
+        elif "Timeout" in exc_type:
             return cls.TIMEOUT
         elif "API" in exc_type or "HTTPError" in exc_type:
             return cls.API_ERROR
@@ -183,7 +189,9 @@ class ErrorTracker:
         """Classify an error based on type and message."""
         lower_msg = message.lower()
         
-        if "timeout" in lower_msg:
+        if "stalled" in lower_msg:
+            return ErrorClassification.STALLED
+        elif "timeout" in lower_msg:
             return ErrorClassification.TIMEOUT
         elif "rate limit" in lower_msg or "429" in message:
             return ErrorClassification.RATE_LIMIT
@@ -206,6 +214,7 @@ class ErrorTracker:
         classification = ErrorClassification.from_exception(exc)
         return classification in [
             ErrorClassification.TIMEOUT,
+            ErrorClassification.STALLED,
             ErrorClassification.RATE_LIMIT,
             ErrorClassification.NETWORK_ERROR,
         ]
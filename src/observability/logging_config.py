@@ -347,14 +347,20 @@ def log_agent_execution_start(agent: str) -> None:
     logger.info("execution_started", executing_agent=agent)
 
 
-def log_agent_execution_end(agent: str, duration_ms: float, success: bool) -> None:
-    """Log agent execution completion."""
+def log_agent_execution_end(
+    agent: str,
+    duration_ms: float,
+    success: bool,
+    resource_usage: dict[str, Any] | None = None,
+) -> None:
+    """Log agent execution completion, with CPU/memory usage if measured."""
     logger = get_logger("executor")
     logger.info(
         "execution_completed",
         executing_agent=agent,
         duration_ms=duration_ms,
         success=success,
+        **(resource_usage or {}),
     )
 
 
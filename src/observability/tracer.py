@@ -2,9 +2,17 @@
 LastAgent Tracer
 
 Distributed tracing with span management for request correlation.
+
+Agent CLIs run as child processes, so a span's context is handed to them
+as a W3C trace context in the TRACEPARENT environment variable (see
+Span.traceparent); a CLI that emits its own telemetry can join the trace.
+ProcessTrace splits a CLI run into spawn / first_byte / last_byte / exit
+sub-spans under the execution span.
 """
 from __future__ import annotations
 
+import hashlib
+import re
 import uuid
 from contextlib import contextmanager
 from dataclasses import dataclass, field
@@ -15,6 +23,24 @@ from typing import Any, Generator
 from .logger import set_trace_context, get_trace_context, clear_trace_context
 
 
+# Environment variable carrying the W3C trace context into child processes
+TRACEPARENT_ENV = "TRACEPARENT"
+
+# Traces kept in memory; the oldest are dropped beyond this
+DEFAULT_MAX_TRACES = 1000
+
+_HEX = re.compile(r"^[0-9a-f]+$")
+
+
+def _w3c_id(value: str, length: int) -> str:
+    """Map an ID onto the fixed-width lowercase hex a traceparent needs."""
+    value = value.lower().replace("-", "")
+    if not _HEX.match(value) or len(value) > length:
+        value = hashlib.sha256(value.encode()).hexdigest()[:length]
+    value = value.rjust(length, "0")
+    return value if value.strip("0") else "0" * (length - 1) + "1"
+
+
 # =============================================================================
 # SPAN STATUS
 # =============================================================================
@@ -47,6 +73,11 @@ class Span:
     events: list[dict[str, Any]] = field(default_factory=list)
     error: dict[str, Any] | None = None
     
+    @property
+    def traceparent(self) -> str:
+        """W3C trace context header value naming this span as the parent."""
+        return f"00-{_w3c_id(self.trace_id, 32)}-{_w3c_id(self.span_id, 16)}-01"
+    
     @property
     def duration_ms(self) -> float | None:
         """Get span duration in milliseconds."""
@@ -119,14 +150,26 @@ class Span:
 class Tracer:
     """Manages traces and spans for request correlation."""
     
-    def __init__(self, service_name: str = "lastagent"):
+    def __init__(self, service_name: str = "lastagent", max_traces: int = DEFAULT_MAX_TRACES):
         self.service_name = service_name
+        self.max_traces = max_traces
         self._spans: dict[str, Span] = {}
         self._trace_spans: dict[str, list[str]] = {}  # trace_id -> [span_ids]
-        
+    
     def _generate_id(self) -> str:
-        """Generate a unique ID."""
-        return str(uuid.uuid4())[:16]
+        """Generate a unique ID (16 hex digits, usable as a W3C span ID)."""
+        return uuid.uuid4().hex[:16]
+    
+    def _store(self, span: Span) -> None:
+        """Keep a span, dropping the oldest traces beyond max_traces."""
+        self._spans[span.span_id] = span
+        if span.trace_id not in self._trace_spans:
+            self._trace_spans[span.trace_id] = []
+            while len(self._trace_spans) > self.max_traces:
+                oldest = next(iter(self._trace_spans))
+                for span_id in self._trace_spans.pop(oldest):
+                    self._spans.pop(span_id, None)
+        self._trace_spans[span.trace_id].append(span.span_id)
     
     def start_trace(self, name: str = "request") -> Span:
         """Start a new trace with root span."""
@@ -159,11 +202,7 @@ class Tracer:
             agent=agent or ctx["agent"],
         )
         
-        # Store span
-        self._spans[span.span_id] = span
-        if trace_id not in self._trace_spans:
-            self._trace_spans[trace_id] = []
-        self._trace_spans[trace_id].append(span.span_id)
+        self._store(span)
         
         # Update context
         set_trace_context(
@@ -192,6 +231,32 @@ class Tracer:
                     agent=parent.agent,
                 )
     
+    def record_span(
+        self,
+        name: str,
+        parent: Span,
+        start_time: datetime,
+        end_time: datetime,
+        status: SpanStatus = SpanStatus.SUCCESS,
+        attributes: dict[str, Any] | None = None,
+    ) -> Span:
+        """Add an already finished child span (leaves the current context alone)."""
+        span = Span(
+            span_id=self._generate_id(),
+            trace_id=parent.trace_id,
+            name=name,
+            parent_span_id=parent.span_id,
+            start_time=start_time,
+            end_time=end_time,
+            status=status,
+            component=parent.component,
+            phase=parent.phase,
+            agent=parent.agent,
+            attributes=attributes or {},
+        )
+        self._store(span)
+        return span
+    
     def get_span(self, span_id: str) -> Span | None:
         """Get a span by ID."""
         return self._spans.get(span_id)
@@ -229,6 +294,102 @@ class Tracer:
         clear_trace_context()
 
 
+# =============================================================================
+# PROCESS TRACE
+# =============================================================================
+class ProcessTrace:
+    """
+    Timing of one agent CLI process, recorded as sub-spans of a span.
+    
+    Usage:
+        trace = ProcessTrace(tracer, execution_span)
+        process = await spawn(cmd, env={**os.environ, **trace.env()})
+        trace.spawned(pid=process.pid)
+        ...  # trace.output() whenever stdout data arrives
+        trace.exited(process.returncode)
+        trace.finish()
+    
+    Sub-spans (each starts where the previous one ended):
+        spawn:      fork/exec of the CLI (near zero for a warm process)
+        first_byte: CLI startup until its first stdout output
+        last_byte:  first until last stdout output (streaming)
+        exit:       last output until the process exited
+    """
+    
+    def __init__(self, tracer: Tracer, parent: Span):
+        self.tracer = tracer
+        self.parent = parent
+        self.attributes: dict[str, Any] = {}
+        self._started = datetime.now(timezone.utc)
+        self._spawned: datetime | None = None
+        self._first_byte: datetime | None = None
+        self._last_byte: datetime | None = None
+        self._exited: datetime | None = None
+        self._finished = False
+    
+    def env(self) -> dict[str, str]:
+        """Environment variables that hand the trace context to the CLI."""
+        return {TRACEPARENT_ENV: self.parent.traceparent}
+    
+    def spawned(self, **attributes: Any) -> None:
+        """The process exists."""
+        self._spawned = datetime.now(timezone.utc)
+        self.attributes.update(attributes)
+    
+    def output(self) -> None:
+        """Stdout data arrived."""
+        self._last_byte = datetime.now(timezone.utc)
+        if self._first_byte is None:
+            self._first_byte = self._last_byte
+    
+    def exited(self, returncode: int | None) -> None:
+        """The process exited (or was killed)."""
+        self._exited = datetime.now(timezone.utc)
+        self.attributes["returncode"] = returncode
+    
+    def finish(self, status: SpanStatus = SpanStatus.SUCCESS) -> list[Span]:
+        """Record the sub-spans the run got through (once)."""
+        if self._finished:
+            return []
+        self._finished = True
+        
+        marks = [
+            ("spawn", self._spawned),
+            ("first_byte", self._first_byte),
+            ("last_byte", self._last_byte),
+            ("exit", self._exited),
+        ]
+        spans = []
+        start = self._started
+        for name, end in marks:
+            if end is None:
+                continue
+            spans.append(self.tracer.record_span(
+                name,
+                self.parent,
+                start,
+                end,
+                status=status if name == "exit" else SpanStatus.SUCCESS,
+                attributes=dict(self.attributes) if name == "exit" else {},
+            ))
+            start = end
+        return spans
+    
+    def timings(self) -> dict[str, float | None]:
+        """Milliseconds from start to each mark, for result metadata."""
+        def since_start(mark: datetime | None) -> float | None:
+            if mark is None:
+                return None
+            return round((mark - self._started).total_seconds() * 1000, 2)
+        
+        return {
+            "spawn_ms": since_start(self._spawned),
+            "first_byte_ms": since_start(self._first_byte),
+            "last_byte_ms": since_start(self._last_byte),
+            "exit_ms": since_start(self._exited),
+        }
+
+
 # =============================================================================
 # CONTEXT MANAGER
 # =============================================================================
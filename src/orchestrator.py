@@ -20,7 +20,7 @@ import time
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 # Enterprise structured logging
 try:
@@ -49,17 +49,33 @@ except ImportError:
 try:
     from src.config import get_config, AgentConfig
     from src.council_selector import get_council_selector, CouncilSelector
-    from src.executor import get_agent_executor, AgentExecutor, ExecutionContext
+    from src.executor import (
+        get_agent_executor,
+        AgentExecutor,
+        ExecutionContext,
+        StreamEvent,
+        StreamEventType,
+    )
     from src.mesh import get_mesh_coordinator, MeshCoordinator
     from src.approvals import get_approval_manager, ApprovalManager, RiskLevel
-    from src.decision_log import get_decision_logger, DecisionLogger, DecisionType, Alternative
+    from src.decision_log import (
+        get_decision_logger, DecisionLogger, DecisionType, DecisionStatus, Alternative
+    )
 except ImportError:
     from .config import get_config, AgentConfig
     from .council_selector import get_council_selector, CouncilSelector
-    from .executor import get_agent_executor, AgentExecutor, ExecutionContext
+    from .executor import (
+        get_agent_executor,
+        AgentExecutor,
+        ExecutionContext,
+        StreamEvent,
+        StreamEventType,
+    )
     from .mesh import get_mesh_coordinator, MeshCoordinator
     from .approvals import get_approval_manager, ApprovalManager, RiskLevel
-    from .decision_log import get_decision_logger, DecisionLogger, DecisionType, Alternative
+    from .decision_log import (
+        get_decision_logger, DecisionLogger, DecisionType, DecisionStatus, Alternative
+    )
 
 
 # =============================================================================
@@ -73,6 +89,13 @@ class ApprovalMode(Enum):
     APPROVE_HIGH_RISK = "APPROVE_HIGH_RISK"
 
 
+class FanOutPolicy(Enum):
+    """Which result a fan-out (n > 1) request returns."""
+    FIRST_SUCCESS = "first_success"  # Fastest good answer; other runs are cancelled
+    ALL = "all"  # Every agent's result
+    JUDGE = "judge"  # All runs complete, then the chairman picks the best
+
+
 class TaskStatus(Enum):
     """Status of a task in the orchestration pipeline."""
     PENDING = "pending"
@@ -108,6 +131,15 @@ class AgentSelection:
     reasoning: str
     votes: Dict[str, str] = field(default_factory=dict)
     rankings: Dict[str, List[str]] = field(default_factory=dict)
+    # Selected agent first, then runners-up (council scores, then local matching)
+    candidates: List[str] = field(default_factory=list)
+    task_type: Optional[str] = None  # Task analyzer type (for adaptive timeouts)
+    cache_status: Optional[str] = None  # "hit", "similar", "routing_table", "miss" or "bypass"
+    similarity: Optional[float] = None  # Prompt similarity of a "similar" hit
+    signature: Optional[str] = None  # Task feature signature (routing table key)
+    # Council convened: "full", "single", "skipped", "routing_table" or "fallback"
+    council_path: Optional[str] = None
+    match_margin: Optional[float] = None  # Top local match score minus the runner-up's
 
 
 @dataclass
@@ -120,6 +152,7 @@ class ExecutionResult:
     duration_ms: int
     error: Optional[str] = None
     inter_agent_calls: List[Dict[str, Any]] = field(default_factory=list)
+    metadata: Dict[str, Any] = field(default_factory=dict)
 
 
 @dataclass
@@ -174,13 +207,18 @@ class Orchestrator:
         self._mesh = get_mesh_coordinator()
         self._approval_manager = get_approval_manager()
         self._decision_logger = get_decision_logger()
-        
+    
     async def process_task(
         self,
         system_prompt: str,
         user_prompt: str,
         working_directory: Optional[str] = None,
         approval_mode: Optional[ApprovalMode] = None,
+        bypass_cache: bool = False,
+        isolation: Optional[str] = None,
+        read_only: Optional[bool] = None,
+        n: int = 1,
+        fan_out_policy: Optional[FanOutPolicy] = None,
     ) -> ExecutionResult:
         """
         Process a task through the full LastAgent pipeline.
@@ -190,7 +228,16 @@ class Orchestrator:
             user_prompt: User prompt for the task
             working_directory: Optional working directory for CLI agents
             approval_mode: Override approval mode for this task
-            
+            bypass_cache: Skip the council selection and execution result
+                caches for this task
+            isolation: "worktree" to run in an isolated git worktree,
+                "shared" to run in place (default: settings.execution.isolation)
+            read_only: Task won't modify files, so it shares the working
+                directory lock even with a mutating agent (None = agent default)
+            n: Run the task on the top n agents at once (fan-out)
+            fan_out_policy: Result to return when n > 1
+                (default: settings.execution.fan_out.policy)
+        
         Returns:
             ExecutionResult with the agent's response
         """
@@ -204,6 +251,7 @@ class Orchestrator:
             system_prompt=system_prompt,
             user_prompt=user_prompt,
             working_directory=working_directory,
+            metadata={"bypass_cache": bypass_cache, "isolation": isolation, "read_only": read_only},
         )
         self._tasks[task.id] = task
         
@@ -245,9 +293,16 @@ class Orchestrator:
             task.status = TaskStatus.EXECUTING
             log_phase_start("EXECUTION")
             execution_start = time.perf_counter()
-            result = await self._execute_agent(task, selection.selected_agent)
+            if n > 1:
+                result = await self._execute_fan_out(task, selection, n, fan_out_policy)
+            else:
+                result = await self._execute_with_failover(task, selection)
+            if selection.cache_status:
+                result.metadata["selection_cache"] = selection.cache_status
+            if selection.similarity is not None:
+                result.metadata["selection_similarity"] = selection.similarity
             execution_duration = (time.perf_counter() - execution_start) * 1000
-            log_phase_end("EXECUTION", execution_duration, agent=selection.selected_agent, success=result.success)
+            log_phase_end("EXECUTION", execution_duration, agent=result.agent, success=result.success)
             
             # Step 4: Log decision
             await self._log_decision(task, selection, result)
@@ -257,12 +312,12 @@ class Orchestrator:
             self._log.info(
                 "task_completed",
                 task_id=task.id,
-                agent=selection.selected_agent,
+                agent=result.agent,
                 success=result.success,
                 duration_ms=round(total_duration, 2),
             )
             return result
-            
+        
         except Exception as e:
             task.status = TaskStatus.FAILED
             duration_ms = int((time.perf_counter() - start_time) * 1000)
@@ -281,7 +336,172 @@ class Orchestrator:
                 duration_ms=duration_ms,
                 error=str(e),
             )
+    
+    async def process_task_stream(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        working_directory: Optional[str] = None,
+        approval_mode: Optional[ApprovalMode] = None,
+        bypass_cache: bool = False,
+        isolation: Optional[str] = None,
+        read_only: Optional[bool] = None,
+    ) -> AsyncIterator[StreamEvent]:
+        """
+        Process a task, streaming the selected agent's output as it arrives.
+        
+        Runs the same selection/approval steps as process_task(), then yields
+        StreamEvents from AgentExecutor.execute_stream(). The last event is
+        always a SUMMARY.
+        
+        Args:
+            system_prompt: System prompt for the task
+            user_prompt: User prompt for the task
+            working_directory: Optional working directory for CLI agents
+            approval_mode: Override approval mode for this task
+            bypass_cache: Skip the selection and result caches (see process_task)
+            isolation: "worktree" or "shared" (see process_task)
+            read_only: Share the working directory lock (see process_task)
+        
+        Yields:
+            StreamEvent objects from the executing agent
+        """
+        import uuid
+        
+        start_time = time.perf_counter()
+        
+        task = Task(
+            id=str(uuid.uuid4()),
+            system_prompt=system_prompt,
+            user_prompt=user_prompt,
+            working_directory=working_directory,
+            metadata={"bypass_cache": bypass_cache, "isolation": isolation, "read_only": read_only},
+        )
+        self._tasks[task.id] = task
+        
+        self._log.info(
+            "task_received",
+            task_id=task.id,
+            prompt_preview=user_prompt[:100],
+            stream=True,
+        )
+        
+        try:
+            task.status = TaskStatus.COUNCIL_SELECTING
+            log_phase_start("SELECTION")
+            selection_start = time.perf_counter()
+            selection = await self._select_agent(task)
+            selection_duration = (time.perf_counter() - selection_start) * 1000
+            log_phase_end("SELECTION", selection_duration, agent=selection.selected_agent)
+            
+            mode = approval_mode or ApprovalMode(
+                self.config.settings.approval.get("mode", "AUTO")
+            )
+            if mode != ApprovalMode.AUTO:
+                task.status = TaskStatus.AWAITING_APPROVAL
+                approved = await self._check_approval(task, selection, mode)
+                if not approved:
+                    task.status = TaskStatus.REJECTED
+                    yield StreamEvent(
+                        type=StreamEventType.SUMMARY,
+                        agent_name=selection.selected_agent,
+                        error="User rejected agent selection",
+                    )
+                    return
+        except Exception as e:
+            task.status = TaskStatus.FAILED
+            log_error(
+                "task_failed",
+                error_type=type(e).__name__,
+                error_message=str(e),
+                task_id=task.id,
+            )
+            yield StreamEvent(
+                type=StreamEventType.SUMMARY,
+                agent_name="unknown",
+                duration_ms=int((time.perf_counter() - start_time) * 1000),
+                error=str(e),
+            )
+            return
+        
+        task.status = TaskStatus.EXECUTING
+        log_phase_start("EXECUTION")
+        context = self._execution_context(task, selection)
+        
+        # Fail over to the next candidate only while nothing has been streamed
+        chain = self._failover_chain(selection)
+        attempts: List[Dict[str, Any]] = []
+        first: Optional[Tuple[str, StreamEvent]] = None
+        for index, agent_name in enumerate(chain):
+            log_agent_execution_start(agent_name)
+            streamed = False
+            summary: Optional[StreamEvent] = None
+            async for event in self._executor.execute_stream(agent_name, context):
+                if event.type == StreamEventType.SUMMARY:
+                    summary = event
+                else:
+                    streamed = True
+                    yield event
+            
+            log_agent_execution_end(
+                agent_name,
+                summary.duration_ms,
+                summary.success,
+                resource_usage=summary.resource_usage,
+            )
+            reason = self._failover_reason(summary.success, streamed, summary.failure_kind)
+            self._record_attempt(
+                task, attempts, agent_name, summary.success, summary.duration_ms, summary.error,
+                reason,
+                resource_usage=summary.resource_usage,
+                usage=summary.usage,
+            )
+            first = first or (agent_name, summary)
+            if reason and not streamed:
+                if index < len(chain) - 1:
+                    self._log.warning(
+                        "agent_failover",
+                        task_id=task.id,
+                        failed_agent=agent_name,
+                        next_agent=chain[index + 1],
+                        reason=reason,
+                    )
+                    continue
+                # Every candidate failed: report the first, as process_task() does
+                agent_name, summary = first
             
+            log_phase_end(
+                "EXECUTION",
+                summary.duration_ms,
+                agent=agent_name,
+                success=summary.success,
+            )
+            result = ExecutionResult(
+                task_id=task.id,
+                agent=agent_name,
+                response="",
+                success=summary.success,
+                duration_ms=summary.duration_ms,
+                error=summary.error,
+                metadata={
+                    "attempts": attempts,
+                    "resource_usage": summary.resource_usage,
+                    "worktree": summary.worktree,
+                    "usage": summary.usage,
+                },
+            )
+            await self._log_decision(task, selection, result)
+            task.status = TaskStatus.COMPLETED
+            self._log.info(
+                "task_completed",
+                task_id=task.id,
+                agent=agent_name,
+                success=summary.success,
+                duration_ms=round((time.perf_counter() - start_time) * 1000, 2),
+            )
+            yield summary
+            return
+    
     async def _select_agent(self, task: Task) -> AgentSelection:
         """
         Select the best agent for the task using LLM Council.
@@ -293,20 +513,46 @@ class Orchestrator:
             user_prompt=task.user_prompt,
             system_prompt=task.system_prompt,
             working_directory=task.working_directory,
+            bypass_cache=task.metadata.get("bypass_cache", False),
         )
         
         # Convert votes and rankings to dicts
         votes = {v.model: v.selected_agent for v in council_result.votes}
         rankings = {r.model: r.ranking for r in council_result.rankings}
         
+        # Runners-up: council aggregate scores first, then local matching
+        candidates = [council_result.selected_agent]
+        by_score = sorted(
+            council_result.aggregate_scores,
+            key=lambda a: council_result.aggregate_scores[a],
+            reverse=True,
+        )
+        recommended = (
+            council_result.match_result.recommended_agents
+            if council_result.match_result else []
+        )
+        for agent in by_score + recommended:
+            if agent and agent not in candidates and agent in self.config.agents:
+                candidates.append(agent)
+        
         return AgentSelection(
             selected_agent=council_result.selected_agent,
             confidence=council_result.confidence,
             reasoning=council_result.reasoning,
             votes=votes,
             rankings=rankings,
+            candidates=candidates,
+            task_type=(
+                council_result.match_result.task_analysis.task_type.value
+                if council_result.match_result else None
+            ),
+            cache_status=council_result.cache_status,
+            similarity=council_result.similarity,
+            signature=council_result.signature,
+            council_path=council_result.council_path,
+            match_margin=council_result.match_margin,
         )
-        
+    
     async def _check_approval(
         self,
         task: Task,
@@ -329,7 +575,7 @@ class Orchestrator:
         
         if not self._approval_manager.requires_approval("agent_execution", risk_level):
             return True
-            
+        
         # Create approval request
         request = self._approval_manager.create_request(
             action_type="agent_execution",
@@ -342,35 +588,362 @@ class Orchestrator:
         # Auto-approve for now (would be UI in production)
         response = self._approval_manager.auto_approve(request)
         return response.approved
-        
+    
     async def _execute_agent(
         self,
         task: Task,
         agent_name: str,
+        selection: Optional[AgentSelection] = None,
     ) -> ExecutionResult:
         """
         Execute the selected agent with the original prompts.
+        
+        With hedging enabled (settings.execution.hedging), a runner-up from
+        the selection is started if the agent outlives its historical p95.
         """
         log_agent_execution_start(agent_name)
         
         # Use the real executor
-        context = ExecutionContext(
-            system_prompt=task.system_prompt,
-            user_prompt=task.user_prompt,
-            working_directory=task.working_directory,
-        )
+        context = self._execution_context(task, selection)
         
-        result = await self._executor.execute(agent_name, context)
+        hedge = self._plan_hedge(agent_name, selection)
+        if hedge:
+            hedge_agent, hedge_after_ms = hedge
+            result = await self._executor.execute_hedged(
+                agent_name, context, hedge_agent, hedge_after_ms
+            )
+        else:
+            result = await self._executor.execute(agent_name, context)
+        
+        metadata = dict(getattr(result, "metadata", {}) or {})
+        winner = metadata.get("hedge", {}).get("winner")
+        log_agent_execution_end(
+            winner or agent_name,
+            result.duration_ms,
+            result.success,
+            resource_usage=metadata.get("resource_usage"),
+        )
         
         return ExecutionResult(
             task_id=task.id,
-            agent=agent_name,
+            agent=winner or agent_name,
             response=result.response,
             success=result.success,
             duration_ms=result.duration_ms,
             error=result.error,
+            metadata=metadata,
+        )
+    
+    def _execution_context(
+        self,
+        task: Task,
+        selection: Optional[AgentSelection] = None,
+    ) -> ExecutionContext:
+        """Executor context for a task (prompts plus per-request options)."""
+        return ExecutionContext(
+            system_prompt=task.system_prompt,
+            user_prompt=task.user_prompt,
+            working_directory=task.working_directory,
+            bypass_cache=task.metadata.get("bypass_cache", False),
+            isolation=task.metadata.get("isolation"),
+            read_only=task.metadata.get("read_only"),
+            task_type=selection.task_type if selection else None,
+        )
+    
+    def _fan_out_agents(self, selection: AgentSelection, n: int) -> List[str]:
+        """
+        The selected agent plus installed runners-up, up to n agents
+        (capped by settings.execution.fan_out.max_agents).
+        """
+        settings = self.config.settings.execution.get("fan_out", {})
+        n = min(n, max(1, int(settings.get("max_agents", 3))))
+        agents = [selection.selected_agent]
+        for candidate in selection.candidates:
+            if len(agents) >= n:
+                break
+            if candidate not in agents and self._executor.availability.is_available(candidate):
+                agents.append(candidate)
+        return agents
+    
+    async def _execute_fan_out(
+        self,
+        task: Task,
+        selection: AgentSelection,
+        n: int,
+        policy: Optional[FanOutPolicy] = None,
+    ) -> ExecutionResult:
+        """
+        Run the task on the top n agents concurrently.
+        
+        FIRST_SUCCESS returns the first run that succeeds with output and
+        cancels the rest; ALL and JUDGE let every run finish, then return
+        the best-ranked good result (ALL) or the judge's pick (JUDGE, falling
+        back to the best-ranked one). Every run is recorded as an attempt,
+        and metadata["fan_out"]["results"] lists each agent's result.
+        """
+        if policy is None:
+            settings = self.config.settings.execution.get("fan_out", {})
+            policy = FanOutPolicy(settings.get("policy", FanOutPolicy.FIRST_SUCCESS.value))
+        agents = self._fan_out_agents(selection, n)
+        for agent_name in agents:
+            log_agent_execution_start(agent_name)
+        
+        results = await self._executor.execute_many(
+            agents,
+            self._execution_context(task, selection),
+            first_success=policy == FanOutPolicy.FIRST_SUCCESS,
+        )
+        
+        attempts: List[Dict[str, Any]] = []
+        for result in results:
+            log_agent_execution_end(
+                result.agent_name,
+                result.duration_ms,
+                result.success,
+                resource_usage=result.metadata.get("resource_usage"),
+            )
+            self._record_attempt(
+                task, attempts, result.agent_name, result.success, result.duration_ms, result.error,
+                self._failover_reason(
+                    result.success,
+                    bool(result.response.strip()),
+                    result.metadata.get("failure_kind"),
+                ),
+                resource_usage=result.metadata.get("resource_usage"),
+                usage=result.metadata.get("usage"),
+            )
+        
+        # Best first: selection ranking, not completion order
+        ranked = sorted(results, key=lambda r: agents.index(r.agent_name))
+        good = [r for r in ranked if r.success and r.response.strip()]
+        fan_out = dict(results[0].metadata["fan_out"]) if results else {"agents": agents}
+        fan_out["policy"] = policy.value
+        if policy == FanOutPolicy.FIRST_SUCCESS:
+            chosen = next((r for r in good if r.agent_name == fan_out.get("winner")), None)
+        elif policy == FanOutPolicy.JUDGE and len(good) > 1:
+            winner, reasoning = await self._council_selector.judge_responses(
+                task.user_prompt, {r.agent_name: r.response for r in good}
+            )
+            fan_out["judge"] = {"winner": winner, "reasoning": reasoning}
+            chosen = next((r for r in good if r.agent_name == winner), good[0])
+        else:
+            chosen = good[0] if good else None
+        chosen = chosen or (ranked[0] if ranked else None)
+        
+        fan_out["winner"] = chosen.agent_name if any(chosen is r for r in good) else None
+        fan_out["results"] = [
+            {
+                "agent": r.agent_name,
+                "success": r.success,
+                "response": r.response,
+                "duration_ms": r.duration_ms,
+                "error": r.error,
+                "usage": r.metadata.get("usage"),
+            }
+            for r in ranked
+        ]
+        self._log.info(
+            "fan_out_result",
+            task_id=task.id,
+            policy=policy.value,
+            agents=agents,
+            winner=fan_out["winner"],
+        )
+        if chosen is None:
+            return ExecutionResult(
+                task_id=task.id,
+                agent=selection.selected_agent,
+                response="",
+                success=False,
+                duration_ms=0,
+                error="No fan-out run completed",
+                metadata={"attempts": attempts, "fan_out": fan_out},
+            )
+        metadata = {k: v for k, v in chosen.metadata.items() if k != "fan_out"}
+        return ExecutionResult(
+            task_id=task.id,
+            agent=chosen.agent_name,
+            response=chosen.response,
+            success=chosen.success,
+            duration_ms=chosen.duration_ms,
+            error=chosen.error,
+            metadata={**metadata, "attempts": attempts, "fan_out": fan_out},
+        )
+    
+    def _failover_chain(self, selection: AgentSelection) -> List[str]:
+        """
+        Agents to try, in order, for one request.
+        
+        The selected agent always comes first. With failover enabled
+        (settings.execution.failover), installed runners-up from the
+        selection follow, up to max_attempts agents in total.
+        """
+        settings = self.config.settings.execution.get("failover", {})
+        chain = [selection.selected_agent]
+        if not settings.get("enabled", True):
+            return chain
+        
+        max_attempts = max(1, int(settings.get("max_attempts", 3)))
+        for candidate in selection.candidates:
+            if len(chain) >= max_attempts:
+                break
+            if candidate not in chain and self._executor.availability.is_available(candidate):
+                chain.append(candidate)
+        return chain
+    
+    @staticmethod
+    def _failover_reason(
+        success: bool,
+        has_output: bool,
+        failure_kind: Optional[str],
+    ) -> Optional[str]:
+        """
+        Why an attempt should fail over, or None if it succeeded.
+        
+        failure_kind is the executor's classification of a failed run
+        ("stalled", "resource_limit" or "unavailable"), never the error text.
+        """
+        if success and has_output:
+            return None
+        if failure_kind == "unavailable":
+            return "cli_missing"
+        if failure_kind in ("stalled", "resource_limit"):
+            return failure_kind
+        if success:
+            return "empty_output"
+        return "execution_failed"
+    
+    def _record_attempt(
+        self,
+        task: Task,
+        attempts: List[Dict[str, Any]],
+        agent_name: str,
+        success: bool,
+        duration_ms: int,
+        error: Optional[str],
+        failover_reason: Optional[str],
+        resource_usage: Optional[Dict[str, Any]] = None,
+        usage: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Add an execution attempt to the task's attempt list and the decision log.
+        
+        usage is the token usage the agent's CLI reported (structured output
+        formats only); the decision log aggregates it for capacity planning.
+        """
+        attempt = {
+            "attempt": len(attempts) + 1,
+            "agent": agent_name,
+            "success": success,
+            "duration_ms": duration_ms,
+            "error": error,
+            "failover_reason": failover_reason,
+            "resource_usage": resource_usage,
+            "usage": usage,
+        }
+        attempts.append(attempt)
+        
+        decision_id = self._decision_logger.log_decision(
+            decision_type=DecisionType.AGENT_EXECUTION,
+            title=f"Attempt {attempt['attempt']}: executed {agent_name}",
+            reasoning=(
+                "Agent completed the task" if failover_reason is None
+                else f"Attempt failed ({failover_reason}): {error or 'no output'}"
+            ),
+            confidence_score=1.0 if failover_reason is None else 0.0,
+            context=attempt,
+            task_id=task.id,
+        )
+        self._decision_logger.update_outcome(
+            decision_id,
+            status=DecisionStatus.EXECUTED if failover_reason is None else DecisionStatus.FAILED,
+            outcome_status="success" if failover_reason is None else "failure",
+            outcome_data={
+                "duration_ms": duration_ms,
+                "resource_usage": resource_usage,
+                "usage": usage,
+            },
+        )
+    
+    async def _execute_with_failover(
+        self,
+        task: Task,
+        selection: AgentSelection,
+    ) -> ExecutionResult:
+        """
+        Execute the selected agent, failing over to runners-up on failure.
+        
+        A missing CLI, a non-zero exit or empty stdout moves on to the next
+        agent in the failover chain without re-running selection. Every
+        attempt is recorded in the decision log and in result.metadata.
+        If every attempt fails, the selected agent's result is returned.
+        """
+        chain = self._failover_chain(selection)
+        attempts: List[Dict[str, Any]] = []
+        tried = set()
+        first: Optional[ExecutionResult] = None
+        result: Optional[ExecutionResult] = None
+        
+        for agent_name in chain:
+            if agent_name in tried:
+                continue  # Already ran as a hedge
+            result = await self._execute_agent(task, agent_name, selection)
+            hedge = result.metadata.get("hedge")
+            tried.update([agent_name, hedge["hedge_agent"]] if hedge else [agent_name])
+            
+            reason = self._failover_reason(
+                result.success, bool(result.response.strip()), result.metadata.get("failure_kind")
+            )
+            self._record_attempt(
+                task, attempts, result.agent, result.success, result.duration_ms, result.error,
+                reason,
+                resource_usage=result.metadata.get("resource_usage"),
+                usage=result.metadata.get("usage"),
+            )
+            first = first or result
+            if reason is None:
+                break
+            self._log.warning(
+                "agent_failover",
+                task_id=task.id,
+                failed_agent=result.agent,
+                reason=reason,
+                error=result.error,
+            )
+        else:
+            result = first
+        
+        result.metadata["attempts"] = attempts
+        return result
+    
+    def _plan_hedge(
+        self,
+        agent_name: str,
+        selection: Optional[AgentSelection],
+    ) -> Optional[Tuple[str, float]]:
+        """
+        Decide whether to hedge this execution.
+        
+        Returns:
+            (runner-up agent, delay in ms) or None. Needs hedging enabled, a
+            latency history for the agent and an installed runner-up.
+        """
+        settings = self.config.settings.execution.get("hedging", {})
+        if not settings.get("enabled", False) or selection is None:
+            return None
+        
+        hedge_after_ms = self._executor.latency.percentile(
+            agent_name, settings.get("percentile", 95)
         )
+        if hedge_after_ms is None:
+            return None
+        hedge_after_ms = max(hedge_after_ms, settings.get("min_delay_ms", 0))
         
+        for candidate in selection.candidates:
+            if candidate != agent_name and self._executor.availability.is_available(candidate):
+                return candidate, hedge_after_ms
+        return None
+    
     async def _log_decision(
         self,
         task: Task,
@@ -396,6 +969,12 @@ class Orchestrator:
             confidence_score=selection.confidence,
             risk_level="low",
             alternatives=alternatives,
+            # How the selection was made, for tuning council sizing and caches
+            context={
+                "council_path": selection.council_path,
+                "match_margin": selection.match_margin,
+                "selection_cache": selection.cache_status,
+            },
             task_id=task.id,
         )
         
@@ -418,14 +997,23 @@ class Orchestrator:
             agent=selection.selected_agent,
         )
         
+        # Outcomes decide whether the council's routes can be trusted
+        attempts = result.metadata.get("attempts") or [
+            {"agent": result.agent, "failover_reason": None if result.success else "failed"}
+        ]
+        for attempt in attempts:
+            self._council_selector.record_outcome(
+                selection.signature, attempt["agent"], attempt["failover_reason"] is None
+            )
+    
     def get_available_agents(self) -> List[str]:
         """Get list of available agent names."""
         return self.config.get_agent_names()
-        
+    
     def get_agent_info(self, name: str) -> AgentConfig:
         """Get detailed info about an agent."""
         return self.config.get_agent(name)
-        
+    
     def get_decisions(self, limit: int = 100) -> List[Decision]:
         """Get recent decisions for audit."""
         return self._decisions[-limit:]
@@ -0,0 +1,304 @@
+"""
+LastAgent Output Buffers
+
+Bounded capture of agent stdout/stderr.
+
+communicate() keeps everything a CLI prints in memory, and agents that dump
+huge diffs or logs can push a worker to hundreds of MB. SpillBuffer keeps
+output in memory up to max_memory_bytes; past that, everything is written
+to a temp file and only a preview (the first preview_bytes) stays in
+memory.
+
+Spilled files are registered with the OutputStore, which hands out an
+opaque handle (served by GET /v1/outputs/{handle}) and deletes files after
+retention_seconds.
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+from .config import get_config
+
+# Enterprise structured logging
+try:
+    from src.observability import get_logger
+except ImportError:
+    from .observability import get_logger
+
+
+# Bytes read from a pipe per drain iteration
+READ_CHUNK_SIZE = 65536
+
+
+class CapturedOutput(bytes):
+    """
+    Captured stream contents.
+    
+    Behaves like the bytes communicate() returned. When the stream spilled
+    to disk, the bytes are only the preview and handle/total_bytes point at
+    the full output.
+    """
+    
+    handle: Optional[str] = None
+    total_bytes: int = 0
+    
+    @property
+    def truncated(self) -> bool:
+        """Whether the full output is larger than these bytes."""
+        return self.handle is not None
+    
+    def describe(self) -> Dict[str, object]:
+        """Metadata for a truncated stream (for ExecutionResult.metadata)."""
+        return {
+            "handle": self.handle,
+            "total_bytes": self.total_bytes,
+            "preview_bytes": len(self),
+        }
+
+
+def _trim_utf8(data: bytes) -> bytes:
+    """Drop a multi-byte character cut off at the end of a preview."""
+    for cut in range(min(4, len(data))):
+        head = data[:len(data) - cut]
+        try:
+            head.decode("utf-8")
+            return head
+        except UnicodeDecodeError:
+            continue
+    return data
+
+
+class SpillBuffer:
+    """
+    Write-only byte buffer that spills to a temp file past a memory cap.
+    
+    Usage:
+        buffer = get_output_store().new_buffer()
+        buffer.write(chunk)
+        ...
+        output = buffer.finish()  # CapturedOutput
+    """
+    
+    def __init__(
+        self,
+        max_memory_bytes: int,
+        preview_bytes: int,
+        spill_dir: Optional[str] = None,
+        store: Optional["OutputStore"] = None,
+    ):
+        """
+        Initialize the buffer.
+        
+        Args:
+            max_memory_bytes: Bytes kept in memory before spilling to disk
+            preview_bytes: Bytes kept in memory (and returned) once spilled
+            spill_dir: Directory for spill files (default: system temp dir)
+            store: Registry for spilled files. Defaults to get_output_store()
+        """
+        self.max_memory_bytes = max(0, int(max_memory_bytes))
+        self.preview_bytes = max(0, min(int(preview_bytes), self.max_memory_bytes))
+        self.spill_dir = spill_dir
+        self.store = store
+        self.size = 0
+        self._memory = bytearray()
+        self._file = None
+    
+    @property
+    def spilled(self) -> bool:
+        """Whether output has been moved to disk."""
+        return self._file is not None
+    
+    def write(self, data: bytes) -> None:
+        """Append data, spilling to disk once the memory cap is exceeded."""
+        self.size += len(data)
+        if self._file is not None:
+            self._file.write(data)
+            return
+        
+        self._memory += data
+        if len(self._memory) > self.max_memory_bytes:
+            self._file = tempfile.NamedTemporaryFile(
+                prefix="lastagent-output-",
+                dir=self.spill_dir,
+                delete=False,
+            )
+            self._file.write(self._memory)
+            del self._memory[self.preview_bytes:]
+    
+    def finish(self) -> CapturedOutput:
+        """
+        Close the buffer and return its contents.
+        
+        Spilled files are registered with the output store and deleted
+        when their retention expires.
+        """
+        if self._file is None:
+            return CapturedOutput(self._memory)
+        
+        self._file.close()
+        store = self.store or get_output_store()
+        output = CapturedOutput(_trim_utf8(bytes(self._memory)))
+        output.handle = store.register(self._file.name, self.size)
+        output.total_bytes = self.size
+        self._file = None
+        return output
+    
+    def discard(self) -> None:
+        """Close and delete any spill file without registering it."""
+        if self._file is not None:
+            self._file.close()
+            try:
+                os.unlink(self._file.name)
+            except OSError:
+                pass
+            self._file = None
+        self._memory.clear()
+
+
+async def drain(
+    stream: asyncio.StreamReader,
+    buffer: SpillBuffer,
+    on_data: Optional[Callable[[], None]] = None,
+) -> None:
+    """Read a pipe to EOF into a buffer, calling on_data for every chunk."""
+    while True:
+        chunk = await stream.read(READ_CHUNK_SIZE)
+        if not chunk:
+            return
+        buffer.write(chunk)
+        if on_data is not None:
+            on_data()
+
+
+@dataclass
+class StoredOutput:
+    """A spilled output file."""
+    handle: str
+    path: str
+    size: int
+    created_at: float
+
+
+class OutputStore:
+    """
+    Registry of spilled output files, retrievable by handle.
+    
+    Usage:
+        store = get_output_store()
+        buffer = store.new_buffer()
+        ...
+        stored = store.get(handle)  # None once retention expires
+    """
+    
+    def __init__(
+        self,
+        max_memory_bytes: Optional[int] = None,
+        preview_bytes: Optional[int] = None,
+        retention_seconds: Optional[float] = None,
+        spill_dir: Optional[str] = None,
+    ):
+        """
+        Initialize the store.
+        
+        Args:
+            max_memory_bytes: Per-stream memory cap.
+                Defaults to settings.execution.output.max_memory_bytes
+            preview_bytes: Bytes kept once spilled. Defaults to output.preview_bytes
+            retention_seconds: Spill file lifetime. Defaults to output.retention_seconds
+            spill_dir: Directory for spill files. Defaults to output.spill_dir
+        """
+        settings = get_config().settings.execution.get("output", {})
+        if max_memory_bytes is None:
+            max_memory_bytes = settings.get("max_memory_bytes", 4 * 1024 * 1024)
+        if preview_bytes is None:
+            preview_bytes = settings.get("preview_bytes", 64 * 1024)
+        if retention_seconds is None:
+            retention_seconds = settings.get("retention_seconds", 3600)
+        if spill_dir is None:
+            spill_dir = settings.get("spill_dir")
+        
+        self.max_memory_bytes = int(max_memory_bytes)
+        self.preview_bytes = int(preview_bytes)
+        self.retention_seconds = float(retention_seconds)
+        self.spill_dir = spill_dir
+        self._log = get_logger("output_buffer")
+        
+        self._outputs: Dict[str, StoredOutput] = {}
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+    
+    def new_buffer(self) -> SpillBuffer:
+        """Create a capture buffer using this store's limits."""
+        return SpillBuffer(
+            max_memory_bytes=self.max_memory_bytes,
+            preview_bytes=self.preview_bytes,
+            spill_dir=self.spill_dir,
+            store=self,
+        )
+    
+    def register(self, path: str, size: int) -> str:
+        """Register a spilled file and return its handle."""
+        self.prune()
+        handle = uuid.uuid4().hex
+        self._outputs[handle] = StoredOutput(
+            handle=handle,
+            path=path,
+            size=size,
+            created_at=time.time(),
+        )
+        self._log.info("output_spilled", handle=handle, size=size, path=path)
+        return handle
+    
+    def get(self, handle: str) -> Optional[StoredOutput]:
+        """Get a spilled output, or None if unknown or expired."""
+        entry = self._outputs.get(handle)
+        if entry is None:
+            return None
+        expired = time.time() - entry.created_at > self.retention_seconds
+        if expired or not os.path.exists(entry.path):
+            self._remove(handle)
+            return None
+        return entry
+    
+    def prune(self) -> int:
+        """Delete spill files past retention. Returns how many were removed."""
+        cutoff = time.time() - self.retention_seconds
+        expired = [h for h, e in self._outputs.items() if e.created_at < cutoff]
+        for handle in expired:
+            self._remove(handle)
+        return len(expired)
+    
+    def clear(self) -> None:
+        """Delete every spill file."""
+        for handle in list(self._outputs):
+            self._remove(handle)
+    
+    def _remove(self, handle: str) -> None:
+        """Forget a handle and delete its file."""
+        entry = self._outputs.pop(handle, None)
+        if entry is None:
+            return
+        try:
+            os.unlink(entry.path)
+        except OSError:
+            pass
+
+
+# =============================================================================
+# SINGLETON INSTANCE
+# =============================================================================
+
+_store: Optional[OutputStore] = None
+
+
+def get_output_store() -> OutputStore:
+    """Get the global output store instance."""
+    global _store
+    if _store is None:
+        _store = OutputStore()
+    return _store
@@ -0,0 +1,252 @@
+"""
+LastAgent Output Parsers
+
+Extracts the response, tool events and token usage from agent CLI output.
+
+With plain text output (`claude -p --output-format text`) the only thing
+we learn from a run is its text, so token counts had to be guessed from
+word counts. Agents whose CLI can emit structured output set
+`output_format` in agents.yml and get a parser for it:
+
+  - text:        output is the response (no usage)
+  - stream-json: Claude Code's newline-delimited JSON events
+                 (`--output-format stream-json --verbose`); assistant text
+                 blocks stream as they arrive, tool_use / tool_result blocks
+                 become tool events and the final `result` event carries
+                 the response, token counts and cost
+
+Parsers are incremental: feed() takes decoded stdout as it arrives and
+returns the text to show, so streaming responses stay live.
+"""
+
+import json
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Type
+
+# Enterprise structured logging
+try:
+    from src.observability import get_logger
+except ImportError:
+    from .observability import get_logger
+
+
+TEXT = "text"
+STREAM_JSON = "stream-json"
+
+
+@dataclass
+class TokenUsage:
+    """Tokens (and cost) reported by an agent CLI for one run."""
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cache_read_tokens: int = 0
+    cache_creation_tokens: int = 0
+    cost_usd: Optional[float] = None
+    model: Optional[str] = None
+    num_turns: Optional[int] = None
+    
+    @property
+    def prompt_tokens(self) -> int:
+        """Input tokens including cached ones (OpenAI prompt_tokens)."""
+        return self.input_tokens + self.cache_read_tokens + self.cache_creation_tokens
+    
+    @property
+    def total_tokens(self) -> int:
+        """Prompt plus output tokens."""
+        return self.prompt_tokens + self.output_tokens
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize for result metadata and the decision log."""
+        return {**asdict(self), "total_tokens": self.total_tokens}
+
+
+@dataclass
+class ParsedOutput:
+    """What was extracted from one run's stdout."""
+    text: str
+    usage: Optional[TokenUsage] = None
+    tool_calls: List[Dict[str, Any]] = field(default_factory=list)
+    is_error: bool = False  # The CLI reported the run as failed
+    
+    def metadata(self) -> Dict[str, Any]:
+        """ExecutionResult metadata (usage and tool calls, when known)."""
+        metadata: Dict[str, Any] = {}
+        if self.usage:
+            metadata["usage"] = self.usage.to_dict()
+        if self.tool_calls:
+            metadata["tool_calls"] = self.tool_calls
+        return metadata
+
+
+class OutputParser:
+    """
+    Plain text output: everything is response text.
+    
+    Usage:
+        parser = create_parser(agent.output_format)
+        for chunk in stdout_chunks:
+            show(parser.feed(chunk))
+        show(parser.finish())
+        parsed = parser.result()
+    """
+    
+    def __init__(self):
+        """Initialize the parser."""
+        self._text: List[str] = []
+    
+    def feed(self, data: str) -> str:
+        """Consume decoded stdout, returning the response text it contains."""
+        self._text.append(data)
+        return data
+    
+    def finish(self) -> str:
+        """End of output; returns any response text still held back."""
+        return ""
+    
+    def result(self) -> ParsedOutput:
+        """Everything extracted (call after finish())."""
+        return ParsedOutput(text="".join(self._text))
+
+
+class StreamJsonParser(OutputParser):
+    """
+    Claude Code `--output-format stream-json` events, one JSON object per line.
+    
+    Lines that aren't JSON (a CLI too old for the format, a crash message)
+    are streamed as they are and become the response if no event carried
+    any text.
+    """
+    
+    def __init__(self):
+        """Initialize the parser."""
+        super().__init__()
+        self._line = ""
+        self._raw: List[str] = []
+        self._final: Optional[str] = None
+        self._usage: Optional[TokenUsage] = None
+        self._model: Optional[str] = None
+        self._tool_calls: Dict[str, Dict[str, Any]] = {}
+        self._is_error = False
+        self._log = get_logger("output_parsers")
+    
+    def feed(self, data: str) -> str:
+        """Consume decoded stdout, returning assistant text from complete lines."""
+        lines = (self._line + data).split("\n")
+        self._line = lines.pop()
+        return "".join(self._parse_line(line) for line in lines)
+    
+    def finish(self) -> str:
+        """Parse a last line without a trailing newline."""
+        line, self._line = self._line, ""
+        return self._parse_line(line)
+    
+    def _parse_line(self, line: str) -> str:
+        """Handle one event line; returns its assistant text."""
+        if not line.strip():
+            return ""
+        try:
+            event = json.loads(line)
+        except ValueError:
+            event = None
+        if not isinstance(event, dict):
+            self._raw.append(line + "\n")
+            return line + "\n"
+        
+        kind = event.get("type")
+        if kind == "system":
+            self._model = event.get("model") or self._model
+        elif kind == "assistant":
+            return self._assistant(event.get("message") or {})
+        elif kind == "user":
+            self._tool_results(event.get("message") or {})
+        elif kind == "result":
+            self._result(event)
+        return ""
+    
+    def _assistant(self, message: Dict[str, Any]) -> str:
+        """Assistant turn: text blocks are response text, tool_use blocks tool calls."""
+        self._model = message.get("model") or self._model
+        text = []
+        for block in message.get("content") or []:
+            if block.get("type") == "text":
+                text.append(block.get("text", ""))
+            elif block.get("type") == "tool_use":
+                self._tool_calls[block.get("id", str(len(self._tool_calls)))] = {
+                    "name": block.get("name"),
+                    "id": block.get("id"),
+                    "is_error": None,
+                }
+        if text:
+            text.append("\n")
+        joined = "".join(text)
+        self._text.append(joined)
+        return joined
+    
+    def _tool_results(self, message: Dict[str, Any]) -> None:
+        """Tool output fed back to the model: mark the tool call's outcome."""
+        content = message.get("content")
+        if not isinstance(content, list):
+            return
+        for block in content:
+            if isinstance(block, dict) and block.get("type") == "tool_result":
+                call = self._tool_calls.get(block.get("tool_use_id"))
+                if call is not None:
+                    call["is_error"] = bool(block.get("is_error", False))
+    
+    def _result(self, event: Dict[str, Any]) -> None:
+        """Final event: response, token counts and cost."""
+        if isinstance(event.get("result"), str):
+            self._final = event["result"]
+        self._is_error = bool(event.get("is_error", False))
+        usage = event.get("usage") or {}
+        self._usage = TokenUsage(
+            input_tokens=int(usage.get("input_tokens") or 0),
+            output_tokens=int(usage.get("output_tokens") or 0),
+            cache_read_tokens=int(usage.get("cache_read_input_tokens") or 0),
+            cache_creation_tokens=int(usage.get("cache_creation_input_tokens") or 0),
+            cost_usd=event.get("total_cost_usd", event.get("cost_usd")),
+            model=self._model,
+            num_turns=event.get("num_turns"),
+        )
+    
+    def result(self) -> ParsedOutput:
+        """Response (the result event's, else streamed text, else raw lines)."""
+        if self._final is not None:
+            text = self._final
+        else:
+            text = "".join(self._text).strip() or "".join(self._raw)
+            if self._raw and self._usage is None:
+                self._log.warning("stream_json_unparsed", lines=len(self._raw))
+        return ParsedOutput(
+            text=text,
+            usage=self._usage,
+            tool_calls=list(self._tool_calls.values()),
+            is_error=self._is_error,
+        )
+
+
+OUTPUT_PARSERS: Dict[str, Type[OutputParser]] = {
+    TEXT: OutputParser,
+    STREAM_JSON: StreamJsonParser,
+}
+
+
+def create_parser(output_format: Optional[str]) -> OutputParser:
+    """
+    Parser for an agent's output_format (agents.yml).
+    
+    Raises:
+        ValueError: If the format is unknown
+    """
+    try:
+        return OUTPUT_PARSERS[output_format or TEXT]()
+    except KeyError:
+        raise ValueError(f"Unknown output format: {output_format}")
+
+
+def parse_output(output_format: Optional[str], output: str) -> ParsedOutput:
+    """Parse a run's complete stdout."""
+    parser = create_parser(output_format)
+    parser.feed(output)
+    parser.finish()
+    return parser.result()
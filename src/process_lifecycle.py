@@ -0,0 +1,373 @@
+"""
+LastAgent Process Lifecycle Manager
+
+Owns every agent CLI subprocess from spawn to reap.
+
+Agent CLIs spawn their own children (tool shells, language servers, test
+runners). Killing only the CLI leaves those running, so each agent is
+started as the leader of its own process group (new session) and the whole
+group is terminated on timeout or cancellation:
+
+  1. SIGTERM to the process group
+  2. wait kill_grace_seconds
+  3. SIGKILL to the process group
+  4. await the leader so it is reaped (no zombies)
+
+After a normal exit the group is checked for members that outlived the
+leader. Those are reported as leaked/orphaned and, by default, killed.
+
+Agents configured with `pty: true` get a pseudo-terminal as stdout
+(src/pty_stream.py) so they don't block-buffer their output. Agents with
+`limits` get their rlimits and nice level applied in the child before exec
+(src/resource_limits.py).
+
+Process groups are POSIX-only; elsewhere only the CLI itself is killed.
+"""
+
+import asyncio
+import os
+import signal
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional
+
+from .config import get_config
+from .pty_stream import PTY_SUPPORTED, PtyReader, open_pty
+from .resource_usage import ResourceUsage, get_resource_monitor
+from .resource_limits import get_resource_limiter
+
+# Enterprise structured logging
+try:
+    from src.observability import get_logger
+except ImportError:
+    from .observability import get_logger
+
+
+# Recent leak reports kept for inspection
+LEAK_REPORT_SIZE = 100
+
+_POSIX = os.name == "posix"
+
+
+@dataclass
+class LeakReport:
+    """Processes that outlived their agent CLI."""
+    agent_name: str
+    leader_pid: int
+    pgid: int
+    leaked_pids: List[int]
+    killed: bool
+    detected_at: datetime = field(default_factory=datetime.utcnow)
+
+
+@dataclass
+class ProcessStats:
+    """Lifecycle counters."""
+    spawned: int
+    active: int
+    exited: int
+    killed_timeout: int
+    killed_cancelled: int
+    killed_stalled: int
+    recycled: int
+    leaked_groups: int
+    leaked_processes: int
+
+
+@dataclass
+class _TrackedProcess:
+    """Bookkeeping for a live agent process."""
+    agent_name: str
+    process: asyncio.subprocess.Process
+    pgid: Optional[int]
+    pty: Optional[PtyReader] = None
+    started_at: float = field(default_factory=time.perf_counter)
+
+
+class ProcessLifecycleManager:
+    """
+    Spawns agent CLIs in their own process group and tears down whole trees.
+    
+    Usage:
+        manager = get_process_manager()
+        process = await manager.spawn("claude", cmd, cwd=".")
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(), 300)
+        except asyncio.TimeoutError:
+            await manager.terminate(process, reason="timeout")
+            raise
+        await manager.finalize(process)
+    """
+    
+    def __init__(
+        self,
+        kill_grace_seconds: Optional[float] = None,
+        kill_orphans: Optional[bool] = None,
+    ):
+        """
+        Initialize the manager.
+        
+        Args:
+            kill_grace_seconds: Delay between SIGTERM and SIGKILL.
+                Defaults to settings.execution.process.kill_grace_seconds
+            kill_orphans: Kill group members still alive after the CLI exits.
+                Defaults to settings.execution.process.kill_orphans
+        """
+        settings = get_config().settings.execution.get("process", {})
+        if kill_grace_seconds is None:
+            kill_grace_seconds = settings.get("kill_grace_seconds", 5)
+        if kill_orphans is None:
+            kill_orphans = settings.get("kill_orphans", True)
+        
+        self.kill_grace_seconds = float(kill_grace_seconds)
+        self.kill_orphans = bool(kill_orphans)
+        self.monitor = get_resource_monitor()
+        self.limits = get_resource_limiter()
+        self._log = get_logger("process")
+        
+        self._active: Dict[int, _TrackedProcess] = {}
+        self._leaks: Deque[LeakReport] = deque(maxlen=LEAK_REPORT_SIZE)
+        self._counters: Dict[str, int] = {
+            "spawned": 0,
+            "exited": 0,
+            "killed_timeout": 0,
+            "killed_cancelled": 0,
+            "killed_stalled": 0,
+            "recycled": 0,
+            "leaked_groups": 0,
+            "leaked_processes": 0,
+        }
+    
+    async def spawn(
+        self,
+        agent_name: str,
+        cmd: List[str],
+        cwd: Optional[str] = None,
+        pty: bool = False,
+        **kwargs: Any,
+    ) -> asyncio.subprocess.Process:
+        """
+        Start an agent CLI as the leader of a new process group.
+        
+        Args:
+            agent_name: Agent being executed (for reporting)
+            cmd: argv to execute
+            cwd: Working directory
+            pty: Give the CLI a pseudo-terminal as stdout; process.stdout then
+                yields its output with terminal control sequences stripped
+            **kwargs: Extra arguments for asyncio.create_subprocess_exec
+        
+        Returns:
+            The started process
+        """
+        kwargs.setdefault("stdout", asyncio.subprocess.PIPE)
+        kwargs.setdefault("stderr", asyncio.subprocess.PIPE)
+        if _POSIX:
+            kwargs["start_new_session"] = True
+        preexec = self.limits.preexec(agent_name)
+        if preexec is not None:
+            kwargs.setdefault("preexec_fn", preexec)
+        
+        reader = None
+        if pty and PTY_SUPPORTED:
+            master_fd, slave_fd = open_pty()
+            kwargs["stdout"] = slave_fd
+            try:
+                process = await asyncio.create_subprocess_exec(*cmd, cwd=cwd, **kwargs)
+            except BaseException:
+                os.close(master_fd)
+                raise
+            finally:
+                os.close(slave_fd)  # The CLI holds its own copy
+            reader = PtyReader(master_fd)
+            process.stdout = reader.stream
+        else:
+            process = await asyncio.create_subprocess_exec(*cmd, cwd=cwd, **kwargs)
+        
+        self._active[process.pid] = _TrackedProcess(
+            agent_name=agent_name,
+            process=process,
+            pgid=process.pid if _POSIX else None,
+            pty=reader,
+        )
+        self.monitor.track(process.pid, process.pid if _POSIX else None)
+        self._counters["spawned"] += 1
+        return process
+    
+    async def terminate(
+        self,
+        process: asyncio.subprocess.Process,
+        reason: str = "timeout",
+    ) -> None:
+        """
+        Kill the process and everything in its process group, then reap it.
+        
+        Args:
+            process: Process returned by spawn()
+            reason: "timeout", "stalled", "cancelled" or "recycled" (for metrics and logs)
+        """
+        tracked = self._active.get(process.pid)
+        pgid = tracked.pgid if tracked else None
+        
+        self._signal(process, pgid, signal.SIGTERM)
+        try:
+            await asyncio.wait_for(
+                asyncio.shield(process.wait()),
+                timeout=self.kill_grace_seconds,
+            )
+        except asyncio.TimeoutError:
+            pass
+        
+        # SIGKILL the group even if the leader exited: children may linger
+        self._signal(process, pgid, signal.SIGKILL if _POSIX else signal.SIGTERM)
+        await process.wait()
+        
+        counter = {
+            "cancelled": "killed_cancelled",
+            "stalled": "killed_stalled",
+            "recycled": "recycled",
+        }.get(reason, "killed_timeout")
+        self._counters[counter] += 1
+        self._active.pop(process.pid, None)
+        self.monitor.untrack(process.pid)
+        if tracked and tracked.pty:
+            tracked.pty.close()
+        self._log.warning(
+            "agent_process_terminated",
+            agent=tracked.agent_name if tracked else None,
+            pid=process.pid,
+            reason=reason,
+            returncode=process.returncode,
+        )
+    
+    async def finalize(self, process: asyncio.subprocess.Process) -> Optional[LeakReport]:
+        """
+        Reap a process that exited on its own and check for leaked children.
+        
+        Args:
+            process: Process returned by spawn()
+        
+        Returns:
+            LeakReport if group members outlived the CLI, else None
+        """
+        await process.wait()
+        self.monitor.untrack(process.pid)
+        tracked = self._active.pop(process.pid, None)
+        if tracked is None:
+            return None  # Already terminated or finalized
+        self._counters["exited"] += 1
+        if tracked.pty:
+            tracked.pty.close()
+        
+        if tracked.pgid is None or not self._group_alive(tracked.pgid):
+            return None
+        
+        leaked = await asyncio.to_thread(self._group_members, tracked.pgid)
+        killed = False
+        if self.kill_orphans:
+            try:
+                os.killpg(tracked.pgid, signal.SIGKILL)
+                killed = True
+            except (ProcessLookupError, PermissionError):
+                pass
+        
+        report = LeakReport(
+            agent_name=tracked.agent_name,
+            leader_pid=process.pid,
+            pgid=tracked.pgid,
+            leaked_pids=leaked,
+            killed=killed,
+        )
+        self._leaks.append(report)
+        self._counters["leaked_groups"] += 1
+        self._counters["leaked_processes"] += len(leaked)
+        self._log.warning(
+            "agent_processes_leaked",
+            agent=tracked.agent_name,
+            pgid=tracked.pgid,
+            leaked_pids=leaked,
+            killed=killed,
+        )
+        return report
+    
+    def _signal(
+        self,
+        process: asyncio.subprocess.Process,
+        pgid: Optional[int],
+        sig: int,
+    ) -> None:
+        """Send a signal to the process group, or the process if no group."""
+        try:
+            if pgid is not None:
+                os.killpg(pgid, sig)
+            elif process.returncode is None:
+                process.send_signal(sig)
+        except (ProcessLookupError, PermissionError):
+            pass
+    
+    def _group_alive(self, pgid: int) -> bool:
+        """Check whether any process is left in a process group."""
+        try:
+            os.killpg(pgid, 0)
+            return True
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+    
+    def _group_members(self, pgid: int) -> List[int]:
+        """List PIDs in a process group (Linux /proc; empty elsewhere). Blocking."""
+        proc = Path("/proc")
+        if not proc.is_dir():
+            return []
+        members = []
+        for entry in proc.iterdir():
+            if not entry.name.isdigit():
+                continue
+            try:
+                stat = (entry / "stat").read_text()
+            except OSError:
+                continue
+            # Fields after the ")" that closes the command name: state ppid pgrp ...
+            fields = stat.rsplit(")", 1)[-1].split()
+            if len(fields) > 2 and fields[2] == str(pgid):
+                members.append(int(entry.name))
+        return sorted(members)
+    
+    async def resource_usage(
+        self,
+        process: asyncio.subprocess.Process,
+    ) -> Optional[ResourceUsage]:
+        """
+        CPU, memory and context switches of a process tree so far.
+        
+        Call before terminate()/finalize(), which stop the accounting.
+        """
+        await self.monitor.sample()
+        return self.monitor.get(process.pid)
+    
+    def get_leaks(self, limit: int = 20) -> List[LeakReport]:
+        """Get the most recent leak reports."""
+        return list(self._leaks)[-limit:]
+    
+    def get_stats(self) -> ProcessStats:
+        """Get lifecycle counters."""
+        return ProcessStats(active=len(self._active), **self._counters)
+
+
+# =============================================================================
+# SINGLETON INSTANCE
+# =============================================================================
+
+_manager: Optional[ProcessLifecycleManager] = None
+
+
+def get_process_manager() -> ProcessLifecycleManager:
+    """Get the global process lifecycle manager instance."""
+    global _manager
+    if _manager is None:
+        _manager = ProcessLifecycleManager()
+    return _manager
@@ -0,0 +1,154 @@
+"""
+LastAgent Prompt Transport
+
+Chooses how a prompt reaches an agent CLI.
+
+Putting the prompt in argv (`claude -p <prompt>`) is simplest, but large
+pasted code or logs run into ARG_MAX (E2BIG at spawn), and argv is visible
+to every user in `ps`. Each agent lists the transports its CLI accepts in
+agents.yml (prompt_transports):
+
+  - argv:  prompt as a command-line argument (small prompts only)
+  - stdin: prompt streamed to the CLI's stdin
+  - file:  prompt written to a private temp file whose path is passed
+
+Prompts up to argv_max_bytes use argv when the agent allows it; larger
+ones use the first other transport listed. Temp files are created 0600
+and deleted when the run ends.
+"""
+
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import List, Optional
+
+from .config import get_config
+
+# Enterprise structured logging
+try:
+    from src.observability import get_logger
+except ImportError:
+    from .observability import get_logger
+
+
+ARGV = "argv"
+STDIN = "stdin"
+FILE = "file"
+
+
+@dataclass
+class PromptDelivery:
+    """How one run's prompt is delivered."""
+    mode: str
+    prompt: str
+    path: Optional[str] = None  # Temp file (FILE mode)
+    
+    @property
+    def stdin(self) -> Optional[bytes]:
+        """Bytes to write to the CLI's stdin (STDIN mode), else None."""
+        return self.prompt.encode() if self.mode == STDIN else None
+    
+    def cleanup(self) -> None:
+        """Delete the temp file, if any."""
+        if self.path is None:
+            return
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+        self.path = None
+
+
+class PromptTransport:
+    """
+    Picks a prompt transport per agent and prompt size.
+    
+    Usage:
+        transport = get_prompt_transport()
+        delivery = transport.prepare("aider", prompt)
+        try:
+            ...  # build argv from delivery, write delivery.stdin
+        finally:
+            delivery.cleanup()
+    """
+    
+    def __init__(
+        self,
+        argv_max_bytes: Optional[int] = None,
+        temp_dir: Optional[str] = None,
+    ):
+        """
+        Initialize the transport selector.
+        
+        Args:
+            argv_max_bytes: Largest prompt passed in argv.
+                Defaults to settings.execution.prompt_transport.argv_max_bytes
+            temp_dir: Directory for prompt files. Defaults to
+                prompt_transport.temp_dir (or the system temp dir)
+        """
+        self.config = get_config()
+        settings = self.config.settings.execution.get("prompt_transport", {})
+        if argv_max_bytes is None:
+            argv_max_bytes = settings.get("argv_max_bytes", 16384)
+        if temp_dir is None:
+            temp_dir = settings.get("temp_dir")
+        
+        self.argv_max_bytes = int(argv_max_bytes)
+        self.temp_dir = temp_dir
+        self._log = get_logger("prompt_transport")
+    
+    def transports(self, agent_name: str) -> List[str]:
+        """Transports an agent's CLI accepts (agents.yml prompt_transports)."""
+        try:
+            return self.config.get_agent(agent_name).prompt_transports
+        except KeyError:
+            return [ARGV]
+    
+    def choose(self, agent_name: str, size: int) -> str:
+        """Pick the transport for a prompt of size bytes."""
+        transports = self.transports(agent_name)
+        if ARGV in transports and size <= self.argv_max_bytes:
+            return ARGV
+        for mode in transports:
+            if mode != ARGV:
+                return mode
+        return ARGV
+    
+    def prepare(self, agent_name: str, prompt: str) -> PromptDelivery:
+        """Choose a transport and, for FILE, write the prompt file."""
+        size = len(prompt.encode())
+        mode = self.choose(agent_name, size)
+        if mode == ARGV and size > self.argv_max_bytes:
+            self._log.warning(
+                "prompt_in_argv",
+                agent=agent_name,
+                size=size,
+                reason="agent accepts no other transport",
+            )
+        
+        delivery = PromptDelivery(mode=mode, prompt=prompt)
+        if mode == FILE:
+            fd, delivery.path = tempfile.mkstemp(
+                prefix="lastagent-prompt-",
+                suffix=".md",
+                dir=self.temp_dir,
+            )
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(prompt)
+        self._log.debug("prompt_transport_chosen", agent=agent_name, mode=mode, size=size)
+        return delivery
+
+
+# =============================================================================
+# SINGLETON INSTANCE
+# =============================================================================
+
+_transport: Optional[PromptTransport] = None
+
+
+def get_prompt_transport() -> PromptTransport:
+    """Get the global prompt transport instance."""
+    global _transport
+    if _transport is None:
+        _transport = PromptTransport()
+    return _transport
@@ -0,0 +1,203 @@
+"""
+LastAgent PTY Output
+
+Runs agent CLIs with stdout on a pseudo-terminal.
+
+Many CLIs (and the Python/Node runtimes under them) block-buffer stdout when
+it isn't a TTY, so through a pipe their output arrives in 4-64 KB bursts or
+only at exit, and time-to-first-byte says nothing about real progress.
+With `pty: true` in agents.yml the executor gives the CLI a pseudo-terminal
+as stdout instead:
+
+  - the terminal is configured without output post-processing (no \\n ->
+    \\r\\n) and with a wide window so lines aren't wrapped
+  - everything read from it goes through TerminalFilter, which strips ANSI
+    colour/cursor sequences, OSC titles and other control characters
+  - stdin and stderr stay pipes, so CLIs still see a non-interactive run
+
+POSIX-only; elsewhere agents always run on pipes.
+"""
+
+import asyncio
+import os
+import re
+import struct
+from typing import Optional, Tuple
+
+try:
+    import fcntl
+    import pty
+    import termios
+    PTY_SUPPORTED = True
+except ImportError:  # Windows
+    PTY_SUPPORTED = False
+
+
+# Bytes read from the terminal per read
+READ_CHUNK_SIZE = 65536
+
+# Terminal size reported to the CLI (rows, columns)
+WINDOW_SIZE = (50, 400)
+
+# Longest unterminated escape sequence held back between chunks
+MAX_PENDING_BYTES = 4096
+
+_ESCAPE = re.compile(
+    rb"""
+    \x1b\[[0-?]*[\x20-/]*[@-~]              # CSI: colours, cursor movement, erase
+    | \x1b\][^\x07\x1b]*(?:\x07|\x1b\\)     # OSC: window title, hyperlinks
+    | \x1b[PX^_][^\x1b]*\x1b\\              # DCS / SOS / PM / APC strings
+    | \x1b[\x20-/]*[0-~]                    # Two-byte escapes, charset selection
+    """,
+    re.VERBOSE,
+)
+
+# Start of an escape sequence that runs to the end of the data
+_PARTIAL = re.compile(
+    rb"""
+    \x1b
+    (?: \[[0-?]*[\x20-/]*
+      | \][^\x07\x1b]*\x1b?
+      | [PX^_][^\x1b]*\x1b?
+      | [\x20-/]*
+    )
+    """,
+    re.VERBOSE,
+)
+
+# C0 controls and DEL, except tab, newline and carriage return
+_CONTROL = re.compile(rb"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]")
+
+# Carriage return not followed by a newline (spinner / progress redraw)
+_LONE_CR = re.compile(rb"\r(?!\n)")
+
+
+class TerminalFilter:
+    """
+    Incremental stripper for terminal control sequences.
+    
+    An escape sequence or "\\r\\n" split across two reads is held back
+    until the rest arrives.
+    
+    Usage:
+        terminal = TerminalFilter()
+        text = terminal.feed(chunk)
+        ...
+        text += terminal.flush()
+    """
+    
+    def __init__(self):
+        """Initialize the filter."""
+        self._pending = b""
+    
+    def feed(self, data: bytes) -> bytes:
+        """Filter a chunk, returning the printable bytes that are complete."""
+        data = self._pending + data
+        self._pending = b""
+        
+        start = self._incomplete(data)
+        if start is not None:
+            data, self._pending = data[:start], data[start:]
+        elif data.endswith(b"\r"):
+            data, self._pending = data[:-1], b"\r"
+        return self._clean(data)
+    
+    @staticmethod
+    def _incomplete(data: bytes) -> Optional[int]:
+        """Offset of an escape sequence cut off at the end of data, if any."""
+        pos = 0
+        while True:
+            start = data.find(b"\x1b", pos)
+            if start == -1:
+                return None
+            if _PARTIAL.fullmatch(data, start):
+                return start if len(data) - start < MAX_PENDING_BYTES else None
+            match = _ESCAPE.match(data, start)
+            pos = match.end() if match else start + 1
+    
+    def flush(self) -> bytes:
+        """Return whatever is still held back (at end of output)."""
+        data, self._pending = self._pending, b""
+        return self._clean(data)
+    
+    @staticmethod
+    def _clean(data: bytes) -> bytes:
+        """Remove escape sequences and control characters."""
+        data = _ESCAPE.sub(b"", data)
+        data = _LONE_CR.sub(b"", data).replace(b"\r\n", b"\n")
+        return _CONTROL.sub(b"", data)
+
+
+def open_pty() -> Tuple[int, int]:
+    """
+    Open a pseudo-terminal pair for a CLI's stdout.
+    
+    Returns:
+        (master_fd, slave_fd) - pass slave_fd as the child's stdout, then
+        close it in the parent
+    """
+    master_fd, slave_fd = pty.openpty()
+    attrs = termios.tcgetattr(slave_fd)
+    attrs[1] &= ~termios.OPOST  # oflag: write "\n" as is
+    attrs[3] &= ~(termios.ECHO | termios.ICANON)  # lflag
+    termios.tcsetattr(slave_fd, termios.TCSANOW, attrs)
+    fcntl.ioctl(slave_fd, termios.TIOCSWINSZ, struct.pack("HHHH", *WINDOW_SIZE, 0, 0))
+    os.set_blocking(master_fd, False)
+    return master_fd, slave_fd
+
+
+class PtyReader:
+    """
+    Feeds a pseudo-terminal's output, filtered, into an asyncio StreamReader.
+    
+    The stream reaches EOF once every process holding the terminal has
+    closed it (Linux reports that as EIO on the master side).
+    
+    Usage:
+        reader = PtyReader(master_fd)
+        process.stdout = reader.stream
+        ...
+        reader.close()
+    """
+    
+    def __init__(self, master_fd: int, loop: Optional[asyncio.AbstractEventLoop] = None):
+        """
+        Start reading the master side of a terminal.
+        
+        Args:
+            master_fd: Non-blocking master fd from open_pty(); owned by the reader
+            loop: Event loop to read on. Defaults to the running loop
+        """
+        self.stream = asyncio.StreamReader()
+        self._fd: Optional[int] = master_fd
+        self._loop = loop or asyncio.get_running_loop()
+        self._filter = TerminalFilter()
+        self._loop.add_reader(master_fd, self._on_readable)
+    
+    def _on_readable(self) -> None:
+        """Move available bytes from the terminal into the stream."""
+        try:
+            data = os.read(self._fd, READ_CHUNK_SIZE)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            data = b""  # EIO: the CLI side of the terminal is closed
+        
+        if not data:
+            self.close()
+            return
+        data = self._filter.feed(data)
+        if data:
+            self.stream.feed_data(data)
+    
+    def close(self) -> None:
+        """Stop reading, close the terminal and end the stream (idempotent)."""
+        if self._fd is None:
+            return
+        self._loop.remove_reader(self._fd)
+        os.close(self._fd)
+        self._fd = None
+        tail = self._filter.flush()
+        if tail:
+            self.stream.feed_data(tail)
+        self.stream.feed_eof()
@@ -0,0 +1,257 @@
+"""
+LastAgent Resource Limits
+
+Caps what an agent CLI, and everything it starts, may use.
+
+A runaway agent (or the test suite it launches) can exhaust memory, CPU or
+file descriptors on the box the API runs on. Agents with a `limits`
+section in agents.yml get these applied in the child between fork and
+exec, so every process the CLI starts inherits them:
+
+  - address_space_mb: RLIMIT_AS, virtual memory (allocations beyond it fail)
+  - cpu_seconds:      RLIMIT_CPU per process (SIGXCPU, then SIGKILL
+                      CPU_HARD_GRACE_SECONDS later)
+  - open_files:       RLIMIT_NOFILE
+  - nice:             Scheduling priority increment (1-19 = lower priority)
+
+A run that breaches a limit fails with ResourceLimitExceeded, recorded in
+the ErrorTracker as RESOURCE_LIMIT. Node-based CLIs reserve a lot of
+virtual memory up front, so give them a generous address_space_mb (or
+none).
+
+POSIX-only; elsewhere limits are ignored.
+"""
+
+import os
+import re
+import signal
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+from .config import ResourceLimitsConfig, get_config
+from .resource_usage import ResourceUsage
+
+try:
+    import resource
+    RLIMITS_SUPPORTED = True
+except ImportError:  # Windows
+    RLIMITS_SUPPORTED = False
+
+# Enterprise structured logging
+try:
+    from src.observability import get_logger, get_error_tracker, ErrorClassification
+    from src.observability.logging_config import get_trace_id
+except ImportError:
+    from .observability import get_logger, get_error_tracker, ErrorClassification
+    from .observability.logging_config import get_trace_id
+
+
+ADDRESS_SPACE = "address_space"
+CPU_TIME = "cpu_time"
+OPEN_FILES = "open_files"
+
+# Seconds of CPU between the soft limit (SIGXCPU) and the hard one (SIGKILL)
+CPU_HARD_GRACE_SECONDS = 5
+
+# Tail of stderr searched for the errors a breached limit causes
+STDERR_SCAN_BYTES = 65536
+
+# What processes print when a limit stops them
+_BREACH_MESSAGES = {
+    ADDRESS_SPACE: re.compile(
+        r"MemoryError|Cannot allocate memory|out of memory|std::bad_alloc",
+        re.IGNORECASE,
+    ),
+    OPEN_FILES: re.compile(r"Too many open files|EMFILE"),
+    CPU_TIME: re.compile(r"CPU time limit exceeded"),
+}
+
+
+class ResourceLimitExceeded(Exception):
+    """An agent run breached one of its agents.yml resource limits."""
+    
+    def __init__(self, agent_name: str, limit: str, value: int):
+        super().__init__(f"Resource limit exceeded: {limit} (limit {value})")
+        self.agent_name = agent_name
+        self.limit = limit
+        self.value = value
+
+
+@dataclass
+class ResourceLimitStats:
+    """Resource limiter counters."""
+    enabled: bool
+    limited_spawns: int
+    breaches: Dict[str, int]
+
+
+def _set_limit(kind: int, soft: int, hard: Optional[int] = None) -> None:
+    """setrlimit, never above the hard limit we already have."""
+    _, current_hard = resource.getrlimit(kind)
+    hard = soft if hard is None else hard
+    if current_hard != resource.RLIM_INFINITY:
+        soft, hard = min(soft, current_hard), min(hard, current_hard)
+    resource.setrlimit(kind, (soft, hard))
+
+
+def apply_limits(limits: ResourceLimitsConfig) -> None:
+    """Apply limits to the current process (runs in the child before exec)."""
+    if limits.address_space_mb:
+        _set_limit(resource.RLIMIT_AS, limits.address_space_mb * 1024 * 1024)
+    if limits.cpu_seconds:
+        _set_limit(
+            resource.RLIMIT_CPU,
+            limits.cpu_seconds,
+            limits.cpu_seconds + CPU_HARD_GRACE_SECONDS,
+        )
+    if limits.open_files:
+        _set_limit(resource.RLIMIT_NOFILE, limits.open_files)
+    if limits.nice:
+        os.nice(limits.nice)
+
+
+class ResourceLimiter:
+    """
+    Per-agent rlimits and nice level for agent CLIs.
+    
+    Usage:
+        limiter = get_resource_limiter()
+        process = await asyncio.create_subprocess_exec(
+            *cmd, preexec_fn=limiter.preexec("aider")
+        )
+        ...
+        breach = limiter.check("aider", process.returncode, stderr, usage)
+        if breach:
+            raise breach
+    """
+    
+    def __init__(self, enabled: Optional[bool] = None):
+        """
+        Initialize the limiter.
+        
+        Args:
+            enabled: Apply agents.yml limits.
+                Defaults to settings.execution.resource_limits.enabled
+        """
+        self.config = get_config()
+        settings = self.config.settings.execution.get("resource_limits", {})
+        if enabled is None:
+            enabled = settings.get("enabled", True)
+        
+        self.enabled = bool(enabled) and RLIMITS_SUPPORTED
+        self._log = get_logger("resource_limits")
+        self._limited_spawns = 0
+        self._breaches: Dict[str, int] = {}
+    
+    def limits(self, agent_name: str) -> Optional[ResourceLimitsConfig]:
+        """An agent's limits (agents.yml limits), or None if it runs unlimited."""
+        if not self.enabled:
+            return None
+        try:
+            return self.config.get_agent(agent_name).limits
+        except KeyError:
+            return None
+    
+    def preexec(self, agent_name: str) -> Optional[Callable[[], None]]:
+        """Function applying the agent's limits in the child, or None."""
+        limits = self.limits(agent_name)
+        if limits is None:
+            return None
+        self._limited_spawns += 1
+        return lambda: apply_limits(limits)
+    
+    def check(
+        self,
+        agent_name: str,
+        returncode: Optional[int],
+        stderr: bytes,
+        usage: Optional[ResourceUsage] = None,
+    ) -> Optional[ResourceLimitExceeded]:
+        """
+        Detect a finished run that failed because it hit a limit.
+        
+        Returns:
+            The error to fail the run with (already recorded), or None
+        """
+        limits = self.limits(agent_name)
+        if limits is None or returncode in (None, 0):
+            return None
+        
+        breached = self._breached(limits, returncode, stderr, usage)
+        if breached is None:
+            return None
+        limit, value = breached
+        error = ResourceLimitExceeded(agent_name, limit, value)
+        self._breaches[limit] = self._breaches.get(limit, 0) + 1
+        self._log.warning(
+            "resource_limit_exceeded",
+            agent=agent_name,
+            limit=limit,
+            value=value,
+            returncode=returncode,
+        )
+        get_error_tracker().record_error(
+            trace_id=get_trace_id() or "",
+            error_type=type(error).__name__,
+            message=str(error),
+            classification=ErrorClassification.RESOURCE_LIMIT,
+            recoverable=True,
+            phase="execution",
+            agent=agent_name,
+            component="executor",
+            execution_context={
+                "limit": limit,
+                "value": value,
+                "returncode": returncode,
+                **(usage.to_dict() if usage else {}),
+            },
+        )
+        return error
+    
+    @staticmethod
+    def _breached(
+        limits: ResourceLimitsConfig,
+        returncode: int,
+        stderr: bytes,
+        usage: Optional[ResourceUsage],
+    ) -> Optional[Tuple[str, int]]:
+        """(limit, configured value) that stopped the run, if any."""
+        if limits.cpu_seconds:
+            cpu = usage.user_cpu_seconds + usage.system_cpu_seconds if usage else 0.0
+            if returncode == -signal.SIGXCPU or (
+                returncode == -signal.SIGKILL and cpu >= limits.cpu_seconds
+            ):
+                return CPU_TIME, limits.cpu_seconds
+        
+        text = stderr[-STDERR_SCAN_BYTES:].decode(errors="replace") if stderr else ""
+        for limit, value in (
+            (CPU_TIME, limits.cpu_seconds),
+            (ADDRESS_SPACE, limits.address_space_mb),
+            (OPEN_FILES, limits.open_files),
+        ):
+            if value and _BREACH_MESSAGES[limit].search(text):
+                return limit, value
+        return None
+    
+    def get_stats(self) -> ResourceLimitStats:
+        """Get limiter counters."""
+        return ResourceLimitStats(
+            enabled=self.enabled,
+            limited_spawns=self._limited_spawns,
+            breaches=dict(self._breaches),
+        )
+
+
+# =============================================================================
+# SINGLETON INSTANCE
+# =============================================================================
+
+_limiter: Optional[ResourceLimiter] = None
+
+
+def get_resource_limiter() -> ResourceLimiter:
+    """Get the global resource limiter instance."""
+    global _limiter
+    if _limiter is None:
+        _limiter = ResourceLimiter()
+    return _limiter
@@ -0,0 +1,246 @@
+"""
+LastAgent Resource Accounting
+
+Per-execution CPU, memory and context-switch usage of agent process trees.
+
+asyncio reaps agent CLIs itself, so their rusage from wait4() is never
+visible to us. Instead, while an agent runs, /proc is sampled every
+sample_interval seconds and every process in the agent's process group is
+accounted:
+
+  - user/system CPU time: each process's own utime/stime at its last sample
+  - peak RSS: highest total resident memory of the group at any sample
+  - voluntary/involuntary context switches: summed like CPU time
+
+The scan reads every /proc/<pid> entry, so it runs in a worker thread
+(asyncio.to_thread) rather than on the event loop. Processes that live less
+than one interval, and the last partial interval before a process exits,
+are not seen. Usage is therefore a lower bound;
+good enough for comparing agents and prompts for capacity planning.
+
+Linux-only; elsewhere every field stays zero.
+"""
+
+import asyncio
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
+
+from .config import get_config
+
+# Enterprise structured logging
+try:
+    from src.observability import get_logger
+except ImportError:
+    from .observability import get_logger
+
+
+_PROC = Path("/proc")
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+@dataclass
+class ResourceUsage:
+    """Resource usage of one agent process tree."""
+    user_cpu_seconds: float = 0.0
+    system_cpu_seconds: float = 0.0
+    peak_rss_bytes: int = 0
+    voluntary_ctx_switches: int = 0
+    involuntary_ctx_switches: int = 0
+    stdout_bytes: int = 0
+    processes: int = 0
+    samples: int = 0
+    
+    def to_dict(self) -> Dict[str, float]:
+        """Rounded values for metadata, logs and the decision log."""
+        return {
+            "user_cpu_seconds": round(self.user_cpu_seconds, 3),
+            "system_cpu_seconds": round(self.system_cpu_seconds, 3),
+            "peak_rss_bytes": self.peak_rss_bytes,
+            "voluntary_ctx_switches": self.voluntary_ctx_switches,
+            "involuntary_ctx_switches": self.involuntary_ctx_switches,
+            "stdout_bytes": self.stdout_bytes,
+            "processes": self.processes,
+            "samples": self.samples,
+        }
+
+
+@dataclass
+class _ProcSample:
+    """Cumulative counters of one process at its last sample."""
+    utime: int = 0
+    stime: int = 0
+    voluntary: int = 0
+    involuntary: int = 0
+
+
+@dataclass
+class _TrackedGroup:
+    """Samples collected for one process group."""
+    pgid: int
+    processes: Dict[int, _ProcSample] = field(default_factory=dict)
+    peak_rss_bytes: int = 0
+    samples: int = 0
+
+
+def _read_stat(pid: str) -> Optional[Tuple[int, int, int, int]]:
+    """Read (pgrp, utime, stime, rss_pages) from /proc/<pid>/stat."""
+    try:
+        stat = (_PROC / pid / "stat").read_text()
+    except OSError:
+        return None
+    # Fields after the ")" that closes the command name start at "state"
+    fields = stat.rsplit(")", 1)[-1].split()
+    try:
+        return int(fields[2]), int(fields[11]), int(fields[12]), int(fields[21])
+    except (IndexError, ValueError):
+        return None
+
+
+def _read_ctx_switches(pid: str) -> Tuple[int, int]:
+    """Read (voluntary, involuntary) context switches from /proc/<pid>/status."""
+    voluntary = involuntary = 0
+    try:
+        for line in (_PROC / pid / "status").read_text().splitlines():
+            if line.startswith("voluntary_ctxt_switches:"):
+                voluntary = int(line.split()[1])
+            elif line.startswith("nonvoluntary_ctxt_switches:"):
+                involuntary = int(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return voluntary, involuntary
+
+
+# pgid -> (samples of its processes by pid, total RSS in bytes)
+_GroupReadings = Dict[int, Tuple[Dict[int, _ProcSample], int]]
+
+
+def _scan_groups(pgids: Set[int]) -> _GroupReadings:
+    """Read every process in the given process groups from /proc (blocking)."""
+    readings: _GroupReadings = {}
+    try:
+        entries = [e.name for e in _PROC.iterdir() if e.name.isdigit()]
+    except OSError:
+        return readings
+    for pid in entries:
+        stat = _read_stat(pid)
+        if stat is None:
+            continue
+        pgrp, utime, stime, rss_pages = stat
+        if pgrp not in pgids:
+            continue
+        voluntary, involuntary = _read_ctx_switches(pid)
+        processes, rss = readings.get(pgrp, ({}, 0))
+        processes[int(pid)] = _ProcSample(utime, stime, voluntary, involuntary)
+        readings[pgrp] = (processes, rss + rss_pages * _PAGE_SIZE)
+    return readings
+
+
+class ResourceMonitor:
+    """
+    Samples resource usage of tracked agent process groups.
+    
+    One background task scans /proc (in a worker thread) for all tracked
+    groups, so the cost doesn't grow with the number of concurrent agents.
+    
+    Usage:
+        monitor = get_resource_monitor()
+        monitor.track(process.pid, pgid)
+        ...
+        usage = monitor.get(process.pid)
+        monitor.untrack(process.pid)
+    """
+    
+    def __init__(self, sample_interval: Optional[float] = None, enabled: Optional[bool] = None):
+        """
+        Initialize the monitor.
+        
+        Args:
+            sample_interval: Seconds between /proc scans.
+                Defaults to settings.execution.resource_usage.sample_interval
+            enabled: Turn sampling on/off. Defaults to resource_usage.enabled
+        """
+        settings = get_config().settings.execution.get("resource_usage", {})
+        if sample_interval is None:
+            sample_interval = settings.get("sample_interval", 0.25)
+        if enabled is None:
+            enabled = settings.get("enabled", True)
+        
+        self.sample_interval = float(sample_interval)
+        self.enabled = bool(enabled) and _PROC.is_dir()
+        self._log = get_logger("resource_usage")
+        
+        self._groups: Dict[int, _TrackedGroup] = {}
+        self._task: Optional[asyncio.Task] = None
+    
+    def track(self, pid: int, pgid: Optional[int]) -> None:
+        """Start sampling the process group led by pid (call from a running loop)."""
+        if not self.enabled:
+            return
+        self._groups[pid] = _TrackedGroup(pgid=pgid if pgid is not None else pid)
+        
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._task = loop.create_task(self._run())
+    
+    def get(self, pid: int) -> Optional[ResourceUsage]:
+        """Usage collected so far for a tracked process group."""
+        group = self._groups.get(pid)
+        if group is None:
+            return None
+        processes = group.processes.values()
+        return ResourceUsage(
+            user_cpu_seconds=sum(p.utime for p in processes) / _CLOCK_TICKS,
+            system_cpu_seconds=sum(p.stime for p in processes) / _CLOCK_TICKS,
+            peak_rss_bytes=group.peak_rss_bytes,
+            voluntary_ctx_switches=sum(p.voluntary for p in processes),
+            involuntary_ctx_switches=sum(p.involuntary for p in processes),
+            processes=len(group.processes),
+            samples=group.samples,
+        )
+    
+    def untrack(self, pid: int) -> Optional[ResourceUsage]:
+        """Stop sampling a process group and return its final usage."""
+        usage = self.get(pid)
+        self._groups.pop(pid, None)
+        return usage
+    
+    async def sample(self) -> None:
+        """Scan /proc once (in a worker thread) and update every tracked group."""
+        if not self._groups:
+            return
+        readings = await asyncio.to_thread(
+            _scan_groups, {group.pgid for group in self._groups.values()}
+        )
+        # Groups untracked during the scan are gone from _groups and skipped
+        for group in list(self._groups.values()):
+            processes, rss = readings.get(group.pgid, ({}, 0))
+            group.processes.update(processes)
+            group.samples += 1
+            group.peak_rss_bytes = max(group.peak_rss_bytes, rss)
+    
+    async def _run(self) -> None:
+        """Sample until no groups are tracked."""
+        while self._groups:
+            try:
+                await self.sample()
+            except Exception as e:
+                self._log.warning("resource_sample_failed", error=str(e))
+            await asyncio.sleep(self.sample_interval)
+
+
+# =============================================================================
+# SINGLETON INSTANCE
+# =============================================================================
+
+_monitor: Optional[ResourceMonitor] = None
+
+
+def get_resource_monitor() -> ResourceMonitor:
+    """Get the global resource monitor instance."""
+    global _monitor
+    if _monitor is None:
+        _monitor = ResourceMonitor()
+    return _monitor
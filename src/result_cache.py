@@ -0,0 +1,275 @@
+"""
+LastAgent Execution Result Cache
+
+Content-addressed cache of agent results, opt-in.
+
+Identical read-only prompts ("explain this module", "summarize the repo")
+against an unchanged working directory produce the same answer, yet each
+costs a full CLI run. The cache key covers everything that can change the
+answer:
+
+  - agent name
+  - normalized system and user prompts (whitespace collapsed)
+  - working directory fingerprint: git HEAD plus a hash of the dirty tree
+    (diff against HEAD and the list of untracked files with size/mtime)
+
+Working directories that aren't git repositories are never cached, as
+there is no cheap way to tell whether they changed. Only read-only runs
+are cached (the executor skips tasks that may edit files), and a result
+is stored only if the directory's fingerprint is the same after the run
+as before it: an answer given while the tree changed matches neither state.
+
+Entries expire after ttl_seconds and the cache is bounded to max_entries
+with LRU eviction. Requests can bypass the cache individually.
+"""
+
+import asyncio
+import hashlib
+import os
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, List, Optional
+
+from .config import get_config
+
+
+# Max seconds for the git commands used to fingerprint a working directory
+GIT_TIMEOUT_SECONDS = 5
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+@dataclass
+class CacheStats:
+    """Result cache counters."""
+    enabled: bool
+    entries: int
+    max_entries: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    bypassed: int
+    uncacheable: int
+    changed: int  # Results not stored because the directory changed during the run
+    evictions: int
+    expirations: int
+
+
+@dataclass
+class _CacheEntry:
+    """A cached result and when it was stored."""
+    value: Any
+    stored_at: float
+
+
+def normalize_prompt(text: str) -> str:
+    """Collapse whitespace so formatting-only differences share a key."""
+    return _WHITESPACE.sub(" ", text or "").strip()
+
+
+async def _git(cwd: str, *args: str) -> Optional[bytes]:
+    """Run a git command, returning stdout or None on any failure."""
+    try:
+        process = await asyncio.create_subprocess_exec(
+            "git", *args,
+            cwd=cwd,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+    except OSError:
+        return None
+    try:
+        stdout, _ = await asyncio.wait_for(process.communicate(), timeout=GIT_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        return None
+    return stdout if process.returncode == 0 else None
+
+
+async def fingerprint_directory(working_directory: Optional[str]) -> Optional[str]:
+    """
+    Fingerprint a working directory as git HEAD plus a dirty-tree hash.
+    
+    Returns:
+        Hex digest, or None if the directory isn't inside a git repository
+    """
+    cwd = os.path.realpath(working_directory or ".")
+    head = await _git(cwd, "rev-parse", "HEAD")
+    if head is None:
+        return None
+    
+    diff, untracked = await asyncio.gather(
+        _git(cwd, "diff", "HEAD", "--binary"),
+        _git(cwd, "ls-files", "--others", "--exclude-standard", "-z"),
+    )
+    if diff is None or untracked is None:
+        return None
+    
+    digest = hashlib.sha256()
+    digest.update(cwd.encode())
+    digest.update(head.strip())
+    digest.update(diff)
+    for name in sorted(filter(None, untracked.split(b"\0"))):
+        digest.update(name)
+        try:
+            stat = os.stat(os.path.join(cwd, os.fsdecode(name)))
+            digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+        except OSError:
+            pass
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    TTL + LRU cache of agent execution results.
+    
+    Usage:
+        cache = get_result_cache()
+        key = await cache.make_key("claude", system_prompt, user_prompt, cwd)
+        result = cache.get(key) if key else None
+        if result is None:
+            result = ...  # run the agent
+            after = await cache.make_key("claude", system_prompt, user_prompt, cwd)
+            if key and result.success and after == key:
+                cache.put(key, result)
+    """
+    
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        ttl_seconds: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        agents: Optional[List[str]] = None,
+    ):
+        """
+        Initialize the cache.
+        
+        Args:
+            enabled: Turn caching on/off. Defaults to settings.execution.result_cache.enabled
+            ttl_seconds: Entry lifetime. Defaults to result_cache.ttl_seconds
+            max_entries: LRU bound. Defaults to result_cache.max_entries
+            agents: Agents whose results may be cached. Defaults to result_cache.agents
+        """
+        settings = get_config().settings.execution.get("result_cache", {})
+        if enabled is None:
+            enabled = settings.get("enabled", False)
+        if ttl_seconds is None:
+            ttl_seconds = settings.get("ttl_seconds", 600)
+        if max_entries is None:
+            max_entries = settings.get("max_entries", 256)
+        if agents is None:
+            agents = settings.get("agents", [])
+        
+        self.enabled = bool(enabled)
+        self.ttl_seconds = float(ttl_seconds)
+        self.max_entries = max(1, int(max_entries))
+        self.agents = set(agents)
+        
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "bypassed": 0,
+            "uncacheable": 0,
+            "changed": 0,
+            "evictions": 0,
+            "expirations": 0,
+        }
+    
+    def supports(self, agent_name: str) -> bool:
+        """Check whether this agent's results may be cached."""
+        return self.enabled and (not self.agents or agent_name in self.agents)
+    
+    async def make_key(
+        self,
+        agent_name: str,
+        system_prompt: str,
+        user_prompt: str,
+        working_directory: Optional[str],
+    ) -> Optional[str]:
+        """
+        Build the cache key for a request.
+        
+        Returns:
+            Hex digest, or None if the request can't be cached
+        """
+        fingerprint = await fingerprint_directory(working_directory)
+        if fingerprint is None:
+            self._counters["uncacheable"] += 1
+            return None
+        
+        digest = hashlib.sha256()
+        for part in (
+            agent_name,
+            normalize_prompt(system_prompt),
+            normalize_prompt(user_prompt),
+            fingerprint,
+        ):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Get a cached value, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self._counters["misses"] += 1
+            return None
+        if time.monotonic() - entry.stored_at > self.ttl_seconds:
+            del self._entries[key]
+            self._counters["expirations"] += 1
+            self._counters["misses"] += 1
+            return None
+        
+        self._entries.move_to_end(key)
+        self._counters["hits"] += 1
+        return entry.value
+    
+    def put(self, key: str, value: Any) -> None:
+        """Store a value, evicting the least recently used entries if full."""
+        self._entries[key] = _CacheEntry(value=value, stored_at=time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+    
+    def record_bypass(self) -> None:
+        """Count a request that skipped the cache on purpose."""
+        self._counters["bypassed"] += 1
+    
+    def record_changed(self) -> None:
+        """Count a result dropped because its working directory changed during the run."""
+        self._counters["changed"] += 1
+    
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+    
+    def get_stats(self) -> CacheStats:
+        """Get cache counters."""
+        return CacheStats(
+            enabled=self.enabled,
+            entries=len(self._entries),
+            max_entries=self.max_entries,
+            ttl_seconds=self.ttl_seconds,
+            **self._counters,
+        )
+
+
+# =============================================================================
+# SINGLETON INSTANCE
+# =============================================================================
+
+_cache: Optional[ResultCache] = None
+
+
+def get_result_cache() -> ResultCache:
+    """Get the global execution result cache instance."""
+    global _cache
+    if _cache is None:
+        _cache = ResultCache()
+    return _cache
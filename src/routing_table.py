@@ -0,0 +1,264 @@
+"""
+LastAgent Routing Table
+
+Learned routes from task features to agents.
+
+The council's choice mostly follows from what the task analyzer sees: the
+task type, the detected capabilities and the requires_* flags. Tasks with
+the same feature signature that the council keeps routing to the same
+agent, and that then succeed on it, don't need the council any more:
+
+  - every council decision is recorded under its signature (recent
+    history_size decisions)
+  - every execution outcome is recorded for the agent that ran it
+  - a signature is established once it has min_decisions decisions, at
+    least min_agreement of them for one agent, and that agent's success
+    rate is min_success_rate or better over at least min_outcomes runs
+
+Established signatures are answered from the table without LLM calls.
+A revalidate_fraction of those requests still goes to the full council;
+its decision is recorded like any other, so a council that changes its
+mind (or an agent that starts failing) takes the route out of the table.
+"""
+
+import random
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional
+
+from .config import get_config
+from .task_analyzer import TaskAnalysis
+
+
+@dataclass
+class Route:
+    """An agent the table answers with for a feature signature."""
+    signature: str
+    agent: str
+    agreement: float  # Share of recent council decisions for the agent
+    success_rate: Optional[float]  # Of the agent's recent runs (None = no runs yet)
+    decisions: int
+    outcomes: int
+    established: bool
+
+
+@dataclass
+class RoutingTableStats:
+    """Routing table counters."""
+    enabled: bool
+    signatures: int
+    established: int
+    hits: int
+    misses: int
+    revalidations: int
+    disagreements: int  # Revalidations where the council picked another agent
+
+
+@dataclass
+class _History:
+    """Recent council decisions and per-agent outcomes of one signature."""
+    decisions: Deque[str]
+    outcomes: Dict[str, Deque[bool]] = field(default_factory=dict)
+
+
+def feature_signature(analysis: TaskAnalysis) -> str:
+    """The task features the council's choice depends on, as a table key."""
+    flags = "".join(
+        "1" if flag else "0"
+        for flag in (
+            analysis.requires_working_directory,
+            analysis.requires_realtime_info,
+            analysis.requires_multimodal,
+            analysis.requires_long_context,
+        )
+    )
+    capabilities = ",".join(sorted(set(analysis.detected_capabilities)))
+    return f"{analysis.task_type.value}|{capabilities}|{flags}"
+
+
+class RoutingTable:
+    """
+    Feature signature -> agent routes learned from council decisions.
+    
+    Usage:
+        table = get_routing_table()
+        route = table.lookup(signature, available_agents)
+        if route and not table.should_revalidate():
+            agent = route.agent  # no council round
+        else:
+            agent = ...  # run the council
+            table.record_decision(signature, agent, expected=route.agent if route else None)
+        ...
+        table.record_outcome(signature, agent, success)
+    """
+    
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        history_size: Optional[int] = None,
+        min_decisions: Optional[int] = None,
+        min_agreement: Optional[float] = None,
+        min_outcomes: Optional[int] = None,
+        min_success_rate: Optional[float] = None,
+        revalidate_fraction: Optional[float] = None,
+        max_signatures: Optional[int] = None,
+        rng: Optional[random.Random] = None,
+    ):
+        """
+        Initialize the table.
+        
+        Args:
+            enabled: Answer from the table. Defaults to settings.execution.routing_table.enabled
+            history_size: Decisions/outcomes kept per signature.
+                Defaults to routing_table.history_size
+            min_decisions: Council decisions before a route is used.
+                Defaults to routing_table.min_decisions
+            min_agreement: Share of decisions for one agent. Defaults to routing_table.min_agreement
+            min_outcomes: Runs of the agent before a route is used.
+                Defaults to routing_table.min_outcomes
+            min_success_rate: Agent success rate required.
+                Defaults to routing_table.min_success_rate
+            revalidate_fraction: Share of table answers re-checked by the council.
+                Defaults to routing_table.revalidate_fraction
+            max_signatures: LRU bound on signatures. Defaults to routing_table.max_signatures
+            rng: Random source for revalidation sampling
+        """
+        settings = get_config().settings.execution.get("routing_table", {})
+        if enabled is None:
+            enabled = settings.get("enabled", True)
+        if history_size is None:
+            history_size = settings.get("history_size", 20)
+        if min_decisions is None:
+            min_decisions = settings.get("min_decisions", 5)
+        if min_agreement is None:
+            min_agreement = settings.get("min_agreement", 0.8)
+        if min_outcomes is None:
+            min_outcomes = settings.get("min_outcomes", 3)
+        if min_success_rate is None:
+            min_success_rate = settings.get("min_success_rate", 0.8)
+        if revalidate_fraction is None:
+            revalidate_fraction = settings.get("revalidate_fraction", 0.05)
+        if max_signatures is None:
+            max_signatures = settings.get("max_signatures", 512)
+        
+        self.enabled = bool(enabled)
+        self.history_size = max(1, int(history_size))
+        self.min_decisions = max(1, int(min_decisions))
+        self.min_agreement = float(min_agreement)
+        self.min_outcomes = max(0, int(min_outcomes))
+        self.min_success_rate = float(min_success_rate)
+        self.revalidate_fraction = min(max(float(revalidate_fraction), 0.0), 1.0)
+        self.max_signatures = max(1, int(max_signatures))
+        self._random = rng or random.Random()
+        
+        self._history: "OrderedDict[str, _History]" = OrderedDict()
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "revalidations": 0,
+            "disagreements": 0,
+        }
+    
+    def route(self, signature: str) -> Optional[Route]:
+        """The leading agent of a signature and whether its route is established."""
+        history = self._history.get(signature)
+        if history is None or not history.decisions:
+            return None
+        
+        counts: Dict[str, int] = {}
+        for agent in history.decisions:
+            counts[agent] = counts.get(agent, 0) + 1
+        agent = max(counts, key=counts.get)
+        agreement = counts[agent] / len(history.decisions)
+        outcomes = history.outcomes.get(agent, ())
+        success_rate = sum(outcomes) / len(outcomes) if outcomes else None
+        established = (
+            len(history.decisions) >= self.min_decisions
+            and agreement >= self.min_agreement
+            and len(outcomes) >= self.min_outcomes
+            and (success_rate is None or success_rate >= self.min_success_rate)
+        )
+        return Route(
+            signature=signature,
+            agent=agent,
+            agreement=round(agreement, 4),
+            success_rate=round(success_rate, 4) if success_rate is not None else None,
+            decisions=len(history.decisions),
+            outcomes=len(outcomes),
+            established=established,
+        )
+    
+    def lookup(self, signature: str, available_agents: List[str]) -> Optional[Route]:
+        """The established route for a signature, or None (counted as a miss)."""
+        route = self.route(signature) if self.enabled else None
+        if route is None or not route.established or route.agent not in available_agents:
+            self._counters["misses"] += 1
+            return None
+        self._history.move_to_end(signature)
+        self._counters["hits"] += 1
+        return route
+    
+    def should_revalidate(self) -> bool:
+        """Sample a table answer for re-checking by the full council."""
+        return self._random.random() < self.revalidate_fraction
+    
+    def record_decision(self, signature: str, agent: str, expected: Optional[str] = None) -> None:
+        """
+        Record a council decision.
+        
+        Args:
+            expected: The route's agent, when the decision revalidates a route
+        """
+        history = self._history.get(signature)
+        if history is None:
+            history = _History(decisions=deque(maxlen=self.history_size))
+            self._history[signature] = history
+            while len(self._history) > self.max_signatures:
+                self._history.popitem(last=False)
+        self._history.move_to_end(signature)
+        history.decisions.append(agent)
+        if expected is not None:
+            self._counters["revalidations"] += 1
+            if agent != expected:
+                self._counters["disagreements"] += 1
+    
+    def record_outcome(self, signature: str, agent: str, success: bool) -> None:
+        """Record how a run of an agent for a known signature went."""
+        history = self._history.get(signature)
+        if history is None:
+            return  # No council decision to learn from yet
+        outcomes = history.outcomes.setdefault(agent, deque(maxlen=self.history_size))
+        outcomes.append(bool(success))
+    
+    def get_routes(self) -> List[Route]:
+        """Current leading route of every signature, most recently used first."""
+        routes = [self.route(signature) for signature in reversed(self._history)]
+        return [route for route in routes if route is not None]
+    
+    def clear(self) -> None:
+        """Forget every route."""
+        self._history.clear()
+    
+    def get_stats(self) -> RoutingTableStats:
+        """Get table counters."""
+        return RoutingTableStats(
+            enabled=self.enabled,
+            signatures=len(self._history),
+            established=sum(1 for route in self.get_routes() if route.established),
+            **self._counters,
+        )
+
+
+# =============================================================================
+# SINGLETON INSTANCE
+# =============================================================================
+
+_table: Optional[RoutingTable] = None
+
+
+def get_routing_table() -> RoutingTable:
+    """Get the global routing table instance."""
+    global _table
+    if _table is None:
+        _table = RoutingTable()
+    return _table
@@ -0,0 +1,265 @@
+"""
+LastAgent Execution Scheduler
+
+Admission control in front of AgentExecutor.
+
+Every agent run is a full CLI subprocess (claude, aider, goose, ...), so
+running one per HTTP request thrashes the host under load. The scheduler
+enforces:
+  - a global concurrency limit (settings.yml -> execution.max_concurrent)
+  - optional per-agent limits (agents.yml -> <agent>.max_concurrent)
+  - a FIFO wait queue for everything above those limits
+
+Waiters are admitted in arrival order. A waiter whose agent is at its own
+limit does not hold up waiters for other agents queued behind it.
+
+A slot can also lock the task's working directory (src/directory_locks.py).
+The directory lock is taken first, so a task waiting for a busy repository
+holds no slot and never delays tasks on other repositories.
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Deque, Dict, List, Optional
+
+from .config import get_config
+from .directory_locks import READ, DirectoryLockManager, get_directory_locks, resolve_lock_path
+
+
+# Number of recent queue waits kept for metrics
+WAIT_SAMPLE_SIZE = 1000
+
+
+@dataclass
+class SchedulerLease:
+    """An admitted execution slot."""
+    agent_name: str
+    queue_wait_ms: float
+    lock_wait_ms: float = 0.0
+    lock_path: Optional[str] = None
+
+
+@dataclass
+class SchedulerStats:
+    """Point-in-time scheduler metrics."""
+    max_concurrent: int
+    in_flight: int
+    queued: int
+    in_flight_by_agent: Dict[str, int]
+    agent_limits: Dict[str, int]
+    admitted_total: int
+    queue_wait_ms_avg: float
+    queue_wait_ms_p95: float
+    queue_wait_ms_max: float
+
+
+@dataclass
+class _Waiter:
+    """A queued request for an execution slot."""
+    agent_name: str
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+class ExecutionScheduler:
+    """
+    Global + per-agent concurrency limiter with a FIFO wait queue.
+    
+    Usage:
+        scheduler = get_execution_scheduler()
+        async with scheduler.slot("aider", directory="/repo", mode=WRITE) as lease:
+            print(lease.lock_wait_ms, lease.queue_wait_ms)
+            ...  # run the CLI
+    """
+    
+    def __init__(
+        self,
+        max_concurrent: Optional[int] = None,
+        agent_limits: Optional[Dict[str, int]] = None,
+        locks: Optional[DirectoryLockManager] = None,
+    ):
+        """
+        Initialize the scheduler.
+        
+        Args:
+            max_concurrent: Global limit. Defaults to settings.execution.max_concurrent
+            agent_limits: Per-agent limits. Defaults to agents.yml max_concurrent values
+            locks: Directory lock manager. Defaults to get_directory_locks()
+        """
+        config = get_config()
+        if max_concurrent is None:
+            max_concurrent = config.settings.execution.get("max_concurrent", 3)
+        if agent_limits is None:
+            agent_limits = {
+                name: agent.max_concurrent
+                for name, agent in config.agents.items()
+                if agent.max_concurrent
+            }
+        
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.agent_limits: Dict[str, int] = dict(agent_limits)
+        self.locks = locks or get_directory_locks()
+        
+        self._in_flight = 0
+        self._in_flight_by_agent: Dict[str, int] = {}
+        self._queue: Deque[_Waiter] = deque()
+        self._admitted_total = 0
+        self._waits_ms: Deque[float] = deque(maxlen=WAIT_SAMPLE_SIZE)
+    
+    def _has_capacity(self, agent_name: str) -> bool:
+        """Check whether a slot for this agent can be granted right now."""
+        if self._in_flight >= self.max_concurrent:
+            return False
+        limit = self.agent_limits.get(agent_name)
+        if limit is not None and self._in_flight_by_agent.get(agent_name, 0) >= limit:
+            return False
+        return True
+    
+    def _grant(self, agent_name: str) -> None:
+        """Account for a newly admitted execution."""
+        self._in_flight += 1
+        self._in_flight_by_agent[agent_name] = self._in_flight_by_agent.get(agent_name, 0) + 1
+        self._admitted_total += 1
+    
+    def _dispatch(self) -> None:
+        """Admit queued waiters in FIFO order while capacity remains."""
+        if not self._queue:
+            return
+        remaining: Deque[_Waiter] = deque()
+        while self._queue:
+            waiter = self._queue.popleft()
+            if waiter.future.done():
+                continue  # Cancelled while queued
+            if self._has_capacity(waiter.agent_name):
+                self._grant(waiter.agent_name)
+                waiter.future.set_result(None)
+            else:
+                remaining.append(waiter)
+            if self._in_flight >= self.max_concurrent:
+                break
+        remaining.extend(self._queue)
+        self._queue = remaining
+    
+    async def acquire(self, agent_name: str) -> float:
+        """
+        Wait for an execution slot.
+        
+        Args:
+            agent_name: Agent about to be executed
+        
+        Returns:
+            Time spent waiting in the queue, in milliseconds
+        """
+        start = time.perf_counter()
+        
+        # Fast path: nobody queued and capacity available
+        if not self._queue and self._has_capacity(agent_name):
+            self._grant(agent_name)
+            self._waits_ms.append(0.0)
+            return 0.0
+        
+        waiter = _Waiter(
+            agent_name=agent_name,
+            future=asyncio.get_running_loop().create_future(),
+        )
+        self._queue.append(waiter)
+        self._dispatch()
+        
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Admitted just as the caller went away - hand the slot back
+                self.release(agent_name)
+            else:
+                try:
+                    self._queue.remove(waiter)
+                except ValueError:
+                    pass
+            raise
+        
+        wait_ms = (time.perf_counter() - start) * 1000
+        self._waits_ms.append(wait_ms)
+        return wait_ms
+    
+    def release(self, agent_name: str) -> None:
+        """Release a slot previously obtained with acquire()."""
+        self._in_flight = max(0, self._in_flight - 1)
+        count = self._in_flight_by_agent.get(agent_name, 0) - 1
+        if count > 0:
+            self._in_flight_by_agent[agent_name] = count
+        else:
+            self._in_flight_by_agent.pop(agent_name, None)
+        self._dispatch()
+    
+    @asynccontextmanager
+    async def slot(
+        self,
+        agent_name: str,
+        directory: Optional[str] = None,
+        mode: str = READ,
+    ) -> AsyncIterator[SchedulerLease]:
+        """
+        Hold an execution slot for the duration of the block.
+        
+        Args:
+            agent_name: Agent about to be executed
+            directory: Working directory to lock first (None = no lock)
+            mode: READ (shared) or WRITE (exclusive) directory lock
+        """
+        lock_path = resolve_lock_path(directory) if directory is not None else None
+        lock_wait_ms = await self.locks.acquire(lock_path, mode) if lock_path else 0.0
+        try:
+            wait_ms = await self.acquire(agent_name)
+            try:
+                yield SchedulerLease(
+                    agent_name=agent_name,
+                    queue_wait_ms=round(wait_ms, 2),
+                    lock_wait_ms=round(lock_wait_ms, 2),
+                    lock_path=lock_path,
+                )
+            finally:
+                self.release(agent_name)
+        finally:
+            if lock_path:
+                self.locks.release(lock_path, mode)
+    
+    def get_stats(self) -> SchedulerStats:
+        """Get current scheduler metrics, including queue-wait percentiles."""
+        waits: List[float] = sorted(self._waits_ms)
+        if waits:
+            avg = sum(waits) / len(waits)
+            p95 = waits[min(len(waits) - 1, int(len(waits) * 0.95))]
+            peak = waits[-1]
+        else:
+            avg = p95 = peak = 0.0
+        
+        return SchedulerStats(
+            max_concurrent=self.max_concurrent,
+            in_flight=self._in_flight,
+            queued=len(self._queue),
+            in_flight_by_agent=dict(self._in_flight_by_agent),
+            agent_limits=dict(self.agent_limits),
+            admitted_total=self._admitted_total,
+            queue_wait_ms_avg=round(avg, 2),
+            queue_wait_ms_p95=round(p95, 2),
+            queue_wait_ms_max=round(peak, 2),
+        )
+
+
+# =============================================================================
+# SINGLETON INSTANCE
+# =============================================================================
+
+_scheduler: Optional[ExecutionScheduler] = None
+
+
+def get_execution_scheduler() -> ExecutionScheduler:
+    """Get the global execution scheduler instance."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = ExecutionScheduler()
+    return _scheduler
@@ -0,0 +1,181 @@
+"""
+LastAgent Council Selection Cache
+
+Exact-match cache of council agent selections.
+
+A council selection costs up to 9 LLM calls, yet CI bots and retries send
+the same task over and over. The selection only depends on the task and on
+what the council can choose from, so the key covers:
+
+  - normalized user and system prompts (whitespace collapsed)
+  - the agent registry version: configured agents (command, capabilities,
+    strengths), which of them are installed, and the council models
+
+Installing or removing an agent CLI, or editing agents.yml / council.yml,
+changes the registry version, so stale selections are never served.
+
+Only real council verdicts are stored; local-matching fallbacks (council
+unavailable or failing) are cheap and should be retried. Entries expire
+after ttl_seconds and the cache is bounded to max_entries with LRU
+eviction. Requests can bypass the cache individually (bypass_cache).
+"""
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, List, Optional
+
+from .config import ConfigLoader, get_config
+from .result_cache import normalize_prompt
+
+
+@dataclass
+class SelectionCacheStats:
+    """Selection cache counters."""
+    enabled: bool
+    entries: int
+    max_entries: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    bypassed: int
+    evictions: int
+    expirations: int
+
+
+@dataclass
+class _CacheEntry:
+    """A cached selection and when it was stored."""
+    value: Any
+    stored_at: float
+
+
+def registry_version(config: ConfigLoader, available_agents: List[str]) -> str:
+    """Hash of everything besides the prompt that the council decides on."""
+    registry = {
+        "agents": {
+            name: agent.model_dump(include={"command", "capabilities", "strengths"})
+            for name, agent in config.agents.items()
+        },
+        "available": sorted(available_agents),
+        "council": [member.model for member in config.council.council_models],
+        "chairman": config.council.chairman.model,
+    }
+    return hashlib.sha256(json.dumps(registry, sort_keys=True).encode()).hexdigest()[:16]
+
+
+class SelectionCache:
+    """
+    TTL + LRU cache of council selections.
+    
+    Usage:
+        cache = get_selection_cache()
+        key = cache.make_key(user_prompt, system_prompt, version)
+        selection = cache.get(key)
+        if selection is None:
+            selection = ...  # run the council
+            cache.put(key, selection)
+    """
+    
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        ttl_seconds: Optional[float] = None,
+        max_entries: Optional[int] = None,
+    ):
+        """
+        Initialize the cache.
+        
+        Args:
+            enabled: Turn caching on/off. Defaults to settings.execution.selection_cache.enabled
+            ttl_seconds: Entry lifetime. Defaults to selection_cache.ttl_seconds
+            max_entries: LRU bound. Defaults to selection_cache.max_entries
+        """
+        settings = get_config().settings.execution.get("selection_cache", {})
+        if enabled is None:
+            enabled = settings.get("enabled", True)
+        if ttl_seconds is None:
+            ttl_seconds = settings.get("ttl_seconds", 900)
+        if max_entries is None:
+            max_entries = settings.get("max_entries", 1024)
+        
+        self.enabled = bool(enabled)
+        self.ttl_seconds = float(ttl_seconds)
+        self.max_entries = max(1, int(max_entries))
+        
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "bypassed": 0,
+            "evictions": 0,
+            "expirations": 0,
+        }
+    
+    @staticmethod
+    def make_key(user_prompt: str, system_prompt: str, version: str) -> str:
+        """Build the cache key for a selection request."""
+        digest = hashlib.sha256()
+        for part in (normalize_prompt(user_prompt), normalize_prompt(system_prompt), version):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Get a cached selection, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self._counters["misses"] += 1
+            return None
+        if time.monotonic() - entry.stored_at > self.ttl_seconds:
+            del self._entries[key]
+            self._counters["expirations"] += 1
+            self._counters["misses"] += 1
+            return None
+        
+        self._entries.move_to_end(key)
+        self._counters["hits"] += 1
+        return entry.value
+    
+    def put(self, key: str, value: Any) -> None:
+        """Store a selection, evicting the least recently used entries if full."""
+        self._entries[key] = _CacheEntry(value=value, stored_at=time.monotonic())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+    
+    def record_bypass(self) -> None:
+        """Count a request that skipped the cache on purpose."""
+        self._counters["bypassed"] += 1
+    
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+    
+    def get_stats(self) -> SelectionCacheStats:
+        """Get cache counters."""
+        return SelectionCacheStats(
+            enabled=self.enabled,
+            entries=len(self._entries),
+            max_entries=self.max_entries,
+            ttl_seconds=self.ttl_seconds,
+            **self._counters,
+        )
+
+
+# =============================================================================
+# SINGLETON INSTANCE
+# =============================================================================
+
+_cache: Optional[SelectionCache] = None
+
+
+def get_selection_cache() -> SelectionCache:
+    """Get the global council selection cache instance."""
+    global _cache
+    if _cache is None:
+        _cache = SelectionCache()
+    return _cache
@@ -0,0 +1,313 @@
+"""
+LastAgent Similarity Routing Cache
+
+Approximate cache of council selections for near-duplicate tasks.
+
+"Fix the failing test in utils.py" and "fix the failing tests in
+parser.py" should route the same way, but the exact selection cache
+(src/selection_cache.py) treats them as different tasks. This cache finds
+earlier tasks whose prompts are similar enough and reuses their selection:
+
+  - prompts are normalized (lowercased; file paths and numbers become
+    placeholders) and split into word shingles
+  - a MinHash signature of the shingles is indexed with LSH banding, so a
+    lookup only compares against prompts that share a band
+  - candidates are verified by exact Jaccard similarity of their shingles;
+    the best one at or above the threshold is a hit
+
+Matches are scoped: the task type, system prompt and agent registry
+version must be identical, only the user prompt may differ. Pure Python,
+no embedding service.
+
+Entries expire after ttl_seconds and the index is bounded to max_entries
+with LRU eviction.
+"""
+
+import hashlib
+import random
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from .config import get_config
+from .result_cache import normalize_prompt
+
+
+# Modulus for the MinHash permutations (Mersenne prime 2^61 - 1)
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+_TOKEN = re.compile(r"[\w./\\:-]+")
+_PATH = re.compile(r"[/\\]|^[\w-]+\.[a-z][a-z0-9]{0,4}$")
+_NUMBER = re.compile(r"^\d[\d.,:-]*$")
+
+# (scope, band number, signature rows) - prompts sharing one are candidates
+BandKey = Tuple[str, int, Tuple[int, ...]]
+
+
+@dataclass
+class SimilarityCacheStats:
+    """Similarity cache counters."""
+    enabled: bool
+    entries: int
+    max_entries: int
+    threshold: float
+    hits: int
+    misses: int
+    skipped: int  # Prompts too short to compare
+    evictions: int
+    expirations: int
+
+
+@dataclass
+class _Entry:
+    """An indexed prompt and its cached value."""
+    shingles: FrozenSet[int]
+    bands: List[BandKey]
+    value: Any
+    stored_at: float = field(default_factory=time.monotonic)
+
+
+def tokenize(text: str) -> List[str]:
+    """Normalized words; file paths and numbers become placeholders."""
+    tokens = []
+    for token in _TOKEN.findall(normalize_prompt(text).lower()):
+        token = token.strip(".:-")
+        if not token:
+            continue
+        if _PATH.search(token):
+            token = "<path>"
+        elif _NUMBER.match(token):
+            token = "<num>"
+        tokens.append(token)
+    return tokens
+
+
+def shingles(tokens: List[str], size: int) -> FrozenSet[int]:
+    """Hashes of the word n-grams of a token list."""
+    if len(tokens) < size:
+        size = max(1, len(tokens))
+    return frozenset(
+        int.from_bytes(
+            hashlib.blake2b(" ".join(tokens[i:i + size]).encode(), digest_size=4).digest(),
+            "big",
+        )
+        for i in range(len(tokens) - size + 1)
+    )
+
+
+def jaccard(a: FrozenSet[int], b: FrozenSet[int]) -> float:
+    """Jaccard similarity of two shingle sets."""
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class SimilarityCache:
+    """
+    MinHash/LSH index of prompts mapping to cached values.
+    
+    Usage:
+        cache = get_similarity_cache()
+        match = cache.lookup(user_prompt, scope)
+        if match is not None:
+            selection, similarity = match
+        else:
+            selection = ...  # run the council
+            cache.put(user_prompt, scope, selection)
+    """
+    
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        threshold: Optional[float] = None,
+        num_perm: Optional[int] = None,
+        bands: Optional[int] = None,
+        shingle_size: Optional[int] = None,
+        min_tokens: Optional[int] = None,
+        ttl_seconds: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        seed: int = 1,
+    ):
+        """
+        Initialize the cache.
+        
+        Args:
+            enabled: Turn the cache on/off.
+                Defaults to settings.execution.selection_cache.similarity.enabled
+            threshold: Minimum Jaccard similarity for a hit. Defaults to similarity.threshold
+            num_perm: MinHash signature length. Defaults to similarity.num_perm
+            bands: LSH bands (num_perm must divide evenly). Defaults to similarity.bands
+            shingle_size: Words per shingle. Defaults to similarity.shingle_size
+            min_tokens: Shorter prompts are left to the exact cache.
+                Defaults to similarity.min_tokens
+            ttl_seconds: Entry lifetime. Defaults to selection_cache.ttl_seconds
+            max_entries: LRU bound. Defaults to similarity.max_entries
+            seed: Seed of the MinHash permutations
+        """
+        cache_settings = get_config().settings.execution.get("selection_cache", {})
+        settings = cache_settings.get("similarity", {})
+        if enabled is None:
+            enabled = settings.get("enabled", True)
+        if threshold is None:
+            threshold = settings.get("threshold", 0.8)
+        if num_perm is None:
+            num_perm = settings.get("num_perm", 64)
+        if bands is None:
+            bands = settings.get("bands", 16)
+        if shingle_size is None:
+            shingle_size = settings.get("shingle_size", 1)
+        if min_tokens is None:
+            min_tokens = settings.get("min_tokens", 4)
+        if ttl_seconds is None:
+            ttl_seconds = cache_settings.get("ttl_seconds", 900)
+        if max_entries is None:
+            max_entries = settings.get("max_entries", 2048)
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands})")
+        
+        self.enabled = bool(enabled)
+        self.threshold = float(threshold)
+        self.num_perm = int(num_perm)
+        self.bands = int(bands)
+        self.rows = self.num_perm // self.bands
+        self.shingle_size = max(1, int(shingle_size))
+        self.min_tokens = int(min_tokens)
+        self.ttl_seconds = float(ttl_seconds)
+        self.max_entries = max(1, int(max_entries))
+        
+        rng = random.Random(seed)
+        self._perms = [
+            (rng.randrange(1, _PRIME), rng.randrange(0, _PRIME))
+            for _ in range(self.num_perm)
+        ]
+        self._entries: "OrderedDict[int, _Entry]" = OrderedDict()
+        self._buckets: Dict[BandKey, Set[int]] = {}
+        self._next_id = 0
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "skipped": 0,
+            "evictions": 0,
+            "expirations": 0,
+        }
+    
+    def signature(self, shingle_set: FrozenSet[int]) -> List[int]:
+        """MinHash signature of a shingle set."""
+        return [
+            min(((a * s + b) % _PRIME) & _MAX_HASH for s in shingle_set)
+            for a, b in self._perms
+        ]
+    
+    def _index(self, text: str, scope: str) -> Optional[Tuple[FrozenSet[int], List[BandKey]]]:
+        """Shingles and LSH band keys of a prompt, or None if it's too short."""
+        tokens = tokenize(text)
+        if len(tokens) < self.min_tokens:
+            return None
+        shingle_set = shingles(tokens, self.shingle_size)
+        sig = self.signature(shingle_set)
+        bands = [
+            (scope, band, tuple(sig[band * self.rows:(band + 1) * self.rows]))
+            for band in range(self.bands)
+        ]
+        return shingle_set, bands
+    
+    def lookup(self, text: str, scope: str) -> Optional[Tuple[Any, float]]:
+        """
+        Find the most similar earlier prompt in the same scope.
+        
+        Returns:
+            (cached value, Jaccard similarity), or None below the threshold
+        """
+        indexed = self._index(text, scope)
+        if indexed is None:
+            self._counters["skipped"] += 1
+            return None
+        shingle_set, bands = indexed
+        
+        candidates: Set[int] = set()
+        for key in bands:
+            candidates.update(self._buckets.get(key, ()))
+        
+        best: Optional[Tuple[int, float]] = None
+        now = time.monotonic()
+        for entry_id in candidates:
+            entry = self._entries.get(entry_id)
+            if entry is None:
+                continue
+            if now - entry.stored_at > self.ttl_seconds:
+                self._remove(entry_id)
+                self._counters["expirations"] += 1
+                continue
+            similarity = jaccard(shingle_set, entry.shingles)
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (entry_id, similarity)
+        
+        if best is None:
+            self._counters["misses"] += 1
+            return None
+        entry_id, similarity = best
+        self._entries.move_to_end(entry_id)
+        self._counters["hits"] += 1
+        return self._entries[entry_id].value, round(similarity, 4)
+    
+    def put(self, text: str, scope: str, value: Any) -> bool:
+        """Index a prompt's value. Returns False if the prompt is too short."""
+        indexed = self._index(text, scope)
+        if indexed is None:
+            return False
+        shingle_set, bands = indexed
+        
+        entry_id = self._next_id
+        self._next_id += 1
+        self._entries[entry_id] = _Entry(shingles=shingle_set, bands=bands, value=value)
+        for key in bands:
+            self._buckets.setdefault(key, set()).add(entry_id)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self._counters["evictions"] += 1
+        return True
+    
+    def _remove(self, entry_id: int) -> None:
+        """Drop an entry and its bucket memberships."""
+        entry = self._entries.pop(entry_id, None)
+        if entry is None:
+            return
+        for key in entry.bands:
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(entry_id)
+                if not bucket:
+                    del self._buckets[key]
+    
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+        self._buckets.clear()
+    
+    def get_stats(self) -> SimilarityCacheStats:
+        """Get cache counters."""
+        return SimilarityCacheStats(
+            enabled=self.enabled,
+            entries=len(self._entries),
+            max_entries=self.max_entries,
+            threshold=self.threshold,
+            **self._counters,
+        )
+
+
+# =============================================================================
+# SINGLETON INSTANCE
+# =============================================================================
+
+_cache: Optional[SimilarityCache] = None
+
+
+def get_similarity_cache() -> SimilarityCache:
+    """Get the global similarity routing cache instance."""
+    global _cache
+    if _cache is None:
+        _cache = SimilarityCache()
+    return _cache
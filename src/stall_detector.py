@@ -0,0 +1,280 @@
+"""
+LastAgent Stall Detector
+
+Aborts agent runs that have gone silent long before their timeout.
+
+An agent CLI waiting on a prompt it will never get (an aider confirmation,
+an auth or login prompt) prints nothing and uses no CPU, yet holds its
+execution slot until ExecutionContext.timeout (300 s by default). While an
+agent runs, a StallWatch checks every check_interval seconds whether it is
+still making progress:
+
+  - output: stdout/stderr grew since the last check
+  - CPU: the process tree used at least cpu_fraction of a core since the
+    last check (from src/resource_usage.py)
+
+Once neither happened for the agent's stall_timeout (agents.yml, falling
+back to settings.execution.stall_detection.idle_seconds) the run is
+aborted with AgentStalledError. The process tree is killed like on a
+timeout, the stall is recorded in the ErrorTracker as STALLED, and the
+orchestrator fails over to the next agent.
+
+CLIs that print only at exit (claude -p, gemini) are silent while they
+wait for the model, so their stall_timeout must exceed their longest
+silent model call.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from .config import get_config
+from .resource_usage import ResourceMonitor, get_resource_monitor
+
+# Enterprise structured logging
+try:
+    from src.observability import get_logger, get_error_tracker, ErrorClassification
+    from src.observability.logging_config import get_trace_id
+except ImportError:
+    from .observability import get_logger, get_error_tracker, ErrorClassification
+    from .observability.logging_config import get_trace_id
+
+
+T = TypeVar("T")
+
+
+class AgentStalledError(asyncio.TimeoutError):
+    """An agent produced no output and used no CPU for its stall timeout."""
+    
+    def __init__(self, agent_name: str, idle_seconds: float):
+        super().__init__(
+            f"Agent stalled: no output or CPU activity for {idle_seconds:.0f}s"
+        )
+        self.agent_name = agent_name
+        self.idle_seconds = idle_seconds
+
+
+@dataclass
+class StallStats:
+    """Stall detector counters."""
+    enabled: bool
+    idle_seconds: float
+    check_interval: float
+    watched: int
+    stalled: int
+
+
+class StallWatch:
+    """
+    Activity tracking for one running agent process.
+    
+    Call check() with the bytes of output produced so far; it returns True
+    once the run has been idle for the threshold.
+    """
+    
+    def __init__(
+        self,
+        agent_name: str,
+        pid: int,
+        threshold: float,
+        cpu_fraction: float,
+        monitor: ResourceMonitor,
+    ):
+        """
+        Start watching a process.
+        
+        Args:
+            agent_name: Agent being executed
+            pid: Process group leader tracked by the resource monitor
+            threshold: Idle seconds before the run counts as stalled
+            cpu_fraction: CPU use (cores) between checks that counts as activity
+            monitor: Source of CPU usage
+        """
+        self.agent_name = agent_name
+        self.pid = pid
+        self.threshold = threshold
+        self.cpu_fraction = cpu_fraction
+        self.monitor = monitor
+        
+        now = time.monotonic()
+        self.last_activity = now
+        self._last_check = now
+        self._output_bytes = 0
+        self._cpu_seconds = 0.0
+    
+    @property
+    def idle_seconds(self) -> float:
+        """Seconds since output or CPU activity was last seen."""
+        return time.monotonic() - self.last_activity
+    
+    def check(self, output_bytes: int) -> bool:
+        """Record activity since the last check; True if the run is stalled."""
+        now = time.monotonic()
+        usage = self.monitor.get(self.pid)
+        cpu_seconds = (
+            usage.user_cpu_seconds + usage.system_cpu_seconds if usage else self._cpu_seconds
+        )
+        elapsed = max(now - self._last_check, 1e-6)
+        
+        if (
+            output_bytes != self._output_bytes
+            or (cpu_seconds - self._cpu_seconds) / elapsed >= self.cpu_fraction
+        ):
+            self.last_activity = now
+        self._output_bytes = output_bytes
+        self._cpu_seconds = cpu_seconds
+        self._last_check = now
+        return now - self.last_activity >= self.threshold
+
+
+class StallDetector:
+    """
+    Inactivity watchdog for agent executions.
+    
+    Usage:
+        detector = get_stall_detector()
+        watch = detector.watch("aider", process.pid)
+        result = await detector.supervise(watch, communicate(), lambda: buffer.size)
+    """
+    
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        idle_seconds: Optional[float] = None,
+        check_interval: Optional[float] = None,
+        cpu_fraction: Optional[float] = None,
+        monitor: Optional[ResourceMonitor] = None,
+    ):
+        """
+        Initialize the detector.
+        
+        Args:
+            enabled: Turn stall detection on/off.
+                Defaults to settings.execution.stall_detection.enabled
+            idle_seconds: Default stall threshold (agents.yml stall_timeout
+                overrides it per agent). Defaults to stall_detection.idle_seconds
+            check_interval: Seconds between activity checks.
+                Defaults to stall_detection.check_interval
+            cpu_fraction: Minimum CPU use (cores) that counts as activity.
+                Defaults to stall_detection.cpu_fraction
+            monitor: CPU usage source. Defaults to get_resource_monitor()
+        """
+        self.config = get_config()
+        settings = self.config.settings.execution.get("stall_detection", {})
+        if enabled is None:
+            enabled = settings.get("enabled", True)
+        if idle_seconds is None:
+            idle_seconds = settings.get("idle_seconds", 120)
+        if check_interval is None:
+            check_interval = settings.get("check_interval", 5)
+        if cpu_fraction is None:
+            cpu_fraction = settings.get("cpu_fraction", 0.01)
+        
+        self.enabled = bool(enabled)
+        self.idle_seconds = float(idle_seconds)
+        self.check_interval = float(check_interval)
+        self.cpu_fraction = float(cpu_fraction)
+        self.monitor = monitor or get_resource_monitor()
+        self._log = get_logger("stall_detector")
+        self._counters = {"watched": 0, "stalled": 0}
+    
+    def threshold(self, agent_name: str) -> Optional[float]:
+        """Idle seconds before an agent's run is stalled (None = not watched)."""
+        if not self.enabled:
+            return None
+        try:
+            stall_timeout = self.config.get_agent(agent_name).stall_timeout
+        except KeyError:
+            stall_timeout = None
+        threshold = self.idle_seconds if stall_timeout is None else stall_timeout
+        return threshold if threshold > 0 else None
+    
+    def watch(self, agent_name: str, pid: int) -> Optional[StallWatch]:
+        """Start watching a run, or None if stall detection is off for the agent."""
+        threshold = self.threshold(agent_name)
+        if threshold is None:
+            return None
+        self._counters["watched"] += 1
+        return StallWatch(agent_name, pid, threshold, self.cpu_fraction, self.monitor)
+    
+    async def supervise(
+        self,
+        watch: Optional[StallWatch],
+        awaitable: Awaitable[T],
+        output_bytes: Callable[[], int],
+    ) -> T:
+        """
+        Await a run, aborting it if it stalls.
+        
+        Raises:
+            AgentStalledError: If the watch reports a stall first; the
+                awaitable is cancelled
+        """
+        if watch is None:
+            return await awaitable
+        
+        task = asyncio.ensure_future(awaitable)
+        try:
+            while True:
+                done, _ = await asyncio.wait({task}, timeout=self.check_interval)
+                if done:
+                    return task.result()
+                if watch.check(output_bytes()):
+                    raise self.stalled(watch)
+        finally:
+            if not task.done():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+    
+    def stalled(self, watch: StallWatch) -> AgentStalledError:
+        """Record a stalled run and build the error to abort it with."""
+        error = AgentStalledError(watch.agent_name, watch.idle_seconds)
+        self._counters["stalled"] += 1
+        self._log.warning(
+            "agent_stalled",
+            agent=watch.agent_name,
+            pid=watch.pid,
+            idle_seconds=round(watch.idle_seconds, 1),
+            threshold=watch.threshold,
+        )
+        get_error_tracker().record_error(
+            trace_id=get_trace_id() or "",
+            error_type=type(error).__name__,
+            message=str(error),
+            classification=ErrorClassification.STALLED,
+            recoverable=True,
+            phase="execution",
+            agent=watch.agent_name,
+            component="executor",
+            execution_context={
+                "pid": watch.pid,
+                "idle_seconds": round(watch.idle_seconds, 1),
+                "threshold": watch.threshold,
+            },
+        )
+        return error
+    
+    def get_stats(self) -> StallStats:
+        """Get detector counters."""
+        return StallStats(
+            enabled=self.enabled,
+            idle_seconds=self.idle_seconds,
+            check_interval=self.check_interval,
+            **self._counters,
+        )
+
+
+# =============================================================================
+# SINGLETON INSTANCE
+# =============================================================================
+
+_detector: Optional[StallDetector] = None
+
+
+def get_stall_detector() -> StallDetector:
+    """Get the global stall detector instance."""
+    global _detector
+    if _detector is None:
+        _detector = StallDetector()
+    return _detector
@@ -0,0 +1,171 @@
+"""
+LastAgent Adaptive Timeouts
+
+Derives each run's timeout from the agent's observed latency.
+
+A fixed 300 s timeout is far too long for a quick Gemini answer (a hung run
+holds its slot for minutes) and can be too short for long Goose workflows.
+When a task doesn't set ExecutionContext.timeout, the effective timeout is:
+
+  1. an override set through the API (PUT /v1/agents/{agent}/timeout),
+     for the task type or for the agent as a whole
+  2. adaptive: latency percentile (p99) x factor, clamped to
+     [min_seconds, max_seconds], from the agent's runs of this task type,
+     else from all of its runs (needs latency.min_samples runs). Timed-out
+     runs count at their timeout, so once more than 1% of recent runs time
+     out the p99 reaches the timeout and the next one is factor x longer
+  3. the agent's default (agents.yml timeout), else default_seconds
+
+Configured in settings.yml -> execution.timeouts.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from .config import get_config
+from .latency import LatencyTracker, get_latency_tracker
+
+
+# (agent_name, task_type) - task_type None applies to every task type
+OverrideKey = Tuple[str, Optional[str]]
+
+
+@dataclass
+class EffectiveTimeout:
+    """The timeout a run gets, and where it came from."""
+    agent_name: str
+    task_type: Optional[str]
+    seconds: float
+    source: str  # "override", "adaptive" or "default"
+    percentile_ms: Optional[float] = None  # Latency the adaptive value is based on
+    samples: int = 0
+
+
+class TimeoutPolicy:
+    """
+    Resolves effective per-agent, per-task-type timeouts.
+    
+    Usage:
+        policy = get_timeout_policy()
+        timeout = policy.resolve("gemini", task_type="research")
+        print(timeout.seconds, timeout.source)
+    """
+    
+    def __init__(
+        self,
+        adaptive: Optional[bool] = None,
+        percentile: Optional[float] = None,
+        factor: Optional[float] = None,
+        min_seconds: Optional[float] = None,
+        max_seconds: Optional[float] = None,
+        default_seconds: Optional[float] = None,
+        latency: Optional[LatencyTracker] = None,
+    ):
+        """
+        Initialize the policy.
+        
+        Args:
+            adaptive: Derive timeouts from latency history.
+                Defaults to settings.execution.timeouts.adaptive
+            percentile: Latency percentile used. Defaults to timeouts.percentile
+            factor: Multiplier applied to the percentile. Defaults to timeouts.factor
+            min_seconds: Lower clamp. Defaults to timeouts.min_seconds
+            max_seconds: Upper clamp. Defaults to timeouts.max_seconds
+            default_seconds: Timeout without history or agent default.
+                Defaults to timeouts.default_seconds
+            latency: Latency history. Defaults to get_latency_tracker()
+        """
+        self.config = get_config()
+        settings = self.config.settings.execution.get("timeouts", {})
+        if adaptive is None:
+            adaptive = settings.get("adaptive", True)
+        if percentile is None:
+            percentile = settings.get("percentile", 99)
+        if factor is None:
+            factor = settings.get("factor", 3)
+        if min_seconds is None:
+            min_seconds = settings.get("min_seconds", 30)
+        if max_seconds is None:
+            max_seconds = settings.get("max_seconds", 1800)
+        if default_seconds is None:
+            default_seconds = settings.get("default_seconds", 300)
+        
+        self.adaptive = bool(adaptive)
+        self.percentile = float(percentile)
+        self.factor = float(factor)
+        self.min_seconds = float(min_seconds)
+        self.max_seconds = max(float(max_seconds), self.min_seconds)
+        self.default_seconds = float(default_seconds)
+        self.latency = latency or get_latency_tracker()
+        self._overrides: Dict[OverrideKey, float] = {}
+    
+    def resolve(self, agent_name: str, task_type: Optional[str] = None) -> EffectiveTimeout:
+        """Effective timeout for a run of an agent on a task type."""
+        for key in ((agent_name, task_type), (agent_name, None)):
+            if key in self._overrides:
+                return EffectiveTimeout(agent_name, task_type, self._overrides[key], "override")
+        
+        if self.adaptive:
+            for scope in ([task_type] if task_type else []) + [None]:
+                latency_ms = self.latency.percentile(agent_name, self.percentile, scope)
+                if latency_ms is None:
+                    continue
+                seconds = latency_ms / 1000 * self.factor
+                seconds = min(max(seconds, self.min_seconds), self.max_seconds)
+                return EffectiveTimeout(
+                    agent_name,
+                    task_type,
+                    round(seconds, 1),
+                    "adaptive",
+                    percentile_ms=round(latency_ms, 2),
+                    samples=self.latency.sample_count(agent_name, scope),
+                )
+        
+        return EffectiveTimeout(agent_name, task_type, self._default(agent_name), "default")
+    
+    def _default(self, agent_name: str) -> float:
+        """Agent default from agents.yml, else settings default."""
+        try:
+            agent_timeout = self.config.get_agent(agent_name).timeout
+        except KeyError:
+            agent_timeout = None
+        return float(agent_timeout) if agent_timeout else self.default_seconds
+    
+    def set_override(
+        self,
+        agent_name: str,
+        seconds: float,
+        task_type: Optional[str] = None,
+    ) -> None:
+        """Pin an agent's timeout (for one task type, or all of them)."""
+        if seconds <= 0:
+            raise ValueError("Timeout must be positive")
+        self._overrides[(agent_name, task_type)] = float(seconds)
+    
+    def clear_override(self, agent_name: str, task_type: Optional[str] = None) -> bool:
+        """Remove an override. Returns False if there was none."""
+        return self._overrides.pop((agent_name, task_type), None) is not None
+    
+    def get_all(self, task_types: Optional[List[str]] = None) -> List[EffectiveTimeout]:
+        """Effective timeouts of every configured agent, overall and per task type."""
+        task_types = task_types or []
+        return [
+            self.resolve(agent_name, task_type)
+            for agent_name in self.config.get_agent_names()
+            for task_type in [None] + task_types
+        ]
+
+
+# =============================================================================
+# SINGLETON INSTANCE
+# =============================================================================
+
+_policy: Optional[TimeoutPolicy] = None
+
+
+def get_timeout_policy() -> TimeoutPolicy:
+    """Get the global timeout policy instance."""
+    global _policy
+    if _policy is None:
+        _policy = TimeoutPolicy()
+    return _policy
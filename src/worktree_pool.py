@@ -0,0 +1,390 @@
+"""
+LastAgent Git Worktree Pool
+
+Isolated checkouts for agents that share a repository.
+
+Two coding tasks on the same working_directory would edit the same files
+and trample each other. In worktree isolation mode each task instead
+leases a git worktree of the repository from a per-repo pool:
+
+  1. lease: take an idle worktree (or create one with `git worktree add`)
+     and check out the repository's current HEAD, detached and clean
+  2. the agent runs in the worktree (same relative subdirectory)
+  3. release: if the agent changed anything, commit it and point a branch
+     (lastagent/<agent>-<id>) at the commit - the "merge back" - then reset
+     the worktree and return it to the pool
+
+A repository keeps pool_size worktrees, leased ones included: the pool is
+topped up with idle worktrees only while fewer than pool_size are leased or
+idle, and a released worktree is kept (and reused first) unless that would
+exceed pool_size.
+
+Worktrees start from HEAD: uncommitted changes in the main checkout are not
+visible to isolated agents. Directories outside git run in place.
+"""
+
+import asyncio
+import hashlib
+import os
+import shutil
+import tempfile
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from .config import get_config
+
+# Enterprise structured logging
+try:
+    from src.observability import get_logger
+except ImportError:
+    from .observability import get_logger
+
+
+# Max seconds for a single git command
+GIT_TIMEOUT_SECONDS = 60
+
+# Identity used for merge-back commits
+COMMIT_IDENTITY = ["-c", "user.name=LastAgent", "-c", "user.email=lastagent@localhost"]
+
+
+class WorktreeError(Exception):
+    """A git worktree operation failed."""
+
+
+@dataclass
+class WorktreeLease:
+    """A worktree leased to one task."""
+    id: str
+    repo_root: str
+    path: str
+    base_commit: str
+    working_directory: str  # Task directory inside the worktree
+    leased_at: datetime = field(default_factory=datetime.utcnow)
+
+
+@dataclass
+class WorktreeStats:
+    """Worktree pool counters."""
+    enabled: bool
+    repos: int
+    idle: int
+    leased: int
+    created: int
+    reused: int
+    removed: int
+    branches: int
+
+
+async def _git(cwd: str, *args: str) -> Tuple[int, str, str]:
+    """Run a git command, returning (returncode, stdout, stderr)."""
+    try:
+        process = await asyncio.create_subprocess_exec(
+            "git", *args,
+            cwd=cwd,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+    except OSError as e:
+        return -1, "", str(e)
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout=GIT_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        return -1, "", f"git {args[0]} timed out"
+    return (
+        process.returncode,
+        stdout.decode(errors="replace").strip(),
+        stderr.decode(errors="replace").strip(),
+    )
+
+
+async def _git_ok(cwd: str, *args: str) -> str:
+    """Run a git command, raising WorktreeError if it fails."""
+    returncode, stdout, stderr = await _git(cwd, *args)
+    if returncode != 0:
+        raise WorktreeError(f"git {' '.join(args)} failed: {stderr or stdout}")
+    return stdout
+
+
+class WorktreePool:
+    """
+    Per-repository pools of git worktrees for isolated agent runs.
+    
+    Usage:
+        pool = get_worktree_pool()
+        lease = await pool.lease("/path/to/repo/src")
+        if lease:
+            ...  # run the agent in lease.working_directory
+            branch = await pool.release(lease, label="aider")
+    """
+    
+    def __init__(
+        self,
+        mode: Optional[str] = None,
+        pool_size: Optional[int] = None,
+        base_dir: Optional[str] = None,
+        merge_back: Optional[bool] = None,
+    ):
+        """
+        Initialize the pool.
+        
+        Args:
+            mode: Default isolation, "shared" or "worktree".
+                Defaults to settings.execution.isolation.mode
+            pool_size: Worktrees kept per repository, leased ones included.
+                Defaults to isolation.pool_size
+            base_dir: Where worktrees are created. Defaults to isolation.base_dir
+                (or <tmp>/lastagent-worktrees)
+            merge_back: Commit agent changes to a branch on release.
+                Defaults to isolation.merge_back
+        """
+        settings = get_config().settings.execution.get("isolation", {})
+        if mode is None:
+            mode = settings.get("mode", "shared")
+        if pool_size is None:
+            pool_size = settings.get("pool_size", 2)
+        if base_dir is None:
+            base_dir = settings.get("base_dir") or os.path.join(
+                tempfile.gettempdir(), "lastagent-worktrees"
+            )
+        if merge_back is None:
+            merge_back = settings.get("merge_back", True)
+        
+        self.mode = mode
+        self.pool_size = max(0, int(pool_size))
+        self.base_dir = base_dir
+        self.merge_back = bool(merge_back)
+        self._log = get_logger("worktree")
+        
+        self._idle: Dict[str, List[str]] = {}
+        self._leased: Dict[str, WorktreeLease] = {}
+        self._filling: Dict[str, asyncio.Task] = {}
+        self._counters: Dict[str, int] = {
+            "created": 0,
+            "reused": 0,
+            "removed": 0,
+            "branches": 0,
+        }
+    
+    def wants_isolation(self, isolation: Optional[str]) -> bool:
+        """Whether a task should run in a worktree (per-task override or default mode)."""
+        return (isolation or self.mode) == "worktree"
+    
+    async def lease(self, working_directory: Optional[str]) -> Optional[WorktreeLease]:
+        """
+        Lease a clean worktree of the repository containing working_directory.
+        
+        Returns:
+            The lease, or None if the directory isn't inside a git repository
+        """
+        cwd = os.path.realpath(working_directory or ".")
+        repo_root = await self._repo_root(cwd)
+        if repo_root is None:
+            return None
+        base_commit = await _git_ok(repo_root, "rev-parse", "HEAD")
+        
+        path = await self._checkout(repo_root, base_commit)
+        lease = WorktreeLease(
+            id=uuid.uuid4().hex[:8],
+            repo_root=repo_root,
+            path=path,
+            base_commit=base_commit,
+            working_directory=os.path.join(path, os.path.relpath(cwd, repo_root)),
+        )
+        self._leased[lease.id] = lease
+        self._schedule_fill(repo_root, base_commit)
+        self._log.info(
+            "worktree_leased",
+            repo=repo_root,
+            path=path,
+            base_commit=base_commit,
+            lease_id=lease.id,
+        )
+        return lease
+    
+    async def prewarm(self, working_directory: str) -> int:
+        """
+        Create idle worktrees for a repository up to pool_size.
+        
+        Returns:
+            Number of idle worktrees for the repository
+        """
+        repo_root = await self._repo_root(os.path.realpath(working_directory))
+        if repo_root is None:
+            return 0
+        await self._fill(repo_root, await _git_ok(repo_root, "rev-parse", "HEAD"))
+        return len(self._idle.get(repo_root, []))
+    
+    async def _repo_root(self, cwd: str) -> Optional[str]:
+        """Top-level directory of the git repository containing cwd."""
+        returncode, repo_root, _ = await _git(cwd, "rev-parse", "--show-toplevel")
+        if returncode != 0 or not repo_root:
+            return None
+        return os.path.realpath(repo_root)
+    
+    def _schedule_fill(self, repo_root: str, commit: str) -> None:
+        """Top the repository's idle worktrees up in the background."""
+        task = self._filling.get(repo_root)
+        if self._missing(repo_root) <= 0 or (task and not task.done()):
+            return
+        self._filling[repo_root] = asyncio.ensure_future(self._fill(repo_root, commit))
+    
+    def _missing(self, repo_root: str) -> int:
+        """How many worktrees the repository is short of pool_size (idle + leased)."""
+        leased = sum(1 for lease in self._leased.values() if lease.repo_root == repo_root)
+        return self.pool_size - len(self._idle.get(repo_root, [])) - leased
+    
+    async def _fill(self, repo_root: str, commit: str) -> None:
+        """Create idle worktrees until the repository has pool_size."""
+        idle = self._idle.setdefault(repo_root, [])
+        try:
+            while self._missing(repo_root) > 0:
+                path = await self._create(repo_root, commit)
+                if self._missing(repo_root) <= 0:
+                    # A release returned a worktree while this one was created
+                    await self._remove(repo_root, path)
+                    break
+                # Behind released worktrees, which are reused first
+                idle.insert(0, path)
+        except WorktreeError as e:
+            self._log.warning("worktree_prewarm_failed", repo=repo_root, error=str(e))
+    
+    async def _checkout(self, repo_root: str, commit: str) -> str:
+        """Get a worktree at commit: reuse an idle one, else create one."""
+        idle = self._idle.setdefault(repo_root, [])
+        while idle:
+            path = idle.pop()
+            try:
+                await self._reset(path, commit)
+                self._counters["reused"] += 1
+                return path
+            except WorktreeError as e:
+                self._log.warning("worktree_reset_failed", path=path, error=str(e))
+                await self._remove(repo_root, path)
+        return await self._create(repo_root, commit)
+    
+    async def _create(self, repo_root: str, commit: str) -> str:
+        """Add a new detached worktree at commit."""
+        repo_dir = os.path.join(
+            self.base_dir,
+            hashlib.sha1(repo_root.encode()).hexdigest()[:12],
+        )
+        os.makedirs(repo_dir, exist_ok=True)
+        path = os.path.join(repo_dir, f"wt-{uuid.uuid4().hex[:8]}")
+        await _git_ok(repo_root, "worktree", "add", "--detach", path, commit)
+        self._counters["created"] += 1
+        return path
+    
+    async def _reset(self, path: str, commit: str) -> None:
+        """Check out commit (detached) and drop every local change."""
+        await _git_ok(path, "checkout", "--quiet", "--detach", "--force", commit)
+        await _git_ok(path, "reset", "--quiet", "--hard", commit)
+        await _git_ok(path, "clean", "-ffdxq")
+    
+    async def release(
+        self,
+        lease: WorktreeLease,
+        label: str = "task",
+        merge: bool = True,
+    ) -> Optional[str]:
+        """
+        Return a worktree to the pool.
+        
+        With merge_back (and merge), any changes (uncommitted edits or new
+        commits) are committed and a branch lastagent/<label>-<lease id> is
+        pointed at them. Otherwise changes are discarded.
+        
+        Returns:
+            The branch name, or None if nothing changed or nothing was merged
+        """
+        self._leased.pop(lease.id, None)
+        branch = None
+        try:
+            if self.merge_back and merge:
+                branch = await self._merge_back(lease, label)
+        except WorktreeError as e:
+            self._log.warning("worktree_merge_back_failed", path=lease.path, error=str(e))
+        
+        idle = self._idle.setdefault(lease.repo_root, [])
+        if self._missing(lease.repo_root) > 0:
+            try:
+                await self._reset(lease.path, lease.base_commit)
+                idle.append(lease.path)
+            except WorktreeError as e:
+                self._log.warning("worktree_reset_failed", path=lease.path, error=str(e))
+                await self._remove(lease.repo_root, lease.path)
+        else:
+            await self._remove(lease.repo_root, lease.path)
+        return branch
+    
+    async def _merge_back(self, lease: WorktreeLease, label: str) -> Optional[str]:
+        """Commit the worktree's changes and create a branch for them."""
+        if await _git_ok(lease.path, "status", "--porcelain"):
+            await _git_ok(lease.path, "add", "--all")
+            await _git_ok(
+                lease.path, *COMMIT_IDENTITY,
+                "commit", "--quiet", "--no-verify",
+                "-m", f"LastAgent: {label} changes (lease {lease.id})",
+            )
+        head = await _git_ok(lease.path, "rev-parse", "HEAD")
+        if head == lease.base_commit:
+            return None
+        
+        branch = f"lastagent/{label}-{lease.id}"
+        await _git_ok(lease.path, "branch", "--force", branch, head)
+        self._counters["branches"] += 1
+        self._log.info(
+            "worktree_merged_back",
+            repo=lease.repo_root,
+            branch=branch,
+            commit=head,
+            base_commit=lease.base_commit,
+        )
+        return branch
+    
+    async def _remove(self, repo_root: str, path: str) -> None:
+        """Delete a worktree and its git metadata."""
+        returncode, _, _ = await _git(repo_root, "worktree", "remove", "--force", path)
+        if returncode != 0:
+            shutil.rmtree(path, ignore_errors=True)
+            await _git(repo_root, "worktree", "prune")
+        self._counters["removed"] += 1
+    
+    async def shutdown(self) -> None:
+        """Remove every idle worktree."""
+        for task in self._filling.values():
+            task.cancel()
+        await asyncio.gather(*self._filling.values(), return_exceptions=True)
+        self._filling.clear()
+        for repo_root, paths in self._idle.items():
+            while paths:
+                await self._remove(repo_root, paths.pop())
+    
+    def get_stats(self) -> WorktreeStats:
+        """Get pool counters."""
+        return WorktreeStats(
+            enabled=self.mode == "worktree",
+            repos=len(self._idle),
+            idle=sum(len(paths) for paths in self._idle.values()),
+            leased=len(self._leased),
+            **self._counters,
+        )
+
+
+# =============================================================================
+# SINGLETON INSTANCE
+# =============================================================================
+
+_pool: Optional[WorktreePool] = None
+
+
+def get_worktree_pool() -> WorktreePool:
+    """Get the global worktree pool instance."""
+    global _pool
+    if _pool is None:
+        _pool = WorktreePool()
+    return _pool
@@ -0,0 +1,175 @@
+"""
+Tests for LastAgent Warm Agent Process Pool
+"""
+
+import asyncio
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.agent_pool import (
+    WarmProcessPool,
+    PoolStats,
+    get_warm_pool,
+)
+from src.process_lifecycle import ProcessLifecycleManager
+
+# Stand-in for a CLI that reads its prompt from stdin
+ECHO_UPPER = [sys.executable, "-c", "import sys; print(sys.stdin.read().upper())"]
+
+
+async def wait_refilled(pool: WarmProcessPool) -> None:
+    """Wait for background refills to finish."""
+    await asyncio.gather(*pool._refilling.values())
+
+
+class TestWarmProcessPool:
+    """Tests for WarmProcessPool class."""
+    
+    @pytest.fixture
+    async def pool(self):
+        """Create an enabled pool with its own lifecycle manager."""
+        pool = WarmProcessPool(
+            enabled=True,
+            processes=ProcessLifecycleManager(kill_grace_seconds=0.5),
+        )
+        yield pool
+        await pool.shutdown()
+    
+    def test_disabled_by_default(self):
+        """Test that pooling is opt-in via settings.yml."""
+        pool = WarmProcessPool()
+        assert not pool.enabled
+        assert not pool.supports("claude")
+    
+    @pytest.mark.asyncio
+    async def test_supports_only_configured_agents(self, pool):
+        """Test that only agents with a warm_pool section are pooled."""
+        assert pool.supports("claude")
+        assert not pool.supports("aider")
+        assert not pool.supports("unknown")
+    
+    @pytest.mark.asyncio
+    async def test_miss_then_hit(self, pool):
+        """Test that a miss warms the key and the next task gets a warm process."""
+        assert await pool.acquire("claude", ".", "", ECHO_UPPER) is None
+        await wait_refilled(pool)
+        assert pool.get_stats().idle == 1
+        
+        process = await pool.acquire("claude", ".", "", ECHO_UPPER)
+        assert process is not None
+        stdout, _ = await process.communicate(b"hello")
+        await pool.release(process)
+        await pool.processes.finalize(process)
+        
+        assert stdout.strip() == b"HELLO"
+        stats = pool.get_stats()
+        assert stats.hits == 1
+        assert stats.misses == 1
+    
+    @pytest.mark.asyncio
+    async def test_keys_are_isolated(self, pool):
+        """Test that a different system prompt doesn't reuse another key's process."""
+        await pool.prewarm("claude", ECHO_UPPER, ".", "system A")
+        
+        assert await pool.acquire("claude", ".", "system B", ECHO_UPPER) is None
+        await wait_refilled(pool)
+    
+    @pytest.mark.asyncio
+    async def test_prune_recycles_expired(self, pool):
+        """Test that idle processes past idle_ttl are killed but not replaced."""
+        await pool.prewarm("claude", ECHO_UPPER)
+        key = pool.make_key("claude", None, "")
+        old = pool._idle[key][0]
+        old.spawned_at -= 3600
+        
+        assert await pool.prune() == 1
+        await wait_refilled(pool)
+        await old.process.wait()
+        
+        assert pool._idle[key] == []
+        stats = pool.get_stats()
+        assert stats.recycled == 1
+        assert stats.spawned == 1
+    
+    @pytest.mark.asyncio
+    async def test_prune_evicts_unused_keys(self, pool):
+        """Test that keys not acquired within key_ttl are dropped with their processes."""
+        pool.key_ttl = 60
+        await pool.prewarm("claude", ECHO_UPPER, ".", "old")
+        await pool.prewarm("claude", ECHO_UPPER, ".", "recent")
+        stale = pool.make_key("claude", ".", "old")
+        process = pool._idle[stale][0].process
+        pool._last_used[stale] -= 3600
+        
+        assert await pool.prune() == 1
+        await process.wait()
+        
+        assert stale not in pool._idle
+        assert stale not in pool._commands
+        stats = pool.get_stats()
+        assert stats.keys == 1
+        assert stats.idle == 1
+        assert stats.evicted_keys == 1
+    
+    @pytest.mark.asyncio
+    async def test_max_idle_caps_all_keys(self, pool):
+        """Test that refills stop once max_idle processes are idle across keys."""
+        pool.max_idle = 2
+        for prompt in ("a", "b", "c"):
+            assert await pool.acquire("claude", ".", prompt, ECHO_UPPER) is None
+            await wait_refilled(pool)
+        
+        stats = pool.get_stats()
+        assert stats.idle == 2
+        assert stats.keys == 3
+        assert pool._idle[pool.make_key("claude", ".", "c")] == []
+    
+    @pytest.mark.asyncio
+    async def test_shutdown_kills_idle(self, pool):
+        """Test that shutdown leaves no idle processes running."""
+        await pool.prewarm("claude", ECHO_UPPER)
+        process = pool._idle[pool.make_key("claude", None, "")][0].process
+        
+        await pool.shutdown()
+        
+        assert process.returncode is not None
+        assert pool.get_stats().idle == 0
+
+
+class TestExecutorWarmPool:
+    """Tests that the executor uses warm processes when available."""
+    
+    @pytest.mark.asyncio
+    async def test_run_cli_writes_prompt_to_warm_process(self):
+        """Test that a warm process receives the prompt on stdin."""
+        from src.executor import AgentExecutor, ExecutionContext
+        
+        executor = AgentExecutor()
+        executor.pool = WarmProcessPool(enabled=True, processes=executor.processes)
+        executor._build_warm_command = lambda agent, ctx: (ECHO_UPPER, ctx.user_prompt.encode())
+        executor._is_cli_available = lambda command: True
+        context = ExecutionContext(system_prompt="", user_prompt="warm prompt")
+        
+        try:
+            await executor.prewarm()
+            returncode, stdout, _ = await executor._run_cli(
+                "claude", [sys.executable, "-c", "print('cold')"], ".", 5, context
+            )
+        finally:
+            await executor.pool.shutdown()
+        
+        assert returncode == 0
+        assert stdout.strip() == b"WARM PROMPT"
+        assert executor.pool.get_stats().hits == 1
+
+
+class TestGlobalWarmPool:
+    """Tests for global warm pool singleton."""
+    
+    def test_get_warm_pool_is_singleton(self):
+        """Test that get_warm_pool returns the same instance."""
+        assert get_warm_pool() is get_warm_pool()
+        assert isinstance(get_warm_pool().get_stats(), PoolStats)
@@ -19,7 +19,7 @@ class TestAPIImports:
         """Test importing the main app."""
         from api import app
         assert app is not None
-        
+    
     def test_import_routes(self):
         """Test importing route modules."""
         from api.routes import chat, agents, decisions, feedback
@@ -45,7 +45,7 @@ class TestRootEndpoint:
         data = response.json()
         assert data["name"] == "LastAgent API"
         assert "endpoints" in data
-        
+    
     def test_health_check(self, client):
         """Test health check endpoint."""
         response = client.get("/health")
@@ -71,7 +71,7 @@ class TestAgentsEndpoint:
         assert "agents" in data
         assert "count" in data
         assert data["count"] > 0
-        
+    
     def test_list_agents_includes_claude(self, client):
         """Test that Claude is in the agents list."""
         response = client.get("/v1/agents")
@@ -79,7 +79,18 @@ class TestAgentsEndpoint:
         data = response.json()
         agent_names = [a["name"] for a in data["agents"]]
         assert "claude" in agent_names
+    
+    def test_list_agents_reports_availability(self, client):
+        """Test that each agent carries real probe results."""
+        response = client.get("/v1/agents?refresh=true")
         
+        for agent in response.json()["agents"]:
+            assert isinstance(agent["available"], bool)
+            assert agent["probe_latency_ms"] is not None
+            assert agent["probed_at"] is not None
+            if not agent["available"]:
+                assert agent["probe_error"]
+    
     def test_get_specific_agent(self, client):
         """Test getting a specific agent."""
         response = client.get("/v1/agents/claude")
@@ -89,13 +100,13 @@ class TestAgentsEndpoint:
         assert data["name"] == "claude"
         assert "capabilities" in data
         assert "strengths" in data
-        
+    
     def test_get_nonexistent_agent(self, client):
         """Test getting a nonexistent agent returns 404."""
         response = client.get("/v1/agents/nonexistent")
         
         assert response.status_code == 404
-        
+    
     def test_get_agents_by_capability(self, client):
         """Test getting agents by capability."""
         response = client.get("/v1/agents/by-capability/coding")
@@ -122,7 +133,7 @@ class TestDecisionsEndpoint:
         data = response.json()
         assert "decisions" in data
         assert "count" in data
-        
+    
     def test_get_decision_stats(self, client):
         """Test getting decision stats."""
         response = client.get("/v1/decisions/stats")
@@ -154,7 +165,7 @@ class TestFeedbackEndpoint:
         data = response.json()
         assert "id" in data
         assert data["status"] == "submitted"
-        
+    
     def test_submit_feedback_invalid_rating(self, client):
         """Test submitting feedback with invalid rating."""
         response = client.post("/v1/feedback", json={
@@ -164,7 +175,7 @@ class TestFeedbackEndpoint:
         })
         
         assert response.status_code == 422  # Validation error
-        
+    
     def test_list_feedback(self, client):
         """Test listing feedback."""
         response = client.get("/v1/feedback")
@@ -173,7 +184,7 @@ class TestFeedbackEndpoint:
         data = response.json()
         assert "feedback" in data
         assert "count" in data
-        
+    
     def test_get_feedback_summary(self, client):
         """Test getting feedback summary."""
         response = client.get("/v1/feedback/summary")
@@ -182,7 +193,7 @@ class TestFeedbackEndpoint:
         data = response.json()
         assert "total_count" in data
         assert "average_rating" in data
-        
+    
     def test_get_best_agent(self, client):
         """Test getting best performing agent."""
         response = client.get("/v1/feedback/best-agent")
@@ -190,6 +201,38 @@ class TestFeedbackEndpoint:
         assert response.status_code == 200
 
 
+class TestOutputsEndpoint:
+    """Tests for /v1/outputs endpoint."""
+    
+    @pytest.fixture
+    def client(self):
+        from api import app
+        return TestClient(app)
+    
+    def test_get_spilled_output(self, client):
+        """Test that a spilled output is served by handle."""
+        from src.output_buffer import get_output_store
+        
+        store = get_output_store()
+        buffer = store.new_buffer()
+        buffer.write(b"x" * (store.max_memory_bytes + 1))
+        output = buffer.finish()
+        
+        try:
+            response = client.get(f"/v1/outputs/{output.handle}")
+        finally:
+            store.clear()
+        
+        assert response.status_code == 200
+        assert len(response.content) == store.max_memory_bytes + 1
+    
+    def test_get_unknown_output(self, client):
+        """Test that unknown handles return 404."""
+        response = client.get("/v1/outputs/unknown")
+        
+        assert response.status_code == 404
+
+
 class TestChatCompletionsEndpoint:
     """Tests for /v1/chat/completions endpoint."""
     
@@ -212,7 +255,7 @@ class TestChatCompletionsEndpoint:
             assert "id" in data
             assert "choices" in data
             assert "usage" in data
-            
+    
     def test_chat_completion_requires_messages(self, client):
         """Test that chat completion requires messages."""
         response = client.post("/v1/chat/completions", json={
@@ -221,3 +264,137 @@ class TestChatCompletionsEndpoint:
         
         # Should fail - no user message
         assert response.status_code in [400, 422, 500]
+    
+    def test_chat_completion_stream(self, client):
+        """Test that stream=true returns chat.completion.chunk events."""
+        from unittest.mock import patch
+        from src.executor import StreamEvent, StreamEventType
+        from src.orchestrator import get_orchestrator
+        
+        async def fake_stream(**kwargs):
+            yield StreamEvent(StreamEventType.CHUNK, "claude", data="Hel")
+            yield StreamEvent(StreamEventType.CHUNK, "claude", data="lo")
+            yield StreamEvent(StreamEventType.SUMMARY, "claude", success=True, exit_code=0)
+        
+        with patch.object(get_orchestrator(), "process_task_stream", fake_stream):
+            response = client.post("/v1/chat/completions", json={
+                "messages": [{"role": "user", "content": "Hello"}],
+                "stream": True,
+            })
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        lines = [
+            line[len("data: "):] for line in response.text.splitlines() if line.startswith("data: ")
+        ]
+        assert lines[-1] == "[DONE]"
+        
+        import json
+        chunks = [json.loads(line) for line in lines[:-1]]
+        assert chunks[0]["object"] == "chat.completion.chunk"
+        content = "".join(c["choices"][0]["delta"].get("content", "") for c in chunks)
+        assert content == "Hello"
+        assert chunks[-1]["choices"][0]["finish_reason"] == "stop"
+    
+    def test_chat_completion_stream_bypass_cache(self, client):
+        """Test that bypass_cache reaches the streaming pipeline."""
+        from unittest.mock import patch
+        from src.executor import StreamEvent, StreamEventType
+        from src.orchestrator import get_orchestrator
+        calls = []
+        
+        async def fake_stream(**kwargs):
+            calls.append(kwargs)
+            yield StreamEvent(StreamEventType.SUMMARY, "claude", success=True, exit_code=0)
+        
+        with patch.object(get_orchestrator(), "process_task_stream", fake_stream):
+            response = client.post("/v1/chat/completions", json={
+                "messages": [{"role": "user", "content": "Hello"}],
+                "stream": True,
+                "bypass_cache": True,
+            })
+        
+        assert response.status_code == 200
+        assert calls[0]["bypass_cache"] is True
+    
+    def test_chat_completion_fan_out_all(self, client):
+        """Test that n > 1 with policy all returns one choice per agent."""
+        from unittest.mock import AsyncMock, patch
+        from src.orchestrator import ExecutionResult, get_orchestrator
+        
+        result = ExecutionResult(
+            task_id="t", agent="claude", response="one", success=True, duration_ms=5,
+            metadata={"fan_out": {"policy": "all", "winner": "claude", "results": [
+                {"agent": "claude", "success": True, "response": "one", "usage": None},
+                {"agent": "gemini", "success": True, "response": "two", "usage": None},
+            ]}},
+        )
+        process_task = AsyncMock(return_value=result)
+        with patch.object(get_orchestrator(), "process_task", process_task):
+            response = client.post("/v1/chat/completions", json={
+                "messages": [{"role": "user", "content": "Hello"}],
+                "n": 2,
+                "fan_out_policy": "all",
+            })
+        
+        assert response.status_code == 200
+        assert process_task.call_args.kwargs["n"] == 2
+        choices = response.json()["choices"]
+        assert [c["message"]["content"] for c in choices] == ["one", "two"]
+    
+    def test_chat_completion_fan_out_rejects_bad_requests(self, client):
+        """Test that an unknown policy, or n > 1 with stream, is a 400."""
+        messages = [{"role": "user", "content": "Hello"}]
+        
+        response = client.post("/v1/chat/completions", json={
+            "messages": messages, "n": 2, "fan_out_policy": "fastest",
+        })
+        assert response.status_code == 400
+        
+        response = client.post("/v1/chat/completions", json={
+            "messages": messages, "n": 2, "stream": True,
+        })
+        assert response.status_code == 400
+
+
+class TestMetricsEndpoint:
+    """Tests for /v1/metrics endpoints."""
+    
+    @pytest.fixture
+    def client(self):
+        from api import app
+        return TestClient(app)
+    
+    def test_scheduler_metrics(self, client):
+        """Test getting scheduler metrics."""
+        response = client.get("/v1/metrics/scheduler")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["max_concurrent"] >= 1
+        assert "queue_wait_ms_p95" in data
+        assert "in_flight" in data
+    
+    def test_process_metrics(self, client):
+        """Test getting process lifecycle metrics."""
+        response = client.get("/v1/metrics/processes")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert "spawned" in data["stats"]
+        assert isinstance(data["recent_leaks"], list)
+    
+    def test_trace_not_found(self, client):
+        """Test that an unknown trace is a 404."""
+        response = client.get("/v1/metrics/traces/no-such-trace")
+        
+        assert response.status_code == 404
+    
+    def test_routing_table_metrics(self, client):
+        """Test getting council routing table metrics."""
+        response = client.get("/v1/metrics/routing-table")
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert "revalidations" in data
+        assert isinstance(data["routes"], list)
@@ -0,0 +1,123 @@
+"""
+Tests for LastAgent Agent Availability Registry
+"""
+
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.availability import (
+    AgentAvailabilityRegistry,
+    AgentAvailability,
+    get_availability_registry,
+)
+
+MISSING_COMMAND = "definitely_not_a_real_command_12345"
+
+
+class TestAgentAvailabilityRegistry:
+    """Tests for AgentAvailabilityRegistry class."""
+    
+    @pytest.fixture
+    def registry(self):
+        """Create a registry with one installed and one missing CLI."""
+        return AgentAvailabilityRegistry(
+            commands={"python": Path(sys.executable).name, "missing": MISSING_COMMAND},
+            version_timeout=5,
+        )
+    
+    @pytest.mark.asyncio
+    async def test_probe_installed_cli(self, registry):
+        """Test that an installed CLI reports path and version."""
+        entry = await registry.probe("python")
+        
+        assert isinstance(entry, AgentAvailability)
+        assert entry.available
+        assert entry.path is not None
+        assert entry.version and "Python" in entry.version
+        assert entry.probe_latency_ms > 0
+        assert entry.error is None
+    
+    @pytest.mark.asyncio
+    async def test_probe_missing_cli(self, registry):
+        """Test that a missing CLI is reported unavailable with a reason."""
+        entry = await registry.probe("missing")
+        
+        assert not entry.available
+        assert entry.path is None
+        assert MISSING_COMMAND in entry.error
+    
+    @pytest.mark.asyncio
+    async def test_probe_all(self, registry):
+        """Test that every configured agent is probed."""
+        entries = await registry.probe_all()
+        
+        assert set(entries) == {"python", "missing"}
+        assert registry.available_agents() == ["python"]
+        assert registry.get("python") is entries["python"]
+    
+    def test_is_available_without_probe(self, registry):
+        """Test that unprobed agents get a PATH lookup on first use."""
+        assert registry.get("python") is None
+        
+        assert registry.is_available("python")
+        assert not registry.is_available("missing")
+        assert registry.get("python") is not None
+    
+    def test_is_available_uses_cache(self, registry):
+        """Test that fresh results are served without another lookup."""
+        registry.is_available("missing")
+        registry.commands["missing"] = Path(sys.executable).name
+        
+        # Still cached as missing until the entry goes stale
+        assert not registry.is_available("missing")
+        
+        registry.get("missing").checked_at -= registry.probe_interval + 1
+        assert registry.is_available("missing")
+    
+    def test_is_command_available(self, registry):
+        """Test command lookups for configured and unconfigured commands."""
+        assert registry.is_command_available(Path(sys.executable).name)
+        assert not registry.is_command_available(MISSING_COMMAND)
+        assert not registry.is_command_available("another_missing_command_12345")
+
+
+class TestAvailabilityRouting:
+    """Tests that selection never routes to uninstalled agents."""
+    
+    def test_matcher_excludes_uninstalled_agents(self):
+        """Test that AgentMatcher marks missing CLIs ineligible and never recommends them."""
+        from src.agent_matcher import AgentMatcher
+        from src.task_analyzer import TaskAnalysis, TaskType
+        
+        matcher = AgentMatcher()
+        matcher.availability = AgentAvailabilityRegistry(
+            commands={"gemini": Path(sys.executable).name, "claude": MISSING_COMMAND},
+        )
+        analysis = TaskAnalysis(
+            task_type=TaskType.CODING,
+            detected_capabilities=["coding", "deep_reasoning"],
+            keywords_matched=["code"],
+            requires_working_directory=False,
+            requires_realtime_info=False,
+            requires_multimodal=False,
+            requires_long_context=False,
+            confidence=0.8,
+        )
+        
+        result = matcher.match(analysis)
+        
+        assert result.recommended_agents == ["gemini"]
+        claude = next(m for m in result.matches if m.agent_name == "claude")
+        assert not claude.is_eligible
+        assert "not installed" in claude.reason
+
+
+class TestGlobalRegistry:
+    """Tests for global availability registry singleton."""
+    
+    def test_get_availability_registry_is_singleton(self):
+        """Test that get_availability_registry returns the same instance."""
+        assert get_availability_registry() is get_availability_registry()
@@ -2,8 +2,11 @@
 Tests for LastAgent Council Selector
 """
 
+import asyncio
+import time
 import pytest
 from pathlib import Path
+from unittest.mock import AsyncMock, patch
 import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -15,6 +18,8 @@ from src.council_selector import (
     CouncilRanking,
     get_council_selector,
 )
+from src.agent_matcher import AgentMatch
+from src.task_analyzer import get_task_analyzer
 
 
 class TestCouncilSelector:
@@ -35,7 +40,7 @@ class TestCouncilSelector:
         
         assert isinstance(result, CouncilSelection)
         assert result.selected_agent in selector.config.get_agent_names()
-        
+    
     @pytest.mark.asyncio
     async def test_select_agent_has_confidence(self, selector):
         """Test that selection has a confidence score."""
@@ -44,7 +49,7 @@ class TestCouncilSelector:
         )
         
         assert 0.0 <= result.confidence <= 1.0
-        
+    
     @pytest.mark.asyncio
     async def test_select_agent_has_reasoning(self, selector):
         """Test that selection has reasoning."""
@@ -54,7 +59,7 @@ class TestCouncilSelector:
         
         assert result.reasoning
         assert len(result.reasoning) > 0
-        
+    
     @pytest.mark.asyncio
     async def test_select_agent_includes_match_result(self, selector):
         """Test that selection includes match result."""
@@ -64,7 +69,7 @@ class TestCouncilSelector:
         
         assert result.match_result is not None
         assert len(result.match_result.matches) > 0
-        
+    
     @pytest.mark.asyncio
     async def test_coding_task_selects_appropriate_agent(self, selector):
         """Test that coding tasks select a coding-capable agent."""
@@ -123,13 +128,13 @@ class TestParsingHelpers:
         
         assert agent == "claude"
         assert "reasoning" in reason.lower()
-        
+    
     def test_parse_agent_suggestion_just_name(self, selector):
         """Test parsing suggestion with just agent name."""
         agent, reason = selector._parse_agent_suggestion("gemini")
         
         assert agent == "gemini"
-        
+    
     def test_parse_ranking(self, selector):
         """Test parsing rankings."""
         text = """1. claude
@@ -142,6 +147,268 @@ class TestParsingHelpers:
         assert ranked == ["claude", "gemini", "aider"]
 
 
+class TestCouncilQuorum:
+    """Tests for early-exit stage 1 voting and unanimous decisions."""
+    
+    @pytest.fixture
+    def selector(self):
+        """Create a selector with four fake council members (model -> (delay, vote))."""
+        selector = CouncilSelector(use_mock=False)
+        selector._council_available = True
+        selector._council_models = ["m1", "m2", "m3", "m4"]
+        selector.answers = {}
+        selector.cancelled = []
+        selector.calls = []
+        
+        async def query_model(model, messages):
+            selector.calls.append(model)
+            delay, vote = selector.answers[model]
+            try:
+                await asyncio.sleep(delay)
+            except asyncio.CancelledError:
+                selector.cancelled.append(model)
+                raise
+            return {"content": f"{vote}: good fit"}
+        
+        async def query_models_parallel(models, messages):
+            return {model: await query_model(model, messages) for model in models}
+        
+        selector._query_model = query_model
+        selector._query_models_parallel = query_models_parallel
+        stage1 = {"quorum": {"enabled": True, "agreement": 0.5}, "skip_on_unanimity": True}
+        with patch.dict(selector.config.council.selection_process, {"stage1": stage1}):
+            yield selector
+    
+    async def run_selection(self, selector, available):
+        """Run the council with stages 2 and 3 mocked; returns (result, stage2, stage3)."""
+        analysis = selector.task_analyzer.analyze("fix the bug")
+        match_result = selector.agent_matcher.match(analysis)
+        stage2 = AsyncMock(return_value=[])
+        stage3 = AsyncMock(return_value=("gemini", 0.8, "chairman"))
+        
+        with patch.object(selector, "_stage2_collect_rankings", stage2), \
+                patch.object(selector, "_stage3_select_final", stage3), \
+                patch.object(selector.agent_matcher, "available_agents", return_value=available):
+            result = await selector._run_council_selection(
+                "fix the bug", "", analysis, match_result
+            )
+        return result, stage2, stage3
+    
+    def test_quorum_size(self, selector):
+        """Test that the quorum is a strict majority of the council."""
+        assert selector._stage1_quorum(4) == 3
+        assert selector._stage1_quorum(5) == 3
+        assert selector._stage1_quorum(3) == 2
+        assert selector._stage1_quorum(2) is None
+        selector.config.council.selection_process["stage1"]["quorum"]["enabled"] = False
+        assert selector._stage1_quorum(4) is None
+    
+    @pytest.mark.asyncio
+    async def test_returns_at_quorum_and_cancels_rest(self, selector):
+        """Test that a majority of agreeing votes ends stage 1 and the slow member is cancelled."""
+        selector.answers = {
+            "m1": (0.01, "claude"),
+            "m2": (0.02, "claude"),
+            "m3": (0.03, "claude"),
+            "m4": (5, "gemini"),
+        }
+        votes, leader = await selector._stage1_collect_votes("fix the bug", "", "")
+        
+        assert [v.model for v in votes] == ["m1", "m2", "m3"]
+        assert leader == "claude"
+        assert selector.cancelled == ["m4"]
+    
+    @pytest.mark.asyncio
+    async def test_split_vote_is_no_quorum(self, selector):
+        """Test that a 2-2 split waits for every member."""
+        selector.answers = {
+            "m1": (0.01, "claude"),
+            "m2": (0.02, "gemini"),
+            "m3": (0.03, "gemini"),
+            "m4": (0.04, "claude"),
+        }
+        votes, leader = await selector._stage1_collect_votes("fix the bug", "", "")
+        
+        assert [v.selected_agent for v in votes] == ["claude", "gemini", "gemini", "claude"]
+        assert leader is None
+        assert selector.cancelled == []
+    
+    @pytest.mark.asyncio
+    async def test_unanimity_skips_ranking_and_chairman(self, selector):
+        """Test that every member agreeing decides without stages 2 and 3."""
+        selector.config.council.selection_process["stage1"]["quorum"]["enabled"] = False
+        selector.answers = {m: (0.01, "claude") for m in selector._council_models}
+        result, stage2, stage3 = await self.run_selection(selector, ["claude"])
+        
+        assert result.selected_agent == "claude"
+        assert "Unanimous" in result.reasoning
+        stage2.assert_not_called()
+        stage3.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_quorum_decides_without_ranking_and_chairman(self, selector):
+        """Test that the quorum leader is selected and the slow member isn't asked again."""
+        selector.answers = {
+            "m1": (0.01, "claude"),
+            "m2": (0.02, "claude"),
+            "m3": (0.03, "claude"),
+            "m4": (5, "gemini"),
+        }
+        start = time.perf_counter()
+        result, stage2, stage3 = await self.run_selection(selector, ["claude", "gemini"])
+        
+        assert time.perf_counter() - start < 1
+        assert result.selected_agent == "claude"
+        assert result.reasoning == "Council quorum (3 of 4 models)"
+        assert result.confidence == 0.75
+        assert selector.calls.count("m4") == 1
+        assert selector.cancelled == ["m4"]
+        stage2.assert_not_called()
+        stage3.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_ranking_only_asks_members_that_voted(self, selector):
+        """Test that stage 2 leaves out members without a stage 1 vote."""
+        selector.answers = {
+            "m1": (0.01, "claude"),
+            "m2": (0.02, "gemini"),
+            "m3": (0.03, "aider"),
+            "m4": (0.04, ""),
+        }
+        
+        async def query_model(model, messages):
+            selector.calls.append(model)
+            delay, vote = selector.answers[model]
+            await asyncio.sleep(delay)
+            return {"content": f"{vote}: good fit"} if vote else None
+        
+        selector._query_model = query_model
+        _, stage2, stage3 = await self.run_selection(selector, ["claude", "gemini", "aider"])
+        
+        assert stage2.call_args.args[3] == ["m1", "m2", "m3"]
+        stage3.assert_called_once()
+    
+    @pytest.mark.asyncio
+    async def test_split_vote_runs_chairman(self, selector):
+        """Test that disagreement goes through ranking and the chairman."""
+        selector.answers = {
+            "m1": (0.01, "claude"),
+            "m2": (0.02, "gemini"),
+            "m3": (0.03, "gemini"),
+            "m4": (0.04, "claude"),
+        }
+        result, stage2, stage3 = await self.run_selection(selector, ["claude", "gemini"])
+        
+        assert result.selected_agent == "gemini"
+        assert sorted(stage2.call_args.args[2]) == ["claude", "gemini"]
+        stage3.assert_called_once()
+
+
+class TestAdaptiveSizing:
+    """Tests for convening the council according to the local match margin."""
+    
+    @pytest.fixture
+    def selector(self):
+        selector = CouncilSelector(use_mock=False)
+        selector._council_available = True
+        selector._council_models = ["m1", "m2", "m3", "m4"]
+        sizing = {"enabled": True, "skip_margin": 0.4, "single_margin": 0.2, "fast_model": None}
+        with patch.dict(selector.config.council.selection_process, {"adaptive_sizing": sizing}), \
+                patch.dict(selector.config.council.fallback, {"min_confidence": 0.6}):
+            yield selector
+    
+    def match_result(self, *scores):
+        """A match result whose eligible agents have the given scores, best first."""
+        from src.agent_matcher import MatchResult
+        
+        names = ["claude", "gemini", "aider"]
+        matches = [AgentMatch(name, score, [], [], True, "") for name, score in zip(names, scores)]
+        analysis = get_task_analyzer().analyze("fix the bug")
+        return MatchResult(analysis, matches, names[:len(scores)])
+    
+    def test_paths(self, selector):
+        """Test that a clear margin convenes less of the council."""
+        assert selector._council_size(self.match_result(0.9, 0.4)) == ("skipped", 0.5, [])
+        assert selector._council_size(self.match_result(0.9, 0.65)) == ("single", 0.25, ["m1"])
+        assert selector._council_size(self.match_result(0.9, 0.8))[0] == "full"
+    
+    def test_margin_does_not_rely_on_match_order(self, selector):
+        """Test that the margin uses the two best eligible scores in any order."""
+        result = self.match_result(0.65, 0.9)
+        result.matches.append(AgentMatch("goose", 1.0, [], [], False, "not installed"))
+        
+        assert selector._council_size(result)[:2] == ("single", 0.25)
+    
+    def test_low_confidence_convenes_full_council(self, selector):
+        """Test that a top score under fallback.min_confidence never skips the council."""
+        path, margin, models = selector._council_size(self.match_result(0.5))
+        
+        assert path == "full"
+        assert margin == 0.5
+        assert models == ["m1", "m2", "m3", "m4"]
+    
+    def test_fast_model_setting(self, selector):
+        """Test that the single-model path uses the configured fast model."""
+        selector.config.council.selection_process["adaptive_sizing"]["fast_model"] = "fast/model"
+        
+        assert selector._council_size(self.match_result(0.9, 0.65))[2] == ["fast/model"]
+    
+    @pytest.mark.asyncio
+    async def test_skipped_council_uses_local_match(self, selector):
+        """Test that a skipped council returns the top local match without LLM calls."""
+        selector._run_council_selection = AsyncMock()
+        match_result = self.match_result(0.9, 0.3)
+        with patch.object(selector.agent_matcher, "match", return_value=match_result):
+            result = await selector.select_agent("fix the bug", bypass_cache=True)
+        
+        selector._run_council_selection.assert_not_called()
+        assert result.selected_agent == "claude"
+        assert result.council_path == "skipped"
+        assert result.confidence == 0.9
+    
+    @pytest.mark.asyncio
+    async def test_single_model_council_skips_chairman(self, selector):
+        """Test that a one-model council decides without ranking and chairman."""
+        async def query_models_parallel(models, messages):
+            return {model: {"content": "gemini: fast"} for model in models}
+        
+        selector._query_models_parallel = query_models_parallel
+        analysis = selector.task_analyzer.analyze("fix the bug")
+        match_result = selector.agent_matcher.match(analysis)
+        stage3 = AsyncMock(return_value=("claude", 0.8, "chairman"))
+        stage1 = {"quorum": {"enabled": True}, "skip_on_unanimity": False}
+        
+        with patch.dict(selector.config.council.selection_process, {"stage1": stage1}), \
+                patch.object(selector, "_stage3_select_final", stage3), \
+                patch.object(selector.agent_matcher, "available_agents", return_value=["gemini"]):
+            result = await selector._run_council_selection(
+                "fix the bug", "", analysis, match_result, models=["m1"]
+            )
+        
+        stage3.assert_not_called()
+        assert result.selected_agent == "gemini"
+        assert result.reasoning == "Single-model council vote (m1)"
+    
+    @pytest.mark.asyncio
+    async def test_single_model_vote(self, selector):
+        """Test that the single-model path passes only the fast model to the council."""
+        selector._run_council_selection = AsyncMock(return_value=CouncilSelection(
+            selected_agent="gemini",
+            confidence=0.9,
+            reasoning="Unanimous council vote (1 of 1 models)",
+            votes=[CouncilVote("m1", "gemini", "fast")],
+            rankings=[],
+            aggregate_scores={"gemini": 1.0},
+        ))
+        match_result = self.match_result(0.9, 0.65)
+        with patch.object(selector.agent_matcher, "match", return_value=match_result):
+            result = await selector.select_agent("fix the bug", bypass_cache=True)
+        
+        assert selector._run_council_selection.call_args.kwargs["models"] == ["m1"]
+        assert result.council_path == "single"
+        assert result.match_margin == 0.25
+
+
 class TestGlobalSelector:
     """Tests for global selector singleton."""
     
@@ -0,0 +1,196 @@
+"""
+Tests for LastAgent Directory Lock Manager
+"""
+
+import asyncio
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.directory_locks import (
+    READ,
+    WRITE,
+    DirectoryLockManager,
+    DirectoryLockStats,
+    resolve_lock_path,
+    get_directory_locks,
+)
+
+
+async def _settle():
+    """Let queued tasks run."""
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestResolveLockPath:
+    """Tests for lock keys."""
+    
+    def test_subdirectories_share_repo_root(self, tmp_path):
+        """Test that directories inside one repository map to its root."""
+        (tmp_path / ".git").mkdir()
+        (tmp_path / "src" / "pkg").mkdir(parents=True)
+        
+        root = resolve_lock_path(str(tmp_path))
+        assert resolve_lock_path(str(tmp_path / "src" / "pkg")) == root
+    
+    def test_non_git_directory(self, tmp_path):
+        """Test that directories outside git lock their own real path."""
+        (tmp_path / "a").mkdir()
+        
+        assert resolve_lock_path(str(tmp_path / "a")) == str((tmp_path / "a").resolve())
+
+
+class TestDirectoryLockManager:
+    """Tests for DirectoryLockManager class."""
+    
+    @pytest.mark.asyncio
+    async def test_readers_share(self):
+        """Test that any number of readers hold a directory together."""
+        locks = DirectoryLockManager()
+        await locks.acquire("/repo", READ)
+        assert await locks.acquire("/repo", READ) == 0.0
+        
+        assert locks.holders("/repo") == {"readers": 2, "writers": 0, "waiting": 0}
+    
+    @pytest.mark.asyncio
+    async def test_writer_is_exclusive(self):
+        """Test that a writer waits for readers and blocks later readers."""
+        locks = DirectoryLockManager()
+        await locks.acquire("/repo", READ)
+        writer = asyncio.create_task(locks.acquire("/repo", WRITE))
+        await _settle()
+        assert not writer.done()
+        
+        locks.release("/repo", READ)
+        await writer
+        reader = asyncio.create_task(locks.acquire("/repo", READ))
+        await _settle()
+        assert not reader.done()
+        
+        locks.release("/repo", WRITE)
+        await reader
+        assert locks.get_stats().contended_total == 2
+    
+    @pytest.mark.asyncio
+    async def test_fifo_does_not_starve_writer(self):
+        """Test that readers arriving after a queued writer wait behind it."""
+        locks = DirectoryLockManager()
+        order = []
+        await locks.acquire("/repo", READ)
+        
+        async def take(name, mode):
+            await locks.acquire("/repo", mode)
+            order.append(name)
+        
+        writer = asyncio.create_task(take("writer", WRITE))
+        await _settle()
+        late_reader = asyncio.create_task(take("reader", READ))
+        await _settle()
+        assert order == []
+        
+        locks.release("/repo", READ)
+        await writer
+        locks.release("/repo", WRITE)
+        await late_reader
+        assert order == ["writer", "reader"]
+    
+    @pytest.mark.asyncio
+    async def test_directories_are_independent(self):
+        """Test that a writer on one repository doesn't block another."""
+        locks = DirectoryLockManager()
+        await locks.acquire("/repo-a", WRITE)
+        
+        assert await asyncio.wait_for(locks.acquire("/repo-b", WRITE), timeout=1) == 0.0
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_queue(self):
+        """Test that cancelling a queued request lets the next one through."""
+        locks = DirectoryLockManager()
+        await locks.acquire("/repo", WRITE)
+        cancelled = asyncio.create_task(locks.acquire("/repo", WRITE))
+        reader = asyncio.create_task(locks.acquire("/repo", READ))
+        await _settle()
+        
+        cancelled.cancel()
+        await asyncio.gather(cancelled, return_exceptions=True)
+        locks.release("/repo", WRITE)
+        await reader
+        
+        assert locks.holders("/repo") == {"readers": 1, "writers": 0, "waiting": 0}
+        locks.release("/repo", READ)
+        assert locks.get_stats().locked_directories == 0
+
+
+class TestSchedulerDirectoryLocks:
+    """Tests that scheduler slots take directory locks."""
+    
+    @pytest.mark.asyncio
+    async def test_waiting_repo_holds_no_slot(self, tmp_path):
+        """Test that a task waiting on repo A doesn't block repo B."""
+        from src.scheduler import ExecutionScheduler
+        
+        repo_a, repo_b = tmp_path / "a", tmp_path / "b"
+        repo_a.mkdir()
+        repo_b.mkdir()
+        scheduler = ExecutionScheduler(
+            max_concurrent=1, agent_limits={}, locks=DirectoryLockManager()
+        )
+        
+        release_first = asyncio.Event()
+        
+        async def run(directory, wait=None):
+            async with scheduler.slot("aider", str(directory), WRITE) as lease:
+                if wait:
+                    await wait.wait()
+                return lease
+        
+        first = asyncio.create_task(run(repo_a, release_first))
+        await _settle()
+        queued = asyncio.create_task(run(repo_a))
+        await _settle()
+        
+        # The only slot is taken by the first task on repo A
+        assert scheduler.get_stats().in_flight == 1
+        release_first.set()
+        await first
+        
+        lease = await asyncio.wait_for(queued, timeout=1)
+        assert lease.lock_wait_ms > 0
+        assert lease.lock_path == str(repo_a.resolve())
+        
+        other = await asyncio.wait_for(run(repo_b), timeout=1)
+        assert other.lock_wait_ms == 0.0
+
+
+class TestExecutorDirectoryLock:
+    """Tests for the executor's choice of lock mode."""
+    
+    def test_modes(self):
+        """Test that mutating agents write-lock unless the task is read-only."""
+        from src.executor import AgentExecutor, ExecutionContext
+        
+        executor = AgentExecutor()
+        context = ExecutionContext(system_prompt="", user_prompt="", working_directory="/repo")
+        aider = executor.config.get_agent("aider")
+        claude = executor.config.get_agent("claude")
+        
+        assert executor._directory_lock(aider, context) == ("/repo", WRITE)
+        assert executor._directory_lock(claude, context) == ("/repo", WRITE)
+        reader = claude.model_copy(update={"mutates_files": False})
+        assert executor._directory_lock(reader, context) == ("/repo", READ)
+        context.read_only = True
+        assert executor._directory_lock(aider, context) == ("/repo", READ)
+        context.isolation = "worktree"
+        assert executor._directory_lock(aider, context) == (None, READ)
+
+
+class TestGlobalDirectoryLocks:
+    """Tests for global lock manager singleton."""
+    
+    def test_get_directory_locks_is_singleton(self):
+        """Test that get_directory_locks returns the same instance."""
+        assert get_directory_locks() is get_directory_locks()
+        assert isinstance(get_directory_locks().get_stats(), DirectoryLockStats)
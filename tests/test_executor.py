@@ -4,10 +4,12 @@ Tests for LastAgent Agent Executor
 CRITICAL: Agents are NOT LLMs. All execution is via CLI subprocess.
 """
 
+import asyncio
 import pytest
 from pathlib import Path
 from unittest.mock import patch
 import sys
+import time
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
@@ -16,10 +18,41 @@ from src.executor import (
     ExecutionContext,
     ExecutionResult,
     ExecutionMethod,
+    StreamEventType,
     get_agent_executor,
 )
 
 
+def python_command(code: str):
+    """Build an argv that runs a Python snippet in place of an agent CLI."""
+    return [sys.executable, "-c", code]
+
+
+def delayed_executor():
+    """Create an executor whose runs take a per-agent delay."""
+    executor = AgentExecutor()
+    executor.delays = {}
+    executor.outcomes = {}
+    executor.cancelled = []
+    
+    async def fake_execute(agent_name, context):
+        try:
+            await asyncio.sleep(executor.delays.get(agent_name, 0))
+        except asyncio.CancelledError:
+            executor.cancelled.append(agent_name)
+            raise
+        return ExecutionResult(
+            success=executor.outcomes.get(agent_name, True),
+            response=f"from {agent_name}",
+            agent_name=agent_name,
+            execution_method=ExecutionMethod.CLI_SUBPROCESS,
+            duration_ms=0,
+        )
+    
+    executor.execute = fake_execute
+    return executor
+
+
 class TestExecutionContext:
     """Tests for ExecutionContext dataclass."""
     
@@ -32,8 +65,8 @@ class TestExecutionContext:
         
         assert context.system_prompt == "You are a helpful assistant."
         assert context.user_prompt == "Write hello world."
-        assert context.timeout == 300  # Default
-        
+        assert context.timeout is None  # Adaptive (src/timeouts.py)
+    
     def test_context_with_working_directory(self):
         """Test context with working directory."""
         context = ExecutionContext(
@@ -62,7 +95,7 @@ class TestExecutionResult:
         assert result.response == "Hello, World!"
         assert result.agent_name == "claude"
         assert result.error is None
-        
+    
     def test_failed_result(self):
         """Test creating a failed result."""
         result = ExecutionResult(
@@ -102,7 +135,7 @@ class TestAgentExecutor:
         for name in executor.config.get_agent_names():
             agent = executor.config.get_agent(name)
             assert agent.type == "cli", f"Agent {name} should be type=cli, not {agent.type}"
-        
+    
     @pytest.mark.asyncio
     async def test_execute_returns_result(self, executor):
         """Test that execute returns an ExecutionResult."""
@@ -117,7 +150,7 @@ class TestAgentExecutor:
         assert isinstance(result, ExecutionResult)
         assert result.agent_name == "claude"
         assert result.execution_method == ExecutionMethod.CLI_SUBPROCESS
-        
+    
     @pytest.mark.asyncio
     async def test_execute_unknown_agent(self, executor):
         """Test that unknown agent returns error."""
@@ -132,6 +165,278 @@ class TestAgentExecutor:
         assert "Unknown agent" in result.error
 
 
+class TestExecuteStream:
+    """Tests for AgentExecutor.execute_stream()."""
+    
+    @pytest.fixture
+    def executor(self):
+        """Create an executor whose CLI availability check always passes."""
+        executor = AgentExecutor()
+        executor._is_cli_available = lambda command: True
+        return executor
+    
+    async def collect(self, executor, agent_name, context):
+        return [event async for event in executor.execute_stream(agent_name, context)]
+    
+    @pytest.mark.asyncio
+    async def test_stream_yields_chunks_then_summary(self, executor):
+        """Test that stdout arrives as chunks followed by one summary."""
+        code = "import sys; print('hello'); sys.stderr.write('careful')"
+        with patch.object(executor, "_build_command", return_value=python_command(code)):
+            events = await self.collect(executor, "claude", ExecutionContext("", "hi"))
+        
+        chunks = [e for e in events if e.type == StreamEventType.CHUNK]
+        summary = events[-1]
+        assert "".join(c.data for c in chunks).strip() == "hello"
+        assert summary.type == StreamEventType.SUMMARY
+        assert summary.success
+        assert summary.exit_code == 0
+        assert summary.stderr == "careful"
+    
+    @pytest.mark.asyncio
+    async def test_stream_first_chunk_before_exit(self, executor):
+        """Test that output is delivered before the CLI finishes."""
+        code = "import sys, time; print('early', flush=True); time.sleep(1)"
+        with patch.object(executor, "_build_command", return_value=python_command(code)):
+            start = time.perf_counter()
+            stream = executor.execute_stream("claude", ExecutionContext("", "hi"))
+            first = await stream.__anext__()
+            first_latency = time.perf_counter() - start
+            remaining = [e async for e in stream]
+        
+        assert first.type == StreamEventType.CHUNK
+        assert first_latency < 0.9
+        assert remaining[-1].success
+    
+    @pytest.mark.asyncio
+    async def test_stream_nonzero_exit(self, executor):
+        """Test that a failing CLI is reported in the summary."""
+        code = "import sys; sys.exit(3)"
+        with patch.object(executor, "_build_command", return_value=python_command(code)):
+            events = await self.collect(executor, "claude", ExecutionContext("", "hi"))
+        
+        assert not events[-1].success
+        assert events[-1].exit_code == 3
+        assert events[-1].error == "Exit code: 3"
+    
+    @pytest.mark.asyncio
+    async def test_stream_timeout(self, executor):
+        """Test that a hung CLI is killed at the timeout."""
+        code = "import time; time.sleep(30)"
+        context = ExecutionContext("", "hi", timeout=1)
+        with patch.object(executor, "_build_command", return_value=python_command(code)):
+            start = time.perf_counter()
+            events = await self.collect(executor, "claude", context)
+        
+        assert time.perf_counter() - start < 10
+        assert events[-1].error == "Execution timeout"
+        assert not events[-1].success
+    
+    @pytest.mark.asyncio
+    async def test_stream_records_process_spans(self, executor):
+        """Test that a streamed run gets an execution span with sub-spans."""
+        code = "import sys, time; print('a', flush=True); time.sleep(0.1); print('b')"
+        with patch.object(executor, "_build_command", return_value=python_command(code)):
+            events = await self.collect(executor, "claude", ExecutionContext("", "hi"))
+        
+        assert events[-1].success
+        execution = [
+            s for s in executor.tracer._spans.values()
+            if s.name == "agent_execution" and s.attributes.get("process", {}).get("exit_ms")
+        ][-1]
+        names = [s.name for s in executor.tracer.get_trace_spans(execution.trace_id)
+                 if s.parent_span_id == execution.span_id]
+        assert names == ["spawn", "first_byte", "last_byte", "exit"]
+    
+    @pytest.mark.asyncio
+    async def test_stream_unknown_agent(self, executor):
+        """Test that an unknown agent yields only an error summary."""
+        events = await self.collect(executor, "unknown_agent", ExecutionContext("", "hi"))
+        
+        assert len(events) == 1
+        assert events[0].type == StreamEventType.SUMMARY
+        assert "Unknown agent" in events[0].error
+
+
+class TestTracePropagation:
+    """Tests for trace context propagation into agent CLIs."""
+    
+    @pytest.mark.asyncio
+    async def test_traceparent_reaches_cli(self):
+        """Test that the CLI sees TRACEPARENT and the run records process timing."""
+        executor = AgentExecutor()
+        executor._is_cli_available = lambda command: True
+        code = "import os; print(os.environ.get('TRACEPARENT', 'missing'))"
+        executor._build_claude_command = lambda ctx, delivery=None: python_command(code)
+        
+        result = await executor.execute("claude", ExecutionContext("", "hi", bypass_cache=True))
+        
+        assert result.success
+        trace = result.metadata["trace"]
+        span = executor.tracer.get_span(trace["span_id"])
+        assert result.response.strip() == span.traceparent
+        assert trace["first_byte_ms"] <= trace["last_byte_ms"] <= trace["exit_ms"]
+        children = [s.name for s in executor.tracer.get_trace_spans(trace["trace_id"])
+                    if s.parent_span_id == span.span_id]
+        assert children == ["spawn", "first_byte", "last_byte", "exit"]
+    
+    @pytest.mark.asyncio
+    async def test_tracing_disabled(self):
+        """Test that with tracing off the CLI gets no TRACEPARENT."""
+        executor = AgentExecutor()
+        executor.tracing = False
+        executor._is_cli_available = lambda command: True
+        code = "import os; print(os.environ.get('TRACEPARENT', 'missing'))"
+        executor._build_claude_command = lambda ctx, delivery=None: python_command(code)
+        
+        result = await executor.execute("claude", ExecutionContext("", "hi", bypass_cache=True))
+        
+        assert result.response.strip() == "missing"
+        assert "trace" not in result.metadata
+
+
+class TestExecuteHedged:
+    """Tests for AgentExecutor.execute_hedged()."""
+    
+    @pytest.fixture
+    def executor(self):
+        return delayed_executor()
+    
+    @pytest.mark.asyncio
+    async def test_fast_primary_is_not_hedged(self, executor):
+        """Test that no backup starts when the primary finishes in time."""
+        context = ExecutionContext("", "hi", read_only=True)
+        result = await executor.execute_hedged("claude", context, "gemini", 500)
+        
+        assert result.agent_name == "claude"
+        assert "hedge" not in result.metadata
+    
+    @pytest.mark.asyncio
+    async def test_straggler_loses_to_hedge(self, executor):
+        """Test that the backup wins against a straggler, which is cancelled."""
+        executor.delays = {"claude": 5, "gemini": 0.01}
+        
+        start = time.perf_counter()
+        context = ExecutionContext("", "hi", read_only=True)
+        result = await executor.execute_hedged("claude", context, "gemini", 50)
+        
+        assert time.perf_counter() - start < 2
+        assert result.agent_name == "gemini"
+        assert result.metadata["hedge"]["winner"] == "gemini"
+        assert executor.cancelled == ["claude"]
+    
+    @pytest.mark.asyncio
+    async def test_failed_hedge_waits_for_primary(self, executor):
+        """Test that a failing backup doesn't beat a slower successful primary."""
+        executor.delays = {"claude": 0.2, "gemini": 0.01}
+        executor.outcomes = {"gemini": False}
+        
+        context = ExecutionContext("", "hi", read_only=True)
+        result = await executor.execute_hedged("claude", context, "gemini", 50)
+        
+        assert result.success
+        assert result.metadata["hedge"]["winner"] == "claude"
+        assert executor.cancelled == []
+    
+    @pytest.mark.asyncio
+    async def test_both_fail_returns_primary(self, executor):
+        """Test that the primary's failure is reported when both runs fail."""
+        executor.delays = {"claude": 0.1}
+        executor.outcomes = {"claude": False, "gemini": False}
+        
+        context = ExecutionContext("", "hi", read_only=True)
+        result = await executor.execute_hedged("claude", context, "gemini", 20)
+        
+        assert not result.success
+        assert result.agent_name == "claude"
+        assert result.metadata["hedge"]["winner"] is None
+    
+    @pytest.mark.asyncio
+    async def test_mutating_agents_are_not_hedged(self, executor):
+        """Test that a task that may edit the shared directory runs the primary only."""
+        executor.delays = {"aider": 0.2, "gemini": 0.01}
+        
+        result = await executor.execute_hedged("aider", ExecutionContext("", "hi"), "gemini", 20)
+        
+        assert result.agent_name == "aider"
+        assert "hedge" not in result.metadata
+    
+    @pytest.mark.asyncio
+    async def test_read_only_task_is_hedged(self, executor):
+        """Test that read_only lets mutating agents be hedged."""
+        executor.delays = {"aider": 5, "gemini": 0.01}
+        context = ExecutionContext("", "hi", read_only=True)
+        
+        result = await executor.execute_hedged("aider", context, "gemini", 20)
+        
+        assert result.metadata["hedge"]["winner"] == "gemini"
+        assert executor.cancelled == ["aider"]
+    
+    @pytest.mark.asyncio
+    async def test_primary_with_early_output_is_hedged(self):
+        """Test that output a CLI writes on startup doesn't keep a straggler from being hedged."""
+        executor = AgentExecutor()
+        executor._is_cli_available = lambda command: True
+        code = "import time; print('{\"type\": \"system\"}', flush=True); time.sleep(5)"
+        executor._build_claude_command = lambda ctx, delivery=None: python_command(code)
+        executor._build_gemini_command = lambda ctx, delivery=None: python_command("print('ok')")
+        
+        start = time.perf_counter()
+        result = await executor.execute_hedged(
+            "claude", ExecutionContext("", "hi", read_only=True, bypass_cache=True), "gemini", 200
+        )
+        
+        assert time.perf_counter() - start < 3
+        assert result.metadata["hedge"]["winner"] == "gemini"
+
+
+class TestExecuteMany:
+    """Tests for AgentExecutor.execute_many() (fan-out)."""
+    
+    @pytest.fixture
+    def executor(self):
+        return delayed_executor()
+    
+    @pytest.mark.asyncio
+    async def test_first_success_cancels_slower_runs(self, executor):
+        """Test that the first good result wins and the rest are cancelled."""
+        executor.delays = {"claude": 5, "gemini": 0.01, "aider": 5}
+        
+        start = time.perf_counter()
+        results = await executor.execute_many(
+            ["claude", "gemini", "aider"], ExecutionContext("", "hi")
+        )
+        
+        assert time.perf_counter() - start < 2
+        assert [r.agent_name for r in results] == ["gemini"]
+        assert results[0].metadata["fan_out"]["winner"] == "gemini"
+        assert sorted(executor.cancelled) == ["aider", "claude"]
+    
+    @pytest.mark.asyncio
+    async def test_first_success_skips_failures(self, executor):
+        """Test that a fast failure doesn't end the fan-out."""
+        executor.delays = {"claude": 0.1, "gemini": 0.01}
+        executor.outcomes = {"gemini": False}
+        
+        results = await executor.execute_many(["claude", "gemini"], ExecutionContext("", "hi"))
+        
+        assert [r.agent_name for r in results] == ["gemini", "claude"]
+        assert results[0].metadata["fan_out"]["winner"] == "claude"
+        assert executor.cancelled == []
+    
+    @pytest.mark.asyncio
+    async def test_all_waits_for_every_run(self, executor):
+        """Test that first_success=False returns every result."""
+        executor.delays = {"claude": 0.1, "gemini": 0.01}
+        
+        results = await executor.execute_many(
+            ["claude", "gemini"], ExecutionContext("", "hi"), first_success=False
+        )
+        
+        assert [r.agent_name for r in results] == ["gemini", "claude"]
+        assert all(r.metadata["fan_out"]["cancelled"] == [] for r in results)
+
+
 class TestGlobalExecutor:
     """Tests for global executor singleton."""
     
@@ -0,0 +1,78 @@
+"""
+Tests for LastAgent Latency Tracker
+"""
+
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.latency import (
+    LatencyTracker,
+    LatencyStats,
+    get_latency_tracker,
+)
+
+
+class TestLatencyTracker:
+    """Tests for LatencyTracker class."""
+    
+    def test_min_samples_from_config(self):
+        """Test that min_samples is read from settings.yml."""
+        assert LatencyTracker().min_samples == 20
+    
+    def test_no_percentile_below_min_samples(self):
+        """Test that percentiles need enough history."""
+        tracker = LatencyTracker(min_samples=5)
+        for ms in (100, 200, 300):
+            tracker.record("claude", ms)
+        
+        assert tracker.percentile("claude", 95) is None
+        assert tracker.percentile("unknown", 95) is None
+    
+    def test_percentiles(self):
+        """Test nearest-rank percentiles over recorded runs."""
+        tracker = LatencyTracker(min_samples=1)
+        for ms in range(1, 101):
+            tracker.record("claude", ms)
+        
+        assert tracker.percentile("claude", 50) == 51
+        assert tracker.percentile("claude", 95) == 96
+        assert tracker.percentile("claude", 100) == 100
+    
+    def test_stats_per_agent(self):
+        """Test that stats are reported per agent."""
+        tracker = LatencyTracker(min_samples=1)
+        tracker.record("claude", 100)
+        tracker.record("gemini", 300)
+        
+        stats = {s.agent_name: s for s in tracker.get_stats()}
+        
+        assert isinstance(stats["claude"], LatencyStats)
+        assert stats["claude"].samples == 1
+        assert stats["gemini"].max_ms == 300
+    
+    
+    def test_task_type_buckets(self):
+        """Test that runs are tracked per task type as well as overall."""
+        tracker = LatencyTracker(min_samples=1)
+        tracker.record("claude", 100, task_type="coding")
+        tracker.record("claude", 300, task_type="research")
+        
+        assert tracker.sample_count("claude") == 2
+        assert tracker.sample_count("claude", "coding") == 1
+        assert tracker.percentile("claude", 100, "coding") == 100
+        assert tracker.percentile("claude", 100) == 300
+        
+        stats = tracker.get_stats(include_task_types=True)
+        assert {s.task_type for s in stats} == {None, "coding", "research"}
+        assert all(s.task_type is None for s in tracker.get_stats())
+
+
+
+class TestGlobalLatencyTracker:
+    """Tests for global latency tracker singleton."""
+    
+    def test_get_latency_tracker_is_singleton(self):
+        """Test that get_latency_tracker returns the same instance."""
+        assert get_latency_tracker() is get_latency_tracker()
@@ -18,6 +18,8 @@ from src.observability.tracer import (
     Span,
     SpanStatus,
     Tracer,
+    ProcessTrace,
+    TRACEPARENT_ENV,
     trace_context,
     get_tracer,
 )
@@ -46,7 +48,7 @@ class TestLogLevel:
         """Test converting string to LogLevel."""
         assert LogLevel.from_string("info") == LogLevel.INFO
         assert LogLevel.from_string("DEBUG") == LogLevel.DEBUG
-        
+    
     def test_to_python_level(self):
         """Test converting to Python logging level."""
         assert LogLevel.INFO.to_python_level() == 20
@@ -59,14 +61,14 @@ class TestTraceContext:
     def setup_method(self):
         """Clear context before each test."""
         clear_trace_context()
-        
+    
     def test_set_and_get_context(self):
         """Test setting and getting trace context."""
         set_trace_context(trace_id="test-trace", span_id="test-span")
         ctx = get_trace_context()
         assert ctx["trace_id"] == "test-trace"
         assert ctx["span_id"] == "test-span"
-        
+    
     def test_clear_context(self):
         """Test clearing trace context."""
         set_trace_context(trace_id="test")
@@ -88,7 +90,7 @@ class TestLogEntry:
         json_str = entry.to_json()
         assert "Test message" in json_str
         assert "INFO" in json_str
-        
+    
     def test_create_with_context(self):
         """Test creating entry with trace context."""
         set_trace_context(trace_id="ctx-trace", span_id="ctx-span")
@@ -105,7 +107,7 @@ class TestStructuredLogger:
         """Test creating a logger."""
         logger = StructuredLogger("test", LogLevel.DEBUG)
         assert logger.name == "test"
-        
+    
     def test_get_logger_singleton(self):
         """Test get_logger returns cached instance."""
         logger1 = get_logger("singleton-test")
@@ -125,21 +127,21 @@ class TestSpan:
         span.end()
         assert span.duration_ms is not None
         assert span.duration_ms >= 0
-        
+    
     def test_add_event(self):
         """Test adding events to span."""
         span = Span(span_id="s1", trace_id="t1", name="test")
         span.add_event("test_event", {"key": "value"})
         assert len(span.events) == 1
         assert span.events[0]["name"] == "test_event"
-        
+    
     def test_set_error(self):
         """Test setting error on span."""
         span = Span(span_id="s1", trace_id="t1", name="test")
         span.set_error("TestError", "Something went wrong")
         assert span.status == SpanStatus.ERROR
         assert span.error["type"] == "TestError"
-        
+    
     def test_to_dict(self):
         """Test converting span to dict."""
         span = Span(span_id="s1", trace_id="t1", name="test")
@@ -157,7 +159,7 @@ class TestTracer:
         span = tracer.start_trace("request")
         assert span.trace_id is not None
         assert span.parent_span_id is None
-        
+    
     def test_start_child_span(self):
         """Test starting a child span."""
         tracer = Tracer()
@@ -165,7 +167,7 @@ class TestTracer:
         child = tracer.start_span("child")
         assert child.parent_span_id == parent.span_id
         assert child.trace_id == parent.trace_id
-        
+    
     def test_get_trace_spans(self):
         """Test getting all spans for a trace."""
         tracer = Tracer()
@@ -174,7 +176,7 @@ class TestTracer:
         tracer.start_span("child2")
         spans = tracer.get_trace_spans(span.trace_id)
         assert len(spans) == 3
-        
+    
     def test_trace_context_manager(self):
         """Test trace context manager."""
         tracer = Tracer()
@@ -182,9 +184,9 @@ class TestTracer:
         
         with trace_context(tracer, "operation") as span:
             assert span.status == SpanStatus.RUNNING
-            
-        assert span.status == SpanStatus.SUCCESS
         
+        assert span.status == SpanStatus.SUCCESS
+    
     def test_trace_context_manager_error(self):
         """Test trace context manager with error."""
         tracer = Tracer()
@@ -193,10 +195,79 @@ class TestTracer:
         with pytest.raises(ValueError):
             with trace_context(tracer, "operation") as span:
                 raise ValueError("Test error")
-                
+        
         assert span.status == SpanStatus.ERROR
 
 
+class TestTraceparent:
+    """Tests for W3C trace context propagation."""
+    
+    def test_traceparent_format(self):
+        """Test that span IDs map onto a valid traceparent."""
+        span = Tracer().start_trace("request")
+        version, trace_id, parent_id, flags = span.traceparent.split("-")
+        assert (version, flags) == ("00", "01")
+        assert len(trace_id) == 32 and trace_id.endswith(span.trace_id)
+        assert parent_id == span.span_id
+    
+    def test_traceparent_non_hex_ids(self):
+        """Test that arbitrary IDs still give fixed-width hex."""
+        span = Span(span_id="s1", trace_id="t1", name="test")
+        _, trace_id, parent_id, _ = span.traceparent.split("-")
+        assert len(trace_id) == 32 and len(parent_id) == 16
+        assert int(trace_id, 16) and int(parent_id, 16)
+    
+    def test_max_traces(self):
+        """Test that the oldest traces are dropped beyond max_traces."""
+        tracer = Tracer(max_traces=2)
+        first = tracer.start_span("a", trace_id="t1")
+        tracer.start_span("b", trace_id="t2")
+        tracer.start_span("c", trace_id="t3")
+        assert tracer.get_trace_spans("t1") == []
+        assert tracer.get_span(first.span_id) is None
+        assert len(tracer.get_trace_spans("t3")) == 1
+
+
+class TestProcessTrace:
+    """Tests for ProcessTrace sub-spans."""
+    
+    def test_sub_spans_in_order(self):
+        """Test that spawn/first_byte/last_byte/exit chain under the parent."""
+        tracer = Tracer()
+        parent = tracer.start_trace("agent_execution")
+        trace = ProcessTrace(tracer, parent)
+        trace.spawned(pid=123)
+        trace.output()
+        trace.output()
+        trace.exited(0)
+        spans = trace.finish()
+        
+        assert [s.name for s in spans] == ["spawn", "first_byte", "last_byte", "exit"]
+        assert all(s.parent_span_id == parent.span_id for s in spans)
+        for earlier, later in zip(spans, spans[1:]):
+            assert earlier.end_time == later.start_time
+        assert spans[-1].attributes == {"pid": 123, "returncode": 0}
+        assert trace.finish() == []
+    
+    def test_no_output(self):
+        """Test that a silent process has no byte spans."""
+        tracer = Tracer()
+        trace = ProcessTrace(tracer, tracer.start_trace("agent_execution"))
+        trace.spawned()
+        trace.exited(None)
+        spans = trace.finish(SpanStatus.TIMEOUT)
+        
+        assert [s.name for s in spans] == ["spawn", "exit"]
+        assert spans[-1].status == SpanStatus.TIMEOUT
+        assert trace.timings()["first_byte_ms"] is None
+    
+    def test_env(self):
+        """Test that the child env carries the parent's traceparent."""
+        tracer = Tracer()
+        parent = tracer.start_trace("agent_execution")
+        assert ProcessTrace(tracer, parent).env() == {TRACEPARENT_ENV: parent.traceparent}
+
+
 class TestGlobalTracer:
     """Tests for global tracer instance."""
     
@@ -233,21 +304,21 @@ class TestExecutionTimeline:
         event = timeline.add_event(EventType.TASK_RECEIVED, message="Test")
         assert len(timeline.events) == 1
         assert event.event_type == EventType.TASK_RECEIVED
-        
+    
     def test_record_task_received(self):
         """Test recording task received."""
         timeline = ExecutionTimeline(trace_id="t1")
         event = timeline.record_task_received("Write a function to...")
         assert event.event_type == EventType.TASK_RECEIVED
         assert "task_preview" in event.data
-        
+    
     def test_record_selection(self):
         """Test recording selection events."""
         timeline = ExecutionTimeline(trace_id="t1")
         timeline.record_selection_start(["claude", "gemini"])
         timeline.record_selection_complete("claude", 1200.0, "Best for coding")
         assert len(timeline.events) == 2
-        
+    
     def test_finalize(self):
         """Test finalizing timeline."""
         timeline = ExecutionTimeline(trace_id="t1")
@@ -255,7 +326,7 @@ class TestExecutionTimeline:
         timeline.finalize()
         assert timeline.end_time is not None
         assert timeline.total_duration_ms is not None
-        
+    
     def test_to_summary(self):
         """Test getting timeline summary."""
         timeline = ExecutionTimeline(trace_id="t1")
@@ -273,14 +344,14 @@ class TestTimelineManager:
         manager = TimelineManager()
         timeline = manager.create_timeline("t1")
         assert timeline.trace_id == "t1"
-        
+    
     def test_get_timeline(self):
         """Test getting timeline."""
         manager = TimelineManager()
         manager.create_timeline("t1")
         timeline = manager.get_timeline("t1")
         assert timeline is not None
-        
+    
     def test_max_timelines(self):
         """Test timeline eviction at capacity."""
         manager = TimelineManager(max_timelines=2)
@@ -304,7 +375,7 @@ class TestErrorClassification:
         exc = TimeoutError("Request timed out")
         classification = ErrorClassification.from_exception(exc)
         assert classification == ErrorClassification.TIMEOUT
-        
+    
     def test_from_unknown_exception(self):
         """Test classifying unknown exception."""
         exc = Exception("Unknown error")
@@ -342,7 +413,7 @@ class TestErrorTracker:
         )
         assert record.error_id.startswith("err_")
         assert record.trace_id == "t1"
-        
+    
     def test_record_exception(self):
         """Test recording from exception."""
         tracker = ErrorTracker()
@@ -350,7 +421,7 @@ class TestErrorTracker:
         record = tracker.record_exception("t1", exc)
         assert record.error_type == "ValueError"
         assert record.stack_trace is not None
-        
+    
     def test_get_recent_errors(self):
         """Test getting recent errors."""
         tracker = ErrorTracker()
@@ -359,7 +430,7 @@ class TestErrorTracker:
         errors = tracker.get_recent_errors(limit=1)
         assert len(errors) == 1
         assert errors[0].message == "Error 2"
-        
+    
     def test_get_errors_by_trace(self):
         """Test getting errors by trace ID."""
         tracker = ErrorTracker()
@@ -368,7 +439,7 @@ class TestErrorTracker:
         tracker.record_error("t2", "E3", "Error 3")
         errors = tracker.get_errors_by_trace("t1")
         assert len(errors) == 2
-        
+    
     def test_error_stats(self):
         """Test getting error stats."""
         tracker = ErrorTracker()
@@ -379,7 +450,7 @@ class TestErrorTracker:
         stats = tracker.get_error_stats()
         assert stats["total_errors"] == 2
         assert "timeout" in stats["by_classification"]
-        
+    
     def test_clear(self):
         """Test clearing errors."""
         tracker = ErrorTracker()
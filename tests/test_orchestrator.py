@@ -38,7 +38,7 @@ class TestTask:
         assert task.user_prompt == "Write hello world in Python."
         assert task.status == TaskStatus.PENDING
         assert task.working_directory is None
-        
+    
     def test_task_with_working_directory(self):
         """Test task with working directory."""
         task = Task(
@@ -79,7 +79,7 @@ class TestOrchestrator:
         """Test that orchestrator initializes correctly."""
         assert orchestrator.config is not None
         assert orchestrator._log is not None
-        
+    
     def test_get_available_agents(self, orchestrator):
         """Test getting available agents."""
         agents = orchestrator.get_available_agents()
@@ -88,19 +88,19 @@ class TestOrchestrator:
         assert len(agents) > 0
         assert "claude" in agents
         assert "gemini" in agents
-        
+    
     def test_get_agent_info(self, orchestrator):
         """Test getting agent info."""
         info = orchestrator.get_agent_info("claude")
         
         assert info.display_name == "Claude Agent"
         assert "coding" in info.capabilities
-        
+    
     def test_get_agent_info_not_found(self, orchestrator):
         """Test KeyError for unknown agent."""
         with pytest.raises(KeyError):
             orchestrator.get_agent_info("unknown_agent")
-            
+    
     @pytest.mark.asyncio
     async def test_process_task_returns_result(self, orchestrator):
         """Test that process_task returns an ExecutionResult."""
@@ -123,7 +123,7 @@ class TestOrchestrator:
         assert result.task_id
         assert result.agent
         assert result.success
-        
+    
     @pytest.mark.asyncio
     async def test_process_task_default_agent_selection(self, orchestrator):
         """Test that default agent is selected (before Phase 2)."""
@@ -134,7 +134,7 @@ class TestOrchestrator:
         
         # Default is Claude until council is implemented
         assert result.agent == "claude"
-        
+    
     @pytest.mark.asyncio
     async def test_process_task_logs_decision(self, orchestrator):
         """Test that processing a task logs a decision."""
@@ -150,7 +150,26 @@ class TestOrchestrator:
         
         last_decision = decisions[-1]
         assert last_decision.decision_type == "AGENT_SELECTION"
+    
+    @pytest.mark.asyncio
+    async def test_selection_decision_records_council_path(self, orchestrator):
+        """Test that the decision log says how much of the council was convened."""
+        from src.decision_log import DecisionType
         
+        task = Task(id="path-1", system_prompt="", user_prompt="hi")
+        selection = AgentSelection("claude", 0.8, "", council_path="single", match_margin=0.25)
+        result = ExecutionResult(
+            task_id="path-1", agent="claude", response="ok", success=True, duration_ms=1
+        )
+        await orchestrator._log_decision(task, selection, result)
+        
+        logged = [
+            d for d in orchestrator._decision_logger.get_decisions_for_task("path-1")
+            if d.decision_type == DecisionType.AGENT_SELECTION
+        ]
+        assert logged[0].context["council_path"] == "single"
+        assert logged[0].context["match_margin"] == 0.25
+    
     @pytest.mark.asyncio
     async def test_process_task_updates_status(self, orchestrator):
         """Test that task status updates during processing."""
@@ -162,7 +181,7 @@ class TestOrchestrator:
         # Task should be completed
         task = orchestrator._tasks[result.task_id]
         assert task.status == TaskStatus.COMPLETED
-        
+    
     @pytest.mark.asyncio
     async def test_process_task_with_approval_mode(self, orchestrator):
         """Test processing with explicit approval mode."""
@@ -183,18 +202,383 @@ class TestOrchestrator:
             )
         
         assert result.success
-        
+    
     def test_get_decisions_empty(self, orchestrator):
         """Test getting decisions when none exist."""
         decisions = orchestrator.get_decisions()
         assert isinstance(decisions, list)
-        
+    
     def test_get_decisions_with_limit(self, orchestrator):
         """Test getting decisions with limit."""
         decisions = orchestrator.get_decisions(limit=10)
         assert len(decisions) <= 10
 
 
+class TestHedgePlanning:
+    """Tests for hedged execution planning."""
+    
+    @pytest.fixture
+    def orchestrator(self):
+        """Create an orchestrator with hedging enabled and a latency history."""
+        from src.latency import LatencyTracker
+        
+        orchestrator = Orchestrator()
+        executor = orchestrator._executor
+        saved = (orchestrator.config.settings.execution.get("hedging"), executor.latency)
+        orchestrator.config.settings.execution["hedging"] = {"enabled": True, "percentile": 95}
+        executor.latency = LatencyTracker(min_samples=1)
+        with patch.object(executor.availability, "is_available", return_value=True):
+            yield orchestrator
+        orchestrator.config.settings.execution["hedging"], executor.latency = saved
+    
+    @pytest.mark.asyncio
+    async def test_select_agent_orders_candidates(self, orchestrator):
+        """Test that runners-up follow the selected agent."""
+        task = Task(id="t", system_prompt="", user_prompt="Write a Python function")
+        selection = await orchestrator._select_agent(task)
+        
+        assert selection.candidates[0] == selection.selected_agent
+        assert len(set(selection.candidates)) == len(selection.candidates)
+    
+    def test_no_hedge_without_history(self, orchestrator):
+        """Test that an agent without latency samples is never hedged."""
+        selection = AgentSelection("claude", 0.9, "", candidates=["claude", "gemini"])
+        
+        assert orchestrator._plan_hedge("claude", selection) is None
+    
+    def test_hedge_uses_p95_and_runner_up(self, orchestrator):
+        """Test that the runner-up is hedged after the agent's p95 latency."""
+        for ms in range(1000, 3000, 100):
+            orchestrator._executor.latency.record("claude", ms)
+        selection = AgentSelection("claude", 0.9, "", candidates=["claude", "gemini"])
+        
+        hedge_agent, hedge_after_ms = orchestrator._plan_hedge("claude", selection)
+        
+        assert hedge_agent == "gemini"
+        assert hedge_after_ms == orchestrator._executor.latency.percentile("claude", 95)
+    
+    @pytest.mark.asyncio
+    async def test_hedged_result_reports_winner(self, orchestrator):
+        """Test that the orchestrator result names the agent that actually won."""
+        from src.executor import ExecutionResult as AgentResult, ExecutionMethod
+        
+        orchestrator._executor.latency.record("claude", 1000)
+        hedged = AgentResult(
+            success=True,
+            response="ok",
+            agent_name="gemini",
+            execution_method=ExecutionMethod.CLI_SUBPROCESS,
+            duration_ms=10,
+            metadata={"hedge": {"primary": "claude", "hedge_agent": "gemini", "winner": "gemini"}},
+        )
+        task = Task(id="t", system_prompt="", user_prompt="hi")
+        selection = AgentSelection("claude", 0.9, "", candidates=["claude", "gemini"])
+        
+        with patch.object(orchestrator._executor, "execute_hedged", AsyncMock(return_value=hedged)):
+            result = await orchestrator._execute_agent(task, "claude", selection)
+        
+        assert result.agent == "gemini"
+        assert result.metadata["hedge"]["winner"] == "gemini"
+
+
+class TestFailover:
+    """Tests for the failover chain across candidate agents."""
+    
+    @pytest.fixture
+    def orchestrator(self):
+        """Create an orchestrator where every agent counts as installed."""
+        orchestrator = Orchestrator()
+        with patch.object(orchestrator._executor.availability, "is_available", return_value=True):
+            yield orchestrator
+    
+    @pytest.fixture
+    def selection(self):
+        return AgentSelection("claude", 0.9, "", candidates=["claude", "gemini", "aider", "goose"])
+    
+    def fake_execute(self, outcomes):
+        """Build an executor.execute replacement: agent -> (success, response, error[, kind])."""
+        from src.executor import ExecutionResult as AgentResult, ExecutionMethod
+        calls = []
+        
+        async def execute(agent_name, context):
+            calls.append(agent_name)
+            success, response, error, *kind = outcomes[agent_name]
+            return AgentResult(
+                success=success,
+                response=response,
+                agent_name=agent_name,
+                execution_method=ExecutionMethod.CLI_SUBPROCESS,
+                duration_ms=5,
+                error=error,
+                metadata={"failure_kind": kind[0]} if kind else {},
+            )
+        
+        return execute, calls
+    
+    def test_chain_respects_max_attempts(self, orchestrator, selection):
+        """Test that the chain starts with the selection and is capped."""
+        assert orchestrator._failover_chain(selection) == ["claude", "gemini", "aider"]
+    
+    def test_chain_skips_uninstalled(self, orchestrator, selection):
+        """Test that runners-up without a CLI are left out."""
+        with patch.object(
+            orchestrator._executor.availability, "is_available",
+            side_effect=lambda agent: agent != "gemini",
+        ):
+            assert orchestrator._failover_chain(selection) == ["claude", "aider", "goose"]
+    
+    @pytest.mark.asyncio
+    async def test_failover_to_next_candidate(self, orchestrator, selection):
+        """Test that missing CLI and empty output both move to the next agent."""
+        execute, calls = self.fake_execute({
+            "claude": (False, "", "Agent CLI not installed: claude", "unavailable"),
+            "gemini": (True, "   ", None),
+            "aider": (True, "done", None),
+        })
+        task = Task(id="failover-1", system_prompt="", user_prompt="hi")
+        
+        with patch.object(orchestrator._executor, "execute", execute):
+            result = await orchestrator._execute_with_failover(task, selection)
+        
+        assert calls == ["claude", "gemini", "aider"]
+        assert result.success
+        assert result.agent == "aider"
+        reasons = [a["failover_reason"] for a in result.metadata["attempts"]]
+        assert reasons == ["cli_missing", "empty_output", None]
+    
+    @pytest.mark.asyncio
+    async def test_all_attempts_fail_returns_selected(self, orchestrator, selection):
+        """Test that the selected agent's failure is reported when the chain is exhausted."""
+        execute, calls = self.fake_execute({
+            "claude": (False, "", "Exit code: 1"),
+            "gemini": (False, "", "Exit code: 2"),
+            "aider": (False, "", "Exit code: 3"),
+        })
+        task = Task(id="failover-2", system_prompt="", user_prompt="hi")
+        
+        with patch.object(orchestrator._executor, "execute", execute):
+            result = await orchestrator._execute_with_failover(task, selection)
+        
+        assert len(calls) == 3
+        assert not result.success
+        assert result.agent == "claude"
+        assert result.error == "Exit code: 1"
+    
+    @pytest.mark.asyncio
+    async def test_attempts_recorded_in_decision_log(self, orchestrator, selection):
+        """Test that every attempt is an AGENT_EXECUTION decision for the task."""
+        from src.decision_log import DecisionType, DecisionStatus
+        
+        execute, _ = self.fake_execute({
+            "claude": (False, "", "Exit code: 1"),
+            "gemini": (True, "ok", None),
+        })
+        task = Task(id="failover-3", system_prompt="", user_prompt="hi")
+        
+        with patch.object(orchestrator._executor, "execute", execute):
+            await orchestrator._execute_with_failover(task, selection)
+        
+        attempts = [
+            d for d in orchestrator._decision_logger.get_decisions_for_task("failover-3")
+            if d.decision_type == DecisionType.AGENT_EXECUTION
+        ]
+        assert sorted(d.context["agent"] for d in attempts) == ["claude", "gemini"]
+        statuses = {d.context["agent"]: d.status for d in attempts}
+        assert statuses == {"claude": DecisionStatus.FAILED, "gemini": DecisionStatus.EXECUTED}
+    
+    @pytest.mark.asyncio
+    async def test_attempt_outcomes_feed_routing_table(self, orchestrator, selection):
+        """Test that every attempt's outcome is reported for the task's signature."""
+        execute, _ = self.fake_execute({
+            "claude": (False, "", "Exit code: 1"),
+            "gemini": (True, "ok", None),
+        })
+        task = Task(id="failover-4", system_prompt="", user_prompt="hi")
+        selection.signature = "coding||0000"
+        
+        with patch.object(orchestrator._executor, "execute", execute), \
+                patch.object(orchestrator._council_selector, "record_outcome") as record:
+            result = await orchestrator._execute_with_failover(task, selection)
+            await orchestrator._log_decision(task, selection, result)
+        
+        outcomes = [call.args for call in record.call_args_list]
+        assert outcomes == [("coding||0000", "claude", False), ("coding||0000", "gemini", True)]
+    
+    @pytest.mark.asyncio
+    async def test_stream_fails_over_before_output(self, orchestrator, selection):
+        """Test that a stream switches agents only while nothing has been sent."""
+        from src.executor import StreamEvent, StreamEventType
+        
+        async def fake_stream(agent_name, context):
+            if agent_name == "claude":
+                yield StreamEvent(StreamEventType.SUMMARY, agent_name, error="Exit code: 1")
+                return
+            yield StreamEvent(StreamEventType.CHUNK, agent_name, data="hello")
+            yield StreamEvent(StreamEventType.SUMMARY, agent_name, success=True, exit_code=0)
+        
+        with patch.object(orchestrator, "_select_agent", AsyncMock(return_value=selection)), \
+                patch.object(orchestrator._executor, "execute_stream", fake_stream):
+            events = [e async for e in orchestrator.process_task_stream("", "hi")]
+        
+        assert [e.type for e in events] == [StreamEventType.CHUNK, StreamEventType.SUMMARY]
+        assert events[-1].agent_name == "gemini"
+        assert events[-1].success
+    
+    @pytest.mark.asyncio
+    async def test_stream_all_attempts_fail_returns_selected(self, orchestrator, selection):
+        """Test that an exhausted stream reports the selected agent, like process_task."""
+        from src.executor import StreamEvent, StreamEventType
+        contexts = []
+        
+        async def fake_stream(agent_name, context):
+            contexts.append(context)
+            yield StreamEvent(StreamEventType.SUMMARY, agent_name, error=f"{agent_name} failed")
+        
+        with patch.object(orchestrator, "_select_agent", AsyncMock(return_value=selection)), \
+                patch.object(orchestrator._executor, "execute_stream", fake_stream):
+            events = [
+                e async for e in orchestrator.process_task_stream("", "hi", bypass_cache=True)
+            ]
+        
+        assert len(events) == 1
+        assert events[0].agent_name == "claude"
+        assert events[0].error == "claude failed"
+        assert len(contexts) == 3
+        assert all(context.bypass_cache for context in contexts)
+
+
+class TestFanOut:
+    """Tests for running one task on the top-n agents."""
+    
+    @pytest.fixture
+    def orchestrator(self):
+        """Create an orchestrator where every agent counts as installed."""
+        orchestrator = Orchestrator()
+        with patch.object(orchestrator._executor.availability, "is_available", return_value=True):
+            yield orchestrator
+    
+    @pytest.fixture
+    def selection(self):
+        return AgentSelection("claude", 0.9, "", candidates=["claude", "gemini", "aider", "goose"])
+    
+    def fake_execute_many(self, outcomes):
+        """Build an executor.execute_many replacement returning results in the given order."""
+        from src.executor import ExecutionResult as AgentResult, ExecutionMethod
+        
+        async def execute_many(agent_names, context, first_success=True):
+            results = [
+                AgentResult(
+                    success=success,
+                    response=response,
+                    agent_name=agent_name,
+                    execution_method=ExecutionMethod.CLI_SUBPROCESS,
+                    duration_ms=5,
+                    metadata={"usage": {"total_tokens": 10}},
+                )
+                for agent_name, (success, response) in outcomes.items()
+                if agent_name in agent_names
+            ]
+            winner = next((r.agent_name for r in results if r.success), None)
+            for result in results:
+                result.metadata["fan_out"] = {
+                    "agents": agent_names, "winner": winner, "cancelled": []
+                }
+            return results
+        
+        return execute_many
+    
+    def test_fan_out_agents_capped(self, orchestrator, selection):
+        """Test that fan-out takes the top candidates, capped by max_agents."""
+        assert orchestrator._fan_out_agents(selection, 2) == ["claude", "gemini"]
+        assert orchestrator._fan_out_agents(selection, 10) == ["claude", "gemini", "aider"]
+    
+    @pytest.mark.asyncio
+    async def test_first_success_returns_winner(self, orchestrator, selection):
+        """Test that first_success returns the run that finished first."""
+        from src.orchestrator import FanOutPolicy
+        
+        execute_many = self.fake_execute_many({"gemini": (True, "fast"), "claude": (True, "slow")})
+        task = Task(id="fan-out-1", system_prompt="", user_prompt="hi")
+        
+        with patch.object(orchestrator._executor, "execute_many", execute_many):
+            result = await orchestrator._execute_fan_out(
+                task, selection, 2, FanOutPolicy.FIRST_SUCCESS
+            )
+        
+        assert result.agent == "gemini"
+        assert result.response == "fast"
+        assert result.metadata["fan_out"]["winner"] == "gemini"
+        assert len(result.metadata["attempts"]) == 2
+    
+    @pytest.mark.asyncio
+    async def test_all_lists_results_by_rank(self, orchestrator, selection):
+        """Test that policy all returns the best-ranked good result and every run."""
+        from src.orchestrator import FanOutPolicy
+        
+        execute_many = self.fake_execute_many({
+            "aider": (True, "third"),
+            "gemini": (False, ""),
+            "claude": (True, "first"),
+        })
+        task = Task(id="fan-out-2", system_prompt="", user_prompt="hi")
+        
+        with patch.object(orchestrator._executor, "execute_many", execute_many):
+            result = await orchestrator._execute_fan_out(task, selection, 3, FanOutPolicy.ALL)
+        
+        assert result.agent == "claude"
+        results = result.metadata["fan_out"]["results"]
+        assert [r["agent"] for r in results] == ["claude", "gemini", "aider"]
+        assert [r["success"] for r in results] == [True, False, True]
+    
+    @pytest.mark.asyncio
+    async def test_judge_picks_winner(self, orchestrator, selection):
+        """Test that policy judge returns the judge's pick."""
+        from src.orchestrator import FanOutPolicy
+        
+        execute_many = self.fake_execute_many({"claude": (True, "a"), "gemini": (True, "b")})
+        judge = AsyncMock(return_value=("gemini", "more complete"))
+        task = Task(id="fan-out-3", system_prompt="", user_prompt="hi")
+        
+        with patch.object(orchestrator._executor, "execute_many", execute_many), \
+                patch.object(orchestrator._council_selector, "judge_responses", judge):
+            result = await orchestrator._execute_fan_out(task, selection, 2, FanOutPolicy.JUDGE)
+        
+        assert result.agent == "gemini"
+        assert result.metadata["fan_out"]["judge"]["reasoning"] == "more complete"
+    
+    @pytest.mark.asyncio
+    async def test_judge_unavailable_falls_back_to_rank(self, orchestrator, selection):
+        """Test that without a verdict the best-ranked good result is returned."""
+        from src.orchestrator import FanOutPolicy
+        
+        execute_many = self.fake_execute_many({"gemini": (True, "b"), "claude": (True, "a")})
+        judge = AsyncMock(return_value=(None, "Judge unavailable"))
+        task = Task(id="fan-out-4", system_prompt="", user_prompt="hi")
+        
+        with patch.object(orchestrator._executor, "execute_many", execute_many), \
+                patch.object(orchestrator._council_selector, "judge_responses", judge):
+            result = await orchestrator._execute_fan_out(task, selection, 2, FanOutPolicy.JUDGE)
+        
+        assert result.agent == "claude"
+    
+    @pytest.mark.asyncio
+    async def test_all_runs_fail(self, orchestrator, selection):
+        """Test that a fan-out without a good result fails with the top agent's run."""
+        from src.orchestrator import FanOutPolicy
+        
+        execute_many = self.fake_execute_many({"gemini": (False, ""), "claude": (False, "")})
+        task = Task(id="fan-out-5", system_prompt="", user_prompt="hi")
+        
+        with patch.object(orchestrator._executor, "execute_many", execute_many):
+            result = await orchestrator._execute_fan_out(
+                task, selection, 2, FanOutPolicy.FIRST_SUCCESS
+            )
+        
+        assert not result.success
+        assert result.agent == "claude"
+        assert result.metadata["fan_out"]["winner"] is None
+
+
 class TestGlobalOrchestrator:
     """Tests for global orchestrator singleton."""
     
@@ -202,7 +586,7 @@ class TestGlobalOrchestrator:
         """Test that get_orchestrator returns an Orchestrator."""
         orch = get_orchestrator()
         assert isinstance(orch, Orchestrator)
-        
+    
     def test_get_orchestrator_is_singleton(self):
         """Test that get_orchestrator returns same instance."""
         orch1 = get_orchestrator()
@@ -0,0 +1,126 @@
+"""
+Tests for LastAgent Output Buffers
+"""
+
+import os
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.output_buffer import (
+    OutputStore,
+    CapturedOutput,
+    get_output_store,
+)
+
+
+class TestSpillBuffer:
+    """Tests for SpillBuffer class."""
+    
+    @pytest.fixture
+    def store(self, tmp_path):
+        """Create a store with tiny limits spilling into tmp_path."""
+        store = OutputStore(
+            max_memory_bytes=16,
+            preview_bytes=8,
+            retention_seconds=60,
+            spill_dir=str(tmp_path),
+        )
+        yield store
+        store.clear()
+    
+    def test_small_output_stays_in_memory(self, store, tmp_path):
+        """Test that output under the cap is returned whole."""
+        buffer = store.new_buffer()
+        buffer.write(b"hello ")
+        buffer.write(b"world")
+        output = buffer.finish()
+        
+        assert output == b"hello world"
+        assert not output.truncated
+        assert list(tmp_path.iterdir()) == []
+    
+    def test_large_output_spills(self, store):
+        """Test that output past the cap spills and keeps only a preview."""
+        buffer = store.new_buffer()
+        for i in range(10):
+            buffer.write(f"line {i}\n".encode())
+        output = buffer.finish()
+        
+        assert isinstance(output, CapturedOutput)
+        assert output.truncated
+        assert output == b"line 0\nl"
+        assert output.total_bytes == 70
+        stored = store.get(output.handle)
+        assert Path(stored.path).read_bytes().endswith(b"line 9\n")
+        assert output.describe()["preview_bytes"] == 8
+    
+    def test_preview_does_not_split_characters(self, store):
+        """Test that a multi-byte character cut by the preview is dropped."""
+        buffer = store.new_buffer()
+        buffer.write("1234567é".encode() + b"x" * 20)
+        output = buffer.finish()
+        
+        assert output.decode() == "1234567"
+    
+    def test_discard_removes_spill_file(self, store, tmp_path):
+        """Test that an abandoned capture leaves nothing on disk."""
+        buffer = store.new_buffer()
+        buffer.write(b"x" * 100)
+        assert buffer.spilled
+        buffer.discard()
+        
+        assert list(tmp_path.iterdir()) == []
+    
+    def test_retention_expiry(self, store):
+        """Test that expired outputs are deleted."""
+        buffer = store.new_buffer()
+        buffer.write(b"x" * 100)
+        output = buffer.finish()
+        path = store.get(output.handle).path
+        store._outputs[output.handle].created_at -= 61
+        
+        assert store.prune() == 1
+        assert store.get(output.handle) is None
+        assert not os.path.exists(path)
+
+
+class TestExecutorOutputCapture:
+    """Tests that CLI output is captured with bounded memory."""
+    
+    @pytest.mark.asyncio
+    async def test_run_cli_spills_large_stdout(self, tmp_path):
+        """Test that a chatty CLI returns a preview plus a retrievable handle."""
+        from src.executor import AgentExecutor
+        
+        executor = AgentExecutor()
+        executor.outputs = OutputStore(
+            max_memory_bytes=1024,
+            preview_bytes=100,
+            spill_dir=str(tmp_path),
+        )
+        script = "import sys; sys.stdout.write('a' * 100000); sys.stderr.write('warn')"
+        cmd = [sys.executable, "-c", script]
+        
+        try:
+            returncode, stdout, stderr = await executor._run_cli("codex", cmd, ".", 10)
+            
+            assert returncode == 0
+            assert stdout == b"a" * 100
+            assert stderr == b"warn"
+            expected = {"output": {"stdout": stdout.describe()}}
+            assert executor._output_metadata(stdout, stderr) == expected
+            assert "/v1/outputs/" in executor._decode_output(stdout)
+            assert os.path.getsize(executor.outputs.get(stdout.handle).path) == 100000
+        finally:
+            executor.outputs.clear()
+
+
+class TestGlobalOutputStore:
+    """Tests for global output store singleton."""
+    
+    def test_get_output_store_is_singleton(self):
+        """Test that get_output_store returns the same instance."""
+        assert get_output_store() is get_output_store()
@@ -0,0 +1,257 @@
+"""
+Tests for LastAgent Output Parsers
+"""
+
+import json
+import sys
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.output_parsers import (
+    OutputParser,
+    ParsedOutput,
+    StreamJsonParser,
+    TokenUsage,
+    create_parser,
+    parse_output,
+)
+
+
+def stream_json(*events) -> str:
+    """Render events as Claude Code stream-json output."""
+    return "".join(json.dumps(e) + "\n" for e in events)
+
+
+SESSION = stream_json(
+    {"type": "system", "subtype": "init", "model": "claude-sonnet-4"},
+    {"type": "assistant", "message": {"content": [
+        {"type": "text", "text": "Reading the file."},
+        {"type": "tool_use", "id": "t1", "name": "Read", "input": {"path": "a.py"}},
+    ]}},
+    {"type": "user", "message": {"content": [
+        {"type": "tool_result", "tool_use_id": "t1", "is_error": False},
+    ]}},
+    {"type": "assistant", "message": {"content": [{"type": "text", "text": "Done."}]}},
+    {
+        "type": "result",
+        "subtype": "success",
+        "is_error": False,
+        "result": "Done.",
+        "num_turns": 2,
+        "total_cost_usd": 0.0123,
+        "usage": {
+            "input_tokens": 10,
+            "output_tokens": 50,
+            "cache_read_input_tokens": 200,
+            "cache_creation_input_tokens": 40,
+        },
+    },
+)
+
+
+class TestTextParser:
+    """Tests for plain text output."""
+    
+    def test_text_passes_through(self):
+        """Test that text output is the response, without usage."""
+        parser = create_parser("text")
+        
+        assert parser.feed("hello ") == "hello "
+        assert parser.feed("world") == "world"
+        assert parser.finish() == ""
+        assert parser.result() == ParsedOutput(text="hello world")
+        assert parser.result().metadata() == {}
+    
+    def test_default_and_unknown_formats(self):
+        """Test the default format and rejection of unknown ones."""
+        assert type(create_parser(None)) is OutputParser
+        with pytest.raises(ValueError):
+            create_parser("xml")
+
+
+class TestStreamJsonParser:
+    """Tests for Claude Code stream-json output."""
+    
+    def test_final_result_and_usage(self):
+        """Test the response, token counts and cost from the result event."""
+        parsed = parse_output("stream-json", SESSION)
+        
+        assert parsed.text == "Done."
+        assert not parsed.is_error
+        assert parsed.usage.input_tokens == 10
+        assert parsed.usage.output_tokens == 50
+        assert parsed.usage.prompt_tokens == 250
+        assert parsed.usage.total_tokens == 300
+        assert parsed.usage.cost_usd == 0.0123
+        assert parsed.usage.model == "claude-sonnet-4"
+        assert parsed.usage.num_turns == 2
+    
+    def test_tool_calls(self):
+        """Test that tool_use blocks become tool calls with their outcome."""
+        parsed = parse_output("stream-json", SESSION)
+        
+        assert parsed.tool_calls == [{"name": "Read", "id": "t1", "is_error": False}]
+        assert parsed.metadata()["tool_calls"] == parsed.tool_calls
+        assert parsed.metadata()["usage"]["total_tokens"] == 300
+    
+    def test_incremental_feed(self):
+        """Test that assistant text streams even with lines split across chunks."""
+        parser = StreamJsonParser()
+        shown = [parser.feed(SESSION[i:i + 7]) for i in range(0, len(SESSION), 7)]
+        shown.append(parser.finish())
+        
+        assert "".join(shown) == "Reading the file.\nDone.\n"
+        assert parser.result().text == "Done."
+    
+    def test_last_line_without_newline(self):
+        """Test that a final event without a trailing newline is parsed."""
+        parser = StreamJsonParser()
+        parser.feed(SESSION.rstrip("\n"))
+        parser.finish()
+        
+        assert parser.result().usage is not None
+    
+    def test_error_result(self):
+        """Test that a failed run is reported."""
+        parsed = parse_output("stream-json", stream_json(
+            {"type": "result", "subtype": "error_max_turns", "is_error": True, "usage": {}},
+        ))
+        
+        assert parsed.is_error
+        assert parsed.usage == TokenUsage()
+    
+    def test_non_json_output(self):
+        """Test that plain output (e.g. an old CLI) is still returned."""
+        parsed = parse_output("stream-json", "error: unknown option --verbose\n")
+        
+        assert parsed.text == "error: unknown option --verbose\n"
+        assert parsed.usage is None
+
+
+class TestExecutorOutputParsing:
+    """Tests that the executor parses structured agent output."""
+    
+    @pytest.fixture
+    def executor(self):
+        from src.executor import AgentExecutor
+        
+        executor = AgentExecutor()
+        executor._is_cli_available = lambda command: True
+        executor._output_format = lambda agent_name: "stream-json"
+        return executor
+    
+    def emit(self):
+        """argv printing SESSION, like claude --output-format stream-json."""
+        return [sys.executable, "-c", f"import sys; sys.stdout.write({SESSION!r})"]
+    
+    def test_claude_command(self, executor):
+        """Test that stream-json output is requested from claude."""
+        from src.executor import ExecutionContext
+        
+        cmd = executor._build_claude_command(ExecutionContext("", "hi"))
+        
+        assert cmd[cmd.index("--output-format") + 1] == "stream-json"
+        assert "--verbose" in cmd
+    
+    @pytest.mark.asyncio
+    async def test_execute_reports_usage(self, executor):
+        """Test that the response is the final text and usage is in metadata."""
+        from src.executor import ExecutionContext
+        
+        executor._build_claude_command = lambda ctx, delivery=None: self.emit()
+        result = await executor.execute(
+            "claude", ExecutionContext("", "hi", bypass_cache=True, timeout=30)
+        )
+        
+        assert result.success
+        assert result.response == "Done."
+        assert result.metadata["usage"]["total_tokens"] == 300
+        assert result.metadata["tool_calls"][0]["name"] == "Read"
+    
+    @pytest.mark.asyncio
+    async def test_spilled_output_keeps_result(self, executor, tmp_path):
+        """Test that the final result event is parsed even when stdout spilled to disk."""
+        from src.executor import ExecutionContext
+        from src.output_buffer import OutputStore
+        
+        executor.outputs = OutputStore(
+            max_memory_bytes=1024, preview_bytes=100, spill_dir=str(tmp_path)
+        )
+        # Verbose tool results fill stdout well past the preview before the result event
+        session = stream_json(*[
+            {"type": "user", "message": {"content": [
+                {"type": "tool_result", "tool_use_id": "t0", "content": "x" * 500},
+            ]}}
+            for _ in range(20)
+        ]) + SESSION
+        executor._build_claude_command = lambda ctx, delivery=None: [
+            sys.executable, "-c", f"import sys; sys.stdout.write({session!r})"
+        ]
+        
+        try:
+            result = await executor.execute(
+                "claude", ExecutionContext("", "hi", bypass_cache=True, timeout=30)
+            )
+            
+            assert "stdout" in result.metadata["output"]
+            assert result.response == "Done."
+            assert result.metadata["usage"]["total_tokens"] == 300
+        finally:
+            executor.outputs.clear()
+    
+    @pytest.mark.asyncio
+    async def test_stream_reports_usage(self, executor):
+        """Test that streams carry assistant text only, and usage in the summary."""
+        from src.executor import ExecutionContext, StreamEventType
+        
+        with patch.object(executor, "_build_command", return_value=self.emit()):
+            context = ExecutionContext("", "hi", timeout=30)
+            events = [e async for e in executor.execute_stream("claude", context)]
+        
+        text = "".join(e.data for e in events if e.type == StreamEventType.CHUNK)
+        assert text == "Reading the file.\nDone.\n"
+        assert events[-1].usage["cost_usd"] == 0.0123
+
+
+class TestUsageReporting:
+    """Tests for usage in API responses and the decision log."""
+    
+    def test_api_usage(self):
+        """Test real and estimated usage in the chat completion Usage model."""
+        from api.routes.chat import Usage
+        
+        usage = TokenUsage(input_tokens=10, output_tokens=5, cache_read_tokens=100).to_dict()
+        real = Usage.from_run(usage, "ignored prompt", "ignored")
+        estimate = Usage.from_run(None, "two words", "three more words")
+        
+        assert (real.prompt_tokens, real.completion_tokens, real.total_tokens) == (110, 5, 115)
+        assert not real.estimated
+        assert (estimate.total_tokens, estimate.estimated) == (5, True)
+    
+    def test_decision_log_totals(self):
+        """Test that the decision log sums token usage per agent."""
+        from src.decision_log import DecisionLogger, DecisionStatus, DecisionType
+        
+        logger = DecisionLogger()
+        for cost in (0.25, 0.5):
+            decision_id = logger.log_decision(
+                decision_type=DecisionType.AGENT_EXECUTION,
+                title="Attempt",
+                reasoning="",
+                confidence_score=1.0,
+                context={"agent": "claude"},
+            )
+            logger.update_outcome(
+                decision_id,
+                status=DecisionStatus.EXECUTED,
+                outcome_status="success",
+                outcome_data={"usage": TokenUsage(output_tokens=100, cost_usd=cost).to_dict()},
+            )
+        
+        totals = logger.get_stats().token_usage["claude"]
+        assert totals["runs"] == 2
+        assert totals["output_tokens"] == 200
+        assert totals["cost_usd"] == 0.75
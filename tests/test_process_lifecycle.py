@@ -0,0 +1,168 @@
+"""
+Tests for LastAgent Process Lifecycle Manager
+"""
+
+import asyncio
+import os
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.process_lifecycle import (
+    ProcessLifecycleManager,
+    LeakReport,
+    get_process_manager,
+)
+
+posix_only = pytest.mark.skipif(os.name != "posix", reason="process groups are POSIX-only")
+
+# Parent that starts a long-lived grandchild, prints its PID and then waits
+PARENT_WITH_CHILD = (
+    "import subprocess, sys, time;"
+    "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)']);"
+    "print(child.pid, flush=True);"
+    "time.sleep(60)"
+)
+
+# Parent that starts a grandchild detached from its pipes and exits immediately
+PARENT_LEAKS_CHILD = (
+    "import subprocess, sys;"
+    "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'],"
+    " stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL);"
+    "print(child.pid, flush=True)"
+)
+
+
+def pid_alive(pid: int) -> bool:
+    """Check whether a PID exists and is not a zombie."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    stat = Path(f"/proc/{pid}/stat")
+    if stat.exists():
+        try:
+            return stat.read_text().rsplit(")", 1)[-1].split()[0] != "Z"
+        except OSError:
+            return False
+    return True
+
+
+async def wait_dead(pid: int, timeout: float = 5.0) -> bool:
+    """Poll until a PID is gone."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while loop.time() < deadline:
+        if not pid_alive(pid):
+            return True
+        await asyncio.sleep(0.05)
+    return False
+
+
+class TestProcessLifecycleManager:
+    """Tests for ProcessLifecycleManager class."""
+    
+    @pytest.fixture
+    def manager(self):
+        """Create a manager with a short kill grace period."""
+        return ProcessLifecycleManager(kill_grace_seconds=0.5, kill_orphans=True)
+    
+    @pytest.mark.asyncio
+    async def test_spawn_and_finalize(self, manager):
+        """Test a normal run is tracked and reaped."""
+        process = await manager.spawn("claude", [sys.executable, "-c", "print('ok')"])
+        stdout, _ = await process.communicate()
+        report = await manager.finalize(process)
+        
+        assert stdout.strip() == b"ok"
+        assert report is None
+        stats = manager.get_stats()
+        assert stats.spawned == 1
+        assert stats.exited == 1
+        assert stats.active == 0
+    
+    @posix_only
+    @pytest.mark.asyncio
+    async def test_spawn_uses_new_process_group(self, manager):
+        """Test that each agent leads its own process group."""
+        process = await manager.spawn(
+            "claude", [sys.executable, "-c", "import time; time.sleep(5)"]
+        )
+        try:
+            assert os.getpgid(process.pid) == process.pid
+            assert os.getpgid(process.pid) != os.getpgid(0)
+        finally:
+            await manager.terminate(process, reason="cancelled")
+    
+    @posix_only
+    @pytest.mark.asyncio
+    async def test_terminate_kills_whole_tree(self, manager):
+        """Test that timeout termination also kills grandchildren."""
+        process = await manager.spawn("claude", [sys.executable, "-c", PARENT_WITH_CHILD])
+        child_pid = int((await process.stdout.readline()).strip())
+        assert pid_alive(child_pid)
+        
+        await manager.terminate(process, reason="timeout")
+        
+        assert process.returncode is not None
+        assert await wait_dead(child_pid)
+        assert manager.get_stats().killed_timeout == 1
+        assert manager.get_stats().active == 0
+    
+    @posix_only
+    @pytest.mark.asyncio
+    async def test_finalize_reports_and_kills_leaked_children(self, manager):
+        """Test that children outliving the CLI are reported and killed."""
+        process = await manager.spawn("aider", [sys.executable, "-c", PARENT_LEAKS_CHILD])
+        stdout, _ = await process.communicate()
+        child_pid = int(stdout.strip())
+        
+        report = await manager.finalize(process)
+        
+        assert isinstance(report, LeakReport)
+        assert report.agent_name == "aider"
+        assert report.killed
+        if Path("/proc").is_dir():
+            assert child_pid in report.leaked_pids
+        assert await wait_dead(child_pid)
+        assert manager.get_stats().leaked_groups == 1
+        assert manager.get_leaks()[-1] is report
+
+
+class TestExecutorTimeoutKillsTree:
+    """Tests that executor timeouts go through the lifecycle manager."""
+    
+    @posix_only
+    @pytest.mark.asyncio
+    async def test_run_cli_timeout_kills_children(self):
+        """Test that a timed-out CLI does not leave its children running."""
+        from src.executor import AgentExecutor
+        
+        executor = AgentExecutor()
+        executor.processes = ProcessLifecycleManager(kill_grace_seconds=0.5)
+        
+        code = (
+            "import subprocess, sys, time;"
+            "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)']);"
+            "open(sys.argv[1], 'w').write(str(child.pid));"
+            "time.sleep(60)"
+        )
+        pid_file = Path(f"/tmp/lastagent-test-{os.getpid()}.pid")
+        with pytest.raises(asyncio.TimeoutError):
+            await executor._run_cli(
+                "claude", [sys.executable, "-c", code, str(pid_file)], ".", timeout=1
+            )
+        
+        child_pid = int(pid_file.read_text())
+        pid_file.unlink()
+        assert await wait_dead(child_pid)
+
+
+class TestGlobalProcessManager:
+    """Tests for global process manager singleton."""
+    
+    def test_get_process_manager_is_singleton(self):
+        """Test that get_process_manager returns the same instance."""
+        assert get_process_manager() is get_process_manager()
@@ -0,0 +1,160 @@
+"""
+Tests for LastAgent Prompt Transport
+"""
+
+import os
+import stat
+import sys
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.prompt_transport import (
+    ARGV,
+    FILE,
+    STDIN,
+    PromptDelivery,
+    PromptTransport,
+    get_prompt_transport,
+)
+
+# Writes 1 MB to stdout before reading stdin, then reports the stdin size
+READ_STDIN_LATE = (
+    "import sys;"
+    "sys.stdout.buffer.write(b'x' * 1000000); sys.stdout.flush();"
+    "sys.stderr.write(str(len(sys.stdin.buffer.read())))"
+)
+
+
+class TestPromptTransport:
+    """Tests for PromptTransport class."""
+    
+    @pytest.fixture
+    def transport(self, tmp_path):
+        """Create a transport with a 100-byte argv limit."""
+        return PromptTransport(argv_max_bytes=100, temp_dir=str(tmp_path))
+    
+    def test_small_prompts_use_argv(self, transport):
+        """Test that prompts under the limit stay in argv."""
+        assert transport.choose("claude", 100) == ARGV
+        assert transport.choose("aider", 10) == ARGV
+    
+    def test_large_prompts_use_agent_transport(self, transport):
+        """Test that large prompts use the agent's first non-argv transport."""
+        assert transport.choose("claude", 101) == STDIN
+        assert transport.choose("goose", 101) == STDIN
+        assert transport.choose("aider", 101) == FILE
+        assert transport.choose("codex", 101) == ARGV  # No alternative
+    
+    def test_file_delivery(self, transport):
+        """Test that prompt files are private and deleted on cleanup."""
+        delivery = transport.prepare("aider", "fix it " * 50)
+        
+        assert delivery.mode == FILE
+        assert Path(delivery.path).read_text() == "fix it " * 50
+        assert stat.S_IMODE(os.stat(delivery.path).st_mode) == 0o600
+        assert delivery.stdin is None
+        
+        path = delivery.path
+        delivery.cleanup()
+        assert not os.path.exists(path)
+    
+    def test_stdin_delivery(self, transport):
+        """Test that stdin deliveries carry the encoded prompt."""
+        delivery = transport.prepare("claude", "é" * 100)
+        
+        assert delivery.mode == STDIN
+        assert delivery.stdin == ("é" * 100).encode()
+        assert delivery.path is None
+
+
+class TestCommandBuilders:
+    """Tests that command builders honour the delivery."""
+    
+    @pytest.fixture
+    def executor(self):
+        from src.executor import AgentExecutor
+        return AgentExecutor()
+    
+    @pytest.fixture
+    def context(self):
+        from src.executor import ExecutionContext
+        return ExecutionContext(system_prompt="be brief", user_prompt="hello")
+    
+    def test_prompt_left_out_of_argv(self, executor, context):
+        """Test that stdin and file transports keep the prompt out of argv."""
+        stdin = PromptDelivery(mode=STDIN, prompt="hello")
+        file = PromptDelivery(mode=FILE, prompt="hello", path="/tmp/p.md")
+        
+        assert "hello" not in executor._build_claude_command(context, stdin)
+        assert executor._build_gemini_command(context, stdin) == ["gemini", "--yolo"]
+        assert executor._build_aider_command(context, file) == [
+            "aider", "--message-file", "/tmp/p.md", "--yes",
+        ]
+        assert executor._build_goose_command(context, file) == ["goose", "run", "-i", "/tmp/p.md"]
+        assert executor._build_claude_command(context)[2] == "hello"
+    
+    def test_claude_system_prompt_follows_prompt(self, executor, context):
+        """Test that claude's system prompt leaves argv along with the prompt."""
+        delivery = executor._prompt_delivery("claude", context)
+        argv = executor._build_claude_command(context)
+        stdin = executor._build_claude_command(context, PromptDelivery(mode=STDIN, prompt=""))
+        
+        assert delivery.prompt == "be brief\n\nhello"
+        assert argv[argv.index("--append-system-prompt") + 1] == "be brief"
+        assert "--append-system-prompt" not in stdin
+        assert "be brief" not in stdin
+    
+    def test_warm_command_uses_stdin(self, executor, context):
+        """Test that warm commands are the stdin form of each builder."""
+        cmd, payload = executor._build_warm_command("gemini", context)
+        
+        assert cmd == ["gemini", "--yolo"]
+        assert payload == b"be brief\n\nhello"
+        assert executor._build_warm_command("aider", context) is None
+
+
+class TestLargePrompts:
+    """Tests for delivering multi-megabyte prompts."""
+    
+    @pytest.mark.asyncio
+    async def test_stdin_written_while_output_drains(self):
+        """Test that a CLI writing before it reads stdin doesn't deadlock."""
+        from src.executor import AgentExecutor
+        
+        executor = AgentExecutor()
+        prompt = b"p" * (4 * 1024 * 1024)
+        returncode, stdout, stderr = await executor._run_cli(
+            "test", [sys.executable, "-c", READ_STDIN_LATE], ".", 30, stdin_data=prompt
+        )
+        
+        assert returncode == 0
+        assert len(stdout) == 1000000
+        assert stderr == str(len(prompt)).encode()
+    
+    @pytest.mark.asyncio
+    async def test_stream_large_prompt(self):
+        """Test that the streaming path sends a large prompt over stdin."""
+        from src.executor import AgentExecutor, ExecutionContext
+        
+        executor = AgentExecutor()
+        executor._is_cli_available = lambda command: True
+        code = "import sys; print(len(sys.stdin.buffer.read()))"
+        context = ExecutionContext(system_prompt="", user_prompt="q" * 500000)
+        
+        with patch.object(executor, "_build_command", return_value=[sys.executable, "-c", code]):
+            events = [e async for e in executor.execute_stream("claude", context)]
+        
+        assert "".join(e.data or "" for e in events[:-1]).strip() == "500000"
+        assert events[-1].success
+
+
+class TestGlobalPromptTransport:
+    """Tests for global prompt transport singleton."""
+    
+    def test_get_prompt_transport_is_singleton(self):
+        """Test that get_prompt_transport returns the same instance."""
+        assert get_prompt_transport() is get_prompt_transport()
+        assert get_prompt_transport().argv_max_bytes > 0
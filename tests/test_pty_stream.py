@@ -0,0 +1,90 @@
+"""
+Tests for LastAgent PTY Output
+"""
+
+import asyncio
+import sys
+import pytest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.pty_stream import PTY_SUPPORTED, TerminalFilter
+from src.process_lifecycle import ProcessLifecycleManager
+
+requires_pty = pytest.mark.skipif(not PTY_SUPPORTED, reason="pseudo-terminals are POSIX-only")
+
+
+class TestTerminalFilter:
+    """Tests for control sequence stripping."""
+    
+    def test_strips_colours_and_titles(self):
+        """Test that CSI and OSC sequences are removed."""
+        terminal = TerminalFilter()
+        data = b"\x1b]0;claude\x07\x1b[1;32mdone\x1b[0m\x1b[2K\n"
+        
+        assert terminal.feed(data) + terminal.flush() == b"done\n"
+    
+    def test_sequence_split_across_chunks(self):
+        """Test that a partial escape sequence is held until complete."""
+        terminal = TerminalFilter()
+        
+        assert terminal.feed(b"ok \x1b[3") == b"ok "
+        assert terminal.feed(b"1mred\x1b[0m\x1b]0;ti") == b"red"
+        assert terminal.feed(b"tle\x1b") == b""
+        assert terminal.feed(b"\\!") == b"!"
+    
+    def test_line_endings_and_controls(self):
+        """Test CRLF normalization and removal of redraws and bells."""
+        terminal = TerminalFilter()
+        
+        assert terminal.feed(b"a\r") == b"a"
+        assert terminal.feed(b"\nspin\rspin\x07\tx\x08\n") == b"\nspinspin\tx\n"
+        assert terminal.flush() == b""
+    
+    def test_flush_drops_unterminated_escape(self):
+        """Test that an escape cut off at end of output isn't emitted."""
+        terminal = TerminalFilter()
+        
+        assert terminal.feed(b"tail\x1b[") == b"tail"
+        assert terminal.flush() == b""
+
+
+@requires_pty
+class TestPtySpawn:
+    """Tests for spawning CLIs on a pseudo-terminal."""
+    
+    @pytest.mark.asyncio
+    async def test_stdout_is_a_tty(self):
+        """Test that the CLI sees a terminal and output arrives without CRLF."""
+        manager = ProcessLifecycleManager()
+        process = await manager.spawn(
+            "test",
+            [
+                sys.executable, "-c",
+                "import sys; print(sys.stdout.isatty()); print('\\x1b[1mbold\\x1b[0m')",
+            ],
+            pty=True,
+        )
+        stdout = await asyncio.wait_for(process.stdout.read(), timeout=10)
+        await manager.finalize(process)
+        
+        assert stdout == b"True\nbold\n"
+        assert process.returncode == 0
+    
+    @pytest.mark.asyncio
+    async def test_output_is_not_block_buffered(self):
+        """Test that a line printed before a long pause arrives immediately."""
+        manager = ProcessLifecycleManager(kill_grace_seconds=1)
+        process = await manager.spawn(
+            "test",
+            [sys.executable, "-c", "import time; print('first'); time.sleep(30)"],
+            pty=True,
+        )
+        try:
+            line = await asyncio.wait_for(process.stdout.readline(), timeout=10)
+        finally:
+            await manager.terminate(process, reason="cancelled")
+        
+        assert line == b"first\n"
+        assert await process.stdout.read() == b""
@@ -0,0 +1,221 @@
+"""
+Tests for LastAgent Resource Limits
+"""
+
+import json
+import os
+import signal
+import sys
+import pytest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config import ResourceLimitsConfig
+from src.resource_limits import (
+    ADDRESS_SPACE,
+    CPU_TIME,
+    OPEN_FILES,
+    RLIMITS_SUPPORTED,
+    ResourceLimitExceeded,
+    ResourceLimiter,
+    ResourceLimitStats,
+    get_resource_limiter,
+)
+from src.resource_usage import ResourceUsage
+from src.observability import ErrorClassification, get_error_tracker
+
+pytestmark = pytest.mark.skipif(not RLIMITS_SUPPORTED, reason="POSIX only")
+
+
+def limiter_with(limits: ResourceLimitsConfig) -> ResourceLimiter:
+    """Limiter that gives every agent the same limits."""
+    limiter = ResourceLimiter(enabled=True)
+    limiter.limits = lambda agent_name: limits
+    return limiter
+
+
+def python_command(code: str):
+    return [sys.executable, "-c", code]
+
+
+class TestResourceLimiter:
+    """Tests for ResourceLimiter class."""
+    
+    def test_limits_from_config(self):
+        """Test that agents.yml limits are loaded per agent."""
+        limiter = ResourceLimiter()
+        
+        assert limiter.limits("aider").cpu_seconds == 1800
+        assert limiter.limits("aider").nice == 5
+        assert limiter.limits("unknown") is None
+    
+    def test_disabled(self):
+        """Test that a disabled limiter applies nothing."""
+        limiter = ResourceLimiter(enabled=False)
+        
+        assert limiter.limits("aider") is None
+        assert limiter.preexec("aider") is None
+    
+    def test_no_breach_on_success(self):
+        """Test that successful runs are never breaches."""
+        limiter = limiter_with(ResourceLimitsConfig(open_files=10))
+        
+        assert limiter.check("aider", 0, b"Too many open files") is None
+        assert limiter.check("aider", 1, b"ordinary failure") is None
+    
+    def test_breach_detection(self):
+        """Test detection from signals, CPU usage and stderr."""
+        limiter = limiter_with(
+            ResourceLimitsConfig(cpu_seconds=10, open_files=10, address_space_mb=100)
+        )
+        busy = ResourceUsage(user_cpu_seconds=9.5, system_cpu_seconds=1)
+        
+        assert limiter.check("aider", -signal.SIGXCPU, b"").limit == CPU_TIME
+        assert limiter.check("aider", -signal.SIGKILL, b"", busy).limit == CPU_TIME
+        assert limiter.check("aider", -signal.SIGKILL, b"", ResourceUsage()) is None
+        breach = limiter.check("aider", 1, b"OSError: [Errno 24] Too many open files")
+        assert breach.limit == OPEN_FILES
+        assert limiter.check("aider", 1, b"MemoryError").limit == ADDRESS_SPACE
+        assert limiter.get_stats().breaches == {CPU_TIME: 2, OPEN_FILES: 1, ADDRESS_SPACE: 1}
+    
+    def test_breach_recorded(self):
+        """Test that breaches are classified as RESOURCE_LIMIT errors."""
+        limiter = limiter_with(ResourceLimitsConfig(open_files=10))
+        error = limiter.check("codex", 1, b"Too many open files")
+        
+        assert str(error) == "Resource limit exceeded: open_files (limit 10)"
+        latest = get_error_tracker().get_recent_errors(1)[0]
+        assert latest.classification == ErrorClassification.RESOURCE_LIMIT
+        assert latest.agent == "codex"
+        assert ErrorClassification.from_exception(error) == ErrorClassification.RESOURCE_LIMIT
+
+
+class TestLimitsInChild:
+    """Tests that spawned CLIs run with their limits."""
+    
+    @pytest.fixture
+    def manager(self):
+        from src.process_lifecycle import ProcessLifecycleManager
+        
+        manager = ProcessLifecycleManager()
+        manager.limits = limiter_with(
+            ResourceLimitsConfig(address_space_mb=2048, cpu_seconds=60, open_files=64, nice=3)
+        )
+        return manager
+    
+    @pytest.mark.asyncio
+    async def test_limits_applied(self, manager):
+        """Test rlimits and nice level as seen by the child."""
+        code = (
+            "import json, os, resource; print(json.dumps(["
+            "resource.getrlimit(resource.RLIMIT_AS), resource.getrlimit(resource.RLIMIT_CPU),"
+            "resource.getrlimit(resource.RLIMIT_NOFILE), os.nice(0)]))"
+        )
+        parent_nice = os.nice(0)
+        process = await manager.spawn("aider", python_command(code))
+        stdout, _ = await process.communicate()
+        await manager.finalize(process)
+        
+        address_space, cpu, open_files, nice = json.loads(stdout)
+        assert address_space == [2048 * 1024 * 1024] * 2
+        assert cpu == [60, 65]
+        assert open_files == [64, 64]
+        assert nice == min(parent_nice + 3, 19)
+    
+    @pytest.mark.asyncio
+    async def test_unlimited_agent(self, manager):
+        """Test that agents without limits spawn normally."""
+        manager.limits = ResourceLimiter(enabled=False)
+        process = await manager.spawn("aider", python_command("print('ok')"))
+        stdout, _ = await process.communicate()
+        await manager.finalize(process)
+        
+        assert stdout.strip() == b"ok"
+
+
+class TestExecutorLimits:
+    """Tests that the executor fails runs that hit a limit."""
+    
+    @pytest.fixture
+    def executor(self):
+        from src.executor import AgentExecutor
+        
+        executor = AgentExecutor()
+        executor._is_cli_available = lambda command: True
+        return executor
+    
+    def limit(self, executor, limits: ResourceLimitsConfig) -> None:
+        executor.limits = limiter_with(limits)
+        executor.processes.limits = executor.limits
+    
+    @pytest.mark.asyncio
+    async def test_cpu_limit(self, executor):
+        """Test that a CPU-bound runaway is stopped and reported."""
+        self.limit(executor, ResourceLimitsConfig(cpu_seconds=1))
+        try:
+            with pytest.raises(ResourceLimitExceeded) as info:
+                await executor._run_cli(
+                    "codex", python_command("while True: pass"), ".", timeout=30
+                )
+        finally:
+            executor.processes.limits = get_resource_limiter()
+        
+        assert info.value.limit == CPU_TIME
+    
+    @pytest.mark.asyncio
+    async def test_open_files_limit(self, executor):
+        """Test that a run failing on its file limit fails as a breach."""
+        from src.executor import ExecutionContext
+        
+        self.limit(executor, ResourceLimitsConfig(open_files=16))
+        code = "fs = [open(__import__('os').devnull) for _ in range(100)]"
+        executor._build_codex_command = lambda ctx, delivery=None: python_command(code)
+        try:
+            result = await executor.execute("codex", ExecutionContext("", "hi", timeout=30))
+        finally:
+            executor.processes.limits = get_resource_limiter()
+        
+        assert not result.success
+        assert result.error == "Resource limit exceeded: open_files (limit 16)"
+        assert result.metadata["failure_kind"] == "resource_limit"
+    
+    @pytest.mark.asyncio
+    async def test_stream_address_space_limit(self, executor):
+        """Test that streamed runs report breaches in the summary."""
+        from unittest.mock import patch
+        from src.executor import ExecutionContext
+        
+        self.limit(executor, ResourceLimitsConfig(address_space_mb=512))
+        code = "x = bytearray(2 * 1024 ** 3)"
+        try:
+            with patch.object(executor, "_build_command", return_value=python_command(code)):
+                context = ExecutionContext("", "hi", timeout=30)
+                events = [e async for e in executor.execute_stream("codex", context)]
+        finally:
+            executor.processes.limits = get_resource_limiter()
+        
+        assert events[-1].error == "Resource limit exceeded: address_space (limit 512)"
+        assert events[-1].failure_kind == "resource_limit"
+    
+    def test_failover_reason(self):
+        """Test that the orchestrator reports breaches as their own failover reason."""
+        from src.orchestrator import Orchestrator
+        
+        assert Orchestrator._failover_reason(False, False, "resource_limit") == "resource_limit"
+    
+    def test_failover_reason_ignores_error_text(self):
+        """Test that a CLI merely printing the breach message isn't a breach."""
+        from src.orchestrator import Orchestrator
+        
+        reason = Orchestrator._failover_reason(False, False, None)
+        assert reason == "execution_failed"
+
+
+class TestGlobalResourceLimiter:
+    """Tests for global resource limiter singleton."""
+    
+    def test_get_resource_limiter_is_singleton(self):
+        """Test that get_resource_limiter returns the same instance."""
+        assert get_resource_limiter() is get_resource_limiter()
+        assert isinstance(get_resource_limiter().get_stats(), ResourceLimitStats)
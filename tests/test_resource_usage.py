@@ -0,0 +1,128 @@
+"""
+Tests for LastAgent Resource Accounting
+"""
+
+import threading
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src import resource_usage
+from src.resource_usage import (
+    ResourceMonitor,
+    ResourceUsage,
+    get_resource_monitor,
+)
+from src.process_lifecycle import ProcessLifecycleManager
+
+# Burns CPU and allocates ~50 MB in a child process of the CLI
+BUSY_TREE = [
+    sys.executable, "-c",
+    "import subprocess, sys; subprocess.run([sys.executable, '-c', "
+    "'import time; b = bytearray(50 << 20); t = time.time()\\nwhile time.time() - t < 0.6: pass'])",
+]
+
+requires_proc = pytest.mark.skipif(not Path("/proc").is_dir(), reason="needs /proc")
+
+
+class TestResourceMonitor:
+    """Tests for ResourceMonitor class."""
+    
+    @pytest.fixture
+    def manager(self):
+        """Create a lifecycle manager with a fast-sampling monitor."""
+        manager = ProcessLifecycleManager(kill_grace_seconds=0.5)
+        manager.monitor = ResourceMonitor(sample_interval=0.05)
+        return manager
+    
+    @requires_proc
+    @pytest.mark.asyncio
+    async def test_accounts_process_tree(self, manager):
+        """Test that CPU and memory of the CLI's children are accounted."""
+        process = await manager.spawn("test", BUSY_TREE)
+        await process.wait()
+        usage = await manager.resource_usage(process)
+        await manager.finalize(process)
+        
+        assert usage.processes >= 2
+        assert usage.user_cpu_seconds + usage.system_cpu_seconds > 0.2
+        assert usage.peak_rss_bytes > 40 << 20
+        assert usage.voluntary_ctx_switches + usage.involuntary_ctx_switches > 0
+        assert usage.samples > 1
+    
+    @requires_proc
+    @pytest.mark.asyncio
+    async def test_untracked_after_finalize(self, manager):
+        """Test that accounting stops once the process is reaped."""
+        process = await manager.spawn("test", [sys.executable, "-c", "pass"])
+        await manager.finalize(process)
+        
+        assert await manager.resource_usage(process) is None
+    
+    @requires_proc
+    @pytest.mark.asyncio
+    async def test_scan_runs_off_the_event_loop(self, manager):
+        """Test that /proc is read in a worker thread, not on the loop's thread."""
+        threads = []
+        scan = resource_usage._scan_groups
+        
+        def recording_scan(pgids):
+            threads.append(threading.current_thread())
+            return scan(pgids)
+        
+        with patch.object(resource_usage, "_scan_groups", recording_scan):
+            process = await manager.spawn("test", [sys.executable, "-c", "pass"])
+            usage = await manager.resource_usage(process)
+            await manager.finalize(process)
+        
+        assert usage is not None
+        assert threads
+        assert threading.current_thread() not in threads
+    
+    def test_disabled(self):
+        """Test that a disabled monitor tracks nothing."""
+        monitor = ResourceMonitor(enabled=False)
+        monitor.track(12345, 12345)
+        
+        assert monitor.get(12345) is None
+    
+    def test_to_dict(self):
+        """Test that usage serializes with rounded CPU times."""
+        data = ResourceUsage(user_cpu_seconds=1.23456, stdout_bytes=10).to_dict()
+        
+        assert data["user_cpu_seconds"] == 1.235
+        assert data["stdout_bytes"] == 10
+
+
+class TestExecutorResourceUsage:
+    """Tests that execution results carry resource usage."""
+    
+    @requires_proc
+    @pytest.mark.asyncio
+    async def test_execute_attaches_usage(self):
+        """Test that execute() reports usage and stdout bytes in metadata."""
+        from src.executor import AgentExecutor, ExecutionContext
+        
+        executor = AgentExecutor()
+        executor._is_cli_available = lambda command: True
+        command = [sys.executable, "-c", "print('x' * 99)"]
+        executor._build_codex_command = lambda ctx, delivery=None: command
+        
+        context = ExecutionContext(system_prompt="", user_prompt="hi")
+        result = await executor.execute("codex", context)
+        
+        usage = result.metadata["resource_usage"]
+        assert result.success
+        assert usage["stdout_bytes"] == 100
+        assert usage["processes"] >= 1
+
+
+class TestGlobalResourceMonitor:
+    """Tests for global resource monitor singleton."""
+    
+    def test_get_resource_monitor_is_singleton(self):
+        """Test that get_resource_monitor returns the same instance."""
+        assert get_resource_monitor() is get_resource_monitor()
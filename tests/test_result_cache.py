@@ -0,0 +1,246 @@
+"""
+Tests for LastAgent Execution Result Cache
+"""
+
+import subprocess
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.result_cache import (
+    ResultCache,
+    CacheStats,
+    fingerprint_directory,
+    normalize_prompt,
+    get_result_cache,
+)
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """Create a git repository with one commit."""
+    def git(*args):
+        subprocess.run(["git", *args], cwd=tmp_path, check=True, capture_output=True)
+    
+    git("init", "-q")
+    git("config", "user.email", "test@example.com")
+    git("config", "user.name", "Test")
+    (tmp_path / "main.py").write_text("print('hello')\n")
+    git("add", "main.py")
+    git("commit", "-q", "-m", "init")
+    return tmp_path
+
+
+class TestFingerprint:
+    """Tests for working directory fingerprints."""
+    
+    def test_normalize_prompt(self):
+        """Test that whitespace-only differences normalize to the same prompt."""
+        assert normalize_prompt("  explain\n\nthis   code ") == "explain this code"
+        assert normalize_prompt(None) == ""
+    
+    @pytest.mark.asyncio
+    async def test_stable_for_unchanged_tree(self, repo):
+        """Test that an unchanged tree fingerprints identically."""
+        first = await fingerprint_directory(str(repo))
+        assert first is not None
+        assert await fingerprint_directory(str(repo)) == first
+    
+    @pytest.mark.asyncio
+    async def test_changes_with_dirty_tree(self, repo):
+        """Test that edits and untracked files change the fingerprint."""
+        clean = await fingerprint_directory(str(repo))
+        
+        (repo / "main.py").write_text("print('changed')\n")
+        edited = await fingerprint_directory(str(repo))
+        assert edited != clean
+        
+        (repo / "notes.txt").write_text("new file")
+        assert await fingerprint_directory(str(repo)) not in (clean, edited)
+    
+    @pytest.mark.asyncio
+    async def test_non_git_directory(self, tmp_path):
+        """Test that directories outside git can't be fingerprinted."""
+        assert await fingerprint_directory(str(tmp_path)) is None
+
+
+class TestResultCache:
+    """Tests for ResultCache class."""
+    
+    @pytest.fixture
+    def cache(self):
+        """Create an enabled cache for every agent."""
+        return ResultCache(enabled=True, ttl_seconds=60, max_entries=2, agents=[])
+    
+    def test_disabled_by_default(self):
+        """Test that caching is opt-in via settings.yml."""
+        cache = ResultCache()
+        assert not cache.enabled
+        assert not cache.supports("claude")
+    
+    def test_supports_configured_agents(self):
+        """Test that only listed agents are cached."""
+        cache = ResultCache(enabled=True, agents=["claude"])
+        assert cache.supports("claude")
+        assert not cache.supports("aider")
+    
+    @pytest.mark.asyncio
+    async def test_key_normalizes_prompts(self, cache, repo):
+        """Test that keys ignore whitespace but not agent or prompt changes."""
+        key = await cache.make_key("claude", "sys", "explain  main.py", str(repo))
+        
+        assert key == await cache.make_key("claude", " sys ", "explain main.py\n", str(repo))
+        assert key != await cache.make_key("gemini", "sys", "explain main.py", str(repo))
+        assert key != await cache.make_key("claude", "sys", "explain other.py", str(repo))
+    
+    @pytest.mark.asyncio
+    async def test_key_none_outside_git(self, cache, tmp_path):
+        """Test that non-git directories are uncacheable."""
+        assert await cache.make_key("claude", "", "hi", str(tmp_path)) is None
+        assert cache.get_stats().uncacheable == 1
+    
+    def test_lru_eviction(self, cache):
+        """Test that the least recently used entry is evicted when full."""
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1  # "b" is now least recently used
+        cache.put("c", 3)
+        
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+        assert cache.get_stats().evictions == 1
+    
+    def test_ttl_expiry(self, cache):
+        """Test that entries older than ttl_seconds are dropped."""
+        cache.put("a", 1)
+        cache._entries["a"].stored_at -= 61
+        
+        assert cache.get("a") is None
+        stats = cache.get_stats()
+        assert stats.expirations == 1
+        assert stats.entries == 0
+
+
+class TestExecutorResultCache:
+    """Tests that the executor serves repeated prompts from the cache."""
+    
+    @pytest.fixture
+    def executor(self):
+        """Create an executor with an enabled cache and a stand-in CLI."""
+        from src.executor import AgentExecutor
+        
+        executor = AgentExecutor()
+        executor.cache = ResultCache(enabled=True, agents=[])
+        executor._is_cli_available = lambda command: True
+        executor.calls = 0
+        
+        async def fake_cli(agent_name, agent, context):
+            from src.executor import ExecutionResult, ExecutionMethod
+            executor.calls += 1
+            return ExecutionResult(
+                success=True,
+                response=f"answer {executor.calls}",
+                agent_name=agent_name,
+                execution_method=ExecutionMethod.CLI_SUBPROCESS,
+                duration_ms=0,
+            )
+        
+        executor._execute_cli = fake_cli
+        return executor
+    
+    @pytest.mark.asyncio
+    async def test_hit_skips_execution(self, executor, repo):
+        """Test that the second identical request is a cache hit."""
+        from src.executor import ExecutionContext
+        
+        context = ExecutionContext(
+            system_prompt="", user_prompt="explain", working_directory=str(repo), read_only=True
+        )
+        first = await executor.execute("claude", context)
+        second = await executor.execute("claude", context)
+        
+        assert first.metadata["cache"] == "miss"
+        assert second.metadata["cache"] == "hit"
+        assert second.response == first.response
+        assert executor.calls == 1
+    
+    @pytest.mark.asyncio
+    async def test_bypass_flag(self, executor, repo):
+        """Test that bypass_cache forces a fresh run."""
+        from src.executor import ExecutionContext
+        
+        context = ExecutionContext(
+            system_prompt="", user_prompt="explain", working_directory=str(repo), read_only=True
+        )
+        await executor.execute("claude", context)
+        context.bypass_cache = True
+        result = await executor.execute("claude", context)
+        
+        assert result.metadata["cache"] == "bypass"
+        assert result.response == "answer 2"
+        assert executor.cache.get_stats().bypassed == 1
+    
+    @pytest.mark.asyncio
+    async def test_dirty_tree_misses(self, executor, repo):
+        """Test that editing the working directory invalidates the entry."""
+        from src.executor import ExecutionContext
+        
+        context = ExecutionContext(
+            system_prompt="", user_prompt="explain", working_directory=str(repo), read_only=True
+        )
+        await executor.execute("claude", context)
+        (repo / "main.py").write_text("print('changed')\n")
+        result = await executor.execute("claude", context)
+        
+        assert result.metadata["cache"] == "miss"
+        assert executor.calls == 2
+    
+    @pytest.mark.asyncio
+    async def test_mutating_runs_not_cached(self, executor, repo):
+        """Test that runs of a mutates_files agent skip the cache unless read_only."""
+        from src.executor import ExecutionContext
+        
+        context = ExecutionContext(
+            system_prompt="", user_prompt="fix it", working_directory=str(repo)
+        )
+        first = await executor.execute("claude", context)
+        second = await executor.execute("claude", context)
+        
+        assert "cache" not in first.metadata
+        assert second.response == "answer 2"
+        assert executor.cache.get_stats().entries == 0
+    
+    @pytest.mark.asyncio
+    async def test_tree_changed_during_run_not_stored(self, executor, repo):
+        """Test that a result is dropped when the run changed the tree it was keyed on."""
+        from src.executor import ExecutionContext
+        
+        fake_cli = executor._execute_cli
+        
+        async def editing_cli(agent_name, agent, context):
+            (repo / "main.py").write_text("print('edited')\n")
+            return await fake_cli(agent_name, agent, context)
+        
+        executor._execute_cli = editing_cli
+        context = ExecutionContext(
+            system_prompt="", user_prompt="explain", working_directory=str(repo), read_only=True
+        )
+        await executor.execute("claude", context)
+        executor._execute_cli = fake_cli
+        result = await executor.execute("claude", context)
+        
+        assert result.metadata["cache"] == "miss"
+        assert executor.calls == 2
+        assert executor.cache.get_stats().changed == 1
+
+
+class TestGlobalResultCache:
+    """Tests for global result cache singleton."""
+    
+    def test_get_result_cache_is_singleton(self):
+        """Test that get_result_cache returns the same instance."""
+        assert get_result_cache() is get_result_cache()
+        assert isinstance(get_result_cache().get_stats(), CacheStats)
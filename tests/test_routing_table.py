@@ -0,0 +1,240 @@
+"""
+Tests for LastAgent Council Routing Table
+"""
+
+import random
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.routing_table import (
+    RoutingTable,
+    RoutingTableStats,
+    feature_signature,
+    get_routing_table,
+)
+from src.task_analyzer import get_task_analyzer
+
+
+def make_table(**kwargs):
+    """A table that needs 3 agreeing decisions and 2 good runs."""
+    options = dict(
+        enabled=True,
+        history_size=5,
+        min_decisions=3,
+        min_agreement=0.8,
+        min_outcomes=2,
+        min_success_rate=0.8,
+        revalidate_fraction=0.0,
+    )
+    options.update(kwargs)
+    return RoutingTable(**options)
+
+
+def establish(table, signature="sig", agent="aider", decisions=3, outcomes=2):
+    """Record consistent council decisions and successful runs."""
+    for _ in range(decisions):
+        table.record_decision(signature, agent)
+    for _ in range(outcomes):
+        table.record_outcome(signature, agent, True)
+
+
+class TestFeatureSignature:
+    """Tests for the routing table key."""
+    
+    def test_same_features_same_signature(self):
+        """Test that prompts with the same features share a signature."""
+        analyzer = get_task_analyzer()
+        a = analyzer.analyze("Write a Python function to sort a list")
+        b = analyzer.analyze("Write a Python function to reverse a string")
+        
+        assert feature_signature(a) == feature_signature(b)
+    
+    def test_flags_change_signature(self):
+        """Test that a requires_* flag is part of the signature."""
+        analysis = get_task_analyzer().analyze("Write a Python function to sort a list")
+        before = feature_signature(analysis)
+        analysis.requires_realtime_info = not analysis.requires_realtime_info
+        
+        assert feature_signature(analysis) != before
+        assert feature_signature(analysis).startswith(analysis.task_type.value)
+
+
+class TestRoutingTable:
+    """Tests for RoutingTable class."""
+    
+    def test_established_route(self):
+        """Test that consistent, successful history answers lookups."""
+        table = make_table()
+        establish(table)
+        route = table.lookup("sig", ["aider", "claude"])
+        
+        assert route is not None
+        assert route.agent == "aider"
+        assert route.agreement == 1.0
+        assert route.success_rate == 1.0
+        assert table.get_stats().hits == 1
+    
+    def test_not_enough_history(self):
+        """Test that a route needs min_decisions and min_outcomes."""
+        table = make_table()
+        establish(table, decisions=2)
+        assert table.lookup("sig", ["aider"]) is None
+        
+        table = make_table()
+        establish(table, outcomes=1)
+        assert table.lookup("sig", ["aider"]) is None
+        assert table.get_stats().misses == 1
+    
+    def test_inconsistent_decisions(self):
+        """Test that a split council keeps the signature out of the table."""
+        table = make_table()
+        establish(table)
+        table.record_decision("sig", "claude")
+        
+        route = table.route("sig")
+        assert route.agreement == 0.75
+        assert not route.established
+        assert table.lookup("sig", ["aider", "claude"]) is None
+    
+    def test_failing_agent_unroutes(self):
+        """Test that a poor success rate disables the route."""
+        table = make_table()
+        establish(table)
+        table.record_outcome("sig", "aider", False)
+        
+        assert table.route("sig").success_rate == pytest.approx(2 / 3, abs=1e-4)
+        assert table.lookup("sig", ["aider"]) is None
+    
+    def test_unavailable_agent(self):
+        """Test that a route to an agent that isn't installed is a miss."""
+        table = make_table()
+        establish(table)
+        
+        assert table.lookup("sig", ["claude"]) is None
+    
+    def test_outcome_without_decisions_ignored(self):
+        """Test that outcomes only count for signatures the council decided."""
+        table = make_table()
+        table.record_outcome("sig", "aider", True)
+        
+        assert table.get_stats().signatures == 0
+    
+    def test_revalidation_sampling(self):
+        """Test that revalidate_fraction samples lookups for the council."""
+        always = make_table(revalidate_fraction=1.0)
+        never = make_table(revalidate_fraction=0.0)
+        sampled = make_table(revalidate_fraction=0.5, rng=random.Random(7))
+        picks = [sampled.should_revalidate() for _ in range(200)]
+        
+        assert always.should_revalidate()
+        assert not never.should_revalidate()
+        assert 60 < sum(picks) < 140
+    
+    def test_revalidation_disagreement(self):
+        """Test that a re-validating council decision is counted and recorded."""
+        table = make_table()
+        establish(table)
+        table.record_decision("sig", "claude", expected="aider")
+        
+        stats = table.get_stats()
+        assert isinstance(stats, RoutingTableStats)
+        assert stats.revalidations == 1
+        assert stats.disagreements == 1
+        assert table.route("sig").decisions == 4
+    
+    def test_lru_bound(self):
+        """Test that the least recently used signature is dropped."""
+        table = make_table(max_signatures=2)
+        table.record_decision("a", "aider")
+        table.record_decision("b", "aider")
+        table.record_decision("a", "aider")
+        table.record_decision("c", "aider")
+        
+        assert [route.signature for route in table.get_routes()] == ["c", "a"]
+
+
+class TestCouncilRoutingTable:
+    """Tests that the council selector answers from the routing table."""
+    
+    @pytest.fixture
+    def selector(self):
+        """Create a selector whose council 'runs' are counted."""
+        from src.council_selector import CouncilSelector, CouncilSelection, CouncilVote
+        from src.selection_cache import SelectionCache
+        from src.similarity_cache import SimilarityCache
+        
+        selector = CouncilSelector(use_mock=False)
+        selector._council_available = True
+        selector.cache = SelectionCache(enabled=False)
+        selector.similar = SimilarityCache(enabled=False)
+        selector.routing = make_table()
+        selector.calls = 0
+        selector.verdict = "claude"
+        
+        async def fake_council(user_prompt, system_prompt, analysis, match_result, models=None):
+            selector.calls += 1
+            return CouncilSelection(
+                selected_agent=selector.verdict,
+                confidence=0.9,
+                reasoning="council",
+                votes=[CouncilVote("m", selector.verdict, "writes code")],
+                rankings=[],
+                aggregate_scores={selector.verdict: 1.0},
+                match_result=match_result,
+            )
+        
+        selector._run_council_selection = fake_council
+        selector._council_size = lambda match_result: ("full", 0.0, ["m"])
+        return selector
+    
+    async def train(self, selector):
+        """Run the council and report good outcomes until the route is established."""
+        for _ in range(3):
+            selection = await selector.select_agent("Write a Python function to sort a list")
+            selector.record_outcome(selection.signature, selection.selected_agent, True)
+    
+    @pytest.mark.asyncio
+    async def test_established_signature_skips_council(self, selector):
+        """Test that a task with known features is routed without the council."""
+        await self.train(selector)
+        result = await selector.select_agent("Write a Python function to reverse a string")
+        
+        assert selector.calls == 3
+        assert result.cache_status == "routing_table"
+        assert result.council_path == "routing_table"
+        assert result.selected_agent == "claude"
+        assert result.votes == []
+    
+    @pytest.mark.asyncio
+    async def test_revalidation_runs_council(self, selector):
+        """Test that a sampled request goes to the council and is recorded."""
+        await self.train(selector)
+        selector.routing.revalidate_fraction = 1.0
+        selector.verdict = "gemini"
+        result = await selector.select_agent("Write a Python function to reverse a string")
+        
+        assert selector.calls == 4
+        assert result.selected_agent == "gemini"
+        assert selector.routing.get_stats().disagreements == 1
+    
+    @pytest.mark.asyncio
+    async def test_bypass_skips_table(self, selector):
+        """Test that bypass_cache always runs the council."""
+        await self.train(selector)
+        result = await selector.select_agent(
+            "Write a Python function to sort a list", bypass_cache=True
+        )
+        
+        assert selector.calls == 4
+        assert result.cache_status is None
+
+
+class TestGlobalRoutingTable:
+    """Tests for global routing table singleton."""
+    
+    def test_get_routing_table_is_singleton(self):
+        """Test that get_routing_table returns the same instance."""
+        assert get_routing_table() is get_routing_table()
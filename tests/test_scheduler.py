@@ -0,0 +1,133 @@
+"""
+Tests for LastAgent Execution Scheduler
+"""
+
+import asyncio
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.scheduler import (
+    ExecutionScheduler,
+    SchedulerStats,
+    get_execution_scheduler,
+)
+
+
+class TestExecutionScheduler:
+    """Tests for ExecutionScheduler class."""
+    
+    def test_defaults_from_config(self):
+        """Test that limits are read from settings.yml and agents.yml."""
+        scheduler = ExecutionScheduler()
+        
+        assert scheduler.max_concurrent == 3
+        assert scheduler.agent_limits.get("aider") == 2
+        assert "claude" not in scheduler.agent_limits
+    
+    @pytest.mark.asyncio
+    async def test_slot_without_contention(self):
+        """Test that a free slot is granted immediately."""
+        scheduler = ExecutionScheduler(max_concurrent=2, agent_limits={})
+        
+        async with scheduler.slot("claude") as lease:
+            assert lease.queue_wait_ms == 0.0
+            assert scheduler.get_stats().in_flight == 1
+        
+        assert scheduler.get_stats().in_flight == 0
+    
+    @pytest.mark.asyncio
+    async def test_global_limit_enforced(self):
+        """Test that no more than max_concurrent slots are held at once."""
+        scheduler = ExecutionScheduler(max_concurrent=2, agent_limits={})
+        peak = 0
+        
+        async def job():
+            nonlocal peak
+            async with scheduler.slot("claude"):
+                peak = max(peak, scheduler.get_stats().in_flight)
+                await asyncio.sleep(0.02)
+        
+        await asyncio.gather(*(job() for _ in range(6)))
+        
+        assert peak == 2
+        stats = scheduler.get_stats()
+        assert stats.admitted_total == 6
+        assert stats.queued == 0
+        assert stats.queue_wait_ms_max > 0
+    
+    @pytest.mark.asyncio
+    async def test_fifo_order(self):
+        """Test that queued waiters are admitted in arrival order."""
+        scheduler = ExecutionScheduler(max_concurrent=1, agent_limits={})
+        order = []
+        
+        async def job(i):
+            async with scheduler.slot("claude"):
+                order.append(i)
+                await asyncio.sleep(0.01)
+        
+        tasks = []
+        for i in range(5):
+            tasks.append(asyncio.create_task(job(i)))
+            await asyncio.sleep(0)  # Enqueue in a deterministic order
+        await asyncio.gather(*tasks)
+        
+        assert order == [0, 1, 2, 3, 4]
+    
+    @pytest.mark.asyncio
+    async def test_agent_limit_does_not_block_other_agents(self):
+        """Test that a saturated agent doesn't hold up other agents behind it."""
+        scheduler = ExecutionScheduler(max_concurrent=3, agent_limits={"aider": 1})
+        release_aider = asyncio.Event()
+        
+        async def aider_job():
+            async with scheduler.slot("aider"):
+                await release_aider.wait()
+        
+        first = asyncio.create_task(aider_job())
+        second = asyncio.create_task(aider_job())
+        await asyncio.sleep(0.01)
+        assert scheduler.get_stats().queued == 1
+        
+        # Claude is queued behind the waiting aider job but must not wait for it
+        async with scheduler.slot("claude") as lease:
+            assert scheduler.get_stats().in_flight_by_agent == {"aider": 1, "claude": 1}
+        
+        release_aider.set()
+        await asyncio.gather(first, second)
+        assert lease.queue_wait_ms < 50
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_queue(self):
+        """Test that cancelling a queued waiter frees its queue position."""
+        scheduler = ExecutionScheduler(max_concurrent=1, agent_limits={})
+        await scheduler.acquire("claude")
+        
+        waiter = asyncio.create_task(scheduler.acquire("gemini"))
+        await asyncio.sleep(0.01)
+        assert scheduler.get_stats().queued == 1
+        
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert scheduler.get_stats().queued == 0
+        
+        scheduler.release("claude")
+        assert scheduler.get_stats().in_flight == 0
+    
+    def test_stats_type(self):
+        """Test that get_stats returns SchedulerStats."""
+        stats = ExecutionScheduler(max_concurrent=1, agent_limits={}).get_stats()
+        assert isinstance(stats, SchedulerStats)
+        assert stats.queue_wait_ms_avg == 0.0
+
+
+class TestGlobalScheduler:
+    """Tests for global scheduler singleton."""
+    
+    def test_get_execution_scheduler_is_singleton(self):
+        """Test that get_execution_scheduler returns the same instance."""
+        assert get_execution_scheduler() is get_execution_scheduler()
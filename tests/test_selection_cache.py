@@ -0,0 +1,150 @@
+"""
+Tests for LastAgent Council Selection Cache
+"""
+
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config import get_config
+from src.selection_cache import (
+    SelectionCache,
+    SelectionCacheStats,
+    registry_version,
+    get_selection_cache,
+)
+
+
+class TestSelectionCache:
+    """Tests for SelectionCache class."""
+    
+    @pytest.fixture
+    def cache(self):
+        return SelectionCache(enabled=True, ttl_seconds=60, max_entries=2)
+    
+    def test_key_normalizes_prompts(self, cache):
+        """Test that whitespace-only differences share a key."""
+        key = cache.make_key("fix  the\nbug", "", "v1")
+        assert key == cache.make_key(" fix the bug ", "", "v1")
+        key = cache.make_key("fix the bug", "", "v1")
+        assert key != cache.make_key("fix the bug", "be brief", "v1")
+    
+    def test_key_includes_registry_version(self, cache):
+        """Test that a registry change gives a new key."""
+        assert cache.make_key("fix the bug", "", "v1") != cache.make_key("fix the bug", "", "v2")
+    
+    def test_registry_version_tracks_availability(self):
+        """Test that installing or removing an agent CLI changes the version."""
+        config = get_config()
+        version = registry_version(config, ["claude", "gemini"])
+        assert version == registry_version(config, ["gemini", "claude"])
+        version = registry_version(config, ["claude"])
+        assert version != registry_version(config, ["claude", "gemini"])
+    
+    def test_lru_eviction(self, cache):
+        """Test that the least recently used entry is evicted when full."""
+        cache.put("a", 1)
+        cache.put("b", 2)
+        assert cache.get("a") == 1
+        cache.put("c", 3)
+        
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get_stats().evictions == 1
+    
+    def test_ttl_expiry(self, cache):
+        """Test that entries older than ttl_seconds are dropped."""
+        cache.put("a", 1)
+        cache._entries["a"].stored_at -= 61
+        
+        assert cache.get("a") is None
+        stats = cache.get_stats()
+        assert isinstance(stats, SelectionCacheStats)
+        assert stats.expirations == 1
+        assert stats.misses == 1
+
+
+class TestCouncilSelectionCache:
+    """Tests that the council selector reuses earlier verdicts."""
+    
+    @pytest.fixture
+    def selector(self):
+        """Create a selector whose council 'runs' are counted."""
+        from src.council_selector import CouncilSelector, CouncilSelection, CouncilVote
+        
+        selector = CouncilSelector(use_mock=False)
+        selector._council_available = True
+        selector.cache = SelectionCache(enabled=True)
+        selector.calls = 0
+        
+        async def fake_council(user_prompt, system_prompt, analysis, match_result, models=None):
+            selector.calls += 1
+            return CouncilSelection(
+                selected_agent="gemini",
+                confidence=0.9,
+                reasoning="council",
+                votes=[CouncilVote("m", "gemini", "fast")],
+                rankings=[],
+                aggregate_scores={"gemini": 1.0},
+                match_result=match_result,
+            )
+        
+        selector._run_council_selection = fake_council
+        selector._council_size = lambda match_result: ("full", 0.0, ["m"])
+        return selector
+    
+    @pytest.mark.asyncio
+    async def test_hit_skips_council(self, selector):
+        """Test that an identical task reuses the verdict."""
+        first = await selector.select_agent("summarize the repo")
+        second = await selector.select_agent("summarize  the repo")
+        
+        assert first.cache_status == "miss"
+        assert second.cache_status == "hit"
+        assert second.selected_agent == "gemini"
+        assert selector.calls == 1
+    
+    @pytest.mark.asyncio
+    async def test_bypass(self, selector):
+        """Test that bypass_cache runs the council again."""
+        await selector.select_agent("summarize the repo")
+        result = await selector.select_agent("summarize the repo", bypass_cache=True)
+        
+        assert result.cache_status == "bypass"
+        assert selector.calls == 2
+        assert selector.cache.get_stats().bypassed == 1
+    
+    @pytest.mark.asyncio
+    async def test_registry_change_misses(self, selector):
+        """Test that a changed set of installed agents invalidates entries."""
+        await selector.select_agent("summarize the repo")
+        with patch.object(selector.agent_matcher, "available_agents", return_value=["aider"]):
+            result = await selector.select_agent("summarize the repo")
+        
+        assert result.cache_status == "miss"
+        assert selector.calls == 2
+    
+    @pytest.mark.asyncio
+    async def test_fallback_not_cached(self, selector):
+        """Test that a local-matching fallback is retried next time."""
+        async def failing_council(*args, **kwargs):
+            selector.calls += 1
+            raise RuntimeError("rate limited")
+        
+        selector._run_council_selection = failing_council
+        await selector.select_agent("summarize the repo")
+        await selector.select_agent("summarize the repo")
+        
+        assert selector.calls == 2
+        assert selector.cache.get_stats().entries == 0
+
+
+class TestGlobalSelectionCache:
+    """Tests for global selection cache singleton."""
+    
+    def test_get_selection_cache_is_singleton(self):
+        """Test that get_selection_cache returns the same instance."""
+        assert get_selection_cache() is get_selection_cache()
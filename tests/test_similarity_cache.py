@@ -0,0 +1,156 @@
+"""
+Tests for LastAgent Similarity Routing Cache
+"""
+
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.similarity_cache import (
+    SimilarityCache,
+    SimilarityCacheStats,
+    jaccard,
+    shingles,
+    tokenize,
+    get_similarity_cache,
+)
+
+
+PROMPT = "Fix the failing test in src/utils.py and add a regression test for line 42"
+
+
+class TestTokenize:
+    """Tests for prompt normalization."""
+    
+    def test_paths_and_numbers_become_placeholders(self):
+        """Test that file names and numbers don't make prompts differ."""
+        assert tokenize(PROMPT) == tokenize(
+            "fix the failing test in lib/parser.py and add a regression test for line 7"
+        )
+        assert "<path>" in tokenize(PROMPT)
+        assert "<num>" in tokenize(PROMPT)
+    
+    def test_jaccard(self):
+        """Test Jaccard similarity of shingle sets."""
+        a = shingles(["a", "b", "c", "d"], 1)
+        b = shingles(["a", "b", "c", "e"], 1)
+        assert jaccard(a, a) == 1.0
+        assert jaccard(a, b) == pytest.approx(3 / 5)
+
+
+class TestSimilarityCache:
+    """Tests for SimilarityCache class."""
+    
+    @pytest.fixture
+    def cache(self):
+        return SimilarityCache(enabled=True, threshold=0.8, max_entries=2)
+    
+    def test_near_duplicate_hits(self, cache):
+        """Test that a reworded prompt reuses the cached value."""
+        cache.put(PROMPT, "scope", "gemini")
+        match = cache.lookup(
+            "Fix the failing tests in src/utils.py and add a regression test for line 42", "scope"
+        )
+        
+        assert match is not None
+        value, similarity = match
+        assert value == "gemini"
+        assert 0.8 <= similarity < 1.0
+    
+    def test_different_prompt_misses(self, cache):
+        """Test that an unrelated prompt is a miss."""
+        cache.put(PROMPT, "scope", "gemini")
+        
+        assert cache.lookup("Write a blog post comparing async runtimes in Rust", "scope") is None
+        assert cache.get_stats().misses == 1
+    
+    def test_scope_isolates(self, cache):
+        """Test that identical prompts in another scope don't match."""
+        cache.put(PROMPT, "research", "gemini")
+        
+        assert cache.lookup(PROMPT, "coding") is None
+    
+    def test_short_prompts_skipped(self, cache):
+        """Test that prompts under min_tokens are left to the exact cache."""
+        assert not cache.put("fix it", "scope", "gemini")
+        assert cache.lookup("fix it", "scope") is None
+        assert cache.get_stats().skipped == 1
+    
+    def test_lru_eviction(self, cache):
+        """Test that the least recently used entry and its buckets are dropped."""
+        cache.put(PROMPT, "scope", "a")
+        cache.put(
+            "Summarize the architecture of this repository for new contributors", "scope", "b"
+        )
+        cache.put("Write a blog post comparing async runtimes in Rust", "scope", "c")
+        
+        assert cache.lookup(PROMPT, "scope") is None
+        stats = cache.get_stats()
+        assert isinstance(stats, SimilarityCacheStats)
+        assert stats.entries == 2
+        assert stats.evictions == 1
+        assert all(0 not in bucket for bucket in cache._buckets.values())
+    
+    def test_ttl_expiry(self, cache):
+        """Test that expired entries are not served."""
+        cache.put(PROMPT, "scope", "gemini")
+        next(iter(cache._entries.values())).stored_at -= cache.ttl_seconds + 1
+        
+        assert cache.lookup(PROMPT, "scope") is None
+        assert cache.get_stats().expirations == 1
+    
+    def test_bands_must_divide_signature(self):
+        """Test that an uneven band split is rejected."""
+        with pytest.raises(ValueError):
+            SimilarityCache(num_perm=64, bands=10)
+
+
+class TestCouncilSimilarityCache:
+    """Tests that the council selector reuses selections of near-duplicates."""
+    
+    @pytest.mark.asyncio
+    async def test_similar_task_skips_council(self):
+        """Test that a near-duplicate task is routed like the earlier one."""
+        from src.council_selector import CouncilSelector, CouncilSelection, CouncilVote
+        from src.selection_cache import SelectionCache
+        
+        selector = CouncilSelector(use_mock=False)
+        selector._council_available = True
+        selector.cache = SelectionCache(enabled=True)
+        selector.similar = SimilarityCache(enabled=True)
+        calls = []
+        
+        async def fake_council(user_prompt, system_prompt, analysis, match_result, models=None):
+            calls.append(user_prompt)
+            return CouncilSelection(
+                selected_agent="aider",
+                confidence=0.9,
+                reasoning="council",
+                votes=[CouncilVote("m", "aider", "edits code")],
+                rankings=[],
+                aggregate_scores={"aider": 1.0},
+                match_result=match_result,
+            )
+        
+        selector._run_council_selection = fake_council
+        selector._council_size = lambda match_result: ("full", 0.0, ["m"])
+        first = await selector.select_agent(PROMPT)
+        second = await selector.select_agent(
+            "Fix the failing test in lib/parser.py and add a regression test for line 7"
+        )
+        
+        assert first.cache_status == "miss"
+        assert second.cache_status == "similar"
+        assert second.similarity == 1.0
+        assert second.selected_agent == "aider"
+        assert len(calls) == 1
+
+
+class TestGlobalSimilarityCache:
+    """Tests for global similarity cache singleton."""
+    
+    def test_get_similarity_cache_is_singleton(self):
+        """Test that get_similarity_cache returns the same instance."""
+        assert get_similarity_cache() is get_similarity_cache()
@@ -0,0 +1,189 @@
+"""
+Tests for LastAgent Stall Detector
+"""
+
+import asyncio
+import sys
+import time
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.stall_detector import (
+    AgentStalledError,
+    StallDetector,
+    StallStats,
+    StallWatch,
+    get_stall_detector,
+)
+from src.resource_usage import ResourceUsage
+from src.observability import ErrorClassification, get_error_tracker
+
+
+class FakeMonitor:
+    """Resource monitor reporting a settable CPU time."""
+    
+    def __init__(self):
+        self.cpu_seconds = 0.0
+    
+    def get(self, pid):
+        return ResourceUsage(user_cpu_seconds=self.cpu_seconds)
+
+
+class TestStallWatch:
+    """Tests for StallWatch activity tracking."""
+    
+    @pytest.fixture
+    def watch(self):
+        """Watch with a 10 s threshold and a 1% CPU activity floor."""
+        return StallWatch("aider", 1, threshold=10, cpu_fraction=0.01, monitor=FakeMonitor())
+    
+    def test_idle_run_stalls(self, watch):
+        """Test that a run with no output or CPU stalls after the threshold."""
+        assert not watch.check(0)
+        watch.last_activity -= 11
+        
+        assert watch.check(0)
+    
+    def test_output_is_activity(self, watch):
+        """Test that new output resets the idle clock."""
+        watch.last_activity -= 11
+        
+        assert not watch.check(100)
+        assert watch.idle_seconds < 1
+    
+    def test_cpu_is_activity(self, watch):
+        """Test that CPU use above cpu_fraction resets the idle clock."""
+        watch.last_activity -= 11
+        watch._last_check -= 1
+        watch.monitor.cpu_seconds = 0.5
+        
+        assert not watch.check(0)
+
+
+class TestStallDetector:
+    """Tests for StallDetector class."""
+    
+    def test_per_agent_thresholds(self):
+        """Test that agents.yml stall_timeout overrides the default."""
+        detector = StallDetector(enabled=True, idle_seconds=120)
+        
+        assert detector.threshold("aider") == 60
+        assert detector.threshold("codex") == 120
+        assert detector.threshold("unknown") == 120
+        assert StallDetector(enabled=False).threshold("aider") is None
+        assert StallDetector(enabled=True, idle_seconds=0).threshold("codex") is None
+    
+    @pytest.mark.asyncio
+    async def test_supervise_passes_result_through(self):
+        """Test that an active run completes normally."""
+        detector = StallDetector(
+            enabled=True, idle_seconds=5, check_interval=0.01, monitor=FakeMonitor()
+        )
+        watch = detector.watch("codex", 1)
+        
+        async def work():
+            await asyncio.sleep(0.05)
+            return "done"
+        
+        assert await detector.supervise(watch, work(), lambda: 0) == "done"
+    
+    @pytest.mark.asyncio
+    async def test_supervise_aborts_stalled_run(self):
+        """Test that a silent run is cancelled and recorded as STALLED."""
+        detector = StallDetector(
+            enabled=True, idle_seconds=0.1, check_interval=0.02, monitor=FakeMonitor()
+        )
+        watch = detector.watch("codex", 1)
+        cancelled = asyncio.Event()
+        
+        async def hang():
+            try:
+                await asyncio.sleep(30)
+            finally:
+                cancelled.set()
+        
+        with pytest.raises(AgentStalledError):
+            await detector.supervise(watch, hang(), lambda: 0)
+        
+        assert cancelled.is_set()
+        assert detector.get_stats().stalled == 1
+        latest = get_error_tracker().get_recent_errors(1)[0]
+        assert latest.classification == ErrorClassification.STALLED
+        assert latest.agent == "codex"
+        assert latest.recoverable
+    
+    def test_exception_classification(self):
+        """Test that stalls are classified apart from timeouts."""
+        stalled = AgentStalledError("aider", 60)
+        assert ErrorClassification.from_exception(stalled) == ErrorClassification.STALLED
+        timeout = asyncio.TimeoutError()
+        assert ErrorClassification.from_exception(timeout) == ErrorClassification.TIMEOUT
+
+
+class TestExecutorStalls:
+    """Tests that the executor kills stalled CLIs early."""
+    
+    HANG = [sys.executable, "-c", "import time; time.sleep(30)"]
+    
+    @pytest.fixture
+    def executor(self):
+        """Create an executor with a fast stall detector."""
+        from src.executor import AgentExecutor
+        
+        executor = AgentExecutor()
+        executor._is_cli_available = lambda command: True
+        executor.stalls = StallDetector(enabled=True, idle_seconds=0.5, check_interval=0.1)
+        executor.stalls.threshold = lambda agent_name: 0.5
+        return executor
+    
+    @pytest.mark.asyncio
+    async def test_run_cli_stall(self, executor):
+        """Test that a silent CLI is killed long before its timeout."""
+        start = time.perf_counter()
+        with pytest.raises(AgentStalledError):
+            await executor._run_cli("codex", self.HANG, ".", timeout=30)
+        
+        assert time.perf_counter() - start < 10
+        assert executor.processes.get_stats().killed_stalled >= 1
+    
+    @pytest.mark.asyncio
+    async def test_stream_stall(self, executor):
+        """Test that a silent streaming CLI ends with a stalled summary."""
+        from src.executor import ExecutionContext
+        
+        with patch.object(executor, "_build_command", return_value=self.HANG):
+            context = ExecutionContext("", "hi", timeout=30)
+            events = [e async for e in executor.execute_stream("codex", context)]
+        
+        assert events[-1].error.startswith("Agent stalled")
+        assert events[-1].failure_kind == "stalled"
+        assert not events[-1].success
+    
+    def test_stall_fails_over(self):
+        """Test that the orchestrator treats a stall as its own failover reason."""
+        from src.orchestrator import Orchestrator
+        
+        assert Orchestrator._failover_reason(False, False, "stalled") == "stalled"
+    
+    @pytest.mark.asyncio
+    async def test_stalled_result_kind(self, executor):
+        """Test that a stalled run is classified for failover in its metadata."""
+        from src.executor import ExecutionContext
+        
+        executor._build_codex_command = lambda ctx, delivery=None: self.HANG
+        result = await executor.execute("codex", ExecutionContext("", "hi", timeout=30))
+        
+        assert not result.success
+        assert result.metadata["failure_kind"] == "stalled"
+
+
+class TestGlobalStallDetector:
+    """Tests for global stall detector singleton."""
+    
+    def test_get_stall_detector_is_singleton(self):
+        """Test that get_stall_detector returns the same instance."""
+        assert get_stall_detector() is get_stall_detector()
+        assert isinstance(get_stall_detector().get_stats(), StallStats)
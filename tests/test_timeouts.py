@@ -0,0 +1,262 @@
+"""
+Tests for LastAgent Adaptive Timeouts
+"""
+
+import asyncio
+import sys
+import pytest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.testclient import TestClient
+
+from src.latency import LatencyTracker
+from src.timeouts import (
+    EffectiveTimeout,
+    TimeoutPolicy,
+    get_timeout_policy,
+)
+
+
+def make_policy(**kwargs) -> TimeoutPolicy:
+    """Create a policy with its own latency history."""
+    kwargs.setdefault("latency", LatencyTracker(min_samples=3))
+    return TimeoutPolicy(**kwargs)
+
+
+class TestTimeoutPolicy:
+    """Tests for TimeoutPolicy class."""
+    
+    def test_settings_from_config(self):
+        """Test that the policy is configured from settings.yml."""
+        policy = TimeoutPolicy()
+        
+        assert policy.adaptive is True
+        assert policy.percentile == 99
+        assert policy.factor == 3
+        assert (policy.min_seconds, policy.max_seconds) == (30, 1800)
+    
+    def test_default_without_history(self):
+        """Test that agents without history get their configured default."""
+        policy = make_policy(default_seconds=300)
+        
+        assert policy.resolve("claude").seconds == 300
+        assert policy.resolve("claude").source == "default"
+        assert policy.resolve("goose").seconds == 900  # agents.yml timeout
+    
+    def test_adaptive_from_percentile(self):
+        """Test p99 x factor once there is enough history."""
+        policy = make_policy(factor=3, min_seconds=1)
+        for ms in (10000, 20000, 40000):
+            policy.latency.record("gemini", ms)
+        
+        timeout = policy.resolve("gemini")
+        
+        assert timeout.source == "adaptive"
+        assert timeout.seconds == 120
+        assert timeout.percentile_ms == 40000
+        assert timeout.samples == 3
+    
+    def test_adaptive_is_clamped(self):
+        """Test that adaptive timeouts stay within [min, max]."""
+        policy = make_policy(min_seconds=30, max_seconds=600)
+        for ms in (100, 200, 300):
+            policy.latency.record("gemini", ms)
+            policy.latency.record("goose", ms * 10000)
+        
+        assert policy.resolve("gemini").seconds == 30
+        assert policy.resolve("goose").seconds == 600
+    
+    def test_task_type_history_preferred(self):
+        """Test that task-type history is used, falling back to all runs."""
+        policy = make_policy(min_seconds=1)
+        for ms in (10000, 10000, 10000):
+            policy.latency.record("claude", ms, task_type="conversation")
+        for ms in (100000, 100000, 100000):
+            policy.latency.record("claude", ms, task_type="coding")
+        
+        assert policy.resolve("claude", "conversation").seconds == 30
+        assert policy.resolve("claude", "coding").seconds == 300
+        # No research runs: p99 over every run
+        assert policy.resolve("claude", "research").seconds == 300
+    
+    def test_not_adaptive(self):
+        """Test that adaptive timeouts can be turned off."""
+        policy = make_policy(adaptive=False, default_seconds=120)
+        for ms in (100, 200, 300):
+            policy.latency.record("gemini", ms)
+        
+        assert policy.resolve("gemini").source == "default"
+        assert policy.resolve("gemini").seconds == 120
+    
+    def test_override_precedence(self):
+        """Test that task-type overrides beat agent overrides beat history."""
+        policy = make_policy()
+        for ms in (100, 200, 300):
+            policy.latency.record("aider", ms)
+        policy.set_override("aider", 90)
+        policy.set_override("aider", 45, task_type="coding")
+        
+        assert policy.resolve("aider", "coding").seconds == 45
+        assert policy.resolve("aider", "research").seconds == 90
+        assert policy.resolve("aider").source == "override"
+        
+        assert policy.clear_override("aider")
+        assert not policy.clear_override("aider")
+        assert policy.resolve("aider").source == "adaptive"
+    
+    def test_invalid_override(self):
+        """Test that non-positive overrides are rejected."""
+        with pytest.raises(ValueError):
+            make_policy().set_override("aider", 0)
+    
+    def test_get_all(self):
+        """Test listing every agent, overall and per task type."""
+        policy = make_policy()
+        timeouts = policy.get_all(["coding"])
+        
+        assert all(isinstance(t, EffectiveTimeout) for t in timeouts)
+        assert {t.task_type for t in timeouts} == {None, "coding"}
+        assert len(timeouts) == 2 * len(policy.config.get_agent_names())
+
+
+class TestExecutorTimeouts:
+    """Tests that the executor applies the effective timeout."""
+    
+    @pytest.mark.asyncio
+    async def test_execute_resolves_timeout(self):
+        """Test that runs without a timeout get the policy's."""
+        from src.executor import AgentExecutor, ExecutionContext
+        
+        executor = AgentExecutor()
+        executor._is_cli_available = lambda command: True
+        command = [sys.executable, "-c", "print('ok')"]
+        executor._build_codex_command = lambda ctx, delivery=None: command
+        executor.timeouts = make_policy()
+        executor.timeouts.set_override("codex", 42, task_type="coding")
+        
+        result = await executor.execute(
+            "codex",
+            ExecutionContext(
+                system_prompt="", user_prompt="hi", task_type="coding", bypass_cache=True
+            ),
+        )
+        
+        assert result.success
+        assert result.metadata["timeout"] == {"seconds": 42, "source": "override"}
+    
+    @pytest.mark.asyncio
+    async def test_timeout_recovers_after_timed_out_run(self):
+        """Test that a run killed on timeout raises the next adaptive timeout."""
+        from src.executor import AgentExecutor, ExecutionContext
+        
+        executor = AgentExecutor()
+        executor._is_cli_available = lambda command: True
+        executor._build_codex_command = lambda ctx, delivery=None: [
+            sys.executable, "-c", "import time; time.sleep(10)"
+        ]
+        executor.timeouts = make_policy(min_seconds=0.5, factor=3)
+        executor.latency = executor.timeouts.latency
+        for ms in (100, 100, 100):
+            executor.latency.record("codex", ms)
+        assert executor.timeouts.resolve("codex").seconds == 0.5
+        
+        result = await executor.execute(
+            "codex",
+            ExecutionContext(system_prompt="", user_prompt="hi", bypass_cache=True),
+        )
+        
+        assert not result.success
+        assert result.error == "Execution timeout"
+        assert result.metadata["timeout"] == {"seconds": 0.5, "source": "adaptive"}
+        timeout = executor.timeouts.resolve("codex")
+        assert timeout.percentile_ms >= 500
+        assert timeout.seconds >= 1.5
+    
+    @pytest.mark.asyncio
+    async def test_latency_excludes_waits(self):
+        """Test that time before the CLI starts (here worktree setup) isn't a latency sample."""
+        from src.executor import AgentExecutor, ExecutionContext
+        
+        executor = AgentExecutor()
+        executor._is_cli_available = lambda command: True
+        command = [sys.executable, "-c", "print(1)"]
+        executor._build_codex_command = lambda ctx, delivery=None: command
+        executor.latency = LatencyTracker(min_samples=1)
+        
+        async def slow_lease(context):
+            await asyncio.sleep(0.5)
+            return None
+        
+        executor._lease_worktree = slow_lease
+        context = ExecutionContext(system_prompt="", user_prompt="hi", bypass_cache=True)
+        result = await executor.execute("codex", context)
+        async for event in executor.execute_stream("codex", context):
+            pass
+        
+        assert result.duration_ms >= 500
+        assert event.duration_ms >= 500
+        assert executor.latency.sample_count("codex") == 2
+        assert executor.latency.percentile("codex", 100) < 400
+    
+    @pytest.mark.asyncio
+    async def test_explicit_timeout_wins(self):
+        """Test that a timeout set on the request is kept."""
+        from src.executor import AgentExecutor, ExecutionContext
+        
+        executor = AgentExecutor()
+        context, timeout = executor._resolve_timeout("codex", ExecutionContext("", "hi", timeout=7))
+        
+        assert context.timeout == 7
+        assert timeout["source"] == "request"
+
+
+class TestTimeoutEndpoints:
+    """Tests for the timeout API endpoints."""
+    
+    @pytest.fixture
+    def client(self):
+        from api import app
+        return TestClient(app)
+    
+    def test_get_timeout(self, client):
+        """Test inspecting an agent's effective timeout."""
+        response = client.get("/v1/agents/claude/timeout", params={"task_type": "coding"})
+        
+        assert response.status_code == 200
+        assert response.json()["agent_name"] == "claude"
+        assert response.json()["task_type"] == "coding"
+    
+    def test_override_round_trip(self, client):
+        """Test setting and clearing an override."""
+        response = client.put("/v1/agents/aider/timeout", json={"seconds": 75})
+        assert response.json()["seconds"] == 75
+        assert response.json()["source"] == "override"
+        
+        response = client.delete("/v1/agents/aider/timeout")
+        assert response.status_code == 200
+        assert response.json()["source"] != "override"
+        assert client.delete("/v1/agents/aider/timeout").status_code == 404
+    
+    def test_invalid_requests(self, client):
+        """Test unknown agents and non-positive timeouts."""
+        assert client.get("/v1/agents/nope/timeout").status_code == 404
+        assert client.put("/v1/agents/aider/timeout", json={"seconds": 0}).status_code == 422
+    
+    def test_metrics(self, client):
+        """Test the timeouts metrics endpoint."""
+        response = client.get("/v1/metrics/timeouts")
+        
+        assert response.status_code == 200
+        assert response.json()["percentile"] == 99
+        assert any(t["task_type"] == "coding" for t in response.json()["timeouts"])
+
+
+class TestGlobalTimeoutPolicy:
+    """Tests for global timeout policy singleton."""
+    
+    def test_get_timeout_policy_is_singleton(self):
+        """Test that get_timeout_policy returns the same instance."""
+        assert get_timeout_policy() is get_timeout_policy()
+        assert isinstance(get_timeout_policy().resolve("claude"), EffectiveTimeout)
@@ -0,0 +1,168 @@
+"""
+Tests for LastAgent Git Worktree Pool
+"""
+
+import asyncio
+import subprocess
+import pytest
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.worktree_pool import (
+    WorktreePool,
+    WorktreeStats,
+    get_worktree_pool,
+)
+
+
+def git(cwd, *args):
+    """Run git synchronously and return stdout."""
+    return subprocess.run(
+        ["git", *args], cwd=cwd, check=True, capture_output=True, text=True
+    ).stdout.strip()
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """Create a git repository with one commit and a subdirectory."""
+    repo = tmp_path / "repo"
+    (repo / "src").mkdir(parents=True)
+    git(repo, "init", "-q")
+    git(repo, "config", "user.email", "test@example.com")
+    git(repo, "config", "user.name", "Test")
+    (repo / "src" / "main.py").write_text("print('hello')\n")
+    git(repo, "add", ".")
+    git(repo, "commit", "-q", "-m", "init")
+    return repo
+
+
+class TestWorktreePool:
+    """Tests for WorktreePool class."""
+    
+    @pytest.fixture
+    async def pool(self, tmp_path):
+        """Create a worktree-mode pool under tmp_path."""
+        pool = WorktreePool(mode="worktree", pool_size=1, base_dir=str(tmp_path / "worktrees"))
+        yield pool
+        await pool.shutdown()
+    
+    def test_shared_by_default(self):
+        """Test that isolation is opt-in via settings.yml or per task."""
+        pool = WorktreePool()
+        assert not pool.wants_isolation(None)
+        assert pool.wants_isolation("worktree")
+    
+    @pytest.mark.asyncio
+    async def test_lease_maps_subdirectory(self, pool, repo):
+        """Test that the task runs in the same subdirectory of a clean checkout."""
+        lease = await pool.lease(str(repo / "src"))
+        
+        assert lease.working_directory == str(Path(lease.path) / "src")
+        assert (Path(lease.working_directory) / "main.py").read_text() == "print('hello')\n"
+        assert lease.base_commit == git(repo, "rev-parse", "HEAD")
+        await pool.release(lease)
+    
+    @pytest.mark.asyncio
+    async def test_non_git_directory(self, pool, tmp_path):
+        """Test that directories outside git aren't isolated."""
+        assert await pool.lease(str(tmp_path)) is None
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_leases_are_isolated(self, pool, repo):
+        """Test that two tasks on one repo get separate checkouts."""
+        first = await pool.lease(str(repo))
+        second = await pool.lease(str(repo))
+        
+        (Path(first.path) / "src" / "main.py").write_text("first\n")
+        
+        assert first.path != second.path
+        assert (Path(second.path) / "src" / "main.py").read_text() == "print('hello')\n"
+        assert (repo / "src" / "main.py").read_text() == "print('hello')\n"
+        await pool.release(first, merge=False)
+        await pool.release(second)
+    
+    @pytest.mark.asyncio
+    async def test_release_merges_back_as_branch(self, pool, repo):
+        """Test that changes are committed to a branch visible in the main repo."""
+        lease = await pool.lease(str(repo))
+        (Path(lease.path) / "NEW.md").write_text("added by agent\n")
+        
+        branch = await pool.release(lease, label="aider")
+        
+        assert branch == f"lastagent/aider-{lease.id}"
+        assert git(repo, "show", f"{branch}:NEW.md") == "added by agent"
+        assert not (repo / "NEW.md").exists()
+        assert pool.get_stats().branches == 1
+    
+    @pytest.mark.asyncio
+    async def test_release_without_changes(self, pool, repo):
+        """Test that unchanged worktrees create no branch and are reused clean."""
+        lease = await pool.lease(str(repo))
+        assert await pool.release(lease) is None
+        
+        (Path(lease.path) / "leftover.txt").write_text("x")  # Stray file after release
+        again = await pool.lease(str(repo))
+        
+        assert again.path == lease.path
+        assert not (Path(again.path) / "leftover.txt").exists()
+        assert pool.get_stats().reused == 1
+        await pool.release(again)
+    
+    
+    @pytest.mark.asyncio
+    async def test_pool_size_counts_leased(self, repo, tmp_path):
+        """Test that the top-up counts leased worktrees, so releases are kept."""
+        pool = WorktreePool(mode="worktree", pool_size=2, base_dir=str(tmp_path / "wt"))
+        lease = await pool.lease(str(repo))
+        await asyncio.gather(*pool._filling.values())  # Background top-up
+        assert pool.get_stats().idle == 1
+        
+        await pool.release(lease)
+        again = await pool.lease(str(repo))
+        
+        assert again.path == lease.path  # Released worktree is reused first
+        assert pool.get_stats().removed == 0
+        await pool.release(again)
+        await pool.shutdown()
+
+class TestExecutorIsolation:
+    """Tests that the executor runs isolated tasks in a leased worktree."""
+    
+    @pytest.mark.asyncio
+    async def test_execute_in_worktree(self, repo, tmp_path):
+        """Test that an agent's edits land on a branch, not in the shared checkout."""
+        from src.executor import AgentExecutor, ExecutionContext
+        
+        executor = AgentExecutor()
+        executor.worktrees = WorktreePool(mode="shared", pool_size=0, base_dir=str(tmp_path / "wt"))
+        executor._is_cli_available = lambda command: True
+        executor._build_codex_command = lambda ctx, delivery=None: [
+            sys.executable, "-c",
+            "import os; open('main.py', 'a').write('# edited\\n'); print(os.getcwd())",
+        ]
+        context = ExecutionContext(
+            system_prompt="",
+            user_prompt="edit",
+            working_directory=str(repo / "src"),
+            isolation="worktree",
+        )
+        
+        result = await executor.execute("codex", context)
+        
+        worktree = result.metadata["worktree"]
+        assert result.success
+        assert result.response.strip().startswith(worktree["path"])
+        assert "# edited" in git(repo, "show", f"{worktree['branch']}:src/main.py")
+        assert (repo / "src" / "main.py").read_text() == "print('hello')\n"
+        assert not Path(worktree["path"]).exists()  # pool_size=0: removed on release
+
+
+class TestGlobalWorktreePool:
+    """Tests for global worktree pool singleton."""
+    
+    def test_get_worktree_pool_is_singleton(self):
+        """Test that get_worktree_pool returns the same instance."""
+        assert get_worktree_pool() is get_worktree_pool()
+        assert isinstance(get_worktree_pool().get_stats(), WorktreeStats)